@@ -3,20 +3,29 @@ Lambda Bronze: Ingesta de archivos CSV/Excel a DynamoDB Bronze
 """
 import json
 import base64
+import gzip
 import logging
 from datetime import datetime
 from io import BytesIO
 import pandas as pd
-import boto3
 from botocore.exceptions import ClientError
 
+from tecno_etl.loaders.wire_format import PreSerializedBatchWriter, serialize_frame
+from tecno_etl.utils.capacity import CAPACITY_LEDGER_TABLE, CapacityLedger
+from tecno_etl.utils.aws_clients import get_client, get_resource
+from tecno_etl.utils.metrics import start_invocation
+from tecno_etl.utils.run_ledger import RUN_LEDGER_TABLE, RunLedger, make_file_id
+from tecno_etl.utils.profiling import profile_handler
+
 # Configurar logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Clientes AWS
-dynamodb = boto3.resource('dynamodb')
-sqs = boto3.client('sqs')
+# Clientes AWS (pool, reintentos y timeouts compartidos, ver tecno_etl.utils.aws_clients)
+dynamodb = get_resource('dynamodb')
+sqs = get_client('sqs')
+# Progreso por archivo y etapa (ver tecno_etl.utils.run_ledger)
+runs = RunLedger(dynamodb.Table(RUN_LEDGER_TABLE))
 
 # Configuración
 BRONZE_TABLE = 'tecnomundo_bronze_sales'
@@ -42,6 +51,35 @@ def sanitize_column_name(col_name: str) -> str:
     return sanitized
 
 
+def open_file_stream(file_bytes: bytes, content_encoding: str | None):
+    """
+    Devuelve un stream de lectura sobre el contenido del archivo.
+    Si el evento declara compresión, se descomprime en streaming mientras pandas lee.
+    """
+    raw = BytesIO(file_bytes)
+    if not content_encoding or content_encoding == 'identity':
+        return raw
+    if content_encoding == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='rb')
+    if content_encoding == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(raw)
+    raise ValueError(f"content_encoding no soportado: {content_encoding}")
+
+
+def build_bronze_items(df: pd.DataFrame, file_id: str) -> list[dict]:
+    """
+    Items Bronze (uno por fila del DataFrame) ya serializados al formato de DynamoDB.
+    Se convierten columnas completas (floats a número, NaN a NULL), sin pasar por el recurso boto3.
+    """
+    row_ids = pd.Series([f"row_{idx:05d}" for idx in df.index], index=df.index)
+    return serialize_frame(
+        df.assign(row_id=row_ids),
+        constants={'file_id': file_id, 'loaded_at': datetime.now().isoformat()},
+    )
+
+
+@profile_handler(name='bronze_ingestion')
 def lambda_handler(event, context):
     """
     Handler principal de Lambda Bronze.
@@ -50,9 +88,15 @@ def lambda_handler(event, context):
     {
         "file_content": "base64_encoded_csv_or_excel",
         "file_name": "ventas.csv",
-        "file_type": "csv"  # o "excel"
+        "file_type": "csv",  # o "excel"
+        "content_encoding": "gzip",  # opcional: "gzip" o "zstd"; ausente = sin comprimir
+        "file_id": "ventas_20240101_120000",  # opcional: lo genera el invocador para seguir la corrida
+        "profile": true  # opcional: perfila esta invocación (ver tecno_etl.utils.profiling)
     }
     """
+    metrics = start_invocation('bronze_ingestion', context)
+    ledger = CapacityLedger('bronze_ingestion')
+    file_id = None
     try:
         logger.info("=== Lambda Bronze Ingestion Iniciada ===")
         
@@ -60,61 +104,74 @@ def lambda_handler(event, context):
         file_content_b64 = event['file_content']
         file_name = event['file_name']
         file_type = event.get('file_type', 'csv')
+        content_encoding = event.get('content_encoding')
+        
+        # file_id del invocador (registrado en el ledger de corridas) o uno nuevo
+        file_id = event.get('file_id') or make_file_id(file_name)
+        metrics.set_property('file_id', file_id)
+        runs.start(file_id, 'bronze')
         
         # 2. Decodificar archivo
-        file_bytes = base64.b64decode(file_content_b64)
-        logger.info(f"Archivo decodificado: {file_name} ({len(file_bytes)} bytes)")
+        with metrics.span('decode'):
+            file_bytes = base64.b64decode(file_content_b64)
+        metrics.count('input_bytes', len(file_bytes), unit='Bytes')
+        logger.info(
+            f"Archivo decodificado: {file_name} ({len(file_bytes)} bytes"
+            f"{f', {content_encoding}' if content_encoding else ''})"
+        )
         
-        # 3. Leer con pandas
-        if file_type == 'csv':
-            df = pd.read_csv(BytesIO(file_bytes))
-        else:  # excel
-            df = pd.read_excel(BytesIO(file_bytes), engine='openpyxl')
+        # 3. Leer con pandas (descomprimiendo en streaming si corresponde)
+        with metrics.span('parse'):
+            with open_file_stream(file_bytes, content_encoding) as stream:
+                if file_type == 'csv':
+                    df = pd.read_csv(stream)
+                else:  # excel (openpyxl necesita un archivo con seek)
+                    df = pd.read_excel(BytesIO(stream.read()), engine='openpyxl')
         
+        metrics.count('rows', len(df))
         logger.info(f"DataFrame cargado: {len(df)} filas, {len(df.columns)} columnas")
         
         # 4. Sanitizar nombres de columnas
-        df.columns = [sanitize_column_name(col) for col in df.columns]
+        with metrics.span('sanitize'):
+            df.columns = [sanitize_column_name(col) for col in df.columns]
         logger.info(f"Columnas sanitizadas: {list(df.columns)}")
         
-        # 5. Generar file_id único
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_id = f"{file_name.split('.')[0]}_{timestamp}"
-        
-        # 6. Escribir a DynamoDB Bronze
+        # 5. Escribir a DynamoDB Bronze
         table = dynamodb.Table(BRONZE_TABLE)
+        items = build_bronze_items(df, file_id)
+        remaining_ms = getattr(context, 'get_remaining_time_in_millis', None)
         
-        with table.batch_writer() as batch:
-            for idx, row in df.iterrows():
-                item = {
-                    'file_id': file_id,
-                    'row_id': f"row_{idx:05d}",
-                    'loaded_at': datetime.now().isoformat(),
-                    **row.to_dict()
-                }
-                
-                # Convertir NaN a None
-                item = {k: (None if pd.isna(v) else v) for k, v in item.items()}
-                
+        with metrics.span('write_bronze'), PreSerializedBatchWriter(
+            table, ledger=ledger, file_id=file_id, remaining_ms=remaining_ms
+        ) as batch:
+            # Un archivo que no entra en la capacidad de la tabla falla antes de escribir nada
+            batch.check_deadline(items)
+            for item in items:
                 batch.put_item(Item=item)
+        metrics.count('write_units', batch.write_units)
+        metrics.count('throttles', batch.throttles)
+        metrics.count('rate_wait_ms', batch.rate_wait_s * 1000, unit='Milliseconds')
         
         logger.info(f"✅ {len(df)} registros escritos en {BRONZE_TABLE}")
         
-        # 7. Enviar mensaje a SQS Silver Queue
+        runs.finish(file_id, 'bronze', rows_in=len(df), rows_out=len(df))
+        
+        # 6. Enviar mensaje a SQS Silver Queue
         sqs_message = {
             'file_id': file_id,
             'row_count': len(df),
             'timestamp': datetime.now().isoformat()
         }
         
-        sqs.send_message(
-            QueueUrl=SILVER_QUEUE_URL,
-            MessageBody=json.dumps(sqs_message)
-        )
+        with metrics.span('notify'):
+            sqs.send_message(
+                QueueUrl=SILVER_QUEUE_URL,
+                MessageBody=json.dumps(sqs_message)
+            )
         
         logger.info(f"✅ Mensaje enviado a SQS Silver Queue")
         
-        # 8. Retornar resultado
+        # 7. Retornar resultado
         return {
             'statusCode': 200,
             'body': json.dumps({
@@ -126,7 +183,16 @@ def lambda_handler(event, context):
         
     except Exception as e:
         logger.error(f"❌ Error en Bronze Lambda: {str(e)}", exc_info=True)
+        metrics.count('errors', 1)
+        if file_id:
+            runs.fail(file_id, 'bronze', str(e))
         return {
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
         }
+    finally:
+        # Capacidad consumida por file_id: a la línea de métricas y al ledger de costos
+        ledger.report_to(metrics)
+        ledger.save_to_table(dynamodb.Table(CAPACITY_LEDGER_TABLE))
+        # Una línea EMF por invocación (duraciones por fase, filas, bytes, arranque en frío)
+        metrics.emit()
@@ -3,25 +3,44 @@ Lambda Gold: Enriquecimiento con dimensiones
 """
 import json
 import logging
-from datetime import datetime
-import boto3
+
+from tecno_etl.loaders import RateLimitedBatchWriter
+from tecno_etl.loaders.item_codec import compact_items_enabled, decode_items, encode_gold_items
+from tecno_etl.transformers.enrichment import enrich_items, load_dimensions
+from tecno_etl.utils.capacity import CAPACITY_LEDGER_TABLE, RETURN_CONSUMED_CAPACITY, CapacityLedger
+from tecno_etl.utils.aws_clients import get_resource
+from tecno_etl.utils.metrics import elapsed_ms_since, start_invocation
+from tecno_etl.utils.profiling import profile_handler
+from tecno_etl.utils.run_ledger import RUN_LEDGER_TABLE, RunLedger
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+# Clientes AWS (pool, reintentos y timeouts compartidos, ver tecno_etl.utils.aws_clients)
+dynamodb = get_resource('dynamodb')
+# Progreso por archivo y etapa (ver tecno_etl.utils.run_ledger)
+runs = RunLedger(dynamodb.Table(RUN_LEDGER_TABLE))
 
 # Configuración
 SILVER_TABLE = 'tecnomundo_silver_sales'
 GOLD_TABLE = 'tecnomundo_gold_sales'
 DIMENSIONS_TABLE = 'tecnomundo_dimensions_products'
 
+# Codificación compacta de items (alias cortos, timestamp por archivo); ver tecno_etl.loaders.item_codec
+COMPACT_ITEMS = compact_items_enabled()
+
 
+@profile_handler(name='gold_enrichment')
 def lambda_handler(event, context):
     """
     Handler de Lambda Gold.
     Enriquece datos de Silver con información de dimensiones.
     """
+    metrics = start_invocation('gold_enrichment', context)
+    ledger = CapacityLedger('gold_enrichment')
+    # Tiempo restante de la invocación: los escritores fallan antes del timeout (ver RateLimitedBatchWriter)
+    remaining_ms = getattr(context, 'get_remaining_time_in_millis', None)
+    file_id = None
     try:
         logger.info("=== Lambda Gold Enrichment Iniciada ===")
         
@@ -30,57 +49,68 @@ def lambda_handler(event, context):
             file_id = message['file_id']
             
             logger.info(f"Procesando file_id: {file_id}")
+            runs.start(file_id, 'gold')
             
             # 1. Leer datos de Silver (filtrar por timestamp reciente)
             silver_table = dynamodb.Table(SILVER_TABLE)
             # Simplificado: escanear últimos registros
             # En producción, usar query con GSI por timestamp
-            response = silver_table.scan(Limit=1000)
-            silver_items = response['Items']
+            with metrics.span('read_silver'):
+                response = silver_table.scan(Limit=1000, ReturnConsumedCapacity=RETURN_CONSUMED_CAPACITY)
+            ledger.record(response, file_id=file_id)
+            # Acepta items Silver compactos y en formato original (omite las cabeceras de archivo)
+            silver_items = decode_items(response['Items'])
+            metrics.count('rows_in', len(silver_items))
             
             logger.info(f"Leídos {len(silver_items)} registros de Silver")
             
-            # 2. Leer dimensiones
-            dim_table = dynamodb.Table(DIMENSIONS_TABLE)
-            dimensions = {}
-            
-            # Cargar todas las dimensiones en memoria (OK para volumen bajo)
-            dim_response = dim_table.scan()
-            for dim in dim_response['Items']:
-                dimensions[dim['codigo_producto']] = dim
+            # 2. Cargar todas las dimensiones en memoria (OK para volumen bajo)
+            with metrics.span('load_dimensions'):
+                dimensions = load_dimensions(dynamodb.Table(DIMENSIONS_TABLE), ledger, file_id)
             
             logger.info(f"Cargadas {len(dimensions)} dimensiones")
             
             # 3. Enriquecer y escribir a Gold
             gold_table = dynamodb.Table(GOLD_TABLE)
-            enriched_count = 0
-            not_found_count = 0
+            with metrics.span('enrich'):
+                gold_items, found = enrich_items(silver_items, dimensions)
+                if COMPACT_ITEMS:
+                    # Nombre y categoría se resuelven al leer a partir de la dimensión
+                    gold_items = encode_gold_items(silver_items, found, file_id)
+            not_found_count = found.count(False)
             
-            with gold_table.batch_writer() as batch:
-                for item in silver_items:
-                    codigo = item['codigo_producto']
-                    
-                    # Buscar dimensión
-                    dim = dimensions.get(codigo)
-                    
-                    gold_item = {
-                        **item,  # Todos los campos de Silver
-                        'nombre_del_producto': dim.get('nombre_del_producto', 'NO_ENCONTRADO') if dim else 'NO_ENCONTRADO',
-                        'categoria': dim.get('categoria', 'SIN_CATEGORIA') if dim else 'SIN_CATEGORIA',
-                        'enriched_at': datetime.now().isoformat()
-                    }
-                    
+            with metrics.span('write_gold'), RateLimitedBatchWriter(
+                gold_table, ledger=ledger, file_id=file_id, remaining_ms=remaining_ms
+            ) as batch:
+                for gold_item in gold_items:
                     batch.put_item(Item=gold_item)
-                    
-                    if dim:
-                        enriched_count += 1
-                    else:
-                        not_found_count += 1
+            metrics.count('write_units', batch.write_units)
+            metrics.count('throttles', batch.throttles)
+            metrics.count('rate_wait_ms', batch.rate_wait_s * 1000, unit='Milliseconds')
             
-            logger.info(f"✅ Gold completado: {enriched_count} enriquecidos, {not_found_count} sin dimensión")
+            metrics.count('rows_out', len(silver_items))
+            metrics.count('dimension_not_found', not_found_count)
+            # Latencia del archivo desde que Bronze terminó (para comparar con el modo fusionado de Silver)
+            latency_ms = elapsed_ms_since(message.get('ingested_at'))
+            if latency_ms is not None:
+                metrics.count('pipeline_latency_ms', latency_ms, unit='Milliseconds')
+            runs.finish(file_id, 'gold', rows_in=len(silver_items), rows_out=len(silver_items), final=True)
+            logger.info(
+                f"✅ Gold completado: {len(silver_items) - not_found_count} enriquecidos, "
+                f"{not_found_count} sin dimensión"
+            )
         
         return {'statusCode': 200}
         
     except Exception as e:
         logger.error(f"❌ Error en Gold Lambda: {str(e)}", exc_info=True)
+        metrics.count('errors', 1)
+        if file_id:
+            runs.fail(file_id, 'gold', str(e))
         raise
+    finally:
+        # Capacidad consumida por file_id: a la línea de métricas y al ledger de costos
+        ledger.report_to(metrics)
+        ledger.save_to_table(dynamodb.Table(CAPACITY_LEDGER_TABLE))
+        # Una línea EMF por invocación (duraciones por fase, filas, arranque en frío)
+        metrics.emit()
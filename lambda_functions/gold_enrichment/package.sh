@@ -17,6 +17,10 @@ pip install -r requirements.txt -t package/ --quiet
 # Copiar código Lambda
 cp lambda_function.py package/
 
+# Copiar el paquete compartido (fábrica de clientes AWS, etc.)
+cp -r ../../src/tecno_etl package/
+find package/tecno_etl -name "__pycache__" -type d -prune -exec rm -rf {} +
+
 # Empaquetar todo
 cd package
 zip -r ../function.zip . > /dev/null
@@ -16,6 +16,7 @@ if (Test-Path "package") { Remove-Item -Recurse -Force package }
 if (Test-Path "function.zip") { Remove-Item -Force function.zip }
 New-Item -ItemType Directory -Force -Path package | Out-Null
 Copy-Item lambda_function.py package\
+Copy-Item -Recurse ..\..\src\tecno_etl package\tecno_etl -Exclude __pycache__
 Compress-Archive -Path package\* -DestinationPath function.zip -Force
 $size = (Get-Item function.zip).Length / 1KB
 Write-Host "✅ Bronze empaquetada: $([math]::Round($size, 1)) KB" -ForegroundColor Green
@@ -30,6 +31,7 @@ New-Item -ItemType Directory -Force -Path package | Out-Null
 Write-Host "📦 Instalando dependencias..." -ForegroundColor Gray
 pip install boto3==1.34.0 python-dateutil==2.8.2 -t package\ --quiet
 Copy-Item lambda_function.py package\
+Copy-Item -Recurse ..\..\src\tecno_etl package\tecno_etl -Exclude __pycache__
 Compress-Archive -Path package\* -DestinationPath function.zip -Force
 $size = (Get-Item function.zip).Length / 1MB
 Write-Host "✅ Silver empaquetada: $([math]::Round($size, 1)) MB" -ForegroundColor Green
@@ -44,6 +46,7 @@ New-Item -ItemType Directory -Force -Path package | Out-Null
 Write-Host "📦 Instalando dependencias..." -ForegroundColor Gray
 pip install boto3==1.34.0 -t package\ --quiet
 Copy-Item lambda_function.py package\
+Copy-Item -Recurse ..\..\src\tecno_etl package\tecno_etl -Exclude __pycache__
 Compress-Archive -Path package\* -DestinationPath function.zip -Force
 $size = (Get-Item function.zip).Length / 1MB
 Write-Host "✅ Gold empaquetada: $([math]::Round($size, 1)) MB" -ForegroundColor Green
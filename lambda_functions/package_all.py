@@ -1,6 +1,27 @@
 """
 Script Python para empaquetar Lambdas en Windows (sin necesidad de bash/zip)
+
+Además de instalar dependencias y crear el ZIP, cada paquete se minimiza:
+
+1. Se traza el import del handler (`python -X importtime`) y se podan las
+   dependencias y módulos de `tecno_etl` que nunca se importan.
+2. Se eliminan los modelos de botocore de servicios que la función no usa,
+   cachés, tests y metadatos de instalación.
+3. Se precompila el bytecode (el sistema de archivos de Lambda es de sólo lectura).
+4. Con `--layer`, pandas/numpy y sus dependencias se mueven a un Layer
+   compartido (`layer/pandas_layer.zip`).
+5. Se mide el tamaño descomprimido y el tiempo de import en frío de cada
+   artefacto; si alguno excede su presupuesto el script termina con error.
+
+La traza y la medición importan el paquete con el intérprete local: las
+dependencias compiladas para Lambda (manylinux) sólo se pueden importar en
+Linux x86_64. En otra plataforma se omiten la poda y el presupuesto de import
+(o usar `--no-trace`).
+
+Uso:
+    python lambda_functions/package_all.py [--layer] [--only bronze_ingestion] [--no-trace]
 """
+import argparse
 import os
 import sys
 import shutil
@@ -8,104 +29,240 @@ import zipfile
 from pathlib import Path
 import subprocess
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from tecno_etl.utils.packaging import (
+    LambdaSpec,
+    check_budget,
+    compile_package,
+    directory_size,
+    measure_import_ms,
+    move_to_layer,
+    prune_aws_data,
+    prune_unused,
+    strip_package,
+    trace_imports,
+)
+
+# Configuración y presupuestos por función
+LAMBDAS = {
+    "bronze_ingestion": LambdaSpec(
+        "bronze_ingestion",
+        runtime_imports=("openpyxl", "zstandard"),
+        aws_services=("dynamodb", "sqs"),
+        use_layer=True,
+        max_unzipped_mb=150,
+        max_import_ms=1500,
+    ),
+    "silver_transformation": LambdaSpec(
+        "silver_transformation",
+        runtime_imports=("dateutil.parser",),
+        aws_services=("dynamodb", "sqs"),
+        max_unzipped_mb=25,
+        max_import_ms=600,
+    ),
+    "gold_enrichment": LambdaSpec(
+        "gold_enrichment",
+        aws_services=("dynamodb",),
+        max_unzipped_mb=25,
+        max_import_ms=600,
+    ),
+}
+
+# Límite de AWS para función + Layers descomprimidos
+AWS_MAX_UNZIPPED_MB = 250
+
+LAYER_DIR = Path(__file__).parent / "layer"
+
+
+def install_requirements(lambda_dir: Path, package_dir: Path):
+    """Instala las dependencias de la función en el directorio del paquete"""
+    requirements_file = lambda_dir / "requirements.txt"
+    if not requirements_file.exists():
+        return
+
+    print("📦 Instalando dependencias...")
+
+    # Usar pip con wheels precompilados (sin compilar). Se instalan también las
+    # dependencias transitivas: la poda por traza elimina las que no se importan.
+    result = subprocess.run([
+        sys.executable, "-m", "pip", "install",
+        "-r", str(requirements_file),
+        "-t", str(package_dir),
+        "--only-binary=:all:",  # Solo usar wheels precompilados
+        "--platform", "manylinux2014_x86_64",  # Plataforma de Lambda
+        "--python-version", "311",  # Python 3.11
+        "--implementation", "cp",
+    ], capture_output=True, text=True)
 
-def package_lambda(lambda_dir: Path):
-    """Empaqueta una función Lambda con sus dependencias"""
+    if result.returncode != 0:
+        print("⚠️ Algunos paquetes no tienen wheels, instalando con dependencias...")
+        # Intentar instalación normal para paquetes sin wheels
+        subprocess.run([
+            sys.executable, "-m", "pip", "install",
+            "-r", str(requirements_file),
+            "-t", str(package_dir),
+            "--upgrade"
+        ], check=True)
+
+
+def create_zip(source_dir: Path, zip_file: Path, prefix: str = ""):
+    """Comprime el contenido de `source_dir` (opcionalmente bajo `prefix/`)"""
+    with zipfile.ZipFile(zip_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for root, dirs, files in os.walk(source_dir):
+            for file in files:
+                file_path = Path(root) / file
+                arcname = Path(prefix) / file_path.relative_to(source_dir)
+                zipf.write(file_path, arcname)
+
+
+def package_lambda(lambda_dir: Path, spec: LambdaSpec, use_layer: bool = False, trace: bool = True) -> dict:
+    """Empaqueta una función Lambda con sus dependencias y mide el artefacto"""
     print(f"\n🔧 Empaquetando {lambda_dir.name}...")
-    
+
     # Limpiar archivos anteriores
     package_dir = lambda_dir / "package"
     zip_file = lambda_dir / "function.zip"
-    
+
     if package_dir.exists():
         shutil.rmtree(package_dir)
     if zip_file.exists():
         zip_file.unlink()
-    
+
     # Crear directorio para dependencias
     package_dir.mkdir()
-    
-    # Instalar dependencias
-    requirements_file = lambda_dir / "requirements.txt"
-    if requirements_file.exists():
-        print("📦 Instalando dependencias...")
-        
-        # Usar pip con wheels precompilados (sin compilar)
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "install",
-            "-r", str(requirements_file),
-            "-t", str(package_dir),
-            "--only-binary=:all:",  # Solo usar wheels precompilados
-            "--platform", "manylinux2014_x86_64",  # Plataforma de Lambda
-            "--python-version", "311",  # Python 3.11
-            "--implementation", "cp",
-            "--no-deps"  # Instalar sin dependencias primero
-        ], capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print("⚠️ Algunos paquetes no tienen wheels, instalando con dependencias...")
-            # Intentar instalación normal para paquetes sin wheels
-            subprocess.run([
-                sys.executable, "-m", "pip", "install",
-                "-r", str(requirements_file),
-                "-t", str(package_dir),
-                "--upgrade"
-            ], check=True)
-    
+    install_requirements(lambda_dir, package_dir)
+
     # Copiar código Lambda
     lambda_function = lambda_dir / "lambda_function.py"
     shutil.copy(lambda_function, package_dir / "lambda_function.py")
-    
+
+    # Copiar el paquete compartido (fábrica de clientes AWS, etc.)
+    shutil.copytree(
+        lambda_dir.parent.parent / "src" / "tecno_etl",
+        package_dir / "tecno_etl",
+        ignore=shutil.ignore_patterns("__pycache__", "*.pyc"),
+    )
+
+    initial_bytes = directory_size(package_dir)
+    extra_paths = ()
+    if use_layer and spec.use_layer:
+        layer_python = LAYER_DIR / "python"
+        moved = move_to_layer(package_dir, layer_python)
+        strip_package(layer_python)
+        compile_package(layer_python)
+        extra_paths = (layer_python,)
+        print(f"📚 Movidos al Layer: {', '.join(moved) or 'nada'}")
+
+    # Podar lo que el handler nunca importa
+    import_ms = None
+    traced = False
+    if trace:
+        try:
+            import_trace = trace_imports(package_dir, spec.runtime_imports, extra_paths)
+            removed = prune_unused(package_dir, import_trace)
+            traced = True
+            print(f"✂️  Podados {len(removed)} módulos/paquetes no importados")
+        except RuntimeError as e:
+            print(f"⚠️ {e}")
+            print("   Se omiten la poda y el presupuesto de import (¿plataforma distinta de Lambda?)")
+
+    aws_bytes = prune_aws_data(package_dir, spec.aws_services)
+    stripped_bytes = strip_package(package_dir)
+    print(f"🧹 Eliminados {(aws_bytes + stripped_bytes) / 2**20:.1f} MB (modelos AWS, cachés, tests, metadatos)")
+
+    if compile_package(package_dir):
+        print("⚙️  Bytecode precompilado")
+    else:
+        print(f"⚠️ Python local {sys.version_info.major}.{sys.version_info.minor} != runtime de Lambda: sin bytecode")
+
+    if traced:
+        import_ms = measure_import_ms(package_dir, extra_paths)
+
     # Crear ZIP
     print("📦 Creando archivo ZIP...")
-    with zipfile.ZipFile(zip_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(package_dir):
-            for file in files:
-                file_path = Path(root) / file
-                arcname = file_path.relative_to(package_dir)
-                zipf.write(file_path, arcname)
-    
+    create_zip(package_dir, zip_file)
+
     # Mostrar tamaño
+    unzipped_bytes = directory_size(package_dir)
     size_mb = zip_file.stat().st_size / (1024 * 1024)
-    print(f"✅ {lambda_dir.name} empaquetada: {size_mb:.1f} MB")
+    print(f"✅ {lambda_dir.name} empaquetada: {size_mb:.1f} MB "
+          f"({initial_bytes / 2**20:.1f} -> {unzipped_bytes / 2**20:.1f} MB descomprimido"
+          f"{f', import en frío {import_ms:.0f} ms' if import_ms is not None else ''})")
     print(f"📍 Ubicación: {zip_file}")
-    
-    return zip_file
+
+    violations = check_budget(spec, unzipped_bytes, import_ms)
+    if extra_paths:
+        total_mb = (unzipped_bytes + directory_size(extra_paths[0])) / 2**20
+        if total_mb > AWS_MAX_UNZIPPED_MB:
+            violations.append(f"{spec.name}: función + Layer {total_mb:.1f} MB > {AWS_MAX_UNZIPPED_MB} MB")
+
+    return {
+        "zip_file": zip_file,
+        "unzipped_mb": unzipped_bytes / 2**20,
+        "import_ms": import_ms,
+        "violations": violations,
+    }
 
 
 def main():
     """Empaquetar todas las Lambdas"""
+    parser = argparse.ArgumentParser(description="Empaquetado mínimo de las Lambdas")
+    parser.add_argument("--layer", action="store_true",
+                        help="Mover pandas/numpy a un Layer compartido (layer/pandas_layer.zip)")
+    parser.add_argument("--only", choices=list(LAMBDAS), nargs="+", default=list(LAMBDAS))
+    parser.add_argument("--no-trace", action="store_true",
+                        help="No trazar imports (sin poda ni presupuesto de import)")
+    args = parser.parse_args()
+
     lambda_functions_dir = Path(__file__).parent
-    
-    lambdas = [
-        "bronze_ingestion",
-        "silver_transformation",
-        "gold_enrichment"
-    ]
-    
+
     print("=" * 60)
     print("🚀 Empaquetador de Lambdas para Windows")
     print("=" * 60)
-    
-    for lambda_name in lambdas:
+
+    if args.layer and LAYER_DIR.exists():
+        shutil.rmtree(LAYER_DIR)
+
+    results = {}
+    for lambda_name in args.only:
         lambda_dir = lambda_functions_dir / lambda_name
         if lambda_dir.exists():
             try:
-                package_lambda(lambda_dir)
+                results[lambda_name] = package_lambda(
+                    lambda_dir, LAMBDAS[lambda_name], use_layer=args.layer, trace=not args.no_trace
+                )
             except Exception as e:
                 print(f"❌ Error empaquetando {lambda_name}: {e}")
                 continue
-    
+
+    if args.layer and (LAYER_DIR / "python").exists():
+        layer_zip = LAYER_DIR / "pandas_layer.zip"
+        create_zip(LAYER_DIR / "python", layer_zip, prefix="python")
+        layer_mb = directory_size(LAYER_DIR / "python") / 2**20
+        print(f"\n📚 Layer creado: {layer_zip} ({layer_zip.stat().st_size / 2**20:.1f} MB, "
+              f"{layer_mb:.1f} MB descomprimido)")
+
     print("\n" + "=" * 60)
     print("✅ Empaquetado completado")
     print("=" * 60)
     print("\nArchivos .zip creados:")
-    for lambda_name in lambdas:
-        zip_path = lambda_functions_dir / lambda_name / "function.zip"
-        if zip_path.exists():
-            size_mb = zip_path.stat().st_size / (1024 * 1024)
-            print(f"  - {lambda_name}/function.zip ({size_mb:.1f} MB)")
+    for lambda_name, result in results.items():
+        size_mb = result["zip_file"].stat().st_size / (1024 * 1024)
+        import_info = f", import {result['import_ms']:.0f} ms" if result["import_ms"] is not None else ""
+        print(f"  - {lambda_name}/function.zip ({size_mb:.1f} MB, "
+              f"{result['unzipped_mb']:.1f} MB descomprimido{import_info})")
+
+    violations = [v for result in results.values() for v in result["violations"]]
+    if violations:
+        print("\n❌ Presupuestos excedidos:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+    if len(results) < len(args.only):
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
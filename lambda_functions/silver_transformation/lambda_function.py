@@ -4,19 +4,45 @@ Lambda Silver: Limpieza y validación de datos
 import json
 import logging
 from datetime import datetime
-import boto3
+
+from tecno_etl.loaders import RateLimitedBatchWriter
+from tecno_etl.loaders.item_codec import (
+    compact_items_enabled,
+    encode_gold_items,
+    encode_silver_item,
+    file_header_item,
+)
+from tecno_etl.transformers.enrichment import (
+    enrich_items,
+    fused_max_rows,
+    load_dimensions,
+    use_fused_mode,
+)
+from tecno_etl.utils.capacity import CAPACITY_LEDGER_TABLE, RETURN_CONSUMED_CAPACITY, CapacityLedger
+from tecno_etl.utils.aws_clients import get_client, get_resource
+from tecno_etl.utils.metrics import elapsed_ms_since, start_invocation
+from tecno_etl.utils.profiling import profile_handler
+from tecno_etl.utils.run_ledger import RUN_LEDGER_TABLE, RunLedger
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
-sqs = boto3.client('sqs')
+# Clientes AWS (pool, reintentos y timeouts compartidos, ver tecno_etl.utils.aws_clients)
+dynamodb = get_resource('dynamodb')
+sqs = get_client('sqs')
+# Progreso por archivo y etapa (ver tecno_etl.utils.run_ledger)
+runs = RunLedger(dynamodb.Table(RUN_LEDGER_TABLE))
 
 # Configuración
 BRONZE_TABLE = 'tecnomundo_bronze_sales'
 SILVER_TABLE = 'tecnomundo_silver_sales'
+GOLD_TABLE = 'tecnomundo_gold_sales'
+DIMENSIONS_TABLE = 'tecnomundo_dimensions_products'
 GOLD_QUEUE_URL = 'https://sqs.us-east-1.amazonaws.com/476277674914/tecnomundo-gold-queue'
 
+# Codificación compacta de items (alias cortos, timestamp por archivo); ver tecno_etl.loaders.item_codec
+COMPACT_ITEMS = compact_items_enabled()
+
 
 def clean_and_validate_row(row: dict) -> dict:
     """
@@ -60,73 +86,168 @@ def clean_and_validate_row(row: dict) -> dict:
     return cleaned
 
 
+def build_silver_item(bronze_item: dict) -> dict:
+    """
+    Construye el item Silver a partir de un item Bronze.
+    Lanza excepción si el registro no puede limpiarse.
+    """
+    cleaned = clean_and_validate_row(bronze_item)
+    
+    # Crear sale_id único
+    sale_id = f"{cleaned['comprobante_num']}#{cleaned['codigo_producto']}"
+    
+    return {
+        'fecha': cleaned['fecha'],
+        'sale_id': sale_id,
+        'comprobante_num': cleaned['comprobante_num'],
+        'codigo_producto': cleaned['codigo_producto'],
+        'cantidad': cleaned['cantidad'],
+        'precio_un_': cleaned['precio_un_'],
+        'ganancia': cleaned['ganancia'],
+        'subtotal': cleaned['subtotal'],
+        'processed_at': datetime.now().isoformat()
+    }
+
+
+def write_gold(silver_items: list[dict], file_id: str, ledger: CapacityLedger, metrics, remaining_ms=None) -> None:
+    """
+    Modo fusionado: enriquece en memoria el lote recién limpiado y lo escribe en
+    Gold (mismos items que escribiría la Lambda Gold), sin pasar por la cola de Gold.
+    """
+    with metrics.span('load_dimensions'):
+        dimensions = load_dimensions(dynamodb.Table(DIMENSIONS_TABLE), ledger, file_id)
+    
+    with metrics.span('enrich'):
+        gold_items, found = enrich_items(silver_items, dimensions)
+        if COMPACT_ITEMS:
+            gold_items = encode_gold_items(silver_items, found, file_id)
+    
+    gold_table = dynamodb.Table(GOLD_TABLE)
+    with metrics.span('write_gold'), RateLimitedBatchWriter(
+        gold_table, ledger=ledger, file_id=file_id, remaining_ms=remaining_ms
+    ) as batch:
+        for gold_item in gold_items:
+            batch.put_item(Item=gold_item)
+    metrics.count('write_units', batch.write_units)
+    metrics.count('throttles', batch.throttles)
+    metrics.count('rate_wait_ms', batch.rate_wait_s * 1000, unit='Milliseconds')
+    
+    metrics.count('gold_rows_out', len(silver_items))
+    metrics.count('dimension_not_found', found.count(False))
+    logger.info(f"✅ {len(silver_items)} registros escritos en Gold ({found.count(False)} sin dimensión)")
+
+
+def read_bronze_items(file_id: str, ledger: CapacityLedger, paginate: bool) -> list[dict]:
+    """
+    Items de Bronze de un archivo. Con `paginate` se leen todas las páginas de
+    la query (el modo fusionado escribe Gold con el archivo completo); si no,
+    sólo la primera (hasta 1 MB).
+    """
+    bronze_table = dynamodb.Table(BRONZE_TABLE)
+    kwargs = {
+        'KeyConditionExpression': 'file_id = :fid',
+        'ExpressionAttributeValues': {':fid': file_id},
+        'ReturnConsumedCapacity': RETURN_CONSUMED_CAPACITY,
+    }
+    items = []
+    while True:
+        response = bronze_table.query(**kwargs)
+        ledger.record(response, file_id=file_id)
+        items.extend(response['Items'])
+        if not paginate or 'LastEvaluatedKey' not in response:
+            return items
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+@profile_handler(name='silver_transformation')
 def lambda_handler(event, context):
     """
     Handler de Lambda Silver.
     Triggered por SQS cuando Bronze completa.
+    
+    Con TECNO_ETL_FUSED_MAX_ROWS > 0, los archivos de hasta esa cantidad de filas
+    se procesan en modo fusionado: Silver también escribe Gold y no notifica a la
+    cola de Gold (ver tecno_etl.transformers.enrichment).
     """
+    metrics = start_invocation('silver_transformation', context)
+    ledger = CapacityLedger('silver_transformation')
+    # Tiempo restante de la invocación: los escritores fallan antes del timeout (ver RateLimitedBatchWriter)
+    remaining_ms = getattr(context, 'get_remaining_time_in_millis', None)
+    file_id, stage = None, 'silver'
     try:
         logger.info("=== Lambda Silver Transformation Iniciada ===")
         
         # 1. Leer mensaje de SQS
         for record in event['Records']:
             message_body = json.loads(record['body'])
-            file_id = message_body['file_id']
+            file_id, stage = message_body['file_id'], 'silver'
             
             logger.info(f"Procesando file_id: {file_id}")
+            runs.start(file_id, 'silver')
             
-            # 2. Leer datos de Bronze
-            bronze_table = dynamodb.Table(BRONZE_TABLE)
-            response = bronze_table.query(
-                KeyConditionExpression='file_id = :fid',
-                ExpressionAttributeValues={':fid': file_id}
-            )
-            
-            bronze_items = response['Items']
+            # 2. Leer datos de Bronze (completos si el modo fusionado está habilitado)
+            with metrics.span('read_bronze'):
+                bronze_items = read_bronze_items(file_id, ledger, paginate=fused_max_rows() > 0)
+            # El modo se decide por el tamaño del archivo que informa Bronze
+            # (sin paginar, la query puede devolver sólo una parte)
+            fused = use_fused_mode(int(message_body.get('row_count', len(bronze_items))))
+            metrics.count('rows_in', len(bronze_items))
             logger.info(f"Leídos {len(bronze_items)} registros de Bronze")
+            metrics.set_property('pipeline_mode', 'fused' if fused else 'staged')
             
             # 3. Limpiar y validar cada registro
-            silver_table = dynamodb.Table(SILVER_TABLE)
-            valid_count = 0
-            
-            with silver_table.batch_writer() as batch:
+            silver_items = []
+            with metrics.span('transform'):
                 for item in bronze_items:
                     try:
-                        cleaned = clean_and_validate_row(item)
-                        
-                        # Crear sale_id único
-                        sale_id = f"{cleaned['comprobante_num']}#{cleaned['codigo_producto']}"
-                        
-                        silver_item = {
-                            'fecha': cleaned['fecha'],
-                            'sale_id': sale_id,
-                            'comprobante_num': cleaned['comprobante_num'],
-                            'codigo_producto': cleaned['codigo_producto'],
-                            'cantidad': cleaned['cantidad'],
-                            'precio_un_': cleaned['precio_un_'],
-                            'ganancia': cleaned['ganancia'],
-                            'subtotal': cleaned['subtotal'],
-                            'processed_at': datetime.now().isoformat()
-                        }
-                        
-                        batch.put_item(Item=silver_item)
-                        valid_count += 1
-                        
+                        silver_items.append(build_silver_item(item))
                     except Exception as e:
                         logger.warning(f"Error procesando fila: {e}")
                         continue
             
+            silver_table = dynamodb.Table(SILVER_TABLE)
+            with metrics.span('write_silver'), RateLimitedBatchWriter(
+                silver_table, ledger=ledger, file_id=file_id, remaining_ms=remaining_ms
+            ) as batch:
+                if COMPACT_ITEMS:
+                    batch.put_item(Item=file_header_item(file_id, 'processed_at'))
+                for silver_item in silver_items:
+                    batch.put_item(Item=encode_silver_item(silver_item, file_id) if COMPACT_ITEMS else silver_item)
+            metrics.count('write_units', batch.write_units)
+            metrics.count('throttles', batch.throttles)
+            metrics.count('rate_wait_ms', batch.rate_wait_s * 1000, unit='Milliseconds')
+            
+            valid_count = len(silver_items)
+            metrics.count('rows_out', valid_count)
+            metrics.count('invalid_rows', len(bronze_items) - valid_count)
             logger.info(f"✅ {valid_count} registros escritos en Silver")
+            runs.finish(file_id, 'silver', rows_in=len(bronze_items), rows_out=valid_count)
+            
+            # Momento en que Bronze terminó el archivo (latencia de punta a punta de Silver + Gold)
+            ingested_at = message_body.get('timestamp')
+            
+            # 4a. Modo fusionado: escribir Gold en la misma pasada
+            if fused:
+                stage = 'gold'
+                runs.start(file_id, 'gold', rows_in=valid_count)
+                write_gold(silver_items, file_id, ledger, metrics, remaining_ms)
+                runs.finish(file_id, 'gold', rows_in=valid_count, rows_out=valid_count, final=True)
+                latency_ms = elapsed_ms_since(ingested_at)
+                if latency_ms is not None:
+                    metrics.count('pipeline_latency_ms', latency_ms, unit='Milliseconds')
+                continue
             
-            # 4. Enviar mensaje a Gold Queue
-            sqs.send_message(
-                QueueUrl=GOLD_QUEUE_URL,
-                MessageBody=json.dumps({
-                    'file_id': file_id,
-                    'row_count': valid_count,
-                    'timestamp': datetime.now().isoformat()
-                })
-            )
+            # 4b. Modo por etapas: enviar mensaje a Gold Queue
+            with metrics.span('notify'):
+                sqs.send_message(
+                    QueueUrl=GOLD_QUEUE_URL,
+                    MessageBody=json.dumps({
+                        'file_id': file_id,
+                        'row_count': valid_count,
+                        'ingested_at': ingested_at,
+                        'timestamp': datetime.now().isoformat()
+                    })
+                )
             
             logger.info("✅ Mensaje enviado a Gold Queue")
         
@@ -134,4 +255,13 @@ def lambda_handler(event, context):
         
     except Exception as e:
         logger.error(f"❌ Error en Silver Lambda: {str(e)}", exc_info=True)
+        metrics.count('errors', 1)
+        if file_id:
+            runs.fail(file_id, stage, str(e))
         raise
+    finally:
+        # Capacidad consumida por file_id: a la línea de métricas y al ledger de costos
+        ledger.report_to(metrics)
+        ledger.save_to_table(dynamodb.Table(CAPACITY_LEDGER_TABLE))
+        # Una línea EMF por invocación (duraciones por fase, filas, arranque en frío)
+        metrics.emit()
@@ -1,9 +1,47 @@
 # Script: cargar_dimensiones.py
+#
+# Uso:
+#   python scripts/cargar_dimensiones.py [--no-cache] [--desde-tabla] [--eliminar] [--dry-run]
+#
+# Carga diferencial: sólo escribe los productos nuevos o modificados de
+# Category.xlsx (ver tecno_etl.loaders.dimension_sync). El estado actual de la
+# tabla se toma del snapshot local (data/cache/dimensions/) o, si no existe o
+# con --desde-tabla, de un scan de la tabla. --eliminar borra los productos que
+# ya no están en el catálogo.
+#
+# El Excel parseado se guarda en data/cache/parsed/ (requiere pyarrow); --no-cache
+# fuerza la lectura con openpyxl sin usar ni actualizar la caché.
+import argparse
 import os
-import boto3
-import pandas as pd
+import sys
 from pathlib import Path
-from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from tecno_etl.extractors.local_file_extractor import read_file
+from tecno_etl.extractors.parse_cache import ParseCache
+from tecno_etl.loaders.dimension_sync import (
+    DEFAULT_SNAPSHOT_PATH,
+    DEFAULT_WORKERS,
+    DIMENSIONS_TABLE,
+    apply_diff,
+    diff_catalog,
+    load_snapshot,
+    read_table_hashes,
+    save_snapshot,
+    snapshot_after,
+)
+from tecno_etl.utils.aws_clients import get_resource
+from tecno_etl.utils.capacity import CapacityLedger
+
+parser = argparse.ArgumentParser(description="Carga diferencial de la dimensión de productos")
+parser.add_argument("--no-cache", action="store_true", help="No usar la caché de archivos parseados")
+parser.add_argument("--desde-tabla", action="store_true",
+                    help="Comparar contra un scan de la tabla en lugar del snapshot local")
+parser.add_argument("--eliminar", action="store_true", help="Eliminar productos que ya no están en el catálogo")
+parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Escritores en paralelo")
+parser.add_argument("--snapshot", type=Path, default=DEFAULT_SNAPSHOT_PATH)
+parser.add_argument("--dry-run", action="store_true", help="Mostrar los cambios sin escribir")
+args = parser.parse_args()
 
 # Cargar variables de entorno desde .env.aws manualmente
 env_path = Path("conf/env/.env.aws")
@@ -28,39 +66,61 @@ else:
 
 # Leer archivo
 file_path = Path("data/raw/Category.xlsx")
-df = pd.read_excel(file_path)
+cache = ParseCache(enabled=not args.no_cache)
+df, _ = read_file(file_path, cache=cache)
+if df is None:
+    raise SystemExit(f"❌ No se pudo leer {file_path}")
 
 # Eliminar filas vacías
 df = df.dropna(subset=['Código Interno', 'Nombre del Artículo', 'Categoría'])
 
+productos = [
+    {
+        'codigo_producto': str(codigo).upper(),
+        'nombre_del_producto': str(nombre),
+        'categoria': str(categoria)
+    }
+    for codigo, nombre, categoria in zip(df['Código Interno'], df['Nombre del Artículo'], df['Categoría'], strict=True)
+]
+
 try:
     # Conectar a DynamoDB
     print("Conectando a DynamoDB...")
-    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-    table = dynamodb.Table('tecnomundo_dimensions_products')
+    dynamodb = get_resource('dynamodb', region_name='us-east-1')
+    table = dynamodb.Table(DIMENSIONS_TABLE)
+    ledger = CapacityLedger('cargar_dimensiones')
+    
+    # Estado actual de la tabla: snapshot local o scan
+    current = None if args.desde_tabla else load_snapshot(args.snapshot)
+    if current is None:
+        print(f"Leyendo productos actuales de '{table.table_name}'...")
+        current = read_table_hashes(table, ledger=ledger, file_id=file_path.name)
+    else:
+        print(f"Usando snapshot {args.snapshot} ({len(current)} productos)")
     
-    # Verificar que la tabla existe
-    print(f"Verificando tabla '{table.table_name}'...")
+    diff = diff_catalog(current, productos)
+    print(f"📋 {len(productos)} productos en el catálogo: {diff.summary(delete=args.eliminar)}")
     
-    # Cargar cada producto
-    loaded_count = 0
-    print(f"Cargando {len(df)} productos...")
+    if args.dry_run:
+        for item in diff.inserts[:10]:
+            print(f"  + {item['codigo_producto']}: {item['nombre_del_producto']}")
+        for item in diff.updates[:10]:
+            print(f"  ~ {item['codigo_producto']}: {item['nombre_del_producto']}")
+        for code in diff.deletes[:10]:
+            print(f"  - {code}")
+        raise SystemExit(0)
     
-    with table.batch_writer() as batch:
-        for idx, row in df.iterrows():
-            item = {
-                'codigo_producto': str(row['Código Interno']).upper(),
-                'nombre_del_producto': str(row['Nombre del Artículo']),
-                'categoria': str(row['Categoría'])
-            }
-            batch.put_item(Item=item)
-            loaded_count += 1
-            
-            # Mostrar progreso cada 100 items
-            if loaded_count % 100 == 0:
-                print(f"  Cargados {loaded_count} productos...")
+    # Escritura limitada a la capacidad aprovisionada de la tabla (compartida por los escritores)
+    stats = apply_diff(
+        table, diff, delete=args.eliminar, workers=args.workers, ledger=ledger, file_id=file_path.name
+    )
+    snapshot_path = save_snapshot(snapshot_after(current, diff, delete=args.eliminar), args.snapshot)
     
-    print(f"✅ {loaded_count} productos cargados exitosamente en DynamoDB")
+    print(f"✅ {stats['items']} escrituras en DynamoDB (snapshot: {snapshot_path})")
+    print(f"   {stats['write_units']} WCU, {stats['throttles']} throttling, "
+          f"{stats['rate_wait_s']:.1f}s de espera por capacidad")
+    print(f"📒 Capacidad consumida: {ledger.total('read'):.1f} RCU, {ledger.total('write'):.1f} WCU "
+          f"(ledger: {ledger.save_to_file()})")
     
 except Exception as e:
     print(f"❌ Error: {type(e).__name__}")
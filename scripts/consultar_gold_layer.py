@@ -1,11 +1,23 @@
 """
 Script para consultar datos de la capa Gold en DynamoDB
+
+Uso:
+    python scripts/consultar_gold_layer.py [--compact]
+
+Con --compact el DataFrame se compacta (categorías y tipos reducidos) antes del análisis.
 """
 import os
-import boto3
+import sys
 import pandas as pd
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from tecno_etl.loaders.item_codec import decode_items, is_compact
+from tecno_etl.transformers.compaction import compact_dataframe
+from tecno_etl.transformers.enrichment import load_dimensions
+from tecno_etl.utils.aws_clients import get_resource
+from tecno_etl.utils.capacity import RETURN_CONSUMED_CAPACITY, CapacityLedger
+
 # Cargar credenciales AWS
 env_path = Path(__file__).parent.parent / "conf" / "env" / ".env.aws"
 if env_path.exists():
@@ -20,18 +32,33 @@ if env_path.exists():
         os.environ['AWS_DEFAULT_REGION'] = os.getenv('AWS_REGION')
 
 # Conectar a DynamoDB
-dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+dynamodb = get_resource('dynamodb', region_name='us-east-1')
 
 # Consultar tabla Gold (resultado final)
 gold_table = dynamodb.Table('tecnomundo_gold_sales')
 
 print("🔍 Consultando tabla Gold...")
 
+ledger = CapacityLedger('consultar_gold_layer')
+
 try:
-    response = gold_table.scan()
+    response = gold_table.scan(ReturnConsumedCapacity=RETURN_CONSUMED_CAPACITY)
+    ledger.record(response)
+    items = response['Items']
+    
+    # Items compactos (TECNO_ETL_COMPACT_ITEMS): nombre y categoría salen de las dimensiones
+    dimensions = None
+    if any(is_compact(item) for item in items):
+        # Scan paginado: con más de 1 MB de dimensiones una sola página dejaría productos sin resolver
+        dimensions = load_dimensions(dynamodb.Table('tecnomundo_dimensions_products'), ledger)
+    items = decode_items(items, dimensions)
+    print(f"📏 Capacidad consumida: {ledger.total('read'):.1f} RCU")
     
     # Convertir a DataFrame para análisis
-    df_gold = pd.DataFrame(response['Items'])
+    df_gold = pd.DataFrame(items)
+    if '--compact' in sys.argv[1:] and len(df_gold) > 0:
+        df_gold, reporte = compact_dataframe(df_gold)
+        print(f"🗜️  Memoria: {reporte['before_mb']:.1f} MiB -> {reporte['after_mb']:.1f} MiB")
     
     if len(df_gold) == 0:
         print("⚠️  La tabla Gold está vacía")
@@ -80,7 +107,7 @@ try:
         # Ventas por categoría
         if 'categoria' in df_gold.columns and 'subtotal_num' in df_gold.columns:
             print("\n📊 Ventas por categoría:")
-            ventas_categoria = df_gold.groupby('categoria')['subtotal_num'].agg(['sum', 'count'])
+            ventas_categoria = df_gold.groupby('categoria', observed=True)['subtotal_num'].agg(['sum', 'count'])
             ventas_categoria = ventas_categoria.sort_values('sum', ascending=False)
             for categoria, row in ventas_categoria.head(10).iterrows():
                 print(f"   {categoria}: ${row['sum']:,.2f} ({int(row['count'])} ventas)")
@@ -96,3 +123,6 @@ except Exception as e:
     except:
         print("\n❌ La tabla 'tecnomundo_gold_sales' no existe")
         print("   Verifica que el pipeline haya creado la tabla correctamente")
+
+if ledger.total('read'):
+    print(f"\n📒 Ledger de capacidad: {ledger.save_to_file()}")
@@ -2,10 +2,13 @@
 Script para desplegar funciones Lambda a AWS
 """
 import os
-import boto3
+import sys
 import logging
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from tecno_etl.utils.aws_clients import get_client
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,7 +27,10 @@ if env_path.exists():
         os.environ['AWS_DEFAULT_REGION'] = os.getenv('AWS_REGION')
 
 # Cliente Lambda
-lambda_client = boto3.client('lambda', region_name=os.getenv('AWS_DEFAULT_REGION', 'us-east-1'))
+# La subida del ZIP puede tardar con paquetes grandes
+lambda_client = get_client(
+    'lambda', region_name=os.getenv('AWS_DEFAULT_REGION', 'us-east-1'), read_timeout=300
+)
 
 def deploy_lambda(function_name: str, zip_path: Path):
     """
@@ -0,0 +1,102 @@
+"""
+Script para ejecutar la suite de benchmarks de escalabilidad y comparar contra una corrida previa
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from tecno_etl.benchmarks.fused_mode import DEFAULT_FUSED_SIZES, run_fused_mode_benchmark
+from tecno_etl.benchmarks.replenishment import (
+    DEFAULT_REPLENISHMENT_DAYS,
+    DEFAULT_REPLENISHMENT_PRODUCTS,
+    run_replenishment_benchmark,
+)
+from tecno_etl.benchmarks.suite import (
+    DEFAULT_LAMBDA_MAX_ROWS,
+    DEFAULT_SIZES,
+    compare_results,
+    run_benchmarks,
+    save_results,
+)
+from tecno_etl.benchmarks.write_path import DEFAULT_WRITE_PATH_ROWS, run_write_path_benchmark
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de escalabilidad del pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Tamaños en filas (ej. 1000 10000 100000 1000000 10000000)")
+    parser.add_argument("--formats", nargs="+", choices=["csv", "excel"], default=["csv", "excel"])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--data-dir", type=Path, default=Path("data/synthetic"))
+    parser.add_argument("--output-dir", type=Path, default=Path("reports/benchmarks"))
+    parser.add_argument("--lambda-max-rows", type=int, default=DEFAULT_LAMBDA_MAX_ROWS)
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="JSON de una corrida previa para detectar regresiones")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Empeoramiento relativo admitido antes de reportar regresión")
+    parser.add_argument("--write-path", type=int, nargs="?", const=DEFAULT_WRITE_PATH_ROWS, default=None,
+                        metavar="FILAS",
+                        help="Comparar además la escritura en Bronze vía recurso boto3 vs. pre-serializada "
+                             f"(por defecto {DEFAULT_WRITE_PATH_ROWS:,} filas)")
+    parser.add_argument("--fused-mode", type=int, nargs="*", default=None, metavar="FILAS",
+                        help="Comparar además la latencia de Silver + Gold por etapas vs. fusionado "
+                             f"(por defecto {' '.join(map(str, DEFAULT_FUSED_SIZES))} filas)")
+    parser.add_argument("--replenishment", type=int, nargs="?", const=DEFAULT_REPLENISHMENT_PRODUCTS,
+                        default=None, metavar="PRODUCTOS",
+                        help="Medir además el motor de reposición sobre PRODUCTOS × "
+                             f"{DEFAULT_REPLENISHMENT_DAYS} días de ventas "
+                             f"(por defecto {DEFAULT_REPLENISHMENT_PRODUCTS:,} productos)")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar los logs de cada etapa")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger("tecno_etl").setLevel(logging.WARNING)
+        logging.getLogger("tecno_etl.benchmarks").setLevel(logging.INFO)
+
+    logger.info("🚀 Ejecutando benchmarks...")
+    results = run_benchmarks(
+        sizes=tuple(args.sizes),
+        formats=tuple(args.formats),
+        data_dir=args.data_dir,
+        repeat=args.repeat,
+        lambda_max_rows=args.lambda_max_rows,
+    )
+    if args.write_path:
+        logger.info(f"✍️  Caminos de escritura en Bronze ({args.write_path:,} filas)...")
+        results["results"].extend(
+            run_write_path_benchmark(args.write_path, data_dir=args.data_dir, repeat=args.repeat)
+        )
+    if args.fused_mode is not None:
+        sizes = tuple(args.fused_mode) or DEFAULT_FUSED_SIZES
+        logger.info("🔀 Silver + Gold por etapas vs. fusionado...")
+        results["results"].extend(run_fused_mode_benchmark(sizes, data_dir=args.data_dir))
+    if args.replenishment:
+        logger.info(f"📦 Motor de reposición ({args.replenishment:,} productos)...")
+        results["results"].extend(run_replenishment_benchmark(args.replenishment, repeat=args.repeat))
+    save_results(results, args.output_dir)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_results(baseline, results, args.tolerance)
+        if regressions:
+            logger.error(f"❌ {len(regressions)} regresiones detectadas:")
+            for r in regressions:
+                logger.error(
+                    f"   {r['stage']} ({r['rows']:,} filas, {r['format']}): "
+                    f"{r['baseline_s']:.3f}s → {r['current_s']:.3f}s (x{r['ratio']:.2f})"
+                )
+            return 1
+        logger.info("✅ Sin regresiones respecto a la corrida de referencia")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
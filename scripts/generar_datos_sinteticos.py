@@ -0,0 +1,53 @@
+"""
+Script para generar reportes de ventas sintéticos (CSV/Excel) para pruebas y benchmarks
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from tecno_etl.benchmarks.synthetic_data import build_product_catalog, write_sales_report
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera reportes de ventas sintéticos")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000],
+                        help="Cantidad de filas (uno o más tamaños)")
+    parser.add_argument("--format", choices=["csv", "excel"], default="csv")
+    parser.add_argument("--output-dir", type=Path, default=Path("data/synthetic"))
+    parser.add_argument("--sep", default=",", help="Separador del CSV")
+    parser.add_argument("--encoding", default="utf-8", help="Codificación del CSV")
+    parser.add_argument("--dirty-ratio", type=float, default=0.02,
+                        help="Proporción de filas sucias (0 a 1)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--catalog", type=Path, default=None,
+                        help="Catálogo real de productos (ej. data/raw/Category.xlsx)")
+    args = parser.parse_args()
+
+    catalog = build_product_catalog(seed=args.seed, catalog_path=args.catalog)
+    suffix = ".csv" if args.format == "csv" else ".xlsx"
+
+    for rows in args.rows:
+        path = args.output_dir / f"ventas_{rows}{suffix}"
+        write_sales_report(
+            path,
+            rows,
+            seed=args.seed,
+            sep=args.sep,
+            encoding=args.encoding,
+            dirty_ratio=args.dirty_ratio,
+            catalog=catalog,
+        )
+        size_mb = path.stat().st_size / 1024 / 1024
+        logger.info(f"✅ {path} ({rows:,} filas, {size_mb:.1f} MB)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
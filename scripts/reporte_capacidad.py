@@ -0,0 +1,88 @@
+"""
+Script para resumir el ledger de capacidad consumida de DynamoDB por etapa y archivo
+
+Uso:
+    python scripts/reporte_capacidad.py            # ledger de las Lambdas (tabla DynamoDB)
+    python scripts/reporte_capacidad.py --local    # ledger de los scripts (reports/capacity/ledger.jsonl)
+    python scripts/reporte_capacidad.py --crear-tabla
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from tecno_etl.utils.aws_clients import get_resource
+from tecno_etl.utils.capacity import CAPACITY_LEDGER_TABLE, DEFAULT_LEDGER_PATH, summarize_ledger
+
+
+def crear_tabla(dynamodb):
+    """Crea la tabla del ledger (on-demand: no compite con la capacidad del pipeline)"""
+    table = dynamodb.create_table(
+        TableName=CAPACITY_LEDGER_TABLE,
+        KeySchema=[
+            {'AttributeName': 'file_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'stage_recorded_at', 'KeyType': 'RANGE'},
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'file_id', 'AttributeType': 'S'},
+            {'AttributeName': 'stage_recorded_at', 'AttributeType': 'S'},
+        ],
+        BillingMode='PAY_PER_REQUEST',
+    )
+    table.wait_until_exists()
+    print(f"✅ Tabla '{CAPACITY_LEDGER_TABLE}' creada")
+
+
+def leer_tabla(dynamodb) -> list[dict]:
+    table = dynamodb.Table(CAPACITY_LEDGER_TABLE)
+    rows = []
+    kwargs = {}
+    while True:
+        response = table.scan(**kwargs)
+        rows.extend(response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            return rows
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumen del ledger de capacidad de DynamoDB")
+    parser.add_argument("--local", action="store_true", help="Leer el ledger local de los scripts")
+    parser.add_argument("--ledger", type=Path, default=DEFAULT_LEDGER_PATH)
+    parser.add_argument("--crear-tabla", action="store_true", help="Crear la tabla del ledger")
+    parser.add_argument("--top", type=int, default=10, help="Archivos más costosos a mostrar")
+    args = parser.parse_args()
+
+    if args.local:
+        if not args.ledger.exists():
+            print(f"⚠️  No existe el ledger local {args.ledger}")
+            return 1
+        rows = [json.loads(line) for line in args.ledger.read_text(encoding="utf-8").splitlines() if line]
+    else:
+        dynamodb = get_resource('dynamodb')
+        if args.crear_tabla:
+            crear_tabla(dynamodb)
+            return 0
+        rows = leer_tabla(dynamodb)
+
+    if not rows:
+        print("⚠️  El ledger está vacío")
+        return 0
+
+    print("\n📊 Capacidad consumida por etapa:")
+    print("=" * 70)
+    for stage, totals in sorted(summarize_ledger(rows).items(), key=lambda kv: -(kv[1]['read'] + kv[1]['write'])):
+        print(f"  {stage:<25} {totals['read']:>10.1f} RCU {totals['write']:>10.1f} WCU "
+              f"({totals['files']} registros)")
+
+    print(f"\n🔥 Top {args.top} (archivo, etapa) por capacidad total:")
+    rows.sort(key=lambda r: -(float(r['read']) + float(r['write'])))
+    for row in rows[:args.top]:
+        print(f"  {row['file_id']:<35} {row['stage']:<22} "
+              f"{float(row['read']):>8.1f} RCU {float(row['write']):>8.1f} WCU")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Script para ver las corridas del pipeline: en curso, fallidas y latencia por etapa
+
+Uso:
+    python scripts/reporte_corridas.py                 # resumen por día
+    python scripts/reporte_corridas.py --por hora
+    python scripts/reporte_corridas.py --crear-tabla
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from tecno_etl.utils.aws_clients import get_resource
+from tecno_etl.utils.run_ledger import (
+    RUN_LEDGER_TABLE,
+    STAGES,
+    RunLedger,
+    describe_run,
+    summarize_runs,
+)
+
+
+def crear_tabla(dynamodb):
+    """Crea la tabla del ledger de corridas (on-demand: no compite con la capacidad del pipeline)"""
+    table = dynamodb.create_table(
+        TableName=RUN_LEDGER_TABLE,
+        KeySchema=[{'AttributeName': 'file_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'file_id', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST',
+    )
+    table.wait_until_exists()
+    print(f"✅ Tabla '{RUN_LEDGER_TABLE}' creada")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Corridas del pipeline y latencia por etapa")
+    parser.add_argument("--crear-tabla", action="store_true", help="Crear la tabla del ledger de corridas")
+    parser.add_argument("--por", choices=["dia", "hora"], default="dia", help="Período de los percentiles")
+    parser.add_argument("--limite", type=int, default=10, help="Corridas terminadas recientes a mostrar")
+    args = parser.parse_args()
+
+    dynamodb = get_resource('dynamodb')
+    if args.crear_tabla:
+        crear_tabla(dynamodb)
+        return 0
+
+    runs = RunLedger(dynamodb.Table(RUN_LEDGER_TABLE)).scan()
+    if not runs:
+        print("⚠️  El ledger de corridas está vacío")
+        return 0
+
+    summary = summarize_runs(runs, bucket={"dia": "day", "hora": "hour"}[args.por])
+
+    print(f"\n⏳ En curso ({len(summary['in_flight'])}):")
+    for run in sorted(summary['in_flight'], key=lambda r: r.get('submitted_at') or r.get('updated_at', '')):
+        print(f"  {describe_run(run)}  etapa={run.get('current_stage', '-')}")
+
+    if summary['failed']:
+        print(f"\n❌ Fallidas ({len(summary['failed'])}):")
+        for run in summary['failed']:
+            errors = [f"{stage}: {run[f'{stage}_error']}" for stage in STAGES if f'{stage}_error' in run]
+            print(f"  {run['file_id']:<45} {'; '.join(errors)[:100]}")
+
+    completed = sorted(
+        (run for run in runs if run.get('completed_at')), key=lambda r: r['completed_at'], reverse=True
+    )
+    print(f"\n✅ Terminadas ({summary['completed']}), últimas {args.limite}:")
+    for run in completed[:args.limite]:
+        print(f"  {describe_run(run)}")
+
+    if not summary['end_to_end']:
+        return 0
+
+    print("\n📊 Latencia:")
+    print("=" * 70)
+    for stage, quantiles in summary['stages'].items():
+        print(f"  {stage:<15} p50={quantiles['p50']:>8.1f}s  p95={quantiles['p95']:>8.1f}s")
+    print(f"  {'punta a punta':<15} p50={summary['end_to_end']['p50']:>8.1f}s  "
+          f"p95={summary['end_to_end']['p95']:>8.1f}s")
+
+    print(f"\n📈 Punta a punta por {args.por}:")
+    for period, stats in summary['by_period'].items():
+        print(f"  {period:<15} {stats['runs']:>5} corridas  p50={stats['p50']:>8.1f}s  p95={stats['p95']:>8.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
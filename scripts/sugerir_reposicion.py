@@ -0,0 +1,139 @@
+"""
+Script para calcular demanda, cobertura y cantidades sugeridas de reposición
+
+Arma la matriz producto × día con las ventas de la capa Gold, lee el stock
+actual (tecnomundo_stock_current) y guarda las métricas de todos los productos
+en reports/replenishment/.
+
+La matriz se guarda en data/cache/replenishment/demand.npz: las corridas
+siguientes la cargan y sólo consultan en Gold los días posteriores a su último
+día (la tabla está particionada por fecha), sin volver a escanear la historia.
+Las ventas de días ya cargados que lleguen después (archivos reprocesados o
+tardíos) requieren --reconstruir.
+
+Uso:
+    python scripts/sugerir_reposicion.py
+    python scripts/sugerir_reposicion.py --ventana 56 --plazo 10 --revision 14
+    python scripts/sugerir_reposicion.py --reconstruir   # escanea toda la tabla Gold
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from tecno_etl.analytics.replenishment import (
+    DEFAULT_STATE_PATH,
+    DEFAULT_WINDOW_DAYS,
+    DemandMatrix,
+    ReplenishmentPolicy,
+    sales_arrays_from_items,
+)
+from tecno_etl.loaders.item_codec import decode_items
+from tecno_etl.pipelines.stock_pipeline import STOCK_CURRENT_TABLE, load_aws_env, read_current_stock
+from tecno_etl.utils.aws_clients import get_resource
+from tecno_etl.utils.capacity import RETURN_CONSUMED_CAPACITY, CapacityLedger
+
+
+def scan_gold_sales(table, ledger: CapacityLedger) -> list[dict]:
+    """Ventas Gold decodificadas (sin dimensiones: sólo se usan código, fecha y cantidad)"""
+    items = []
+    kwargs = {'ReturnConsumedCapacity': RETURN_CONSUMED_CAPACITY}
+    while True:
+        response = table.scan(**kwargs)
+        ledger.record(response)
+        items.extend(response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            return decode_items(items)
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def query_gold_sales(table, ledger: CapacityLedger, since: date, until: date) -> list[dict]:
+    """Ventas Gold decodificadas de los días `since`..`until` (una consulta por partición de fecha)"""
+    items = []
+    day = since
+    while day <= until:
+        kwargs = {
+            'KeyConditionExpression': 'fecha = :fecha',
+            'ExpressionAttributeValues': {':fecha': day.isoformat()},
+            'ReturnConsumedCapacity': RETURN_CONSUMED_CAPACITY,
+        }
+        while True:
+            response = table.query(**kwargs)
+            ledger.record(response)
+            items.extend(response['Items'])
+            if 'LastEvaluatedKey' not in response:
+                break
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        day += timedelta(days=1)
+    return decode_items(items)
+
+
+def load_demand(path: Path, window_days: int) -> DemandMatrix | None:
+    """Matriz guardada en `path`, o None si no existe, está vacía o usa otra ventana"""
+    if not path.exists():
+        return None
+    demand = DemandMatrix.load(path)
+    if demand.window_days != window_days:
+        print(f"♻️  La matriz guardada usa una ventana de {demand.window_days} días: se reconstruye")
+        return None
+    return demand if demand.last_date is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Métricas de reposición sobre las ventas Gold")
+    parser.add_argument("--ventana", type=int, default=DEFAULT_WINDOW_DAYS, help="Días de la ventana de demanda")
+    parser.add_argument("--plazo", type=float, default=7.0, help="Plazo de entrega en días")
+    parser.add_argument("--revision", type=float, default=7.0, help="Días entre revisiones de stock")
+    parser.add_argument("--z", type=float, default=1.65, help="Factor de nivel de servicio")
+    parser.add_argument("--output-dir", type=Path, default=Path("reports/replenishment"))
+    parser.add_argument("--estado", type=Path, default=DEFAULT_STATE_PATH, help="Matriz guardada entre corridas")
+    parser.add_argument("--reconstruir", action="store_true", help="Ignorar la matriz guardada y escanear todo Gold")
+    args = parser.parse_args()
+
+    load_aws_env()
+    dynamodb = get_resource('dynamodb')
+    ledger = CapacityLedger('sugerir_reposicion')
+
+    gold_table = dynamodb.Table('tecnomundo_gold_sales')
+    demand = None if args.reconstruir else load_demand(args.estado, args.ventana)
+    if demand is None:
+        print("🔍 Leyendo todas las ventas Gold...")
+        items = scan_gold_sales(gold_table, ledger)
+        if not items:
+            print("⚠️  La tabla Gold está vacía")
+            return 0
+        demand = DemandMatrix.from_sales(*sales_arrays_from_items(items), window_days=args.ventana)
+    else:
+        since = (demand.last_date + np.timedelta64(1, "D")).astype(date)
+        print(f"🔍 Leyendo ventas Gold desde {since} (matriz guardada hasta {demand.last_date})...")
+        items = query_gold_sales(gold_table, ledger, since, date.today())
+        if items:
+            demand.add_sales(*sales_arrays_from_items(items))
+    print(f"  {len(items):,} ventas leídas")
+    state_path = demand.save(args.estado)
+
+    stock = read_current_stock(dynamodb.Table(STOCK_CURRENT_TABLE), ledger)
+    print(f"📏 Capacidad consumida: {ledger.total('read'):.1f} RCU")
+
+    policy = ReplenishmentPolicy(lead_time_days=args.plazo, review_days=args.revision, service_z=args.z)
+    metrics = demand.metrics(stock, policy)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    output = args.output_dir / f"reposicion_{date.today().isoformat()}.csv"
+    metrics.sort_values("cantidad_sugerida", ascending=False).to_csv(output, index=False)
+
+    to_order = metrics[metrics["cantidad_sugerida"] > 0]
+    print(f"\n📦 {demand.n_products:,} productos, {demand.n_days:,} días ({demand.start} a {demand.last_date})")
+    print(f"🛒 {len(to_order):,} productos a reponer ({int(to_order['cantidad_sugerida'].sum()):,} unidades)")
+    for row in to_order.nsmallest(10, "dias_cobertura").itertuples(index=False):
+        print(f"  {row.codigo_producto:<20} stock={row.stock:>6.0f}  cobertura={row.dias_cobertura:>5.1f} días  "
+              f"pedir={row.cantidad_sugerida}")
+    print(f"\n✅ Métricas guardadas en {output} (matriz: {state_path})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,11 @@
 import os
-import boto3
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from tecno_etl.utils.aws_clients import get_resource
+from tecno_etl.utils.capacity import RETURN_CONSUMED_CAPACITY, CapacityLedger
+
 # Cargar credenciales
 env_path = Path("conf/env/.env.aws")
 with open(env_path, 'r') as f:
@@ -12,7 +16,7 @@ with open(env_path, 'r') as f:
             os.environ[key.strip()] = value.strip()
 
 # Conectar a DynamoDB
-dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+dynamodb = get_resource('dynamodb', region_name='us-east-1')
 table = dynamodb.Table('tecnomundo_dimensions_products')
 
 # Obtener información de la tabla
@@ -22,7 +26,10 @@ try:
     print(f"✓ Estado: {table_info}")
     
     # Escanear algunos items
-    response = table.scan(Limit=5)
+    ledger = CapacityLedger('verificar_carga')
+    response = table.scan(Limit=5, ReturnConsumedCapacity=RETURN_CONSUMED_CAPACITY)
+    ledger.record(response)
+    ledger.save_to_file()
     print(f"\n📊 Total items escaneados: {response['Count']}")
     print("\n🔍 Primeros 5 productos:")
     for item in response['Items']:
@@ -32,6 +39,7 @@ try:
     
     # Obtener conteo aproximado
     print(f"📈 Items totales en la tabla (aproximado): {table.item_count}")
+    print(f"📏 Capacidad consumida: {ledger.total('read'):.1f} RCU")
     
 except Exception as e:
     print(f"❌ Error: {e}")
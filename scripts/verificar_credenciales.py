@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -35,8 +36,9 @@ else:
 # Intentar conexión básica
 print("\n🔌 Probando conexión a AWS...")
 try:
-    import boto3
-    sts = boto3.client('sts', region_name=region)
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from tecno_etl.utils.aws_clients import get_client
+    sts = get_client('sts', region_name=region)
     identity = sts.get_caller_identity()
     print(f"   ✓ Conexión exitosa!")
     print(f"   Account: {identity['Account']}")
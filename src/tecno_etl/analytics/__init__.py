@@ -0,0 +1 @@
+"""Métricas analíticas sobre las capas Silver y Gold (reposición de stock)."""
@@ -0,0 +1,303 @@
+"""
+Métricas de reposición sobre las ventas Gold.
+
+`DemandMatrix` guarda las unidades vendidas en una matriz densa producto × día
+(NumPy, float32) y mantiene por producto la suma y la suma de cuadrados de
+los últimos `window_days` días. Con eso calcula, para todos los productos a
+la vez:
+
+- demanda diaria media y desvío de la ventana móvil,
+- días de cobertura del stock actual,
+- stock de seguridad, punto de pedido y cantidad sugerida a comprar.
+
+Cuando llegan ventas de días nuevos, las sumas se actualizan con las columnas
+que entran y salen de la ventana (y las ventas tardías de días dentro de la
+ventana ajustan las sumas de su producto), sin volver a recorrer la historia.
+
+Example:
+    ```python
+    demand = DemandMatrix.from_sales(codes, dates, quantities)
+    demand.add_sales(codes_hoy, fechas_hoy, cantidades_hoy)
+    df = demand.metrics(stock=stock_por_producto)
+    demand.save(DEFAULT_STATE_PATH)  # la próxima corrida parte de DemandMatrix.load
+    ```
+"""
+
+import logging
+import math
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_DAYS = 28
+
+# Silver usa 1900-01-01 cuando no puede parsear la fecha: esas ventas no cuentan
+MIN_SALE_DATE = np.datetime64("2000-01-01", "D")
+
+DEFAULT_STATE_PATH = Path("data/cache/replenishment") / "demand.npz"
+
+
+@dataclass(frozen=True)
+class ReplenishmentPolicy:
+    """
+    Política de reposición (s, S) con revisión periódica.
+
+    Se pide cuando el stock cae al punto de pedido (demanda durante el plazo
+    de entrega más el stock de seguridad, z·σ·√plazo) y se repone hasta el
+    punto de pedido más la demanda del período de revisión.
+    """
+
+    lead_time_days: float = 7.0
+    review_days: float = 7.0
+    # Factor de nivel de servicio (1.65 ≈ 95% de ciclos sin quiebre)
+    service_z: float = 1.65
+
+
+def sales_arrays_from_items(items: Sequence[dict]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Códigos, fechas y cantidades de items Gold (ya decodificados con `decode_items`)."""
+    codes = np.array([item["codigo_producto"] for item in items], dtype=object)
+    dates = np.array([item["fecha"] for item in items], dtype="datetime64[D]")
+    quantities = np.array([float(item.get("cantidad") or 0) for item in items], dtype=float)
+    return codes, dates, quantities
+
+
+class DemandMatrix:
+    """
+    Matriz producto × día de unidades vendidas con sumas móviles incrementales.
+
+    Args:
+        start: Primer día de la matriz (las ventas anteriores se rechazan)
+        window_days: Días de la ventana móvil de demanda
+    """
+
+    def __init__(self, start, window_days: int = DEFAULT_WINDOW_DAYS):
+        if window_days < 1:
+            raise ValueError("window_days debe ser al menos 1")
+        self.start = np.datetime64(start, "D")
+        self.window_days = window_days
+        self.codes: list[str] = []
+        self._rows: dict[str, int] = {}
+        # Filas y columnas con capacidad de reserva: crecer no copia la matriz en cada día
+        self._data = np.zeros((0, 0), dtype=np.float32)
+        self.n_days = 0
+        # Por producto: suma y suma de cuadrados de la ventana, y primer día con ventas
+        self._sum = np.zeros(0)
+        self._sumsq = np.zeros(0)
+        self._first_day = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def from_sales(cls, codes, dates, quantities, window_days: int = DEFAULT_WINDOW_DAYS) -> "DemandMatrix":
+        """Construye la matriz a partir de toda la historia de ventas."""
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        valid = dates >= MIN_SALE_DATE
+        start = dates[valid].min() if valid.any() else MIN_SALE_DATE
+        matrix = cls(start, window_days)
+        matrix.add_sales(codes, dates, quantities)
+        return matrix
+
+    @classmethod
+    def load(cls, path: Path | str) -> "DemandMatrix":
+        """Restaura una matriz guardada con `save` (matriz, códigos y sumas de la ventana)."""
+        with np.load(path, allow_pickle=False) as state:
+            matrix = cls(state["start"].item(), int(state["window_days"]))
+            matrix._data = state["data"].astype(np.float32)
+            matrix.codes = state["codes"].tolist()
+            matrix._sum = state["sum"].astype(float)
+            matrix._sumsq = state["sumsq"].astype(float)
+            matrix._first_day = state["first_day"].astype(np.int64)
+        matrix._rows = {code: row for row, code in enumerate(matrix.codes)}
+        matrix.n_days = matrix._data.shape[1]
+        return matrix
+
+    def save(self, path: Path | str) -> Path:
+        """
+        Guarda el estado de la matriz en un `.npz` para continuarla con `load`.
+
+        Returns:
+            Ruta del archivo guardado
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        n = self.n_products
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                data=self.matrix(),
+                codes=np.array(self.codes, dtype=str),
+                sum=self._sum[:n],
+                sumsq=self._sumsq[:n],
+                first_day=self._first_day[:n],
+                start=np.array(str(self.start)),
+                window_days=np.array(self.window_days),
+            )
+        return path
+
+    @property
+    def n_products(self) -> int:
+        return len(self.codes)
+
+    @property
+    def last_date(self) -> np.datetime64 | None:
+        return self.start + np.timedelta64(self.n_days - 1, "D") if self.n_days else None
+
+    def matrix(self) -> np.ndarray:
+        """Vista de la matriz producto × día (sin la capacidad de reserva)."""
+        return self._data[: self.n_products, : self.n_days]
+
+    def _row_indices(self, codes) -> np.ndarray:
+        """Fila de cada código; los productos nuevos se agregan al final."""
+        inverse, uniques = pd.factorize(np.asarray(codes, dtype=object))
+        rows = np.empty(len(uniques), dtype=np.int64)
+        for i, code in enumerate(uniques):
+            row = self._rows.get(code)
+            if row is None:
+                row = self._rows[code] = len(self.codes)
+                self.codes.append(code)
+            rows[i] = row
+        return rows[inverse]
+
+    def _ensure_capacity(self, n_rows: int, n_days: int) -> None:
+        rows_cap, days_cap = self._data.shape
+        if n_rows <= rows_cap and n_days <= days_cap:
+            return
+        new_rows = rows_cap if n_rows <= rows_cap else n_rows + n_rows // 8
+        new_days = days_cap if n_days <= days_cap else n_days + max(31, n_days // 8)
+        data = np.zeros((new_rows, new_days), dtype=np.float32)
+        data[:rows_cap, :days_cap] = self._data
+        self._data = data
+        grow = new_rows - rows_cap
+        if grow:
+            self._sum = np.concatenate([self._sum, np.zeros(grow)])
+            self._sumsq = np.concatenate([self._sumsq, np.zeros(grow)])
+            self._first_day = np.concatenate(
+                [self._first_day, np.full(grow, np.iinfo(np.int64).max, dtype=np.int64)]
+            )
+
+    def add_sales(self, codes, dates, quantities) -> int:
+        """
+        Agrega ventas (de días nuevos o de días ya cargados) y actualiza la ventana.
+
+        Las ventas con fecha anterior a 2000 (fecha por defecto de Silver) se
+        descartan; las anteriores al inicio de la matriz son un error.
+
+        Returns:
+            Cantidad de ventas agregadas
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        quantities = np.asarray(quantities, dtype=float)
+        valid = (dates >= MIN_SALE_DATE) & np.isfinite(quantities)
+        if not valid.all():
+            logger.info(f"{int((~valid).sum())} ventas sin fecha o cantidad válida descartadas")
+            dates, quantities = dates[valid], quantities[valid]
+            codes = np.asarray(codes, dtype=object)[valid]
+        if len(dates) == 0:
+            return 0
+
+        days = (dates - self.start).astype(np.int64)
+        if days.min() < 0:
+            raise ValueError(f"Ventas anteriores al inicio de la matriz ({self.start}): {dates.min()}")
+        rows = self._row_indices(codes)
+
+        last = self.n_days - 1
+        new_last = max(last, int(days.max()))
+        self._ensure_capacity(self.n_products, new_last + 1)
+
+        # Ventas tardías de días que ya están en la ventana: ajustan las sumas de su producto
+        late = (days <= last) & (days > last - self.window_days)
+        if late.any():
+            cells = rows[late] * self._data.shape[1] + days[late]
+            unique_cells, inverse = np.unique(cells, return_inverse=True)
+            added = np.bincount(inverse.ravel(), weights=quantities[late])
+            cell_rows, cell_days = np.divmod(unique_cells, self._data.shape[1])
+            before = self._data[cell_rows, cell_days].astype(float)
+            np.add.at(self._sum, cell_rows, added)
+            np.add.at(self._sumsq, cell_rows, (before + added) ** 2 - before**2)
+
+        np.add.at(self._data, (rows, days), quantities)
+        np.minimum.at(self._first_day, rows, days)
+
+        if new_last > last:
+            self._advance(last, new_last)
+        return len(days)
+
+    def _advance(self, last: int, new_last: int) -> None:
+        """Mueve la ventana del día `last` al día `new_last`."""
+        n, window = self.n_products, self.window_days
+        self.n_days = new_last + 1
+        if new_last - last >= window:
+            # La ventana nueva no comparte días con la anterior: se suma directamente
+            block = self._data[:n, max(0, new_last + 1 - window): new_last + 1].astype(float)
+            self._sum[:n] = block.sum(axis=1)
+            self._sumsq[:n] = (block**2).sum(axis=1)
+            return
+        entering = self._data[:n, last + 1: new_last + 1].astype(float)
+        leaving = self._data[:n, max(0, last + 1 - window): max(0, new_last + 1 - window)].astype(float)
+        self._sum[:n] += entering.sum(axis=1) - leaving.sum(axis=1)
+        self._sumsq[:n] += (entering**2).sum(axis=1) - (leaving**2).sum(axis=1)
+
+    def demand(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Demanda diaria media, desvío (muestral) y días observados de la ventana por producto.
+
+        Un producto con menos historia que la ventana (ej. recién incorporado)
+        se promedia sobre los días desde su primera venta.
+        """
+        n = self.n_products
+        observed = np.clip(self.n_days - self._first_day[:n], 1, self.window_days).astype(float)
+        total, squares = self._sum[:n], self._sumsq[:n]
+        mean = total / observed
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = np.where(observed > 1, (squares - total**2 / observed) / (observed - 1), 0.0)
+        # El redondeo de las sumas incrementales puede dejar varianzas apenas negativas
+        return mean, np.sqrt(np.maximum(variance, 0.0)), observed
+
+    def metrics(
+        self,
+        stock: Mapping[str, float] | pd.Series | None = None,
+        policy: ReplenishmentPolicy = ReplenishmentPolicy(),
+    ) -> pd.DataFrame:
+        """
+        Métricas de reposición de todos los productos.
+
+        Args:
+            stock: Stock actual por código de producto (los que no figuran cuentan con 0)
+            policy: Plazos y nivel de servicio
+
+        Returns:
+            DataFrame con codigo_producto, demanda_media, desvio, dias_historia,
+            stock, dias_cobertura, stock_seguridad, punto_pedido, stock_objetivo
+            y cantidad_sugerida
+        """
+        mean, std, observed = self.demand()
+        if stock is None:
+            on_hand = np.zeros(self.n_products)
+        else:
+            on_hand = pd.Series(stock, dtype=float).reindex(self.codes).fillna(0.0).to_numpy()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cover = np.where(mean > 0, on_hand / mean, np.inf)
+        # Punto de pedido s = demanda del plazo + stock de seguridad del plazo;
+        # el objetivo S agrega la demanda del período de revisión
+        lead = policy.lead_time_days
+        safety = policy.service_z * std * math.sqrt(lead)
+        reorder_point = mean * lead + safety
+        target = reorder_point + mean * policy.review_days
+        suggested = np.where(on_hand <= reorder_point, np.ceil(np.maximum(target - on_hand, 0.0)), 0.0)
+
+        return pd.DataFrame({
+            "codigo_producto": self.codes,
+            "demanda_media": mean,
+            "desvio": std,
+            "dias_historia": observed.astype(np.int64),
+            "stock": on_hand,
+            "dias_cobertura": cover,
+            "stock_seguridad": safety,
+            "punto_pedido": reorder_point,
+            "stock_objetivo": target,
+            "cantidad_sugerida": suggested.astype(np.int64),
+        })
@@ -0,0 +1 @@
+"""Módulo de generación de datos sintéticos y benchmarks de rendimiento."""
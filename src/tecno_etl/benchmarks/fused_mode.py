@@ -0,0 +1,243 @@
+"""
+Benchmark de latencia de punta a punta: Silver + Gold por etapas vs. fusionado.
+
+Ejecuta los handlers reales de Silver y Gold (mismo código que en Lambda) con
+tablas DynamoDB y cola SQS simuladas en memoria:
+
+- `staged`: Silver escribe Silver y notifica; tras la demora de la cola, Gold
+  lee Silver, carga dimensiones y escribe Gold,
+- `fused`: Silver escribe Silver y Gold en la misma invocación
+  (`TECNO_ETL_FUSED_MAX_ROWS`).
+
+El tiempo de red no se duerme: cada solicitud a DynamoDB suma
+`request_latency_ms` (los scans y queries, una por página de 1 MB) a un reloj
+simulado, y cada salto por SQS suma `queue_delay_ms`. La latencia reportada es
+el tiempo de CPU medido más el tiempo simulado. Los valores por defecto son
+del orden de lo observado en us-east-1; para comparar en AWS, usar la métrica
+`pipeline_latency_ms` de los handlers.
+"""
+
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+from boto3.dynamodb.types import TypeDeserializer
+
+from ..loaders.dynamodb_writer import estimate_item_size
+from ..loaders.rate_limiter import reset_limiters
+from ..transformers.enrichment import FUSED_MAX_ROWS_ENV
+from ..utils.run_ledger import RUN_LEDGER_TABLE, RunLedger
+from .suite import PROJECT_ROOT, load_lambda_module, prepare_dataset
+from .synthetic_data import build_product_catalog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FUSED_SIZES = (1_000, 10_000)
+DEFAULT_REQUEST_LATENCY_MS = 10.0
+DEFAULT_QUEUE_DELAY_MS = 300.0
+
+# Tamaño máximo de una página de Scan/Query
+PAGE_BYTES = 1024 * 1024
+
+# Claves de partición/orden de las tablas del pipeline
+TABLE_KEYS = {
+    "tecnomundo_bronze_sales": ("file_id", "row_id"),
+    "tecnomundo_silver_sales": ("fecha", "sale_id"),
+    "tecnomundo_gold_sales": ("fecha", "sale_id"),
+    "tecnomundo_dimensions_products": ("codigo_producto",),
+}
+
+
+class SimulatedDynamoDB:
+    """Recurso DynamoDB en memoria con latencia simulada por solicitud."""
+
+    def __init__(self, request_latency_ms: float):
+        self.request_latency_s = request_latency_ms / 1000
+        self.network_s = 0.0
+        self.requests = 0
+        self.tables: dict[str, dict[tuple, dict]] = {}
+
+    def _request(self, pages: int = 1) -> None:
+        self.requests += pages
+        self.network_s += pages * self.request_latency_s
+
+    def _key(self, table: str, item: dict) -> tuple:
+        return tuple(item.get(attr) for attr in TABLE_KEYS.get(table, ("file_id", "stage_recorded_at")))
+
+    def put(self, table: str, item: dict) -> None:
+        self.tables.setdefault(table, {})[self._key(table, item)] = item
+
+    def read(self, table: str, items: list[dict]) -> dict:
+        pages = max(1, math.ceil(sum(estimate_item_size(item) for item in items) / PAGE_BYTES))
+        self._request(pages)
+        return {"Items": items, "Count": len(items)}
+
+    def batch_write_item(self, RequestItems: dict, **kwargs) -> dict:
+        self._request()
+        for table, requests in RequestItems.items():
+            for request in requests:
+                self.put(table, request["PutRequest"]["Item"])
+        return {"UnprocessedItems": {}}
+
+    def Table(self, name: str) -> "SimulatedTable":  # noqa: N802 (misma API que boto3)
+        return SimulatedTable(self, name)
+
+
+class SimulatedTable:
+    """Tabla del recurso simulado (las operaciones que usan los handlers)."""
+
+    billing_mode_summary = {"BillingMode": "PAY_PER_REQUEST"}
+
+    def __init__(self, db: SimulatedDynamoDB, name: str):
+        self.db = db
+        self.name = name
+        self.meta = SimpleNamespace(client=db)
+
+    def put_item(self, Item: dict, **kwargs) -> dict:
+        self.db._request()
+        self.db.put(self.name, Item)
+        return {}
+
+    def update_item(self, Key: dict, **kwargs) -> dict:
+        # Ledger de corridas: sólo cuenta la solicitud
+        self.db._request()
+        return {}
+
+    def query(self, ExpressionAttributeValues: dict, **kwargs) -> dict:
+        # Las queries del pipeline son por file_id (':fid')
+        file_id = ExpressionAttributeValues[":fid"]
+        items = [i for i in self.db.tables.get(self.name, {}).values() if i.get("file_id") == file_id]
+        return self.db.read(self.name, items)
+
+    def scan(self, **kwargs) -> dict:
+        # Se devuelve la tabla completa en una respuesta (el caso más favorable para Gold por etapas)
+        return self.db.read(self.name, list(self.db.tables.get(self.name, {}).values()))
+
+
+class SimulatedQueue:
+    """Cliente SQS que guarda los mensajes enviados."""
+
+    def __init__(self):
+        self.messages: list[dict] = []
+
+    def send_message(self, QueueUrl: str, MessageBody: str) -> dict:
+        self.messages.append(json.loads(MessageBody))
+        return {"MessageId": str(len(self.messages))}
+
+
+def _sqs_event(message: dict) -> dict:
+    return {"Records": [{"body": json.dumps(message)}]}
+
+
+def _bronze_items(size: int, data_dir: Path, seed: int) -> list[dict]:
+    """Items de Bronze tal como Silver los lee con el recurso boto3."""
+    bronze = load_lambda_module("bronze_ingestion")
+    df = pd.read_csv(prepare_dataset(size, "csv", data_dir, seed))
+    df.columns = [bronze.sanitize_column_name(col) for col in df.columns]
+    deserializer = TypeDeserializer()
+    return [
+        {name: deserializer.deserialize(value) for name, value in item.items()}
+        for item in bronze.build_bronze_items(df, f"ventas_{size}")
+    ]
+
+
+def _run_mode(
+    mode: str,
+    bronze_items: list[dict],
+    dimensions: list[dict],
+    request_latency_ms: float,
+    queue_delay_ms: float,
+) -> dict:
+    db = SimulatedDynamoDB(request_latency_ms)
+    for item in bronze_items:
+        db.put("tecnomundo_bronze_sales", item)
+    for dim in dimensions:
+        db.put("tecnomundo_dimensions_products", dim)
+    queue = SimulatedQueue()
+
+    silver = load_lambda_module("silver_transformation")
+    gold = load_lambda_module("gold_enrichment")
+    silver.dynamodb, silver.sqs, gold.dynamodb = db, queue, db
+    silver.runs = gold.runs = RunLedger(db.Table(RUN_LEDGER_TABLE))
+
+    file_id = bronze_items[0]["file_id"]
+    os.environ[FUSED_MAX_ROWS_ENV] = str(len(bronze_items) if mode == "fused" else 0)
+    reset_limiters()
+    start = time.perf_counter()
+    hops = 1  # Bronze -> Silver
+    # Los handlers emiten su línea EMF por stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        silver.lambda_handler(_sqs_event({"file_id": file_id, "row_count": len(bronze_items)}), None)
+        if queue.messages:
+            hops += 1  # Silver -> Gold
+            gold.lambda_handler(_sqs_event(queue.messages[-1]), None)
+    compute_s = time.perf_counter() - start
+    reset_limiters()
+
+    latency_s = compute_s + db.network_s + hops * queue_delay_ms / 1000
+    return {
+        "stage": f"silver_gold[{mode}]",
+        "rows": len(bronze_items),
+        "format": "csv",
+        "best_s": latency_s,
+        "mean_s": latency_s,
+        "repeat": 1,
+        "compute_s": compute_s,
+        "network_s": db.network_s,
+        "dynamodb_requests": db.requests,
+        "queue_hops": hops,
+        "gold_rows": len(db.tables.get("tecnomundo_gold_sales", {})),
+    }
+
+
+def run_fused_mode_benchmark(
+    sizes: tuple[int, ...] = DEFAULT_FUSED_SIZES,
+    data_dir: Path | str = PROJECT_ROOT / "data" / "synthetic",
+    request_latency_ms: float = DEFAULT_REQUEST_LATENCY_MS,
+    queue_delay_ms: float = DEFAULT_QUEUE_DELAY_MS,
+    seed: int = 42,
+) -> list[dict]:
+    """
+    Compara la latencia de punta a punta de Silver + Gold en ambos modos.
+
+    Returns:
+        Entradas 'silver_gold[staged]' y 'silver_gold[fused]' por tamaño, con el
+        formato de `run_benchmarks` (`best_s` = latencia de punta a punta).
+    """
+    catalog = build_product_catalog(seed=seed)
+    dimensions = [
+        {"codigo_producto": code, "nombre_del_producto": name, "categoria": cat}
+        for code, name, cat in zip(
+            catalog["codigo"].str.upper(), catalog["nombre"], catalog["categoria"], strict=True
+        )
+    ]
+
+    previous = os.environ.get(FUSED_MAX_ROWS_ENV)
+    results = []
+    try:
+        for size in sizes:
+            bronze_items = _bronze_items(size, Path(data_dir), seed)
+            staged, fused = (
+                _run_mode(mode, bronze_items, dimensions, request_latency_ms, queue_delay_ms)
+                for mode in ("staged", "fused")
+            )
+            fused["speedup"] = staged["best_s"] / fused["best_s"]
+            results += [staged, fused]
+            logger.info(
+                f"  silver_gold {size:>10,} filas: por etapas {staged['best_s']:.2f}s "
+                f"({staged['dynamodb_requests']} solicitudes) -> fusionado {fused['best_s']:.2f}s "
+                f"({fused['dynamodb_requests']} solicitudes), x{fused['speedup']:.2f}"
+            )
+    finally:
+        if previous is None:
+            os.environ.pop(FUSED_MAX_ROWS_ENV, None)
+        else:
+            os.environ[FUSED_MAX_ROWS_ENV] = previous
+    return results
@@ -0,0 +1,124 @@
+"""
+Benchmark del motor de métricas de reposición (`analytics.replenishment`).
+
+Genera la historia de ventas de un catálogo grande (por defecto 50.000
+productos × 3 años) con demanda Poisson de tasa log-normal (pocos productos
+de alta rotación, muchos de baja) y mide:
+
+- `replenishment[build]`: construir la matriz producto × día con toda la historia,
+- `replenishment[metrics]`: demanda, cobertura y cantidades sugeridas de todos los productos,
+- `replenishment[incremental_day]`: agregar las ventas de un día nuevo y recalcular las métricas,
+- `replenishment[rebuild_day]`: lo mismo reconstruyendo desde la historia completa
+  (la alternativa sin actualización incremental), con la aceleración respecto
+  del incremental.
+"""
+
+import logging
+
+import numpy as np
+
+from ..analytics.replenishment import DemandMatrix
+from .suite import time_call
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLENISHMENT_PRODUCTS = 50_000
+DEFAULT_REPLENISHMENT_DAYS = 3 * 365
+BENCHMARK_START = np.datetime64("2022-01-01", "D")
+
+# Días generados por bloque (acota la memoria de la matriz de Poisson temporal)
+_CHUNK_DAYS = 60
+
+
+def product_codes(products: int) -> np.ndarray:
+    return np.array([f"P{i:06d}" for i in range(products)], dtype=object)
+
+
+def generate_sales_events(
+    products: int, days: int, seed: int = 42, first_day: int = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ventas sintéticas (código, fecha, cantidad) de `products` productos durante
+    `days` días a partir de `BENCHMARK_START + first_day`; una venta por
+    producto y día con demanda.
+    """
+    rng = np.random.default_rng(seed)
+    # La tasa depende sólo del producto (misma semilla de tasas en todos los bloques)
+    rates = np.random.default_rng(0).lognormal(mean=np.log(0.15), sigma=1.2, size=products)
+    names = product_codes(products)
+
+    codes, dates, quantities = [], [], []
+    for offset in range(0, days, _CHUNK_DAYS):
+        span = min(_CHUNK_DAYS, days - offset)
+        demand = rng.poisson(rates[:, None], size=(products, span)).astype(np.int32)
+        rows, cols = np.nonzero(demand)
+        codes.append(names[rows])
+        dates.append(BENCHMARK_START + (first_day + offset + cols).astype("timedelta64[D]"))
+        quantities.append(demand[rows, cols].astype(float))
+    return np.concatenate(codes), np.concatenate(dates), np.concatenate(quantities)
+
+
+def run_replenishment_benchmark(
+    products: int = DEFAULT_REPLENISHMENT_PRODUCTS,
+    days: int = DEFAULT_REPLENISHMENT_DAYS,
+    repeat: int = 1,
+    seed: int = 42,
+) -> list[dict]:
+    """
+    Mide el motor de reposición sobre `products` productos × `days` días.
+
+    Returns:
+        Una entrada por etapa con el formato de `run_benchmarks`
+    """
+    codes, dates, quantities = generate_sales_events(products, days, seed)
+    new_codes, new_dates, new_quantities = generate_sales_events(products, 1, seed + 1, first_day=days)
+    stock = dict(zip(product_codes(products).tolist(), np.arange(products) % 50, strict=True))
+    logger.info(f"  {len(codes):,} ventas sintéticas ({products:,} productos × {days:,} días)")
+
+    def incremental_day() -> DemandMatrix:
+        demand.add_sales(new_codes, new_dates, new_quantities)
+        demand.metrics(stock)
+        return demand
+
+    def rebuild_day() -> DemandMatrix:
+        rebuilt = DemandMatrix.from_sales(
+            np.concatenate([codes, new_codes]),
+            np.concatenate([dates, new_dates]),
+            np.concatenate([quantities, new_quantities]),
+        )
+        rebuilt.metrics(stock)
+        return rebuilt
+
+    results = []
+    build_stats, demand = time_call(DemandMatrix.from_sales, codes, dates, quantities, repeat=repeat)
+    metrics_stats, metrics = time_call(demand.metrics, stock, repeat=repeat)
+    # La actualización incremental modifica la matriz: se mide una vez, sobre una matriz recién construida
+    demand = DemandMatrix.from_sales(codes, dates, quantities)
+    incremental_stats, _ = time_call(incremental_day)
+    rebuild_stats, _ = time_call(rebuild_day, repeat=repeat)
+
+    for stage, stats, rows in (
+        ("replenishment[build]", build_stats, len(codes)),
+        ("replenishment[metrics]", metrics_stats, products),
+        ("replenishment[incremental_day]", incremental_stats, len(new_codes)),
+        ("replenishment[rebuild_day]", rebuild_stats, len(codes) + len(new_codes)),
+    ):
+        results.append({
+            "stage": stage,
+            "rows": rows,
+            "format": "numpy",
+            "products": products,
+            "days": days,
+            **stats,
+            "rows_per_s": rows / stats["best_s"] if stats["best_s"] > 0 else None,
+        })
+        logger.info(f"  {stage:<32} {rows:>12,} filas: {stats['best_s']:.3f}s")
+
+    speedup = rebuild_stats["best_s"] / incremental_stats["best_s"]
+    results[2]["speedup"] = speedup
+    logger.info(
+        f"  Matriz {demand.n_products:,} × {demand.n_days:,} días "
+        f"({demand.matrix().nbytes / 2**20:.0f} MiB); {int((metrics['cantidad_sugerida'] > 0).sum()):,} "
+        f"productos a reponer; actualización incremental x{speedup:.0f} más rápida que reconstruir"
+    )
+    return results
@@ -0,0 +1,338 @@
+"""
+Suite de benchmarks de escalabilidad del pipeline.
+
+Mide, para cada tamaño de archivo, el tiempo de las etapas locales
+(`read_file`, `apply_standard_transformations`, `validate_dataframe`) y del
+núcleo de transformación de cada Lambda (Bronze, Silver y Gold) sin tocar AWS.
+Los resultados se guardan en JSON para poder comparar corridas y detectar
+regresiones.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from boto3.dynamodb.types import TypeDeserializer
+
+from ..extractors.local_file_extractor import read_file
+from ..loaders.item_codec import encode_gold_item, encode_silver_item, size_report
+from ..transformers.compaction import compact_dataframe
+from ..transformers.data_normalizer import apply_standard_transformations, validate_dataframe
+from ..transformers.enrichment import enrich_items
+from ..validators.schemas import SalesRecord
+from .synthetic_data import EXCEL_MAX_ROWS, build_product_catalog, write_sales_report
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+LAMBDA_DIR = PROJECT_ROOT / "lambda_functions"
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+FULL_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+FORMAT_SUFFIXES = {"csv": ".csv", "excel": ".xlsx"}
+
+# Bronze recibe el archivo en el payload de invocación (máx. 6 MB), por lo que
+# medir los núcleos Lambda por encima de este tamaño no aporta información útil.
+# El mismo límite aplica a la validación fila a fila (motor "pydantic").
+DEFAULT_LAMBDA_MAX_ROWS = 1_000_000
+
+
+def load_lambda_module(name: str) -> ModuleType:
+    """
+    Carga el módulo `lambda_function.py` de una Lambda sin desplegarla.
+
+    Los módulos crean clientes boto3 al importarse, lo cual no requiere red
+    pero sí una región configurada. Importan `tecno_etl` (empaquetado junto a
+    cada Lambda), por lo que `src` debe estar en el path.
+    """
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    src_dir = str(PROJECT_ROOT / "src")
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    path = LAMBDA_DIR / name / "lambda_function.py"
+    spec = importlib.util.spec_from_file_location(f"lambda_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_call(func: Callable, *args, repeat: int = 1, **kwargs) -> tuple[dict, Any]:
+    """
+    Ejecuta `func` `repeat` veces y devuelve las estadísticas de tiempo y el último resultado.
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+
+    stats = {
+        "best_s": min(timings),
+        "mean_s": statistics.fmean(timings),
+        "repeat": repeat,
+    }
+    return stats, result
+
+
+def measure_peak_memory(func: Callable, *args, **kwargs) -> float:
+    """
+    Ejecuta `func` una vez bajo `tracemalloc` y devuelve el pico de memoria en MiB.
+
+    Se mide aparte de `time_call` porque el trazado de asignaciones altera los tiempos.
+    """
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def prepare_dataset(size: int, file_format: str, data_dir: Path, seed: int = 42) -> Path:
+    """Genera (o reutiliza) el archivo sintético para un tamaño y formato dados."""
+    path = Path(data_dir) / f"ventas_{size}{FORMAT_SUFFIXES[file_format]}"
+    if not path.exists():
+        logger.info(f"Generando dataset sintético: {path}")
+        write_sales_report(path, size, seed=seed)
+    return path
+
+
+def _run_lambda_cores(df_raw: pd.DataFrame, catalog: pd.DataFrame, repeat: int) -> list[dict]:
+    """
+    Mide los núcleos de transformación de Bronze, Silver y Gold.
+
+    Las variantes `[compact]` aplican la codificación compacta de items
+    (`tecno_etl.loaders.item_codec`) y reportan el tamaño promedio por item
+    antes y después (`avg_bytes_*`, `avg_wcu_*`).
+    """
+    bronze = load_lambda_module("bronze_ingestion")
+    silver = load_lambda_module("silver_transformation")
+
+    def bronze_core(df: pd.DataFrame) -> list[dict]:
+        df = df.copy()
+        df.columns = [bronze.sanitize_column_name(col) for col in df.columns]
+        return bronze.build_bronze_items(df, "benchmark_file")
+
+    def silver_core(items: list[dict]) -> list[dict]:
+        silver_items = []
+        for item in items:
+            try:
+                silver_items.append(silver.build_silver_item(item))
+            except Exception:
+                continue
+        return silver_items
+
+    def gold_core(items: list[dict], dimensions: dict) -> list[dict]:
+        return enrich_items(items, dimensions)[0]
+
+    def silver_core_compact(items: list[dict]) -> list[dict]:
+        return [encode_silver_item(item, "benchmark_file") for item in silver_core(items)]
+
+    def gold_core_compact(items: list[dict], dimensions: dict) -> list[dict]:
+        return [
+            encode_gold_item(item, "benchmark_file", found)
+            for item, found in zip(items, enrich_items(items, dimensions)[1], strict=True)
+        ]
+
+    def with_sizes(stats: dict, before: list[dict], after: list[dict]) -> dict:
+        before, after = size_report(before), size_report(after)
+        return {
+            **stats,
+            "avg_bytes_before": round(before["avg_bytes"], 1),
+            "avg_bytes_after": round(after["avg_bytes"], 1),
+            "avg_wcu_before": round(before["avg_wcu"], 3),
+            "avg_wcu_after": round(after["avg_wcu"], 3),
+        }
+
+    dimensions = {
+        code: {"codigo_producto": code, "nombre_del_producto": name, "categoria": cat}
+        for code, name, cat in zip(
+            catalog["codigo"].str.upper(), catalog["nombre"], catalog["categoria"], strict=True
+        )
+    }
+
+    timings = []
+    stats, bronze_items = time_call(bronze_core, df_raw, repeat=repeat)
+    timings.append(("bronze_core", stats))
+    # Silver lee Bronze con el recurso boto3: recibe los valores deserializados (Decimal)
+    deserializer = TypeDeserializer()
+    bronze_items = [
+        {name: deserializer.deserialize(value) for name, value in item.items()} for item in bronze_items
+    ]
+    stats, silver_items = time_call(silver_core, bronze_items, repeat=repeat)
+    timings.append(("silver_core", stats))
+    stats, gold_items = time_call(gold_core, silver_items, dimensions, repeat=repeat)
+    timings.append(("gold_core", stats))
+
+    stats, compact_silver = time_call(silver_core_compact, bronze_items, repeat=repeat)
+    timings.append(("silver_core[compact]", with_sizes(stats, silver_items, compact_silver)))
+    stats, compact_gold = time_call(gold_core_compact, silver_items, dimensions, repeat=repeat)
+    timings.append(("gold_core[compact]", with_sizes(stats, gold_items, compact_gold)))
+    return timings
+
+
+def run_benchmarks(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    formats: tuple[str, ...] = ("csv", "excel"),
+    data_dir: Path | str = PROJECT_ROOT / "data" / "synthetic",
+    repeat: int = 1,
+    seed: int = 42,
+    lambda_max_rows: int = DEFAULT_LAMBDA_MAX_ROWS,
+) -> dict:
+    """
+    Ejecuta la suite completa y devuelve los resultados.
+
+    `read_file` se mide para cada formato; el resto de las etapas se mide una
+    vez por tamaño sobre el DataFrame leído del primer formato.
+
+    Args:
+        sizes: Tamaños de archivo (filas) a medir
+        formats: Formatos de archivo ('csv', 'excel')
+        data_dir: Directorio donde se generan/reutilizan los datasets sintéticos
+        repeat: Repeticiones por etapa (se reporta el mejor tiempo y la media)
+        seed: Semilla de generación de datos
+        lambda_max_rows: Tamaño máximo en el que se miden los núcleos Lambda
+
+    Returns:
+        Diccionario con 'metadata' y 'results' (una entrada por etapa/tamaño/formato).
+    """
+    data_dir = Path(data_dir)
+    catalog = build_product_catalog(seed=seed)
+    results = []
+
+    def record(stage: str, size: int, file_format: str, stats: dict) -> None:
+        entry = {
+            "stage": stage,
+            "rows": size,
+            "format": file_format,
+            **stats,
+            "rows_per_s": size / stats["best_s"] if stats["best_s"] > 0 else None,
+        }
+        results.append(entry)
+        logger.info(f"  {stage:<32} {size:>10,} filas [{file_format}]: {stats['best_s']:.3f}s")
+        if "avg_bytes_before" in stats:
+            logger.info(
+                f"  {'':<32} tamaño promedio: {stats['avg_bytes_before']:.0f} B "
+                f"-> {stats['avg_bytes_after']:.0f} B por item"
+            )
+
+    for size in sizes:
+        df_raw = None
+        for file_format in formats:
+            if file_format == "excel" and size > EXCEL_MAX_ROWS:
+                logger.warning(f"Se omite Excel para {size:,} filas (límite de una hoja)")
+                continue
+
+            path = prepare_dataset(size, file_format, data_dir, seed)
+            stats, (df, _) = time_call(read_file, path, repeat=repeat)
+            record("read_file", size, file_format, stats)
+            if df_raw is None:
+                df_raw, source_format = df, file_format
+
+        if df_raw is None:
+            continue
+
+        stats, df_norm = time_call(apply_standard_transformations, df_raw, repeat=repeat)
+        stats["peak_mb"] = measure_peak_memory(apply_standard_transformations, df_raw)
+        record("apply_standard_transformations", size, source_format, stats)
+
+        # SalesRecord espera 'precio_unitario'; el reporte lo exporta como 'Precio Un.'
+        df_sales = df_norm.rename(columns={"precio_un_": "precio_unitario"})
+        stats, (df_valid, _) = time_call(validate_dataframe, df_sales, SalesRecord, repeat=repeat)
+        record("validate_dataframe", size, source_format, stats)
+
+        stats, (_, report) = time_call(compact_dataframe, df_valid, repeat=repeat)
+        stats.update(before_mb=report["before_mb"], after_mb=report["after_mb"])
+        record("compact_dataframe", size, source_format, stats)
+
+        if size <= lambda_max_rows:
+            stats, _ = time_call(
+                validate_dataframe, df_sales, SalesRecord, engine="pydantic", repeat=repeat
+            )
+            record("validate_dataframe[pydantic]", size, source_format, stats)
+
+            for stage, stats in _run_lambda_cores(df_raw, catalog, repeat):
+                record(stage, size, source_format, stats)
+        else:
+            logger.warning(f"Se omiten los núcleos Lambda para {size:,} filas")
+
+    return {
+        "metadata": {
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+            "formats": list(formats),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def save_results(results: dict, output_dir: Path | str) -> Path:
+    """Guarda los resultados en `output_dir/benchmark_<timestamp>.json`."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = output_dir / f"benchmark_{timestamp}.json"
+    path.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    logger.info(f"Resultados guardados en: {path}")
+    return path
+
+
+def compare_results(baseline: dict, current: dict, tolerance: float = 0.2) -> list[dict]:
+    """
+    Compara dos corridas y devuelve las etapas que empeoraron más que `tolerance`.
+
+    Las entradas se emparejan por (etapa, filas, formato) usando el mejor tiempo.
+
+    Args:
+        baseline: Resultados de referencia (como los devuelve `run_benchmarks`)
+        current: Resultados de la corrida actual
+        tolerance: Empeoramiento relativo admitido (0.2 = 20%)
+
+    Returns:
+        Lista de regresiones con los tiempos de ambas corridas y el ratio.
+    """
+
+    def index(run: dict) -> dict:
+        return {(r["stage"], r["rows"], r["format"]): r for r in run["results"]}
+
+    base_index = index(baseline)
+    regressions = []
+    for key, entry in index(current).items():
+        base = base_index.get(key)
+        if base is None or base["best_s"] <= 0:
+            continue
+        ratio = entry["best_s"] / base["best_s"]
+        if ratio > 1 + tolerance:
+            stage, rows, file_format = key
+            regressions.append(
+                {
+                    "stage": stage,
+                    "rows": rows,
+                    "format": file_format,
+                    "baseline_s": base["best_s"],
+                    "current_s": entry["best_s"],
+                    "ratio": ratio,
+                }
+            )
+    return regressions
@@ -0,0 +1,302 @@
+"""
+Generador de reportes de ventas sintéticos.
+
+Produce archivos con el mismo layout que exporta el sistema de punto de venta
+(y que recibe la Lambda Bronze): encabezados en español con acentos y 'Nº',
+códigos con prefijo de caja (ej. 'A04-LU8029'), formatos de fecha mezclados y
+un porcentaje configurable de filas sucias. La generación es vectorizada y por
+bloques, de modo que escala de miles a decenas de millones de filas.
+"""
+
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Encabezados tal como los exporta el sistema de ventas
+SALES_HEADERS = [
+    "Fecha",
+    "Comprobante Nº",
+    "Cliente",
+    "Código",
+    "Nombre del Artículo",
+    "Categoría",
+    "Cantidad",
+    "Precio Un.",
+    "Ganancia",
+    "Subtotal",
+    "Vendedor",
+]
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S")
+
+# Límite de filas de datos de una hoja de Excel (1.048.576 menos el encabezado)
+EXCEL_MAX_ROWS = 1_048_575
+
+DIRTY_KINDS = (
+    "cantidad_negativa",
+    "precio_cero",
+    "codigo_vacio",
+    "fecha_invalida",
+    "fecha_futura",
+    "cantidad_vacia",
+    "precio_excesivo",
+)
+
+_CATEGORIES = {
+    "LU": ("LUCES", ["FOCO GIRATORIO", "TIRA LED", "LÁMPARA RGB"]),
+    "RC": ("RC/MODULOS", ["MÓDULO PANTALLA", "MODULO TÁCTIL", "DISPLAY"]),
+    "B": ("RC/BATERIAS", ["BATERÍA", "BATERIA ORIGINAL", "PILA LITIO"]),
+    "VT": ("VIDRIO TEMPLADO", ["FILM GLASS", "VIDRIO CERÁMICO", "GLASS 9D"]),
+    "A": ("AURICULARES CON CABLE", ["AURICULAR IN EAR", "AURICULAR MICRÓFONO", "VINCHA"]),
+    "C": ("CONECTIVIDAD", ["ROUTER", "EXTENSOR WIFI", "ADAPTADOR RED"]),
+    "HE": ("HERRAMIENTAS", ["DESTORNILLADOR", "PINZA", "ESTACIÓN DE CALOR"]),
+    "CA": ("CABLES", ["CABLE USB-C", "CABLE LIGHTNING", "CABLE MICRO USB"]),
+}
+_BRANDS = ["SAMSUNG", "MOTO", "IPHONE", "XIAOMI", "LG", "TP-LINK", "GENÉRICO", "SONY"]
+
+_FIRST_NAMES = [
+    "José", "María", "Martín", "Lucía", "Sebastián", "Agustín", "Ramón", "Mónica",
+    "Iñaki", "Begoña", "Julián", "Sofía", "Joaquín", "Verónica", "Ángel", "Nicolás",
+]
+_LAST_NAMES = [
+    "Pérez", "González", "Martínez", "Núñez", "Gómez", "Fernández", "Muñoz", "Díaz",
+    "Peña", "López", "Sánchez", "Álvarez", "Ibáñez", "Rodríguez", "Suárez", "Castaño",
+]
+_SELLERS = ["Caja 1", "Caja 2", "Mostrador", "Franco A.", "Tienda Online", "Depósito"]
+
+
+def build_product_catalog(
+    n_products: int = 2000,
+    seed: int = 0,
+    catalog_path: Path | None = None,
+) -> pd.DataFrame:
+    """
+    Construye el catálogo de productos a partir del cual se generan las ventas.
+
+    Args:
+        n_products: Cantidad de productos sintéticos a generar
+        seed: Semilla del generador aleatorio
+        catalog_path: Ruta opcional a un catálogo real (ej. data/raw/Category.xlsx)
+
+    Returns:
+        DataFrame con columnas 'codigo', 'nombre', 'categoria' y 'codigo_caja'
+        (el mismo código con prefijo de caja, ej. 'A04-LU8029').
+    """
+    rng = np.random.default_rng(seed)
+
+    if catalog_path is not None:
+        raw = pd.read_excel(catalog_path, engine="openpyxl")
+        raw = raw.dropna(subset=["Código Interno", "Nombre del Artículo", "Categoría"])
+        catalog = pd.DataFrame(
+            {
+                "codigo": raw["Código Interno"].astype(str).to_numpy(),
+                "nombre": raw["Nombre del Artículo"].astype(str).to_numpy(),
+                "categoria": raw["Categoría"].astype(str).to_numpy(),
+            }
+        )
+    else:
+        prefixes = list(_CATEGORIES)
+        prefix_idx = rng.integers(0, len(prefixes), n_products)
+        numbers = rng.choice(np.arange(100, 99_999), size=n_products, replace=False)
+        codes, names, categories = [], [], []
+        for i, (p_idx, number) in enumerate(zip(prefix_idx, numbers, strict=True)):
+            prefix = prefixes[p_idx]
+            category, kinds = _CATEGORIES[prefix]
+            codes.append(f"{prefix}{number}")
+            names.append(f"{kinds[i % len(kinds)]} {_BRANDS[(i // 3) % len(_BRANDS)]} {number % 97}")
+            categories.append(category)
+        catalog = pd.DataFrame({"codigo": codes, "nombre": names, "categoria": categories})
+
+    boxes = rng.integers(1, 10, len(catalog))
+    letters = rng.choice(list("ABC"), len(catalog))
+    catalog["codigo_caja"] = [
+        f"{letter}{box:02d}-{code}"
+        for letter, box, code in zip(letters, boxes, catalog["codigo"], strict=True)
+    ]
+    return catalog
+
+
+def _client_pool(rng: np.random.Generator, size: int = 400) -> np.ndarray:
+    """Genera nombres de clientes con acentos, mayúsculas mezcladas y espacios sobrantes."""
+    first = rng.choice(_FIRST_NAMES, size)
+    last = rng.choice(_LAST_NAMES, size)
+    names = np.array([f"{name} {surname}" for name, surname in zip(first, last, strict=True)], dtype=object)
+    variants = rng.integers(0, 4, size)
+    names[variants == 1] = [n.upper() for n in names[variants == 1]]
+    names[variants == 2] = [f"  {n.lower()} " for n in names[variants == 2]]
+    names[:20] = "Consumidor Final"
+    return names
+
+
+def generate_sales_frame(
+    n_rows: int,
+    seed: int = 42,
+    dirty_ratio: float = 0.02,
+    catalog: pd.DataFrame | None = None,
+    start_date: str = "2022-01-01",
+    end_date: str = "2024-12-31",
+    row_offset: int = 0,
+) -> pd.DataFrame:
+    """
+    Genera un DataFrame de ventas con el layout crudo del sistema de ventas.
+
+    Args:
+        n_rows: Cantidad de filas a generar
+        seed: Semilla del generador aleatorio (resultados reproducibles)
+        dirty_ratio: Proporción de filas con problemas de calidad (0 a 1)
+        catalog: Catálogo de productos (ver `build_product_catalog`)
+        start_date: Primera fecha posible de venta
+        end_date: Última fecha posible de venta
+        row_offset: Desplazamiento para numerar comprobantes al generar por bloques
+
+    Returns:
+        DataFrame con las columnas de `SALES_HEADERS`.
+    """
+    rng = np.random.default_rng(seed + row_offset)
+    if catalog is None:
+        catalog = build_product_catalog()
+
+    # Fechas: se pre-formatean los días del rango y se indexan (vectorizado)
+    days = pd.date_range(start_date, end_date, freq="D")
+    day_idx = rng.integers(0, len(days), n_rows)
+    fmt_idx = rng.choice(len(DATE_FORMATS), n_rows, p=[0.6, 0.3, 0.1])
+    formatted = np.stack([days.strftime(fmt).to_numpy(dtype=object) for fmt in DATE_FORMATS])
+    fechas = formatted[fmt_idx, day_idx]
+
+    # Comprobantes: tres líneas por comprobante
+    invoice = (row_offset + np.arange(n_rows)) // 3
+    comprobantes = ("0001-" + pd.Series(invoice).astype(str).str.zfill(8)).to_numpy(dtype=object)
+
+    # Productos: ~35% de las ventas llevan el prefijo de caja
+    product_idx = rng.zipf(1.3, n_rows) % len(catalog)
+    with_box = rng.random(n_rows) < 0.35
+    codigos = np.where(
+        with_box,
+        catalog["codigo_caja"].to_numpy(dtype=object)[product_idx],
+        catalog["codigo"].to_numpy(dtype=object)[product_idx],
+    )
+    lowercase = rng.random(n_rows) < 0.05
+    codigos[lowercase] = [c.lower() for c in codigos[lowercase]]
+
+    clients = _client_pool(rng)
+    cantidad = np.minimum(rng.geometric(0.45, n_rows), 50)
+    precio = np.round(rng.lognormal(mean=8.5, sigma=1.0, size=n_rows), 2)
+    subtotal = np.round(cantidad * precio, 2)
+    ganancia = np.round(subtotal * rng.uniform(0.15, 0.45, n_rows), 2)
+
+    df = pd.DataFrame(
+        {
+            "Fecha": fechas,
+            "Comprobante Nº": comprobantes,
+            "Cliente": clients[rng.integers(0, len(clients), n_rows)],
+            "Código": codigos,
+            "Nombre del Artículo": catalog["nombre"].to_numpy(dtype=object)[product_idx],
+            "Categoría": catalog["categoria"].to_numpy(dtype=object)[product_idx],
+            "Cantidad": pd.array(cantidad, dtype="Int64"),
+            "Precio Un.": precio,
+            "Ganancia": ganancia,
+            "Subtotal": subtotal,
+            "Vendedor": rng.choice(_SELLERS, n_rows),
+        }
+    )
+
+    # Filas sucias: un tipo de problema por fila
+    dirty_rows = np.flatnonzero(rng.random(n_rows) < dirty_ratio)
+    kinds = rng.integers(0, len(DIRTY_KINDS), len(dirty_rows))
+    for kind_idx, kind in enumerate(DIRTY_KINDS):
+        rows = df.index[dirty_rows[kinds == kind_idx]]
+        if len(rows) == 0:
+            continue
+        if kind == "cantidad_negativa":
+            df.loc[rows, "Cantidad"] = -df.loc[rows, "Cantidad"]
+        elif kind == "precio_cero":
+            df.loc[rows, "Precio Un."] = 0.0
+        elif kind == "codigo_vacio":
+            df.loc[rows, "Código"] = "   "
+        elif kind == "fecha_invalida":
+            df.loc[rows, "Fecha"] = "32/13/2023"
+        elif kind == "fecha_futura":
+            df.loc[rows, "Fecha"] = "2099-01-01"
+        elif kind == "cantidad_vacia":
+            df.loc[rows, "Cantidad"] = pd.NA
+        elif kind == "precio_excesivo":
+            df.loc[rows, "Precio Un."] = 5_000_000.0
+
+    return df
+
+
+def iter_sales_chunks(
+    n_rows: int,
+    chunk_rows: int = 500_000,
+    seed: int = 42,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Genera las ventas en bloques de `chunk_rows` filas para no materializar
+    archivos de millones de filas en memoria.
+
+    Los argumentos adicionales se pasan a `generate_sales_frame`.
+    """
+    catalog = kwargs.pop("catalog", None)
+    if catalog is None:
+        catalog = build_product_catalog(seed=seed)
+
+    for offset in range(0, n_rows, chunk_rows):
+        size = min(chunk_rows, n_rows - offset)
+        yield generate_sales_frame(size, seed=seed, catalog=catalog, row_offset=offset, **kwargs)
+
+
+def write_sales_report(
+    path: Path | str,
+    n_rows: int,
+    chunk_rows: int = 500_000,
+    seed: int = 42,
+    sep: str = ",",
+    encoding: str = "utf-8",
+    **kwargs,
+) -> Path:
+    """
+    Escribe un reporte de ventas sintético en CSV o Excel según la extensión.
+
+    Args:
+        path: Ruta de destino (.csv, .xlsx)
+        n_rows: Cantidad de filas de datos
+        chunk_rows: Tamaño de bloque para la generación y escritura de CSV
+        seed: Semilla del generador aleatorio
+        sep: Separador para CSV
+        encoding: Codificación del CSV (ej. 'latin1' para exportaciones de Windows)
+        **kwargs: Argumentos adicionales para `generate_sales_frame`
+
+    Returns:
+        La ruta del archivo escrito.
+
+    Raises:
+        ValueError: Si el formato no es .csv/.xlsx o se superan las filas de una hoja Excel.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = path.suffix.lower()
+
+    if suffix == ".csv":
+        with open(path, "w", encoding=encoding, newline="") as f:
+            for i, chunk in enumerate(iter_sales_chunks(n_rows, chunk_rows, seed, **kwargs)):
+                chunk.to_csv(f, sep=sep, index=False, header=(i == 0))
+    elif suffix == ".xlsx":
+        if n_rows > EXCEL_MAX_ROWS:
+            raise ValueError(
+                f"Una hoja de Excel admite como máximo {EXCEL_MAX_ROWS:,} filas, "
+                f"se pidieron {n_rows:,}"
+            )
+        df = pd.concat(iter_sales_chunks(n_rows, chunk_rows, seed, **kwargs), ignore_index=True)
+        df.to_excel(path, index=False, engine="openpyxl")
+    else:
+        # openpyxl sólo escribe .xlsx: un .xls quedaría con el formato equivocado
+        raise ValueError(f"Formato de archivo no soportado: {path.suffix} (usar .csv o .xlsx)")
+
+    logger.info(f"Reporte sintético escrito: {path} ({n_rows:,} filas)")
+    return path
@@ -0,0 +1,112 @@
+"""
+Benchmark de los caminos de escritura de Bronze en DynamoDB.
+
+Compara, sobre el mismo DataFrame:
+
+- `resource`: items armados fila a fila (NaN a None, float a Decimal) y
+  escritos con el cliente del recurso boto3, que los serializa atributo por
+  atributo (`TypeSerializer`),
+- `wire`: items serializados por columna (`serialize_frame`) y escritos con
+  `PreSerializedBatchWriter` (cliente de bajo nivel).
+
+Las llamadas a `BatchWriteItem` se responden con `botocore.stub.Stubber`,
+que intercepta la llamada después de validar y serializar el request, por lo
+que se mide todo el trabajo del lado del cliente sin tocar AWS.
+"""
+
+import logging
+from decimal import Decimal
+from pathlib import Path
+
+import boto3
+import pandas as pd
+from botocore.stub import Stubber
+
+from ..loaders.dynamodb_writer import MAX_BATCH_SIZE, RateLimitedBatchWriter
+from ..loaders.wire_format import PreSerializedBatchWriter
+from ..utils.aws_clients import build_config
+from .suite import PROJECT_ROOT, load_lambda_module, prepare_dataset, time_call
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_TABLE = "tecnomundo_bronze_sales"
+DEFAULT_WRITE_PATH_ROWS = 100_000
+
+
+def build_resource_items(df: pd.DataFrame, file_id: str) -> list[dict]:
+    """Items Bronze como los acepta el recurso boto3 (fila a fila, float a Decimal)."""
+    items = []
+    for idx, row in df.iterrows():
+        item = {"file_id": file_id, "row_id": f"row_{idx:05d}", "loaded_at": "2024-01-01T00:00:00"}
+        for name, value in row.to_dict().items():
+            if pd.isna(value):
+                item[name] = None
+            elif isinstance(value, float):
+                item[name] = Decimal(str(value))
+            else:
+                item[name] = value
+        items.append(item)
+    return items
+
+
+def _stub_batch_writes(client, rows: int) -> Stubber:
+    stubber = Stubber(client)
+    for _ in range(-(-rows // MAX_BATCH_SIZE)):
+        stubber.add_response("batch_write_item", {"UnprocessedItems": {}})
+    return stubber
+
+
+def run_write_path_benchmark(
+    size: int = DEFAULT_WRITE_PATH_ROWS,
+    data_dir: Path | str = PROJECT_ROOT / "data" / "synthetic",
+    repeat: int = 1,
+    seed: int = 42,
+) -> list[dict]:
+    """
+    Mide ambos caminos de escritura sobre un archivo sintético de `size` filas.
+
+    Returns:
+        Una entrada por camino ('write_path[resource]', 'write_path[wire]') con
+        el formato de `run_benchmarks` y, en la de `wire`, la aceleración.
+    """
+    bronze = load_lambda_module("bronze_ingestion")
+    df = pd.read_csv(prepare_dataset(size, "csv", Path(data_dir), seed))
+    df.columns = [bronze.sanitize_column_name(col) for col in df.columns]
+
+    session = boto3.session.Session(region_name="us-east-1")
+    table = session.resource("dynamodb").Table(BENCHMARK_TABLE)
+    # Misma configuración que el cliente por defecto de PreSerializedBatchWriter
+    low_level_client = session.client("dynamodb", config=build_config(parameter_validation=False))
+
+    def resource_path() -> int:
+        items = build_resource_items(df, "benchmark_file")
+        with _stub_batch_writes(table.meta.client, len(items)):
+            with RateLimitedBatchWriter(table, limiter=None) as writer:
+                for item in items:
+                    writer.put_item(Item=item)
+        return writer.items_written
+
+    def wire_path() -> int:
+        items = bronze.build_bronze_items(df, "benchmark_file")
+        with _stub_batch_writes(low_level_client, len(items)):
+            with PreSerializedBatchWriter(table, client=low_level_client, limiter=None) as writer:
+                for item in items:
+                    writer.put_item(Item=item)
+        return writer.items_written
+
+    results = []
+    for stage, func in (("write_path[resource]", resource_path), ("write_path[wire]", wire_path)):
+        stats, written = time_call(func, repeat=repeat)
+        results.append({
+            "stage": stage,
+            "rows": size,
+            "format": "csv",
+            **stats,
+            "rows_per_s": written / stats["best_s"] if stats["best_s"] > 0 else None,
+        })
+        logger.info(f"  {stage:<32} {size:>10,} filas: {stats['best_s']:.3f}s")
+
+    speedup = results[0]["best_s"] / results[1]["best_s"]
+    results[1]["speedup"] = speedup
+    logger.info(f"  Aceleración del camino pre-serializado: x{speedup:.1f}")
+    return results
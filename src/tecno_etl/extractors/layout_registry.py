@@ -0,0 +1,163 @@
+"""
+Registro persistente de layouts de reportes CSV.
+
+El sistema de ventas exporta todos los meses el mismo layout. En lugar de
+volver a detectar separador y codificación, inferir dtypes y sanear los
+encabezados en cada extracción, el registro guarda esos resultados indexados
+por una huella de los bytes del encabezado:
+
+- separador y codificación,
+- columnas originales y su mapeo a nombres saneados/conformados,
+- dtypes explícitos para `pd.read_csv`.
+
+Si el encabezado cambia (columnas nuevas, otro orden, otro separador u otra
+codificación) cambia la huella y la entrada anterior deja de usarse. Si un
+archivo con un encabezado conocido no respeta el esquema registrado (ej. una
+columna entera con nulos), la entrada se invalida y se vuelve a inferir.
+
+Los usos (contador y último uso, para el desalojo) se acumulan en memoria y se
+escriben una vez al cerrar el registro; altas e invalidaciones se escriben en
+el momento.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_REGISTRY_PATH = PROJECT_ROOT / "reports" / "cache" / "layouts.json"
+
+# Longitud máxima de encabezado que se considera para la huella
+MAX_HEADER_BYTES = 64 * 1024
+
+
+def header_fingerprint(file_path: Path) -> str:
+    """Huella SHA-256 de los bytes de la primera línea del archivo (incluye BOM y fin de línea)."""
+    with open(file_path, "rb") as f:
+        header = f.readline(MAX_HEADER_BYTES)
+    return hashlib.sha256(header).hexdigest()[:32]
+
+
+class LayoutRegistry:
+    """
+    Registro de layouts persistido en un archivo JSON.
+
+    Con `enabled=False` no reconoce ni registra nada: todas las lecturas infieren
+    el layout (para desactivarlo desde la línea de comandos).
+
+    Example:
+        ```python
+        with LayoutRegistry() as registry:
+            df, file_type = read_file(Path("data/ventas_2024_05.csv"), registry=registry)
+        ```
+    """
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_REGISTRY_PATH,
+        max_entries: int = 256,
+        enabled: bool = True,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        if enabled and self.path.exists():
+            self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def __enter__(self) -> "LayoutRegistry":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self._entries
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: archivo temporal + reemplazo
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._entries, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Persiste los usos acumulados desde la última escritura."""
+        if self._dirty:
+            self._save()
+
+    def close(self) -> None:
+        self.flush()
+
+    def lookup(self, fingerprint: str) -> dict | None:
+        """Devuelve el layout registrado para la huella, o None (y lo registra en el log)."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            self.misses += 1
+            logger.info(f"Layout de origen desconocido ({fingerprint[:12]}): se infiere el esquema")
+            return None
+
+        self.hits += 1
+        entry["hits"] = entry.get("hits", 0) + 1
+        entry["last_used"] = time.time()
+        self._dirty = True
+        logger.info(
+            f"Layout de origen reconocido ({fingerprint[:12]}): separador "
+            f"{entry['delimiter']!r}, codificación {entry['encoding']}, "
+            f"{len(entry['columns'])} columnas"
+        )
+        return entry
+
+    def record(
+        self,
+        fingerprint: str,
+        delimiter: str,
+        encoding: str,
+        columns: list[str],
+        dtypes: dict[str, str],
+        column_mapping: dict[str, str],
+    ) -> dict:
+        """Guarda (o reemplaza) el layout de una huella y desaloja los menos usados."""
+        now = time.time()
+        entry = {
+            "delimiter": delimiter,
+            "encoding": encoding,
+            "columns": list(columns),
+            "dtypes": dtypes,
+            "column_mapping": column_mapping,
+            "created_at": now,
+            "last_used": now,
+            "hits": 0,
+        }
+        if not self.enabled:
+            return entry
+        self._entries[fingerprint] = entry
+
+        if len(self._entries) > self.max_entries:
+            oldest = sorted(self._entries, key=lambda k: self._entries[k]["last_used"])
+            for key in oldest[: len(self._entries) - self.max_entries]:
+                del self._entries[key]
+
+        self._save()
+        logger.info(f"Layout de origen registrado ({fingerprint[:12]})")
+        return entry
+
+    def invalidate(self, fingerprint: str) -> None:
+        """Elimina la entrada de una huella."""
+        if self._entries.pop(fingerprint, None) is not None:
+            self._save()
+            logger.info(f"Layout de origen invalidado ({fingerprint[:12]})")
@@ -1,61 +1,342 @@
+import codecs
+import csv
 import logging
+from collections.abc import Iterator
 from pathlib import Path
 
 import pandas as pd
 
+from ..transformers.data_normalizer import build_transformation_plan
+from .layout_registry import LayoutRegistry, header_fingerprint
+from .parse_cache import ParseCache
+
 # Obtiene un logger para este módulo específico.
 logger = logging.getLogger(__name__)
 
+# Filas por bloque de `iter_file_chunks`
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Bytes iniciales que se usan para detectar el separador y el encabezado
+SNIFF_BYTES = 64 * 1024
+
+# Separadores candidatos en los reportes exportados
+CANDIDATE_DELIMITERS = ",;\t|"
+
+# Codificación de respaldo cuando el archivo no es UTF-8 válido (exportaciones de Windows)
+FALLBACK_ENCODING = "latin1"
+
+# Bloque de lectura de la verificación estricta de UTF-8
+PROBE_BLOCK_BYTES = 1024 * 1024
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def detect_file_type(file_path: Path) -> str | None:
+    """Devuelve 'csv', 'excel' o None según la extensión del archivo."""
+    suffix = file_path.suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in [".xlsx", ".xls"]:
+        return "excel"
+    return None
+
+
+def detect_encoding(file_path: Path, probe_bytes: int | None = None) -> str:
+    """
+    Detecta la codificación de un CSV sin parsearlo.
+
+    1. Si el archivo empieza con un BOM, se usa la codificación que indica.
+    2. Si no, se decodifican los bytes como UTF-8 estricto por bloques. Un byte
+       inválido en cualquier punto (típico de reportes exportados en Windows)
+       implica 'latin1'.
+
+    La verificación sólo decodifica bytes, mucho más barato que parsear el CSV,
+    y permite que el archivo se parsee exactamente una vez.
+
+    Args:
+        file_path: La ruta al archivo local.
+        probe_bytes: Bytes a verificar (None para el archivo completo).
+
+    Returns:
+        Nombre de la codificación para `open`/`pd.read_csv`.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="strict")
+    with open(file_path, "rb") as f:
+        block = f.read(PROBE_BLOCK_BYTES)
+        for bom, encoding in _BOMS:
+            if block.startswith(bom):
+                return encoding
+
+        offset = 0
+        try:
+            while block:
+                decoder.decode(block)
+                offset += len(block)
+                if probe_bytes is not None and offset >= probe_bytes:
+                    break
+                block = f.read(PROBE_BLOCK_BYTES)
+            else:
+                decoder.decode(b"", final=True)
+        except UnicodeDecodeError as e:
+            logger.warning(
+                f"El archivo no es UTF-8 válido (byte {offset + e.start}). "
+                f"Se usará la codificación '{FALLBACK_ENCODING}'."
+            )
+            return FALLBACK_ENCODING
+    return "utf-8"
+
+
+def sniff_csv_format(sample: str) -> tuple[str, list[str]]:
+    """
+    Detecta el separador y el encabezado de un CSV a partir de una muestra de texto.
+
+    Se analizan sólo las líneas completas de la muestra. Si no se puede
+    determinar el separador con las líneas completas se intenta con la primera
+    línea (como hace el parser de Python de pandas) y, en último caso, ','.
+
+    Returns:
+        Tupla (separador, columnas del encabezado).
+    """
+    lines = sample.splitlines()
+    if len(lines) > 1 and not sample.endswith(("\n", "\r")):
+        # La última línea puede estar cortada por el tamaño de la muestra
+        lines = lines[:-1]
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return ",", []
+
+    sniffer = csv.Sniffer()
+    delimiter = ","
+    for candidate in ("\n".join(lines), lines[0]):
+        try:
+            delimiter = sniffer.sniff(candidate, delimiters=CANDIDATE_DELIMITERS).delimiter
+            break
+        except csv.Error:
+            continue
+
+    header = next(csv.reader([lines[0]], delimiter=delimiter))
+    return delimiter, header
+
+
+def _iter_csv_chunks(
+    file_path: Path, chunksize: int, encoding: str, delimiter: str | None = None, **read_csv_kwargs
+) -> Iterator[pd.DataFrame]:
+    if delimiter is None:
+        with open(file_path, encoding=encoding, newline="") as f:
+            sample = f.read(SNIFF_BYTES)
+        delimiter, header = sniff_csv_format(sample)
+        logger.info(
+            f"CSV detectado: separador {delimiter!r}, {len(header)} columnas, "
+            f"codificación {encoding}."
+        )
 
-def read_file(file_path: Path) -> tuple[pd.DataFrame | None, str | None]:
+    with pd.read_csv(
+        file_path,
+        sep=delimiter,
+        engine="c",
+        encoding=encoding,
+        chunksize=chunksize,
+        **read_csv_kwargs,
+    ) as reader:
+        for chunk in reader:
+            # El formato elegido queda registrado en los metadatos del bloque
+            chunk.attrs["encoding"] = encoding
+            chunk.attrs["delimiter"] = delimiter
+            yield chunk
+
+
+def iter_file_chunks(
+    file_path: Path,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    encoding: str | None = None,
+    layout: dict | None = None,
+    **read_csv_kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lee un archivo local por bloques de `chunksize` filas.
+
+    Para CSV el separador y el encabezado se detectan en los primeros
+    `SNIFF_BYTES` y el resto se procesa con el parser C de pandas por bloques,
+    sin cargar el archivo completo. Sin `encoding` explícita se detecta una vez
+    con `detect_encoding` antes de parsear, y queda en `chunk.attrs["encoding"]`.
+    Con un `layout` registrado (ver `LayoutRegistry`) no se detecta nada: se
+    parsea con su separador, codificación y dtypes fijos.
+
+    Los archivos Excel se leen completos (openpyxl no lee por bloques) y se
+    entregan en porciones.
+
+    Args:
+        file_path: La ruta al archivo local.
+        chunksize: Filas por bloque.
+        encoding: Codificación del CSV (None para detectarla).
+        layout: Layout registrado del archivo (sólo CSV).
+        **read_csv_kwargs: Argumentos adicionales para `pd.read_csv` (ej. dtype).
+
+    Yields:
+        DataFrames con hasta `chunksize` filas; el índice continúa entre bloques.
+
+    Raises:
+        ValueError: Si el formato de archivo no está soportado.
+    """
+    file_type = detect_file_type(file_path)
+
+    if file_type == "csv" and layout is not None:
+        read_csv_kwargs.setdefault("dtype", layout["dtypes"])
+        yield from _iter_csv_chunks(
+            file_path, chunksize, layout["encoding"], layout["delimiter"], **read_csv_kwargs
+        )
+
+    elif file_type == "csv":
+        encoding = encoding or detect_encoding(file_path)
+        yield from _iter_csv_chunks(file_path, chunksize, encoding, **read_csv_kwargs)
+
+    elif file_type == "excel":
+        logger.info("Archivo Excel detectado. Leyendo con openpyxl.")
+        df = pd.read_excel(file_path, engine="openpyxl", sheet_name=0)
+
+        # Precaución para Excel: eliminar filas completamente en blanco.
+        initial_rows = len(df)
+        df.dropna(how="all", inplace=True)
+        rows_dropped = initial_rows - len(df)
+        if rows_dropped > 0:
+            logger.info(
+                f"Se eliminaron {rows_dropped} filas completamente en blanco del archivo Excel."
+            )
+        for start in range(0, max(len(df), 1), chunksize):
+            yield df.iloc[start : start + chunksize]
+
+    else:
+        raise ValueError(f"Formato de archivo no soportado: {file_path}")
+
+
+def _mixed_type_columns(chunks: list[pd.DataFrame]) -> list[str]:
+    """Columnas que son texto en algunos bloques y numéricas en otros."""
+    mixed = []
+    for col in chunks[0].columns:
+        is_text = {
+            pd.api.types.is_object_dtype(c[col].dtype) or pd.api.types.is_string_dtype(c[col].dtype)
+            for c in chunks
+        }
+        if len(is_text) > 1:
+            mixed.append(col)
+    return mixed
+
+
+def _concat_chunks(chunks: list[pd.DataFrame]) -> pd.DataFrame:
+    """Une los bloques conservando los metadatos (`attrs`) del primero."""
+    if len(chunks) == 1:
+        return chunks[0]
+    df = pd.concat(chunks)
+    df.attrs.update(chunks[0].attrs)
+    return df
+
+
+def _read_csv_inferred(file_path: Path) -> pd.DataFrame:
+    """
+    Lectura completa con detección de codificación, separador y dtypes.
+
+    Si una columna es texto en algunos bloques y numérica en otros, se vuelve a
+    leer como texto sólo esa columna (los números ya parseados no conservan el
+    texto original, ej. ceros a la izquierda); el resto no se parsea de nuevo.
+    """
+    encoding = detect_encoding(file_path)
+    chunks = list(iter_file_chunks(file_path, encoding=encoding))
+    mixed = _mixed_type_columns(chunks) if len(chunks) > 1 else []
+    df = _concat_chunks(chunks)
+
+    if mixed:
+        logger.info(f"Columnas con tipos mixtos entre bloques, segunda pasada como texto: {mixed}")
+        text = _concat_chunks(list(iter_file_chunks(
+            file_path, encoding=encoding, usecols=mixed, dtype=dict.fromkeys(mixed, str)
+        )))
+        df[mixed] = text[mixed]
+    return df
+
+
+def _read_csv(file_path: Path, registry: LayoutRegistry | None) -> pd.DataFrame:
+    """Lee un CSV usando (y alimentando) el registro de layouts si se proporciona."""
+    if registry is None or not registry.enabled:
+        return _read_csv_inferred(file_path)
+
+    fingerprint = header_fingerprint(file_path)
+    layout = registry.lookup(fingerprint)
+    if layout is not None:
+        try:
+            df = _concat_chunks(list(iter_file_chunks(file_path, layout=layout)))
+            df.attrs["column_mapping"] = layout["column_mapping"]
+            return df
+        except (ValueError, UnicodeDecodeError) as e:
+            # El archivo no respeta el esquema registrado (ej. nulos en una columna entera)
+            logger.warning(f"El archivo no coincide con el layout registrado: {e}")
+            registry.invalidate(fingerprint)
+
+    df = _read_csv_inferred(file_path)
+    entry = registry.record(
+        fingerprint,
+        delimiter=df.attrs["delimiter"],
+        encoding=df.attrs["encoding"],
+        columns=[str(col) for col in df.columns],
+        dtypes={str(col): str(dtype) for col, dtype in df.dtypes.items()},
+        column_mapping=build_transformation_plan(df.columns)["renames"],
+    )
+    df.attrs["column_mapping"] = entry["column_mapping"]
+    return df
+
+
+def read_file(
+    file_path: Path,
+    registry: LayoutRegistry | None = None,
+    cache: ParseCache | None = None,
+) -> tuple[pd.DataFrame | None, str | None]:
     """
     Lee un archivo desde el sistema de archivos local con robustez añadida.
     Esta función se especializa en la extracción de datos y maneja problemas
     comunes como filas en blanco en Excel y problemas de codificación en CSV.
 
+    Concatena los bloques de `iter_file_chunks`. Si una columna resulta texto en
+    unos bloques y numérica en otros, se relee con esa columna como texto, que
+    es lo que produce la inferencia sobre el archivo completo. En CSV la
+    codificación y el separador se informan en `df.attrs`.
+
+    Con un `registry`, un CSV cuyo encabezado ya se conoce se parsea con el
+    layout registrado sin inferir nada; el mapeo de columnas saneadas queda en
+    `df.attrs["column_mapping"]` para `apply_standard_transformations`.
+
+    Con una `cache` (ver `ParseCache`), un archivo cuyo contenido ya se parseó
+    se carga desde disco con memory-map en lugar de volver a parsearse.
+
     Args:
         file_path: La ruta al archivo local.
+        registry: Registro de layouts opcional.
+        cache: Caché de parseo opcional.
 
     Returns:
         Una tupla que contiene el DataFrame y el tipo de archivo detectado ('csv' o 'excel').
         Devuelve (None, None) si ocurre un error.
     """
     logger.info(f"Extrayendo datos desde el archivo local: {file_path}")
+    file_type = detect_file_type(file_path)
+    if file_type is None:
+        logger.warning(f"Formato de archivo no soportado: {file_path}. Será omitido.")
+        return None, None
+
     try:
-        file_type = None
-        df = None
-
-        # Determina el tipo de archivo y lo lee de la manera correspondiente.
-        if file_path.suffix.lower() == ".csv":
-            file_type = "csv"
-            try:
-                # Intenta leer con la codificación estándar UTF-8.
-                logger.info("Archivo CSV detectado. Intentando leer con codificación UTF-8.")
-                df = pd.read_csv(file_path, sep=None, engine="python")
-            except UnicodeDecodeError:
-                # Si falla, intenta con una codificación común alternativa.
-                logger.warning(
-                    "La lectura con UTF-8 falló. Reintentando con codificación 'latin1'."
-                )
-                df = pd.read_csv(file_path, sep=None, engine="python", encoding="latin1")
-
-        elif file_path.suffix.lower() in [".xlsx", ".xls"]:
-            file_type = "excel"
-            logger.info("Archivo Excel detectado. Leyendo con openpyxl.")
-            df = pd.read_excel(file_path, engine="openpyxl", sheet_name=0)
-
-            # Precaución para Excel: eliminar filas completamente en blanco.
+        if cache is not None:
+            df = cache.load(file_path)
             if df is not None:
-                initial_rows = len(df)
-                df.dropna(how="all", inplace=True)
-                rows_dropped = initial_rows - len(df)
-                if rows_dropped > 0:
-                    logger.info(
-                        f"Se eliminaron {rows_dropped} filas completamente en blanco del archivo Excel."
-                    )
+                return df, file_type
+
+        if file_type == "csv":
+            df = _read_csv(file_path, registry)
         else:
-            logger.warning(f"Formato de archivo no soportado: {file_path}. Será omitido.")
+            df = _concat_chunks(list(iter_file_chunks(file_path)))
 
+        if cache is not None:
+            cache.store(file_path, df)
         return df, file_type
 
     except FileNotFoundError:
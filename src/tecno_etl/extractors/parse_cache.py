@@ -0,0 +1,214 @@
+"""
+Caché en disco de archivos ya parseados (Excel/CSV) en formato columnar.
+
+Parsear con openpyxl los libros de ventas o `data/raw/Category.xlsx` lleva
+decenas de segundos en cada corrida aunque el archivo no haya cambiado. La
+caché guarda el DataFrame parseado como archivo Arrow IPC sin comprimir, que
+se vuelve a cargar con memory-map: las columnas numéricas (y las de texto con
+almacenamiento Arrow) se usan sin copiar los datos.
+
+Las entradas se indexan por el hash del contenido del archivo (más la versión
+del lector). La ruta, el tamaño y el mtime se guardan en el índice para no
+recalcular el hash mientras el archivo no cambie. El tamaño total está acotado
+con desalojo LRU.
+
+Requiere `pyarrow` (dependencia opcional: `pip install tecno-etl[cache]`); sin
+él la caché se desactiva y las lecturas se hacen normalmente.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "parsed"
+
+# Tamaño máximo de la caché en disco
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# Cambiar cuando cambie el resultado de `read_file` para invalidar entradas viejas
+READER_VERSION = "read_file:1"
+
+_HASH_BLOCK_BYTES = 1024 * 1024
+
+
+def _pyarrow():
+    """Importa pyarrow bajo demanda (dependencia opcional)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        return None
+    return pa
+
+
+def file_content_hash(file_path: Path) -> str:
+    """BLAKE2b del contenido del archivo, leído por bloques."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        while block := f.read(_HASH_BLOCK_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    Caché de DataFrames parseados, con carga memory-mapped y desalojo LRU.
+
+    Example:
+        ```python
+        cache = ParseCache()
+        df, file_type = read_file(Path("data/raw/Category.xlsx"), cache=cache)
+        ```
+    """
+
+    def __init__(
+        self,
+        directory: Path | str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        enabled: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.enabled = enabled and self._check_available()
+        self._index_path = self.directory / "index.json"
+        self._index: dict[str, dict] = {}
+        if self.enabled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if self._index_path.exists():
+                self._index = json.loads(self._index_path.read_text(encoding="utf-8"))
+
+    @staticmethod
+    def _check_available() -> bool:
+        if _pyarrow() is None:
+            logger.warning("pyarrow no está instalado: la caché de parseo queda desactivada")
+            return False
+        return True
+
+    def _save_index(self) -> None:
+        # Escritura atómica: archivo temporal + reemplazo
+        tmp = self._index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._index, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self._index_path)
+
+    def _data_path(self, key: str) -> Path:
+        return self.directory / f"{key}.arrow"
+
+    def key(self, file_path: Path) -> str:
+        """
+        Clave de caché del archivo: hash de contenido + versión del lector.
+
+        Si la ruta, el tamaño y el mtime coinciden con una entrada existente se
+        reutiliza su hash sin volver a leer el archivo.
+        """
+        stat = file_path.stat()
+        resolved = str(file_path.resolve())
+        for key, entry in self._index.items():
+            if (
+                entry["path"] == resolved
+                and entry["size"] == stat.st_size
+                and entry["mtime_ns"] == stat.st_mtime_ns
+            ):
+                return key
+
+        content = file_content_hash(file_path)
+        return hashlib.sha256(f"{READER_VERSION}|{content}".encode()).hexdigest()[:32]
+
+    def load(self, file_path: Path) -> pd.DataFrame | None:
+        """Devuelve el DataFrame cacheado del archivo, o None si no está (o la caché está desactivada)."""
+        if not self.enabled:
+            return None
+
+        key = self.key(file_path)
+        entry = self._index.get(key)
+        data_path = self._data_path(key)
+        if entry is None or not data_path.exists():
+            self.misses += 1
+            logger.info(f"Caché de parseo: miss para {file_path.name}")
+            return None
+
+        pa = _pyarrow()
+        # Memory-map: los buffers Arrow apuntan directamente al archivo en disco
+        with pa.memory_map(str(data_path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        df = table.to_pandas(split_blocks=True)
+        df.attrs.update(entry.get("attrs", {}))
+
+        stat = file_path.stat()
+        entry.update(
+            path=str(file_path.resolve()),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            last_used=time.time(),
+        )
+        self._save_index()
+        self.hits += 1
+        logger.info(f"Caché de parseo: hit para {file_path.name} ({len(df)} filas)")
+        return df
+
+    def store(self, file_path: Path, df: pd.DataFrame) -> bool:
+        """
+        Guarda el DataFrame parseado del archivo. Devuelve False si no se pudo
+        convertir a Arrow (ej. columnas con tipos mezclados) o si la caché está
+        desactivada.
+        """
+        if not self.enabled:
+            return False
+
+        pa = _pyarrow()
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=None)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            logger.warning(f"Caché de parseo: {file_path.name} no se puede cachear ({e})")
+            return False
+
+        key = self.key(file_path)
+        data_path = self._data_path(key)
+        tmp = data_path.with_suffix(".tmp")
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, data_path)
+
+        stat = file_path.stat()
+        self._index[key] = {
+            "path": str(file_path.resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "bytes": data_path.stat().st_size,
+            "last_used": time.time(),
+            "attrs": {k: v for k, v in df.attrs.items() if isinstance(v, (str, int, float))},
+        }
+        self._evict()
+        self._save_index()
+        return True
+
+    def _evict(self) -> None:
+        """Elimina las entradas usadas hace más tiempo hasta respetar `max_bytes`."""
+        total = sum(entry["bytes"] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                self._data_path(key).unlink(missing_ok=True)
+            except OSError:
+                # En Windows no se puede borrar un archivo que sigue mapeado en memoria
+                continue
+            total -= self._index.pop(key)["bytes"]
+            logger.info(f"Caché de parseo: entrada {key[:12]} desalojada (LRU)")
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._index),
+            "bytes": sum(entry["bytes"] for entry in self._index.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
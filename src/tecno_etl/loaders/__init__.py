@@ -0,0 +1,23 @@
+"""
+Módulo de escritura en las tablas DynamoDB.
+
+`wire_format` (serialización desde pandas) se importa explícitamente: Silver y
+Gold usan este paquete y no empaquetan pandas.
+"""
+
+from .dynamodb_writer import (
+    RateLimitedBatchWriter,
+    WriteDeadlineExceeded,
+    estimate_item_size,
+    write_capacity_units,
+)
+from .rate_limiter import TokenBucket, limiter_for_table
+
+__all__ = [
+    "RateLimitedBatchWriter",
+    "TokenBucket",
+    "WriteDeadlineExceeded",
+    "estimate_item_size",
+    "limiter_for_table",
+    "write_capacity_units",
+]
@@ -0,0 +1,184 @@
+"""
+Carga diferencial de la dimensión de productos.
+
+En lugar de reescribir todo el catálogo en cada corrida, se compara un hash
+del contenido de cada producto (`codigo_producto`) con el estado actual de
+la tabla y sólo se escriben las altas y modificaciones (y, opcionalmente,
+se eliminan los productos que ya no están en el catálogo). Así, refrescar el
+catálogo cuesta WCU proporcionales a los cambios y no a su tamaño.
+
+El estado actual se obtiene de un snapshot local (hash por producto, que se
+actualiza después de cada carga) o, si no existe o se pide explícitamente,
+de un scan de la tabla.
+
+Example:
+    ```python
+    current = load_snapshot() or read_table_hashes(table)
+    diff = diff_catalog(current, items)
+    print(diff.summary())
+    apply_diff(table, diff, delete=True)
+    save_snapshot(snapshot_after(current, diff, delete=True))
+    ```
+"""
+
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..transformers.enrichment import load_dimensions
+from ..utils.capacity import CapacityLedger
+from .dynamodb_writer import RateLimitedBatchWriter
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS_TABLE = "tecnomundo_dimensions_products"
+DIMENSION_KEY = "codigo_producto"
+DEFAULT_SNAPSHOT_PATH = Path("data/cache/dimensions") / f"{DIMENSIONS_TABLE}.json"
+DEFAULT_WORKERS = 4
+
+
+def content_hash(item: dict) -> str:
+    """Hash del contenido de un item (independiente del orden de los atributos)."""
+    canonical = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def catalog_hashes(items: list[dict], key: str = DIMENSION_KEY) -> dict[str, str]:
+    """Hash de cada item por clave."""
+    return {item[key]: content_hash(item) for item in items}
+
+
+@dataclass
+class CatalogDiff:
+    """Cambios a aplicar para llevar la tabla al catálogo deseado."""
+
+    inserts: list[dict] = field(default_factory=list)
+    updates: list[dict] = field(default_factory=list)
+    # Claves que están en la tabla y ya no en el catálogo
+    deletes: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    # Claves repetidas en el catálogo (se usa la última aparición)
+    duplicates: int = 0
+
+    @property
+    def puts(self) -> list[dict]:
+        return self.inserts + self.updates
+
+    def summary(self, delete: bool = False) -> str:
+        deletes = f"{len(self.deletes)} bajas" if delete else f"{len(self.deletes)} obsoletos (sin eliminar)"
+        text = (
+            f"{len(self.inserts)} altas, {len(self.updates)} modificaciones, "
+            f"{deletes}, {self.unchanged} sin cambios"
+        )
+        if self.duplicates:
+            text += f", {self.duplicates} códigos repetidos en el catálogo"
+        return text
+
+
+def diff_catalog(current: dict[str, str], desired: list[dict], key: str = DIMENSION_KEY) -> CatalogDiff:
+    """
+    Compara el catálogo deseado con el estado actual de la tabla.
+
+    Args:
+        current: Hash de contenido por clave de lo que hay en la tabla
+        desired: Items del catálogo (ej. Category.xlsx)
+    """
+    latest = {}
+    for item in desired:
+        latest[item[key]] = item
+
+    diff = CatalogDiff(duplicates=len(desired) - len(latest))
+    for code, item in latest.items():
+        previous = current.get(code)
+        if previous is None:
+            diff.inserts.append(item)
+        elif previous != content_hash(item):
+            diff.updates.append(item)
+        else:
+            diff.unchanged += 1
+    diff.deletes = sorted(code for code in current if code not in latest)
+    return diff
+
+
+def snapshot_after(current: dict[str, str], diff: CatalogDiff, delete: bool = False,
+                   key: str = DIMENSION_KEY) -> dict[str, str]:
+    """Estado de la tabla (hash por clave) después de aplicar `diff`."""
+    snapshot = {**current, **catalog_hashes(diff.puts, key)}
+    if delete:
+        for code in diff.deletes:
+            snapshot.pop(code, None)
+    return snapshot
+
+
+def read_table_hashes(table, ledger: CapacityLedger | None = None, file_id: str | None = None) -> dict[str, str]:
+    """Hash de contenido de cada producto de la tabla (scan completo)."""
+    return {code: content_hash(item) for code, item in load_dimensions(table, ledger, file_id).items()}
+
+
+def load_snapshot(path: Path | str = DEFAULT_SNAPSHOT_PATH) -> dict[str, str] | None:
+    """Snapshot local del estado de la tabla, o None si no existe o no se puede leer."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Snapshot de dimensiones ilegible ({path}): {e}")
+        return None
+
+
+def save_snapshot(hashes: dict[str, str], path: Path | str = DEFAULT_SNAPSHOT_PATH) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(hashes, sort_keys=True, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _write_requests(table, requests: list[tuple[str, dict]], writer_kwargs: dict) -> dict:
+    with RateLimitedBatchWriter(table, **writer_kwargs) as writer:
+        for action, payload in requests:
+            if action == "put":
+                writer.put_item(Item=payload)
+            else:
+                writer.delete_item(Key=payload)
+    return writer.stats()
+
+
+def apply_diff(
+    table,
+    diff: CatalogDiff,
+    delete: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    key: str = DIMENSION_KEY,
+    **writer_kwargs,
+) -> dict:
+    """
+    Escribe las altas y modificaciones (y las bajas si `delete`) en paralelo.
+
+    Cada hilo usa su propio `RateLimitedBatchWriter`; todos comparten el
+    limitador de la tabla, por lo que el paralelismo no excede su capacidad.
+
+    Args:
+        **writer_kwargs: Argumentos de `RateLimitedBatchWriter` (ledger, file_id, limiter)
+
+    Returns:
+        Estadísticas sumadas de los escritores (items, WCU, reintentos, ...)
+    """
+    requests = [("put", item) for item in diff.puts]
+    if delete:
+        requests += [("delete", {key: code}) for code in diff.deletes]
+    totals = {"items": 0, "write_units": 0, "retries": 0, "throttles": 0, "rate_wait_s": 0.0}
+    if not requests:
+        return totals
+
+    workers = max(1, min(workers, len(requests)))
+    chunk_size = -(-len(requests) // workers)
+    chunks = [requests[i:i + chunk_size] for i in range(0, len(requests), chunk_size)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for stats in executor.map(lambda chunk: _write_requests(table, chunk, writer_kwargs), chunks):
+            for name in totals:
+                totals[name] += stats[name]
+    return totals
@@ -0,0 +1,263 @@
+"""
+Escritor por lotes para DynamoDB con control de capacidad.
+
+Reemplaza a `table.batch_writer()` en todos los escritores del pipeline:
+
+- agrupa los items en lotes de 25 (máximo de `BatchWriteItem`),
+- antes de enviar cada lote consume del limitador de la tabla las WCU que
+  cuesta, estimadas a partir del tamaño de cada item,
+- reenvía los `UnprocessedItems` con backoff exponencial e informa al
+  limitador del throttling (también cuando boto3 reintentó internamente),
+  para que la tasa baje en lugar de generar tormentas de reintentos,
+- con `remaining_ms` (ej. `context.get_remaining_time_in_millis`) falla con
+  `WriteDeadlineExceeded` si la espera por capacidad no entra en el tiempo
+  que le queda a la invocación, en lugar de cortarse por timeout a mitad de
+  la escritura.
+
+Example:
+    ```python
+    table = get_resource("dynamodb").Table("tecnomundo_bronze_sales")
+    with RateLimitedBatchWriter(table) as writer:
+        for item in items:
+            writer.put_item(Item=item)
+    print(writer.stats())
+    ```
+"""
+
+import logging
+import math
+import random
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from numbers import Number
+
+from botocore.exceptions import ClientError
+
+from ..utils.capacity import RETURN_CONSUMED_CAPACITY, CapacityLedger
+from .rate_limiter import TokenBucket, limiter_for_table
+
+logger = logging.getLogger(__name__)
+
+# Máximo de solicitudes por llamada a BatchWriteItem
+MAX_BATCH_SIZE = 25
+
+# Tamaño de una unidad de escritura
+WRITE_UNIT_BYTES = 1024
+
+THROTTLING_ERRORS = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+}
+
+DEFAULT_MAX_ATTEMPTS = 10
+BACKOFF_BASE_S = 0.05
+BACKOFF_MAX_S = 5.0
+
+# Tiempo de la invocación que se reserva para lo que sigue a la escritura (SQS, métricas)
+DEADLINE_MARGIN_S = 10.0
+
+# Indica que el limitador se obtiene de la capacidad de la tabla
+_TABLE_CAPACITY = object()
+
+
+def _value_size(value) -> int:
+    """Tamaño aproximado en bytes de un valor según las reglas de DynamoDB."""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (Number, Decimal)):
+        # Hasta 38 dígitos significativos, 2 por byte, más 1 byte
+        digits = len(str(value).lstrip("-").replace(".", "").lstrip("0")) or 1
+        return min(21, (digits + 1) // 2 + 1)
+    if isinstance(value, dict):
+        return 3 + sum(
+            len(str(k).encode("utf-8")) + _value_size(v) + 1 for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return 3 + sum(_value_size(v) + 1 for v in value)
+    if isinstance(value, (set, frozenset)):
+        return sum(_value_size(v) for v in value)
+    return len(str(value).encode("utf-8"))
+
+
+def estimate_item_size(item: dict) -> int:
+    """Tamaño aproximado del item en bytes (nombres de atributo + valores)."""
+    return sum(len(str(name).encode("utf-8")) + _value_size(value) for name, value in item.items())
+
+
+def write_capacity_units(item: dict) -> int:
+    """WCU que cuesta escribir el item (1 por cada KB o fracción)."""
+    return max(1, math.ceil(estimate_item_size(item) / WRITE_UNIT_BYTES))
+
+
+class WriteDeadlineExceeded(RuntimeError):
+    """La escritura no puede terminar antes del tiempo límite de la invocación."""
+
+
+class RateLimitedBatchWriter:
+    """
+    Escritor por lotes con limitador de capacidad (ver módulo).
+
+    Args:
+        table: Tabla DynamoDB (recurso boto3)
+        limiter: Limitador a usar; por defecto el compartido de la tabla
+            (`limiter_for_table`). None para escribir sin límite.
+        max_attempts: Reintentos de un lote con items sin procesar
+        ledger: Ledger donde registrar la capacidad consumida (opcional)
+        file_id: Archivo al que se atribuye la capacidad en el ledger
+        remaining_ms: Milisegundos que le quedan a la invocación (ej.
+            `context.get_remaining_time_in_millis`); None para no controlarlo
+        deadline_margin_s: Segundos que se reservan al final de la invocación
+    """
+
+    def __init__(
+        self,
+        table,
+        limiter: TokenBucket | None = _TABLE_CAPACITY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        ledger: CapacityLedger | None = None,
+        file_id: str | None = None,
+        remaining_ms: Callable[[], float] | None = None,
+        deadline_margin_s: float = DEADLINE_MARGIN_S,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.table = table
+        self.table_name = table.name
+        self.limiter = limiter_for_table(table) if limiter is _TABLE_CAPACITY else limiter
+        self.max_attempts = max_attempts
+        self.ledger = ledger
+        self.file_id = file_id
+        self.remaining_ms = remaining_ms
+        self.deadline_margin_s = deadline_margin_s
+        self._client = table.meta.client
+        self._sleep = sleep
+        self._buffer: list[dict] = []
+        self.items_written = 0
+        self.write_units = 0
+        self.retries = 0
+        self.throttles = 0
+        self.rate_wait_s = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Igual que batch_writer: lo pendiente se escribe al salir del bloque
+        # (salvo que se haya agotado el tiempo: volver a intentarlo sólo llega al timeout)
+        if not isinstance(exc, WriteDeadlineExceeded):
+            self.flush()
+        return False
+
+    def put_item(self, Item: dict) -> None:
+        self._buffer.append({"PutRequest": {"Item": Item}})
+        if len(self._buffer) >= MAX_BATCH_SIZE:
+            self.flush()
+
+    def delete_item(self, Key: dict) -> None:
+        self._buffer.append({"DeleteRequest": {"Key": Key}})
+        if len(self._buffer) >= MAX_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Envía los items acumulados."""
+        while self._buffer:
+            batch, self._buffer = self._buffer[:MAX_BATCH_SIZE], self._buffer[MAX_BATCH_SIZE:]
+            self._write_batch(batch)
+
+    @staticmethod
+    def _request_units(request: dict) -> int:
+        if "PutRequest" in request:
+            return write_capacity_units(request["PutRequest"]["Item"])
+        return 1
+
+    def _check_deadline(self, wait_s: float, pending: int) -> None:
+        if self.remaining_ms is None:
+            return
+        available_s = self.remaining_ms() / 1000 - self.deadline_margin_s
+        if wait_s > available_s:
+            raise WriteDeadlineExceeded(
+                f"La escritura en {self.table_name} no termina a tiempo: faltan ~{wait_s:.0f}s "
+                f"de capacidad y quedan {max(available_s, 0):.0f}s de la invocación "
+                f"({self.items_written} items escritos, {pending} pendientes)"
+            )
+
+    def check_deadline(self, items: list[dict]) -> None:
+        """
+        Falla antes de escribir si, a la tasa actual del limitador, los `items`
+        no entran en el tiempo que le queda a la invocación.
+
+        Raises:
+            WriteDeadlineExceeded: Si la espera por capacidad supera el tiempo disponible.
+        """
+        if self.limiter is None or self.remaining_ms is None:
+            return
+        units = sum(self._request_units({"PutRequest": {"Item": item}}) for item in items)
+        self._check_deadline(self.limiter.wait_time(units), len(items))
+
+    def _throttled(self) -> None:
+        self.throttles += 1
+        if self.limiter is not None:
+            self.limiter.on_throttle()
+
+    def _backoff(self, attempt: int, pending: int) -> None:
+        delay = min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2**attempt) * random.uniform(0.5, 1.0)
+        self._check_deadline(delay, pending)
+        self._sleep(delay)
+
+    def _write_batch(self, requests: list[dict]) -> None:
+        attempt = 0
+        while requests:
+            units = sum(self._request_units(r) for r in requests)
+            if self.limiter is not None:
+                self._check_deadline(self.limiter.wait_time(units), len(requests) + len(self._buffer))
+                self.rate_wait_s += self.limiter.acquire(units)
+
+            try:
+                response = self._client.batch_write_item(
+                    RequestItems={self.table_name: requests},
+                    ReturnConsumedCapacity=RETURN_CONSUMED_CAPACITY,
+                )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in THROTTLING_ERRORS:
+                    raise
+                # Todo el lote fue rechazado (después de los reintentos de boto3)
+                unprocessed = requests
+                self._throttled()
+            else:
+                if self.ledger is not None:
+                    self.ledger.record(response, file_id=self.file_id, kind="write")
+                unprocessed = response.get("UnprocessedItems", {}).get(self.table_name, [])
+                hidden_retries = response.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+                if unprocessed or hidden_retries:
+                    self._throttled()
+                elif self.limiter is not None:
+                    self.limiter.on_success()
+
+            written = len(requests) - len(unprocessed)
+            self.items_written += written
+            self.write_units += units - sum(self._request_units(r) for r in unprocessed)
+
+            requests = unprocessed
+            if requests:
+                attempt += 1
+                self.retries += 1
+                if attempt >= self.max_attempts:
+                    raise RuntimeError(
+                        f"{len(requests)} items sin procesar en {self.table_name} "
+                        f"tras {attempt} intentos"
+                    )
+                self._backoff(attempt, len(requests) + len(self._buffer))
+
+    def stats(self) -> dict:
+        return {
+            "items": self.items_written,
+            "write_units": self.write_units,
+            "retries": self.retries,
+            "throttles": self.throttles,
+            "rate_wait_s": self.rate_wait_s,
+        }
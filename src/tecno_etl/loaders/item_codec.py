@@ -0,0 +1,150 @@
+"""
+Codificación compacta (opcional) de los items Silver y Gold.
+
+En el formato original cada item Gold copia todos los atributos de Silver,
+agrega el nombre del producto y la categoría (cadenas repetidas en cada fila)
+y un timestamp ISO por fila; Silver también guarda `processed_at` por fila.
+El tamaño de cada item es varias veces el de sus datos y cuesta WCU de más.
+
+La codificación compacta (versión `compact-v1`):
+
+- usa alias cortos para los atributos que no son clave (`codigo_producto` ->
+  `cp`, ...); las claves de la tabla (`fecha`, `sale_id`) no cambian,
+- en Gold reemplaza nombre y categoría por la clave de dimensión (`cp`, que ya
+  está en el item) y sólo marca `nf` cuando el producto no tenía dimensión,
+- guarda `processed_at`/`enriched_at` una vez por archivo en un item de
+  cabecera (`fecha = "#file"`, `sale_id = file_id`) y en cada fila sólo el
+  `file_id` (`fid`).
+
+Se activa con `TECNO_ETL_COMPACT_ITEMS=1` en Silver y Gold. Los lectores usan
+`decode_items`, que acepta tanto items compactos como en el formato original.
+"""
+
+import os
+from datetime import datetime
+
+from ..transformers.enrichment import dimension_attributes
+from .dynamodb_writer import estimate_item_size, write_capacity_units
+
+COMPACT_ENV_VAR = "TECNO_ETL_COMPACT_ITEMS"
+ENCODING_VERSION = "compact-v1"
+
+# Claves de las tablas Silver y Gold (no se renombran)
+KEY_ATTRIBUTES = ("fecha", "sale_id")
+
+SILVER_ALIASES = {
+    "comprobante_num": "cn",
+    "codigo_producto": "cp",
+    "cantidad": "q",
+    "precio_un_": "pu",
+    "ganancia": "g",
+    "subtotal": "st",
+}
+_SILVER_NAMES = {alias: name for name, alias in SILVER_ALIASES.items()}
+
+FILE_ID_ALIAS = "fid"
+NOT_FOUND_ALIAS = "nf"
+
+# Cabecera por archivo con los timestamps
+FILE_HEADER_PARTITION = "#file"
+TIMESTAMP_ATTRIBUTES = ("processed_at", "enriched_at")
+
+
+def compact_items_enabled() -> bool:
+    """True si la codificación compacta está activada por variable de entorno."""
+    return os.getenv(COMPACT_ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+def encode_silver_item(item: dict, file_id: str) -> dict:
+    """Item Silver compacto (sin `processed_at`, que va en la cabecera del archivo)."""
+    encoded = {key: item[key] for key in KEY_ATTRIBUTES}
+    for name, alias in SILVER_ALIASES.items():
+        if name in item:
+            encoded[alias] = item[name]
+    encoded[FILE_ID_ALIAS] = file_id
+    return encoded
+
+
+def encode_gold_item(item: dict, file_id: str, found: bool) -> dict:
+    """
+    Item Gold compacto a partir de un item Silver (decodificado): nombre y
+    categoría se resuelven al leer, a partir de la dimensión del producto.
+    """
+    encoded = encode_silver_item(item, item.get("file_id") or file_id)
+    if not found:
+        encoded[NOT_FOUND_ALIAS] = True
+    return encoded
+
+
+def encode_gold_items(items: list[dict], found: list[bool], file_id: str) -> list[dict]:
+    """Lote Gold compacto de un archivo: cabecera (`enriched_at`) + un item por venta."""
+    return [file_header_item(file_id, "enriched_at")] + [
+        encode_gold_item(item, file_id, item_found) for item, item_found in zip(items, found, strict=True)
+    ]
+
+
+def file_header_item(file_id: str, timestamp_attribute: str, timestamp: str | None = None) -> dict:
+    """Item de cabecera de un archivo con su timestamp de proceso."""
+    return {
+        "fecha": FILE_HEADER_PARTITION,
+        "sale_id": file_id,
+        timestamp_attribute: timestamp or datetime.now().isoformat(),
+        "encoding": ENCODING_VERSION,
+    }
+
+
+def is_file_header(item: dict) -> bool:
+    return item.get("fecha") == FILE_HEADER_PARTITION
+
+
+def is_compact(item: dict) -> bool:
+    return FILE_ID_ALIAS in item
+
+
+def decode_item(item: dict, dimensions: dict | None = None, headers: dict | None = None) -> dict:
+    """
+    Devuelve el item en el formato original.
+
+    Args:
+        item: Item compacto u original (los originales se devuelven sin cambios)
+        dimensions: Dimensiones por código de producto; se pasan al decodificar
+            items Gold para reconstruir nombre y categoría
+        headers: Cabeceras de archivo por file_id (timestamps)
+    """
+    if not is_compact(item):
+        return item
+
+    decoded = {key: item[key] for key in KEY_ATTRIBUTES if key in item}
+    for alias, value in item.items():
+        name = _SILVER_NAMES.get(alias)
+        if name is not None:
+            decoded[name] = value
+
+    file_id = item[FILE_ID_ALIAS]
+    decoded["file_id"] = file_id
+    header = (headers or {}).get(file_id, {})
+    for attribute in TIMESTAMP_ATTRIBUTES:
+        if attribute in header:
+            decoded[attribute] = header[attribute]
+
+    if dimensions is not None:
+        dim = None if item.get(NOT_FOUND_ALIAS) else dimensions.get(decoded.get("codigo_producto"))
+        decoded.update(dimension_attributes(dim))
+    return decoded
+
+
+def decode_items(items: list[dict], dimensions: dict | None = None) -> list[dict]:
+    """Decodifica los items leídos de una tabla, resolviendo las cabeceras de archivo."""
+    headers = {item["sale_id"]: item for item in items if is_file_header(item)}
+    return [decode_item(item, dimensions, headers) for item in items if not is_file_header(item)]
+
+
+def size_report(items: list[dict]) -> dict:
+    """Tamaño promedio (bytes) y WCU promedio por item."""
+    if not items:
+        return {"items": 0, "avg_bytes": 0.0, "avg_wcu": 0.0}
+    return {
+        "items": len(items),
+        "avg_bytes": sum(estimate_item_size(item) for item in items) / len(items),
+        "avg_wcu": sum(write_capacity_units(item) for item in items) / len(items),
+    }
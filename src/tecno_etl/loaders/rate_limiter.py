@@ -0,0 +1,200 @@
+"""
+Limitador de tasa (token bucket) para escrituras en DynamoDB.
+
+Las tablas usan la pequeña capacidad aprovisionada de la capa gratuita. Sin
+límite, `batch_writer` escribe lo más rápido posible, DynamoDB responde con
+throttling y los reintentos de boto3 alargan la invocación de forma
+impredecible. El limitador reparte las unidades de escritura (WCU) por
+segundo de la tabla:
+
+- la tasa inicial sale de las WCU aprovisionadas (`limiter_for_table`),
+- como DynamoDB, admite ráfagas con la capacidad no usada de los últimos
+  `DEFAULT_BURST_S` segundos: un archivo chico en una tabla de 5 WCU se
+  escribe con la capacidad acumulada en lugar de a 4.5 items/s,
+- cada escritura consume tantos tokens como WCU cuesta (ver
+  `dynamodb_writer.write_capacity_units`),
+- la tasa se adapta (AIMD): se reduce a la mitad ante throttling y vuelve a
+  subir gradualmente con escrituras exitosas, sin superar la aprovisionada.
+
+Los limitadores se comparten por tabla dentro del proceso, de modo que las
+invocaciones siguientes de un contenedor Lambda conservan la tasa aprendida.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+# WCU supuestas si no se puede consultar la tabla (DescribeTable denegado)
+DEFAULT_WRITE_CAPACITY_UNITS = 5.0
+
+# Proporción de la capacidad aprovisionada que usa un escritor (tasa inicial y máxima);
+# se puede fijar con TECNO_ETL_DYNAMODB_CAPACITY_FRACTION
+DEFAULT_CAPACITY_FRACTION = 0.9
+
+# Segundos de capacidad no usada que se pueden gastar en ráfaga (DynamoDB retiene
+# hasta 300 s); se puede fijar con TECNO_ETL_DYNAMODB_BURST_S
+DEFAULT_BURST_S = 300.0
+
+# Tasa mínima (WCU/s) a la que puede bajar el limitador ante throttling
+MIN_RATE = 1.0
+
+_limiters: dict[str, "TokenBucket"] = {}
+_limiters_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe con tasa adaptativa.
+
+    Args:
+        rate: Tokens (WCU) por segundo
+        capacity: Máximo acumulable (ráfaga); por defecto un segundo de tasa
+        min_rate: Tasa mínima ante throttling
+        max_rate: Tasa máxima al recuperarse (por defecto la inicial)
+        increase_fraction: Aumento de tasa por escritura exitosa, como
+            fracción de `max_rate`
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        min_rate: float = MIN_RATE,
+        max_rate: float | None = None,
+        increase_fraction: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate debe ser positiva")
+        self.rate = float(rate)
+        self.max_rate = float(max_rate or rate)
+        self.min_rate = min(float(min_rate), self.rate)
+        self.capacity = float(capacity or rate)
+        self.increase_fraction = increase_fraction
+        self.throttles = 0
+        self.waited_s = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, units: float) -> float:
+        """Segundos que esperaría `acquire(units)` a la tasa actual, sin consumir tokens."""
+        with self._lock:
+            self._refill()
+            return max(0.0, units - self._tokens) / self.rate
+
+    def acquire(self, units: float) -> float:
+        """
+        Consume `units` tokens, esperando lo necesario. Un pedido mayor que la
+        capacidad se admite y deja el saldo negativo (las siguientes esperan).
+
+        Returns:
+            Segundos esperados.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= units
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+            self.waited_s += wait
+        return wait
+
+    def on_throttle(self) -> None:
+        """DynamoDB rechazó escrituras por capacidad: se reduce la tasa a la mitad."""
+        with self._lock:
+            self.throttles += 1
+            previous = self.rate
+            self.rate = max(self.min_rate, self.rate / 2)
+            # Los tokens acumulados a la tasa anterior ya no son válidos
+            self._tokens = min(self._tokens, 0.0)
+        logger.warning(f"Throttling de DynamoDB: tasa {previous:.1f} -> {self.rate:.1f} WCU/s")
+
+    def on_success(self) -> None:
+        """Escritura sin throttling: aumento aditivo de la tasa hasta `max_rate`."""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.increase_fraction)
+
+
+def _provisioned_write_units(table) -> float | None:
+    """WCU aprovisionadas de la tabla; None si es on-demand (PAY_PER_REQUEST)."""
+    configured = os.getenv("TECNO_ETL_DYNAMODB_WCU")
+    if configured:
+        return float(configured)
+    try:
+        billing = (table.billing_mode_summary or {}).get("BillingMode")
+        if billing == "PAY_PER_REQUEST":
+            return None
+        units = (table.provisioned_throughput or {}).get("WriteCapacityUnits")
+    except Exception as e:
+        logger.warning(
+            f"No se pudo consultar la capacidad de {table.name} ({e}); "
+            f"se asumen {DEFAULT_WRITE_CAPACITY_UNITS:.0f} WCU"
+        )
+        return DEFAULT_WRITE_CAPACITY_UNITS
+    return float(units) if units else None
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def limiter_for_table(
+    table, fraction: float | None = None, burst_s: float | None = None
+) -> TokenBucket | None:
+    """
+    Limitador compartido de la tabla, configurado con sus WCU aprovisionadas.
+
+    La capacidad se consulta una vez por proceso (DescribeTable). Se puede fijar
+    con la variable de entorno `TECNO_ETL_DYNAMODB_WCU`.
+
+    Args:
+        table: Tabla DynamoDB (recurso boto3)
+        fraction: Proporción de las WCU a usar como tasa (por defecto
+            `TECNO_ETL_DYNAMODB_CAPACITY_FRACTION` o `DEFAULT_CAPACITY_FRACTION`)
+        burst_s: Segundos de tasa acumulables para ráfagas (por defecto
+            `TECNO_ETL_DYNAMODB_BURST_S` o `DEFAULT_BURST_S`)
+
+    Returns:
+        El limitador, o None si la tabla es on-demand (sin límite de capacidad).
+    """
+    name = table.name
+    if name in _limiters:
+        return _limiters[name]
+    with _limiters_lock:
+        if name not in _limiters:
+            if fraction is None:
+                fraction = _env_float("TECNO_ETL_DYNAMODB_CAPACITY_FRACTION", DEFAULT_CAPACITY_FRACTION)
+            if burst_s is None:
+                burst_s = _env_float("TECNO_ETL_DYNAMODB_BURST_S", DEFAULT_BURST_S)
+            units = _provisioned_write_units(table)
+            limiter = None
+            if units:
+                rate = units * fraction
+                limiter = TokenBucket(rate, capacity=rate * max(burst_s, 1.0))
+                logger.info(
+                    f"Limitador de escritura para {name}: {limiter.rate:.1f} WCU/s, "
+                    f"ráfaga de {limiter.capacity:.0f} WCU"
+                )
+            _limiters[name] = limiter
+    return _limiters[name]
+
+
+def reset_limiters() -> None:
+    """Descarta los limitadores compartidos (ej. tras cambiar la capacidad en tests)."""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,181 @@
+"""
+Serialización columnar de DataFrames al formato de DynamoDB (AttributeValue).
+
+La escritura con el recurso (`Table.batch_writer`, o el cliente de un recurso)
+serializa en Python cada atributo de cada item con `TypeSerializer` y rechaza
+los `float` que produce pandas, lo que obliga a convertir cada valor a
+`Decimal` antes de escribir. Para archivos de cientos de miles de filas ese
+trabajo por valor domina el tiempo de la etapa.
+
+Este módulo convierte columnas completas a valores del formato de red:
+
+- números: una sola conversión vectorizada a texto (`{"N": "1500.5"}`),
+- NaN / None / NaT: `{"NULL": True}`,
+- texto, booleanos y fechas: `{"S": ...}`, `{"BOOL": ...}`, `{"S": iso}`,
+
+y `PreSerializedBatchWriter` los escribe con el cliente de bajo nivel (sin
+la capa de transformación del recurso), manteniendo el limitador de
+capacidad, los reintentos y el ledger de `RateLimitedBatchWriter`.
+
+Example:
+    ```python
+    items = serialize_frame(df, constants={"file_id": file_id})
+    with PreSerializedBatchWriter(dynamodb.Table("tecnomundo_bronze_sales")) as writer:
+        for item in items:
+            writer.put_item(Item=item)
+    ```
+"""
+
+import math
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from boto3.dynamodb.types import TypeSerializer
+
+from ..utils.aws_clients import get_client
+from .dynamodb_writer import WRITE_UNIT_BYTES, RateLimitedBatchWriter
+
+NULL = {"NULL": True}
+
+_serializer = TypeSerializer()
+
+
+def _number_strings(values: np.ndarray) -> np.ndarray:
+    """Representación textual (la más corta que conserva el valor) de un array numérico."""
+    strings = values.astype(str)
+    if values.dtype.kind == "f":
+        # DynamoDB no acepta 'nan'/'inf'; los NaN se enmascaran antes, los infinitos no tienen equivalente
+        if np.isinf(values).any():
+            raise ValueError("DynamoDB no admite valores infinitos")
+        # Notación exponencial (valores muy grandes o muy chicos): se expande con Decimal
+        exponent = np.flatnonzero(np.char.find(strings, "e") >= 0)
+        if len(exponent):
+            # El array de texto tiene ancho fijo: la forma expandida puede no entrar
+            strings = strings.astype(object)
+        for i in exponent:
+            strings[i] = format(Decimal(strings[i]), "f")
+    return strings
+
+
+def serialize_value(value) -> dict:
+    """Valor individual en formato de red (camino general, columnas de tipo mixto)."""
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NaT:
+        return NULL
+    if isinstance(value, (float, np.floating)):
+        return {"N": _number_strings(np.array([value], dtype=float))[0]}
+    if isinstance(value, np.integer):
+        return {"N": str(int(value))}
+    if isinstance(value, np.bool_):
+        return {"BOOL": bool(value)}
+    if isinstance(value, pd.Timestamp):
+        return {"S": value.isoformat()}
+    return _serializer.serialize(value)
+
+
+def serialize_column(values: pd.Series) -> list[dict]:
+    """Convierte una columna completa a una lista de AttributeValues."""
+    missing = values.isna().to_numpy()
+    dtype = values.dtype
+
+    if pd.api.types.is_bool_dtype(dtype):
+        serialized = [{"BOOL": v} for v in values.to_numpy(dtype=object, na_value=False).tolist()]
+    elif pd.api.types.is_numeric_dtype(dtype):
+        if missing.any():
+            numbers = values.to_numpy(dtype=float, na_value=0.0)
+        else:
+            numbers = values.to_numpy(dtype="int64" if pd.api.types.is_integer_dtype(dtype) else float)
+        serialized = [{"N": s} for s in _number_strings(numbers).tolist()]
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        serialized = [{"S": v.isoformat()} if v is not pd.NaT else NULL for v in values.tolist()]
+    elif pd.api.types.is_string_dtype(dtype) and all(
+        isinstance(v, str) for v in values[~missing].tolist()
+    ):
+        serialized = [{"S": v} for v in values.to_numpy(dtype=object, na_value="").tolist()]
+    else:
+        return [serialize_value(v) for v in values.to_numpy(dtype=object).tolist()]
+
+    if missing.any():
+        for i in np.flatnonzero(missing):
+            serialized[i] = NULL
+    return serialized
+
+
+def serialize_frame(df: pd.DataFrame, constants: dict | None = None) -> list[dict]:
+    """
+    Items en formato de red, uno por fila del DataFrame.
+
+    Args:
+        df: Filas a escribir (una columna por atributo)
+        constants: Atributos con el mismo valor en todos los items (ej. file_id);
+            se serializan una sola vez
+    """
+    constants = constants or {}
+    names = tuple(constants) + tuple(str(col) for col in df.columns)
+    fixed = tuple(serialize_value(value) for value in constants.values())
+    columns = [serialize_column(df[col]) for col in df.columns]
+    rows = zip(*columns, strict=True) if columns else [()] * len(df)
+    return [dict(zip(names, fixed + row, strict=True)) for row in rows]
+
+
+def _wire_value_size(value: dict) -> int:
+    """Tamaño aproximado en bytes de un AttributeValue según las reglas de DynamoDB."""
+    ((kind, content),) = value.items()
+    if kind == "S":
+        return len(content.encode("utf-8"))
+    if kind == "N":
+        digits = len(content.lstrip("-").replace(".", "").lstrip("0")) or 1
+        return min(21, (digits + 1) // 2 + 1)
+    if kind == "B":
+        return len(content)
+    if kind == "M":
+        return 3 + sum(len(k.encode("utf-8")) + _wire_value_size(v) + 1 for k, v in content.items())
+    if kind == "L":
+        return 3 + sum(_wire_value_size(v) + 1 for v in content)
+    if kind in ("SS", "NS", "BS"):
+        return sum(len(str(v).encode("utf-8")) for v in content)
+    return 1  # NULL, BOOL
+
+
+def wire_item_size(item: dict) -> int:
+    """Tamaño aproximado de un item en formato de red (nombres de atributo + valores)."""
+    size = 0
+    for name, value in item.items():
+        size += len(name.encode("utf-8"))
+        # Camino rápido para el caso más común (texto); el resto, por tipo
+        text = value.get("S")
+        size += len(text.encode("utf-8")) if text is not None else _wire_value_size(value)
+    return size
+
+
+def wire_write_capacity_units(item: dict) -> int:
+    """WCU que cuesta escribir un item en formato de red."""
+    return max(1, math.ceil(wire_item_size(item) / WRITE_UNIT_BYTES))
+
+
+class PreSerializedBatchWriter(RateLimitedBatchWriter):
+    """
+    `RateLimitedBatchWriter` para items ya serializados (`serialize_frame`).
+
+    Escribe con un cliente de bajo nivel, que envía los AttributeValues sin
+    volver a serializarlos y sin la validación de parámetros de botocore (los
+    items ya salen con la forma correcta de `serialize_frame`). Los `Key` de
+    `delete_item` también deben estar en formato de red.
+
+    Args:
+        table: Tabla DynamoDB (recurso boto3; se usa para el nombre y la capacidad)
+        client: Cliente `dynamodb` de bajo nivel; por defecto el compartido de la región de la tabla
+        **kwargs: Argumentos de `RateLimitedBatchWriter`
+    """
+
+    def __init__(self, table, client=None, **kwargs):
+        super().__init__(table, **kwargs)
+        self._client = client or get_client(
+            "dynamodb", region_name=table.meta.client.meta.region_name, parameter_validation=False
+        )
+
+    @staticmethod
+    def _request_units(request: dict) -> int:
+        if "PutRequest" in request:
+            return wire_write_capacity_units(request["PutRequest"]["Item"])
+        return 1
@@ -1,17 +1,28 @@
 """
 Script para cargar datos de dimensiones (productos) en DynamoDB
 """
-import boto3
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    from ..loaders import RateLimitedBatchWriter
+    from ..utils.aws_clients import get_resource
+    from ..utils.capacity import CapacityLedger
+except ImportError:
+    # Ejecutado como script: python src/tecno_etl/pipelines/cargar_dimensiones.py
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from tecno_etl.loaders import RateLimitedBatchWriter
+    from tecno_etl.utils.aws_clients import get_resource
+    from tecno_etl.utils.capacity import CapacityLedger
+
 # Cargar variables de entorno
 env_path = Path(__file__).parent.parent.parent / "conf" / "env" / ".env.aws"
 load_dotenv(dotenv_path=env_path)
 
 # Conectar a DynamoDB
-dynamodb = boto3.resource('dynamodb', region_name=os.getenv('AWS_REGION', 'us-east-1'))
+dynamodb = get_resource('dynamodb', region_name=os.getenv('AWS_REGION', 'us-east-1'))
 table = dynamodb.Table('tecnomundo_dimensions_products')
 
 # Datos de prueba - productos de ejemplo
@@ -46,11 +57,13 @@ productos = [
 print("🔄 Cargando productos a DynamoDB...")
 
 # Cargar productos
-with table.batch_writer() as batch:
+ledger = CapacityLedger('cargar_dimensiones')
+with RateLimitedBatchWriter(table, ledger=ledger) as batch:
     for producto in productos:
         batch.put_item(Item=producto)
         print(f"  ✅ {producto['codigo_producto']}: {producto['nombre_del_producto']}")
 
 print(f"\n✅ {len(productos)} productos cargados en 'tecnomundo_dimensions_products'")
+print(f"📒 Capacidad consumida: {ledger.total('write'):.1f} WCU (ledger: {ledger.save_to_file()})")
 print("\n📋 Puedes verificar en: https://console.aws.amazon.com/dynamodb/")
 print("   Tabla: tecnomundo_dimensions_products → Explore table items")
@@ -1,14 +1,41 @@
 """
 Script local para invocar el pipeline Lambda en AWS
 """
+import argparse
 import base64
+import gzip
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import boto3
 import os
+import sys
 from dotenv import load_dotenv
 
+try:
+    from ..utils.aws_clients import get_client, get_resource
+    from ..utils.run_ledger import (
+        DEFAULT_WAIT_TIMEOUT_S,
+        RUN_LEDGER_TABLE,
+        RunLedger,
+        describe_run,
+        make_file_id,
+        summarize_runs,
+    )
+except ImportError:
+    # Ejecutado como script: python src/tecno_etl/pipelines/invoke_aws_pipeline.py
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from tecno_etl.utils.aws_clients import get_client, get_resource
+    from tecno_etl.utils.run_ledger import (
+        DEFAULT_WAIT_TIMEOUT_S,
+        RUN_LEDGER_TABLE,
+        RunLedger,
+        describe_run,
+        make_file_id,
+        summarize_runs,
+    )
+
 # Cargar variables de entorno manualmente
 env_path = Path(__file__).parent.parent.parent.parent / "conf" / "env" / ".env.aws"
 if env_path.exists():
@@ -26,13 +53,68 @@ if env_path.exists():
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Cliente Lambda
-lambda_client = boto3.client('lambda', region_name=os.getenv('AWS_REGION', 'us-east-1'))
+# Cliente Lambda (los clientes boto3 son thread-safe y se comparten entre hilos).
+# Una invocación síncrona dura lo que tarde Bronze (hasta 15 min), de ahí el read_timeout.
+lambda_client = get_client(
+    'lambda', region_name=os.getenv('AWS_REGION', 'us-east-1'), read_timeout=900
+)
+
+# Ledger de corridas: el invocador registra el envío y puede esperar a que cada archivo termine
+runs = RunLedger(
+    get_resource('dynamodb', region_name=os.getenv('AWS_REGION', 'us-east-1')).Table(RUN_LEDGER_TABLE)
+)
+
+BRONZE_FUNCTION_NAME = 'tecnomundo-bronze-ingestion'
+SUPPORTED_SUFFIXES = ('.csv', '.xlsx', '.xls')
+DEFAULT_MAX_WORKERS = 4
+
+# Límite de payload de la invocación asíncrona (Event); la síncrona admite 6 MB
+EVENT_PAYLOAD_LIMIT = 256 * 1024
+
+COMPRESSIONS = ('gzip', 'zstd', 'none')
+DEFAULT_COMPRESSION = 'gzip'
 
 
-def invoke_bronze_lambda(file_path: Path) -> dict:
+def compress_file_bytes(file_bytes: bytes, compression: str | None) -> tuple[bytes, str | None]:
+    """
+    Comprime el contenido del archivo antes de codificarlo en base64.
+    
+    Returns:
+        Tupla (bytes a enviar, content_encoding declarado en el evento o None).
+    """
+    if compression in (None, 'none'):
+        return file_bytes, None
+    if compression == 'gzip':
+        return gzip.compress(file_bytes, compresslevel=6, mtime=0), 'gzip'
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "La compresión zstd requiere el paquete 'zstandard' (pip install zstandard)"
+            ) from e
+        return zstandard.ZstdCompressor(level=10).compress(file_bytes), 'zstd'
+    raise ValueError(f"Compresión no soportada: {compression}")
+
+
+def invoke_bronze_lambda(
+    file_path: Path,
+    invocation_type: str = 'RequestResponse',
+    compression: str | None = DEFAULT_COMPRESSION,
+    file_id: str | None = None,
+) -> dict:
     """
     Invoca Lambda Bronze con un archivo local.
+    
+    Con invocation_type='Event' la invocación es asíncrona: Lambda encola el
+    evento y responde 202 sin esperar la escritura en Bronze.
+    
+    Si se pasa `file_id`, Bronze lo usa en lugar de generar uno (así el
+    invocador puede seguir la corrida en el ledger aunque sea asíncrona).
+    
+    Los CSV se comprimen (gzip por defecto) antes de codificarse en base64 y la
+    compresión se declara en 'content_encoding'. Los Excel (.xlsx ya es un ZIP)
+    se envían sin comprimir.
     """
     logger.info(f"Preparando archivo: {file_path}")
     
@@ -40,10 +122,14 @@ def invoke_bronze_lambda(file_path: Path) -> dict:
     with open(file_path, 'rb') as f:
         file_bytes = f.read()
     
-    file_b64 = base64.b64encode(file_bytes).decode('utf-8')
-    
     # Determinar tipo
-    file_type = 'excel' if file_path.suffix in ['.xlsx', '.xls'] else 'csv'
+    file_type = 'excel' if file_path.suffix.lower() in ['.xlsx', '.xls'] else 'csv'
+    
+    if file_type == 'excel':
+        compression = None
+    payload_bytes, content_encoding = compress_file_bytes(file_bytes, compression)
+    
+    file_b64 = base64.b64encode(payload_bytes).decode('utf-8')
     
     # Preparar payload
     payload = {
@@ -51,32 +137,256 @@ def invoke_bronze_lambda(file_path: Path) -> dict:
         'file_name': file_path.name,
         'file_type': file_type
     }
+    if content_encoding:
+        payload['content_encoding'] = content_encoding
+    if file_id:
+        payload['file_id'] = file_id
     
-    logger.info(f"Invocando Lambda Bronze...")
+    payload_json = json.dumps(payload)
+    
+    logger.info(f"Invocando Lambda Bronze ({invocation_type})...")
     logger.info(f"Tamaño del archivo: {len(file_bytes)} bytes")
+    if content_encoding:
+        logger.info(
+            f"Comprimido con {content_encoding}: {len(payload_bytes)} bytes "
+            f"({len(file_bytes) / max(len(payload_bytes), 1):.1f}x)"
+        )
+    if invocation_type == 'Event' and len(payload_json) > EVENT_PAYLOAD_LIMIT:
+        logger.warning(
+            f"El payload ({len(payload_json)} bytes) supera el límite de invocación asíncrona "
+            f"({EVENT_PAYLOAD_LIMIT} bytes): {file_path.name}"
+        )
     
     # Invocar Lambda
     response = lambda_client.invoke(
-        FunctionName='tecnomundo-bronze-ingestion',
-        InvocationType='RequestResponse',  # Síncrono
-        Payload=json.dumps(payload)
+        FunctionName=BRONZE_FUNCTION_NAME,
+        InvocationType=invocation_type,
+        Payload=payload_json
     )
     
-    # Leer respuesta
-    result = json.loads(response['Payload'].read())
+    # La invocación asíncrona no devuelve el resultado del handler
+    if invocation_type == 'Event':
+        result = {'statusCode': response['StatusCode']}
+    else:
+        result = json.loads(response['Payload'].read())
     
     logger.info(f"Respuesta Lambda: {result}")
     
     return result
 
 
-def main():
+def discover_input_files(directory: Path) -> list[Path]:
+    """
+    Busca los archivos CSV/Excel de un directorio (no recursivo), ordenados por nombre.
+    """
+    return sorted(
+        path for path in Path(directory).iterdir()
+        if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES
+    )
+
+
+def assign_file_ids(files: list[Path]) -> list[str]:
+    """file_id de cada archivo a enviar (únicos aunque dos archivos compartan el nombre base)."""
+    file_ids = []
+    for file_path in files:
+        file_id = base_id = make_file_id(file_path.name)
+        suffix = 2
+        while file_id in file_ids:
+            file_id, suffix = f"{base_id}_{suffix}", suffix + 1
+        file_ids.append(file_id)
+    return file_ids
+
+
+def _submit_file(
+    file_path: Path, invocation_type: str, compression: str | None, file_id: str | None = None
+) -> dict:
+    """Invoca Bronze para un archivo y registra su resultado y latencia."""
+    start = time.perf_counter()
+    file_id = file_id or make_file_id(file_path.name)
+    runs.submitted(file_id, file_path.name)
+    try:
+        result = invoke_bronze_lambda(file_path, invocation_type, compression, file_id)
+        status_code = result.get('statusCode')
+        body = result.get('body')
+        body = json.loads(body) if isinstance(body, str) else (body or {})
+        ok = status_code in (200, 202)
+        return {
+            'file': file_path.name,
+            'ok': ok,
+            'status_code': status_code,
+            'file_id': body.get('file_id') or file_id,
+            'rows': body.get('rows_processed'),
+            'error': None if ok else body.get('error', str(result)),
+            'latency_s': time.perf_counter() - start,
+        }
+    except Exception as e:
+        logger.error(f"❌ Error invocando {file_path.name}: {e}")
+        return {
+            'file': file_path.name,
+            'ok': False,
+            'status_code': None,
+            'file_id': file_id,
+            'rows': None,
+            'error': str(e),
+            'latency_s': time.perf_counter() - start,
+        }
+
+
+def submit_batch(
+    files: list[Path],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    invocation_type: str = 'RequestResponse',
+    compression: str | None = DEFAULT_COMPRESSION,
+) -> list[dict]:
+    """
+    Envía varios archivos a Bronze con concurrencia acotada.
+    
+    Args:
+        files: Archivos a enviar
+        max_workers: Máximo de invocaciones en vuelo simultáneamente
+        invocation_type: 'RequestResponse' (espera la escritura) o 'Event' (asíncrona)
+        compression: Compresión del payload ('gzip', 'zstd' o None)
+    
+    Returns:
+        Lista de resultados por archivo, en el mismo orden que `files`.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_submit_file, file_path, invocation_type, compression, file_id): file_path
+            for file_path, file_id in zip(files, assign_file_ids(files), strict=True)
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    
+    return [results[file_path] for file_path in files]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Percentil con interpolación lineal entre rangos."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def print_batch_summary(results: list[dict]) -> None:
+    """Muestra el resultado de cada archivo y los percentiles de latencia."""
+    logger.info("=" * 80)
+    logger.info(f"{'Archivo':<40} {'Estado':<8} {'Latencia':>10} {'Filas':>8}  file_id")
+    for r in results:
+        status = '✅' if r['ok'] else '❌'
+        rows = r['rows'] if r['rows'] is not None else '-'
+        logger.info(
+            f"{r['file']:<40} {status:<8} {r['latency_s']:>9.2f}s {rows:>8}  {r['file_id'] or ''}"
+        )
+        if r['error']:
+            logger.info(f"    Error: {r['error']}")
+    
+    latencies = [r['latency_s'] for r in results]
+    if latencies:
+        logger.info("-" * 80)
+        logger.info(
+            "Latencia: "
+            f"p50={_percentile(latencies, 50):.2f}s  "
+            f"p90={_percentile(latencies, 90):.2f}s  "
+            f"p95={_percentile(latencies, 95):.2f}s  "
+            f"p99={_percentile(latencies, 99):.2f}s  "
+            f"max={max(latencies):.2f}s"
+        )
+    ok_count = sum(1 for r in results if r['ok'])
+    logger.info(f"Archivos enviados: {ok_count}/{len(results)} exitosos")
+    logger.info("=" * 80)
+
+
+def wait_for_runs(file_ids: list[str], timeout_s: float) -> bool:
+    """
+    Espera en el ledger de corridas a que los archivos terminen Gold y muestra
+    la latencia por etapa de cada uno. Retorna True si todos terminaron bien.
+    """
+    logger.info(f"⏳ Esperando {len(file_ids)} corridas en el ledger (timeout {timeout_s:.0f}s)...")
+    finished = runs.wait_for(file_ids, timeout_s=timeout_s)
+    
+    logger.info("=" * 80)
+    for file_id, run in finished.items():
+        logger.info(describe_run(run) if run else f"{file_id:<45} sin registro en el ledger")
+    summary = summarize_runs([run for run in finished.values() if run])
+    if summary['end_to_end']:
+        logger.info("-" * 80)
+        logger.info(
+            f"Punta a punta: p50={summary['end_to_end']['p50']:.1f}s  "
+            f"p95={summary['end_to_end']['p95']:.1f}s"
+        )
+    completed = summary['completed']
+    logger.info(f"Corridas terminadas: {completed}/{len(file_ids)} "
+                f"({len(summary['failed'])} fallidas, {len(file_ids) - completed - len(summary['failed'])} pendientes)")
+    logger.info("=" * 80)
+    return completed == len(file_ids)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Invoca el pipeline Bronze → Silver → Gold")
+    parser.add_argument('--file', type=Path, default=None, help="Archivo a procesar")
+    parser.add_argument('--dir', type=Path, default=None,
+                        help="Procesar todos los CSV/Excel de un directorio (modo batch)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help="Invocaciones concurrentes en modo batch")
+    parser.add_argument('--async', dest='invocation_type', action='store_const',
+                        const='Event', default='RequestResponse',
+                        help="Invocación asíncrona (Event): no espera la escritura en Bronze")
+    parser.add_argument('--compression', choices=COMPRESSIONS, default=DEFAULT_COMPRESSION,
+                        help="Compresión del CSV antes de enviarlo")
+    parser.add_argument('--wait', action='store_true',
+                        help="Esperar en el ledger de corridas a que cada archivo termine Gold")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_WAIT_TIMEOUT_S,
+                        help="Segundos máximos de espera con --wait")
+    return parser.parse_args(argv)
+
+
+def run_batch(
+    directory: Path,
+    max_workers: int,
+    invocation_type: str,
+    compression: str,
+    wait: bool = False,
+    timeout_s: float = DEFAULT_WAIT_TIMEOUT_S,
+) -> int:
+    """Procesa todos los archivos de un directorio"""
+    files = discover_input_files(directory)
+    if not files:
+        logger.error(f"No se encontraron archivos CSV/Excel en: {directory}")
+        return 1
+    
+    logger.info(
+        f"Enviando {len(files)} archivos ({invocation_type}, {max_workers} en paralelo)..."
+    )
+    results = submit_batch(files, max_workers, invocation_type, compression)
+    print_batch_summary(results)
+    
+    all_ok = all(r['ok'] for r in results)
+    if wait:
+        submitted = [r['file_id'] for r in results if r['ok']]
+        all_ok = wait_for_runs(submitted, timeout_s) and all_ok if submitted else all_ok
+    return 0 if all_ok else 1
+
+
+def main(argv: list[str] | None = None):
     """Procesar archivo de ventas"""
+    args = parse_args(argv)
+    
+    if args.dir:
+        return run_batch(
+            args.dir, args.workers, args.invocation_type, args.compression, args.wait, args.timeout
+        )
+    
     # Ir al root del proyecto (subir 4 niveles desde este archivo)
     project_root = Path(__file__).parent.parent.parent.parent
     
     # Archivo de ventas real
-    file_path = project_root / "data" / "raw" / "Reporte de ventas por articulos-2.csv"
+    file_path = args.file or project_root / "data" / "raw" / "Reporte de ventas por articulos-2.csv"
     
     logger.info(f"Buscando archivo en: {file_path}")
     
@@ -85,10 +395,14 @@ def main():
         logger.info("Por favor, coloca un archivo CSV o Excel en data/raw/")
         return 1
     
-    result = invoke_bronze_lambda(file_path)
+    file_id = make_file_id(file_path.name)
+    runs.submitted(file_id, file_path.name)
+    result = invoke_bronze_lambda(file_path, args.invocation_type, args.compression, file_id)
     
-    if result.get('statusCode') == 200:
-        logger.info("✅ Pipeline iniciado exitosamente")
+    if result.get('statusCode') in (200, 202):
+        logger.info(f"✅ Pipeline iniciado exitosamente (file_id: {file_id})")
+        if args.wait:
+            return 0 if wait_for_runs([file_id], args.timeout) else 1
         logger.info("Los datos fluirán automáticamente: Bronze → Silver → Gold")
         logger.info("Revisa CloudWatch Logs para ver el progreso:")
         logger.info("  - /aws/lambda/tecnomundo-bronze-ingestion")
@@ -0,0 +1,266 @@
+"""
+Pipeline local de stock: export diario -> validación -> delta -> DynamoDB
+
+Recorre las mismas capas que las ventas:
+
+- Bronze: lectura del export (CSV/Excel, con la caché de parseo y el
+  registro de layouts CSV) y normalización de encabezados y códigos,
+- Silver: validación con `StockRecord` y stock por `codigo_producto`,
+- Gold: diferencia contra el snapshot anterior; sólo los productos cuyo stock
+  cambió se escriben en el historial (`tecnomundo_stock_changes`, un item por
+  producto y fecha) y en el snapshot actual (`tecnomundo_stock_current`, un
+  item chico por producto).
+
+El snapshot anterior se toma de una copia local (data/cache/stock/, se
+actualiza después de cada carga) o, si no existe o con --desde-tabla, de un
+scan de la tabla del snapshot actual. Un export diario con decenas de miles
+de productos cuesta escrituras proporcionales a lo que cambió.
+
+Uso:
+    python src/tecno_etl/pipelines/stock_pipeline.py --file data/raw/stock_2024-03-05.xlsx
+    python src/tecno_etl/pipelines/stock_pipeline.py --file stock.csv --dry-run
+    python src/tecno_etl/pipelines/stock_pipeline.py --crear-tablas
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    from ..extractors.layout_registry import LayoutRegistry
+    from ..extractors.local_file_extractor import read_file
+    from ..extractors.parse_cache import ParseCache
+    from ..loaders import RateLimitedBatchWriter
+    from ..transformers.stock import (
+        compute_stock_delta,
+        invalid_codes,
+        summarize_stock_delta,
+        validate_stock,
+    )
+    from ..utils.aws_clients import get_resource
+    from ..utils.capacity import RETURN_CONSUMED_CAPACITY, CapacityLedger
+    from ..utils.snapshot import load_json_snapshot, save_json_snapshot
+except ImportError:
+    # Ejecutado como script: python src/tecno_etl/pipelines/stock_pipeline.py
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from tecno_etl.extractors.layout_registry import LayoutRegistry
+    from tecno_etl.extractors.local_file_extractor import read_file
+    from tecno_etl.extractors.parse_cache import ParseCache
+    from tecno_etl.loaders import RateLimitedBatchWriter
+    from tecno_etl.transformers.stock import (
+        compute_stock_delta,
+        invalid_codes,
+        summarize_stock_delta,
+        validate_stock,
+    )
+    from tecno_etl.utils.aws_clients import get_resource
+    from tecno_etl.utils.capacity import RETURN_CONSUMED_CAPACITY, CapacityLedger
+    from tecno_etl.utils.snapshot import load_json_snapshot, save_json_snapshot
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STOCK_CURRENT_TABLE = 'tecnomundo_stock_current'
+STOCK_CHANGES_TABLE = 'tecnomundo_stock_changes'
+DEFAULT_STOCK_SNAPSHOT_PATH = Path("data/cache/stock") / f"{STOCK_CURRENT_TABLE}.json"
+
+
+def load_aws_env() -> None:
+    """Carga las credenciales de conf/env/.env.aws si existe"""
+    env_path = Path(__file__).parent.parent.parent.parent / "conf" / "env" / ".env.aws"
+    if not env_path.exists():
+        return
+    with open(env_path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                os.environ[key.strip()] = value.strip()
+
+    # Asegurar que AWS_DEFAULT_REGION esté configurado
+    if not os.getenv('AWS_DEFAULT_REGION') and os.getenv('AWS_REGION'):
+        os.environ['AWS_DEFAULT_REGION'] = os.getenv('AWS_REGION')
+
+
+def read_current_stock(table, ledger: CapacityLedger | None = None) -> dict[str, int]:
+    """Stock actual por producto desde la tabla del snapshot (scan completo)"""
+    stock = {}
+    kwargs = {'ReturnConsumedCapacity': RETURN_CONSUMED_CAPACITY}
+    while True:
+        response = table.scan(**kwargs)
+        if ledger is not None:
+            ledger.record(response, file_id=STOCK_CURRENT_TABLE)
+        for item in response['Items']:
+            stock[item['codigo_producto']] = int(item['stock_disponible'])
+        if 'LastEvaluatedKey' not in response:
+            return stock
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def build_change_items(delta: pd.DataFrame, snapshot_date: str, file_name: str) -> list[dict]:
+    """Items del historial de cambios (clave: codigo_producto + snapshot_date)"""
+    items = []
+    for code, before, after, change, kind in zip(
+        delta['codigo_producto'].tolist(),
+        delta['stock_anterior'].tolist(),
+        delta['stock_disponible'].tolist(),
+        delta['delta'].tolist(),
+        delta['tipo'].tolist(),
+        strict=True,
+    ):
+        item = {
+            'codigo_producto': code,
+            'snapshot_date': snapshot_date,
+            'stock_disponible': after,
+            'delta': change,
+            'tipo': kind,
+            'source_file': file_name,
+        }
+        if before is not pd.NA:
+            item['stock_anterior'] = before
+        items.append(item)
+    return items
+
+
+def build_current_items(delta: pd.DataFrame, snapshot_date: str) -> list[dict]:
+    """Items del snapshot actual: sólo código, stock y fecha"""
+    return [
+        {'codigo_producto': code, 'stock_disponible': stock, 'snapshot_date': snapshot_date}
+        for code, stock in zip(delta['codigo_producto'].tolist(), delta['stock_disponible'].tolist(), strict=True)
+    ]
+
+
+def write_stock_delta(
+    changes_table,
+    current_table,
+    delta: pd.DataFrame,
+    snapshot_date: str,
+    file_name: str,
+    **writer_kwargs,
+) -> dict:
+    """
+    Escribe el delta: primero el historial y después el snapshot actual, para
+    que un corte a mitad de camino se repare volviendo a correr el mismo export.
+
+    Args:
+        **writer_kwargs: Argumentos de `RateLimitedBatchWriter` (ledger, file_id, limiter)
+
+    Returns:
+        Estadísticas de escritura por tabla
+    """
+    stats = {}
+    for table, items in (
+        (changes_table, build_change_items(delta, snapshot_date, file_name)),
+        (current_table, build_current_items(delta, snapshot_date)),
+    ):
+        with RateLimitedBatchWriter(table, **writer_kwargs) as writer:
+            for item in items:
+                writer.put_item(Item=item)
+        stats[table.name] = writer.stats()
+    return stats
+
+
+def crear_tablas(dynamodb) -> None:
+    """Crea las tablas de stock (on-demand)"""
+    specs = {
+        STOCK_CURRENT_TABLE: [('codigo_producto', 'HASH')],
+        STOCK_CHANGES_TABLE: [('codigo_producto', 'HASH'), ('snapshot_date', 'RANGE')],
+    }
+    for name, keys in specs.items():
+        table = dynamodb.create_table(
+            TableName=name,
+            KeySchema=[{'AttributeName': attr, 'KeyType': kind} for attr, kind in keys],
+            AttributeDefinitions=[{'AttributeName': attr, 'AttributeType': 'S'} for attr, _ in keys],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        table.wait_until_exists()
+        logger.info(f"✅ Tabla '{name}' creada")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Carga diferencial de un export de stock")
+    parser.add_argument('--file', type=Path, help="Export de stock (CSV o Excel)")
+    parser.add_argument('--fecha', default=None,
+                        help="Fecha del snapshot (YYYY-MM-DD); por defecto la de hoy")
+    parser.add_argument('--desde-tabla', action='store_true',
+                        help="Comparar contra un scan de la tabla en lugar del snapshot local")
+    parser.add_argument('--ausentes-en-cero', action='store_true',
+                        help="Los productos que no vienen en el export pasan a stock 0 "
+                             "(los que vienen con filas inválidas conservan su stock)")
+    parser.add_argument('--snapshot', type=Path, default=DEFAULT_STOCK_SNAPSHOT_PATH)
+    parser.add_argument('--no-cache', action='store_true', help="No usar la caché de archivos parseados")
+    parser.add_argument('--no-registry', action='store_true',
+                        help="No usar el registro de layouts CSV (inferir separador, codificación y dtypes)")
+    parser.add_argument('--dry-run', action='store_true', help="Mostrar los cambios sin escribir")
+    parser.add_argument('--crear-tablas', action='store_true', help="Crear las tablas de stock")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    load_aws_env()
+    dynamodb = get_resource('dynamodb', region_name=os.getenv('AWS_REGION', 'us-east-1'))
+
+    if args.crear_tablas:
+        crear_tablas(dynamodb)
+        return 0
+    if args.file is None:
+        logger.error("Indica el export de stock con --file")
+        return 1
+
+    snapshot_date = args.fecha or date.today().isoformat()
+    datetime.strptime(snapshot_date, "%Y-%m-%d")  # Falla con un mensaje claro si el formato es otro
+
+    # Bronze: lectura y normalización (un export con el encabezado de siempre usa el layout registrado)
+    with LayoutRegistry(enabled=not args.no_registry) as registry:
+        df, _ = read_file(args.file, registry=registry, cache=ParseCache(enabled=not args.no_cache))
+    if df is None:
+        logger.error(f"❌ No se pudo leer {args.file}")
+        return 1
+
+    # Silver: validación con StockRecord y stock por producto
+    report_path = f"reports/validation/stock_errors_{snapshot_date}.csv"
+    stock, df_errors = validate_stock(df, report_path=report_path)
+    logger.info(f"📦 {len(stock)} productos con stock válido ({len(df_errors)} filas con errores)")
+
+    # Gold: delta contra el snapshot anterior
+    ledger = CapacityLedger('stock_pipeline')
+    current_table = dynamodb.Table(STOCK_CURRENT_TABLE)
+    previous = None if args.desde_tabla else load_json_snapshot(args.snapshot)
+    if previous is None:
+        logger.info(f"Leyendo el stock actual de '{STOCK_CURRENT_TABLE}'...")
+        previous = read_current_stock(current_table, ledger)
+    else:
+        logger.info(f"Usando snapshot {args.snapshot} ({len(previous)} productos)")
+
+    # Un producto cuyas filas fallaron la validación viene en el export: no es "ausente"
+    delta = compute_stock_delta(
+        stock, previous, missing_as_zero=args.ausentes_en_cero, invalid=invalid_codes(df_errors)
+    )
+    logger.info(f"📋 {summarize_stock_delta(delta, len(stock))}")
+
+    if args.dry_run:
+        for row in delta.head(10).itertuples(index=False):
+            logger.info(f"  {row.codigo_producto:<20} {row.stock_anterior} -> {row.stock_disponible} ({row.tipo})")
+        return 0
+
+    stats = write_stock_delta(
+        dynamodb.Table(STOCK_CHANGES_TABLE), current_table, delta, snapshot_date, args.file.name,
+        ledger=ledger, file_id=args.file.name,
+    )
+    snapshot = {**previous, **dict(zip(delta['codigo_producto'].tolist(), delta['stock_disponible'].tolist(), strict=True))}
+    snapshot_path = save_json_snapshot(snapshot, args.snapshot)
+
+    for name, table_stats in stats.items():
+        logger.info(f"✅ {table_stats['items']} items en {name} ({table_stats['write_units']} WCU)")
+    logger.info(f"📒 Capacidad consumida: {ledger.total('read'):.1f} RCU, {ledger.total('write'):.1f} WCU "
+                f"(ledger: {ledger.save_to_file()}, snapshot: {snapshot_path})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# src/tecno_etl/transformers/compaction.py
+"""
+Compactación opcional de dtypes para DataFrames normalizados.
+
+Tras `apply_standard_transformations` y `validate_dataframe` las columnas de
+texto (código, categoría, nombre del producto, cliente...) quedan como cadenas
+de Python, una por fila. En backfills de varios años esto agota la memoria del
+pipeline local. La compactación:
+
+- convierte en `category` las columnas de texto de baja cardinalidad, y
+- reduce los enteros al menor tipo que los contiene y los flotantes a float32
+  sólo cuando la conversión es exacta (los importes no pierden centavos).
+
+Los joins (`merge`) y agrupaciones (`groupby(..., observed=True)`) siguen
+funcionando sobre el DataFrame compactado.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Proporción máxima de valores distintos para convertir una columna de texto a categoría
+DEFAULT_MAX_CARDINALITY_RATIO = 0.5
+
+
+def _is_text_column(series: pd.Series) -> bool:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    if pd.api.types.is_string_dtype(series.dtype):
+        return pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")
+    return False
+
+
+def _downcast_numeric(series: pd.Series) -> pd.Series:
+    """Reduce el tipo numérico de una columna sin perder información."""
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast="integer")
+    if pd.api.types.is_float_dtype(series.dtype) and series.dtype.itemsize > 4:
+        as_float32 = series.astype(np.float32)
+        # Sólo si el valor vuelve idéntico al convertirlo de nuevo (sin pérdida de precisión)
+        if np.array_equal(
+            as_float32.to_numpy(np.float64, na_value=np.nan),
+            series.to_numpy(np.float64, na_value=np.nan),
+            equal_nan=True,
+        ):
+            return as_float32
+    return series
+
+
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    """Memoria real del DataFrame (incluye el contenido de las cadenas) en MiB."""
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def compact_dataframe(
+    df: pd.DataFrame,
+    max_cardinality_ratio: float = DEFAULT_MAX_CARDINALITY_RATIO,
+    exclude: tuple[str, ...] = (),
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Devuelve una versión compacta del DataFrame y un reporte de memoria.
+
+    Args:
+        df: DataFrame normalizado (no se modifica)
+        max_cardinality_ratio: Proporción máxima de valores distintos
+            (distintos / filas) para convertir una columna de texto a categoría
+        exclude: Columnas que se dejan sin cambios
+
+    Returns:
+        Tupla (df_compacto, reporte) donde el reporte incluye 'before_mb',
+        'after_mb', 'saved_pct' y el cambio de dtype por columna.
+
+    Example:
+        ```python
+        df_clean, df_errors = validate_dataframe(df, SalesRecord)
+        df_small, report = compact_dataframe(df_clean)
+        df_small.groupby("categoria", observed=True)["subtotal"].sum()
+        ```
+    """
+    before_mb = float(memory_usage_mb(df))
+    df_compact = df.copy(deep=False)
+    columns = {}
+
+    for col in df_compact.columns:
+        if col in exclude:
+            continue
+        series = df_compact[col]
+        if _is_text_column(series):
+            if len(series) and series.nunique(dropna=True) / len(series) <= max_cardinality_ratio:
+                compacted = series.astype("category")
+            else:
+                continue
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            compacted = _downcast_numeric(series)
+        else:
+            continue
+
+        if compacted.dtype != series.dtype:
+            df_compact[col] = compacted
+            columns[col] = {"from": str(series.dtype), "to": str(compacted.dtype)}
+
+    after_mb = float(memory_usage_mb(df_compact))
+    report = {
+        "rows": len(df),
+        "before_mb": before_mb,
+        "after_mb": after_mb,
+        "saved_pct": (1 - after_mb / before_mb) * 100 if before_mb else 0.0,
+        "columns": columns,
+    }
+    logger.info(
+        f"Compactación de dtypes: {before_mb:.1f} MiB -> {after_mb:.1f} MiB "
+        f"({report['saved_pct']:.1f}% menos, {len(columns)} columnas convertidas)"
+    )
+    for col, change in columns.items():
+        logger.debug(f"  - '{col}': {change['from']} -> {change['to']}")
+    return df_compact, report
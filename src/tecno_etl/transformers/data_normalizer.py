@@ -3,8 +3,13 @@ import logging
 import re
 import unicodedata
 
+import numpy as np
 import pandas as pd
 
+from ..validators.cache import ValidationCache
+from ..validators.columnar import compile_model
+from .compaction import compact_dataframe
+
 # Configurar un logger para este módulo
 logger = logging.getLogger(__name__)
 
@@ -44,19 +49,81 @@ def normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     return df.rename(columns=renamed_cols)
 
 
+# Mapeos de conformado de nombres de columna (se aplican tras sanitize_string)
+PRODUCT_KEY_MAPPINGS = {
+    "codigo_interno": "codigo_producto",
+    "cdigo": "codigo_producto",
+    "codigo": "codigo_producto",
+    "id": "codigo_producto",
+}
+PRODUCT_NAME_MAPPINGS = {
+    "nombre_del_articulo": "nombre_del_producto",
+    "nombre_del_producto": "nombre_del_producto",
+}
+
+# Patrón de prefijo de caja (Letra, 2 dígitos, guion), ej. 'A04-'
+_BOX_PREFIX_PATTERN = r"^[A-Z]\d{2}-"
+
+
+def _standardize_key_inplace(df: pd.DataFrame, key_col: str = "codigo_producto") -> None:
+    """Estandariza el contenido de la clave de producto sobre `df` (sin copiarlo)."""
+    logger.info(f"Estandarizando formato de la clave '{key_col}'...")
+    # Se asegura de que la columna sea de tipo string y elimina el prefijo de caja
+    df[key_col] = (
+        df[key_col].astype(str).str.upper().str.replace(_BOX_PREFIX_PATTERN, "", regex=True)
+    )
+    logger.info("  - Prefijos de caja eliminados y códigos convertidos a mayúsculas.")
+
+
+def _normalize_text_values(series: pd.Series) -> pd.Series:
+    """Normalización de texto valor a valor: acentos, espacios y mayúsculas."""
+    return series.apply(_remove_accents).str.strip().str.upper()
+
+
+def standardize_text_series(series: pd.Series) -> pd.Series:
+    """
+    Estandariza una columna de texto normalizando sólo sus valores distintos.
+
+    Equivale a `series.astype(str).apply(_remove_accents).str.strip().str.upper()`,
+    pero la parte costosa se aplica una vez por valor distinto (columnas como
+    cliente, categoría o vendedor tienen unos cientos de valores en 100k filas)
+    y se reexpande con los códigos de `pd.factorize`. Los nulos que conserva
+    `astype(str)` (dtype `str` de pandas 3) se mantienen como nulos, igual que
+    en la versión fila a fila; en pandas 2 se convierten en 'NAN'/'NONE'.
+    """
+    as_text = series.astype(str)
+    codes, uniques = pd.factorize(as_text)
+    if len(uniques) == 0:
+        return _normalize_text_values(as_text)
+
+    # Un representante (primera aparición) por valor distinto
+    _, first_positions = np.unique(codes, return_index=True)
+    first_positions = first_positions[codes[first_positions] >= 0]
+    normalized = _normalize_text_values(as_text.iloc[first_positions])
+
+    result = normalized.iloc[np.maximum(codes, 0)]
+    result.index = series.index
+    null_mask = codes < 0
+    if null_mask.any():
+        result[null_mask] = as_text[null_mask].to_numpy()
+    return result
+
+
+def _standardize_text_inplace(df: pd.DataFrame) -> None:
+    """Estandariza las columnas de texto de `df` (sin copiarlo), salvo la clave de producto."""
+    for col in df.select_dtypes(include=["object"]).columns:
+        # No volvemos a procesar la clave del producto que ya tiene su propia lógica
+        if col != "codigo_producto":
+            df[col] = standardize_text_series(df[col])
+            logger.info(f"Columna de texto estandarizada (acentos, espacios, mayúsculas): '{col}'")
+
+
 def conform_product_key_name(df: pd.DataFrame) -> pd.DataFrame:
     """
     Busca columnas de clave de producto inconsistentes y las estandariza a 'codigo_producto'.
     """
     df_conformed = df.copy()
-    key_mappings = {
-        "codigo_interno": "codigo_producto",
-        "cdigo": "codigo_producto",
-        "codigo": "codigo_producto",
-        "id": "codigo_producto",
-    }
-
-    for old_key, new_key in key_mappings.items():
+    for old_key, new_key in PRODUCT_KEY_MAPPINGS.items():
         if old_key in df_conformed.columns:
             df_conformed = df_conformed.rename(columns={old_key: new_key})
             logger.info(f"Clave de producto conformada: '{old_key}' -> '{new_key}'")
@@ -71,20 +138,8 @@ def standardize_product_key_format(df: pd.DataFrame) -> pd.DataFrame:
     - Convierte el código a mayúsculas.
     """
     df_std = df.copy()
-    key_col = "codigo_producto"
-
-    if key_col in df_std.columns:
-        logger.info(f"Estandarizando formato de la clave '{key_col}'...")
-        # Se asegura de que la columna sea de tipo string para las operaciones
-        df_std[key_col] = df_std[key_col].astype(str)
-
-        # Expresión regular para encontrar el patrón de prefijo de caja (Letra, 2 dígitos, guion)
-        prefix_pattern = r"^[A-Z]\d{2}-"
-
-        # Aplica la transformación: elimina el prefijo y convierte a mayúsculas
-        df_std[key_col] = df_std[key_col].str.upper().str.replace(prefix_pattern, "", regex=True)
-        logger.info("  - Prefijos de caja eliminados y códigos convertidos a mayúsculas.")
-
+    if "codigo_producto" in df_std.columns:
+        _standardize_key_inplace(df_std)
     return df_std
 
 
@@ -93,11 +148,7 @@ def standardize_text_columns(df: pd.DataFrame) -> pd.DataFrame:
     Estandariza todas las columnas de tipo texto (object) en el DataFrame.
     """
     df_std = df.copy()
-    for col in df_std.select_dtypes(include=["object"]).columns:
-        # No volvemos a procesar la clave del producto que ya tiene su propia lógica
-        if col != "codigo_producto":
-            df_std[col] = df_std[col].astype(str).apply(_remove_accents).str.strip().str.upper()
-            logger.info(f"Columna de texto estandarizada (acentos, espacios, mayúsculas): '{col}'")
+    _standardize_text_inplace(df_std)
     return df_std
 
 
@@ -106,13 +157,7 @@ def conform_product_name_column(df: pd.DataFrame) -> pd.DataFrame:
     Busca la columna de nombre de producto y la estandariza a 'nombre_del_producto'.
     """
     df_conformed = df.copy()
-    standard_name_col = "nombre_del_producto"
-    name_mappings = {
-        "nombre_del_articulo": standard_name_col,
-        "nombre_del_producto": standard_name_col,
-    }
-
-    for old_name, new_name in name_mappings.items():
+    for old_name, new_name in PRODUCT_NAME_MAPPINGS.items():
         if old_name in df_conformed.columns:
             df_conformed = df_conformed.rename(columns={old_name: new_name})
             logger.info(f"Nombre de columna de producto conformado: '{old_name}' -> '{new_name}'")
@@ -120,22 +165,64 @@ def conform_product_name_column(df: pd.DataFrame) -> pd.DataFrame:
     return df_conformed
 
 
-def apply_standard_transformations(df: pd.DataFrame) -> pd.DataFrame:
+def build_transformation_plan(columns, renames: dict | None = None) -> dict:
+    """
+    Construye el plan de `apply_standard_transformations` para unas columnas de entrada.
+
+    Los tres renombrados (saneo, clave y nombre de producto) se componen en un
+    único mapeo por columna, equivalente a aplicarlos en secuencia. Si se pasa
+    un mapeo ya calculado (ej. el de un layout registrado) que cubre exactamente
+    las columnas, se reutiliza sin volver a sanear los encabezados.
+
+    Returns:
+        Diccionario con 'renames' (columna original -> final), 'columns' (nombres
+        finales en orden) y 'standardize_key' (si existe 'codigo_producto').
+    """
+    columns = list(columns)
+    if renames is None or list(renames) != columns:
+        renames = {}
+        for col in columns:
+            name = sanitize_string(col)
+            name = PRODUCT_KEY_MAPPINGS.get(name, name)
+            renames[col] = PRODUCT_NAME_MAPPINGS.get(name, name)
+
+    final_columns = [renames[col] for col in columns]
+    return {
+        "renames": renames,
+        "columns": final_columns,
+        "standardize_key": "codigo_producto" in final_columns,
+    }
+
+
+def apply_standard_transformations(df: pd.DataFrame, compact: bool = False) -> pd.DataFrame:
     """
     Función orquestadora que aplica una secuencia de transformaciones estándar.
+
+    Equivale a encadenar, en este orden: `normalize_column_names`,
+    `conform_product_key_name`, `standardize_product_key_format`,
+    `conform_product_name_column` y `standardize_text_columns`. En lugar de una
+    copia completa por paso, aplica un único renombrado fusionado sobre una copia
+    superficial y reemplaza sólo las columnas que cambian; el DataFrame de
+    entrada no se modifica.
+
+    Con `compact=True` el resultado pasa por `compact_dataframe` (categorías y
+    tipos numéricos reducidos). Si `read_file` dejó el mapeo de columnas de un
+    layout registrado en `df.attrs["column_mapping"]`, se reutiliza.
     """
     logger.info("Aplicando secuencia de transformaciones estándar...")
-    # El orden es importante:
-    # 1. Normalizar nombres de columna.
-    df_transformed = normalize_column_names(df)
-    # 2. Conformar el NOMBRE de la columna de la clave.
-    df_transformed = conform_product_key_name(df_transformed)
-    # 3. Estandarizar el FORMATO de la clave.
-    df_transformed = standardize_product_key_format(df_transformed)
-    # 4. Conformar el nombre de la columna del nombre del producto.
-    df_transformed = conform_product_name_column(df_transformed)
-    # 5. Estandarizar el resto de columnas de texto.
-    df_transformed = standardize_text_columns(df_transformed)
+    plan = build_transformation_plan(df.columns, df.attrs.get("column_mapping"))
+    for old, new in plan["renames"].items():
+        if old != new:
+            logger.debug(f"Columna renombrada: '{old}' -> '{new}'")
+
+    # Copia superficial: las columnas sin cambios comparten memoria con `df`
+    df_transformed = df.copy(deep=False)
+    df_transformed.columns = plan["columns"]
+    if plan["standardize_key"]:
+        _standardize_key_inplace(df_transformed)
+    _standardize_text_inplace(df_transformed)
+    if compact:
+        df_transformed, _ = compact_dataframe(df_transformed)
 
     logger.info("Secuencia de transformaciones estándar completada.")
 
@@ -146,14 +233,28 @@ def validate_dataframe(
     df: pd.DataFrame,
     record_model: type,
     report_path: str | None = None,
+    engine: str = "columnar",
+    cache: ValidationCache | None = None,
+    compact: bool = False,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     Valida un DataFrame usando un modelo Pydantic y separa registros válidos de inválidos.
 
+    Con engine="columnar" las restricciones del modelo se evalúan como máscaras
+    vectorizadas (ver `validators.columnar`) y sólo las filas que no pueden
+    certificarse así pasan por Pydantic, lo que produce la misma separación y los
+    mismos mensajes de error. Con engine="pydantic" se valida fila a fila.
+
+    Si se pasa una `ValidationCache`, las filas cuya huella ya fue validada con
+    el mismo esquema reutilizan el resultado guardado (válida o texto del error).
+
     Args:
         df: DataFrame a validar
         record_model: Modelo Pydantic para validación (ej. CategoryRecord, SalesRecord)
         report_path: Ruta opcional para guardar reporte de errores
+        engine: "columnar" (por defecto) o "pydantic"
+        cache: Caché persistente opcional de resultados por huella de fila
+        compact: Si es True, compacta los dtypes de df_válido (ver `compact_dataframe`)
 
     Returns:
         Tupla (df_válido, df_errores) donde:
@@ -171,28 +272,72 @@ def validate_dataframe(
         )
         ```
     """
+    if engine not in ("columnar", "pydantic"):
+        raise ValueError(f"Motor de validación desconocido: {engine}")
+
     logger.info(f"Iniciando validación de {len(df)} registros con {record_model.__name__}")
 
-    valid_records = []
-    error_records = []
+    valid_mask = np.zeros(len(df), dtype=bool)
+    errors_by_pos: dict[int, tuple[str, dict]] = {}
+    pending = np.arange(len(df))
+
+    # 1. Filas ya conocidas por la caché (válidas o con su error)
+    if cache is not None:
+        context = cache.context(df, record_model)
+        h1, h2 = cache.fingerprint(df)
+        found, cached_valid, cached_errors = cache.lookup(context, h1, h2)
+        valid_mask |= found & cached_valid
+        for pos in np.flatnonzero(found & ~cached_valid):
+            errors_by_pos[pos] = (cached_errors[pos], df.iloc[pos].to_dict())
+        pending = np.flatnonzero(~found)
+
+    # 2. Certificación columnar de las filas restantes
+    compiled = compile_model(record_model) if engine == "columnar" else None
+    if compiled is not None:
+        certified = compiled.certify(df.iloc[pending])
+        valid_mask[pending[certified]] = True
+        fallback = pending[~certified]
+        logger.info(
+            f"  - {int(certified.sum())}/{len(pending)} registros certificados por el motor columnar"
+        )
+    else:
+        if engine == "columnar":
+            logger.info(f"  - {record_model.__name__} no es compilable, se valida fila a fila")
+        fallback = pending
 
-    for idx, row in df.iterrows():
+    # 3. Las filas no certificadas se validan con el modelo Pydantic
+    for pos, (idx, row) in zip(fallback, df.iloc[fallback].iterrows(), strict=True):
         try:
             # Intentar validar el registro
-            validated = record_model(**row.to_dict())
-            valid_records.append(row)
+            record_model(**row.to_dict())
+            valid_mask[pos] = True
         except Exception as e:
             # Capturar errores de validación
-            error_info = {
-                "row_number": idx + 1,
-                "error_message": str(e),
-                "raw_data": row.to_dict(),
-            }
-            error_records.append(error_info)
+            errors_by_pos[pos] = (str(e), row.to_dict())
             logger.debug(f"Error en fila {idx + 1}: {e}")
 
+    if cache is not None:
+        cache.store(
+            context,
+            h1[pending],
+            h2[pending],
+            valid_mask[pending],
+            [errors_by_pos[pos][0] if pos in errors_by_pos else None for pos in pending],
+        )
+
+    error_records = [
+        {
+            "row_number": df.index[pos] + 1,
+            "error_message": message,
+            "raw_data": raw_data,
+        }
+        for pos, (message, raw_data) in sorted(errors_by_pos.items())
+    ]
+
     # Crear DataFrames de resultados
-    df_valid = pd.DataFrame(valid_records) if valid_records else pd.DataFrame()
+    df_valid = df[valid_mask] if valid_mask.any() else pd.DataFrame()
+    if compact and not df_valid.empty:
+        df_valid, _ = compact_dataframe(df_valid)
     df_errors = pd.DataFrame(error_records) if error_records else pd.DataFrame()
 
     # Logging de resultados
@@ -200,9 +345,17 @@ def validate_dataframe(
     valid_count = len(df_valid)
     error_count = len(df_errors)
 
+    cache_info = ""
+    if cache is not None:
+        hits = total - len(pending)
+        cache_info = (
+            f"; caché: {hits}/{total} aciertos ({(hits / total) * 100:.1f}%), "
+            f"acumulado {cache.hit_rate * 100:.1f}%"
+        )
+
     logger.info(
         f"Validación completada: {valid_count}/{total} registros válidos "
-        f"({error_count} errores, {(valid_count / total) * 100:.1f}% éxito)"
+        f"({error_count} errores, {(valid_count / total) * 100:.1f}% éxito{cache_info})"
     )
 
     # Guardar reporte de errores si se especifica
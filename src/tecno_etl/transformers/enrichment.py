@@ -0,0 +1,97 @@
+"""
+Enriquecimiento Gold: ventas Silver + dimensión de producto.
+
+Lo usan la Lambda Gold (modo por etapas) y la Lambda Silver cuando procesa el
+archivo en modo fusionado: en archivos chicos y medianos Silver enriquece en
+memoria el lote que acaba de limpiar y escribe las dos capas en una pasada,
+sin volver a leer Silver ni pasar por la cola de Gold.
+
+El modo se elige por cantidad de filas con `TECNO_ETL_FUSED_MAX_ROWS`
+(0 o sin definir: siempre por etapas).
+"""
+
+import logging
+import os
+from datetime import datetime
+
+from ..utils.capacity import RETURN_CONSUMED_CAPACITY, CapacityLedger
+
+logger = logging.getLogger(__name__)
+
+FUSED_MAX_ROWS_ENV = "TECNO_ETL_FUSED_MAX_ROWS"
+
+# Valores de Gold cuando el producto no tiene dimensión
+NOT_FOUND_NAME = "NO_ENCONTRADO"
+NOT_FOUND_CATEGORY = "SIN_CATEGORIA"
+
+
+def fused_max_rows() -> int:
+    """Máximo de filas de un archivo para procesarlo en modo fusionado (0 = deshabilitado)."""
+    value = os.getenv(FUSED_MAX_ROWS_ENV, "")
+    try:
+        return max(0, int(value)) if value else 0
+    except ValueError:
+        logger.warning(f"{FUSED_MAX_ROWS_ENV} inválido ({value!r}); se usa el modo por etapas")
+        return 0
+
+
+def use_fused_mode(row_count: int) -> bool:
+    """True si un archivo de `row_count` filas se procesa en modo fusionado."""
+    return 0 < row_count <= fused_max_rows()
+
+
+def dimension_attributes(dim: dict | None) -> dict:
+    """Nombre y categoría del producto (o los valores por defecto si no hay dimensión)."""
+    if not dim:
+        return {"nombre_del_producto": NOT_FOUND_NAME, "categoria": NOT_FOUND_CATEGORY}
+    return {
+        "nombre_del_producto": dim.get("nombre_del_producto", NOT_FOUND_NAME),
+        "categoria": dim.get("categoria", NOT_FOUND_CATEGORY),
+    }
+
+
+def enrich_item(item: dict, dimensions: dict) -> tuple[dict, bool]:
+    """
+    Enriquece un item Silver con su dimensión de producto.
+    Retorna el item Gold y si se encontró la dimensión.
+    """
+    dim = dimensions.get(item["codigo_producto"])
+    gold_item = {
+        **item,  # Todos los campos de Silver
+        **dimension_attributes(dim),
+        "enriched_at": datetime.now().isoformat(),
+    }
+    return gold_item, bool(dim)
+
+
+def enrich_items(items: list[dict], dimensions: dict) -> tuple[list[dict], list[bool]]:
+    """Enriquece un lote de items Silver; retorna los items Gold y, por item, si se encontró la dimensión."""
+    gold_items = []
+    found = []
+    for item in items:
+        gold_item, item_found = enrich_item(item, dimensions)
+        gold_items.append(gold_item)
+        found.append(item_found)
+    return gold_items, found
+
+
+def load_dimensions(table, ledger: CapacityLedger | None = None, file_id: str | None = None) -> dict[str, dict]:
+    """
+    Carga todas las dimensiones de producto en memoria (por código de producto).
+
+    Args:
+        table: Tabla de dimensiones (recurso boto3)
+        ledger: Ledger donde registrar la capacidad de los scans (opcional)
+        file_id: Archivo al que se atribuye la lectura en el ledger
+    """
+    scan_kwargs = {"ReturnConsumedCapacity": RETURN_CONSUMED_CAPACITY} if ledger is not None else {}
+    dimensions = {}
+    while True:
+        response = table.scan(**scan_kwargs)
+        if ledger is not None:
+            ledger.record(response, file_id=file_id)
+        for dim in response["Items"]:
+            dimensions[dim["codigo_producto"]] = dim
+        if "LastEvaluatedKey" not in response:
+            return dimensions
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
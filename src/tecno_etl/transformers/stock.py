@@ -0,0 +1,153 @@
+"""
+Transformaciones de los reportes de stock: normalización, agregado por
+producto y diferencia contra el snapshot anterior.
+
+Un export diario de stock trae decenas de miles de productos, de los que sólo
+cambia una fracción. `compute_stock_delta` compara el stock de cada
+`codigo_producto` con el del snapshot anterior de forma vectorizada para que
+sólo se escriban los niveles que cambiaron.
+"""
+
+import logging
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+from ..validators import StockRecord
+from .data_normalizer import apply_standard_transformations, validate_dataframe
+
+logger = logging.getLogger(__name__)
+
+# Encabezados de stock de los exports (tras sanitize_string) -> nombre de StockRecord
+STOCK_COLUMN_MAPPINGS = {
+    "stock": "stock_disponible",
+    "stock_actual": "stock_disponible",
+    "existencia": "stock_disponible",
+    "existencias": "stock_disponible",
+    "saldo": "stock_disponible",
+    "fecha": "fecha_actualizacion",
+    "fecha_de_actualizacion": "fecha_actualizacion",
+}
+
+STOCK_COLUMNS = ("codigo_producto", "stock_disponible", "fecha_actualizacion")
+
+# Tipos de cambio del delta
+CHANGE_NEW = "alta"
+CHANGE_UPDATE = "cambio"
+CHANGE_MISSING = "ausente"
+
+
+def prepare_stock_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica las transformaciones estándar y conforma las columnas a las de `StockRecord`."""
+    df_std = apply_standard_transformations(df)
+    # Los encabezados ya están saneados; no se pisa una columna que ya tenga el nombre final
+    renames = {
+        col: STOCK_COLUMN_MAPPINGS[col]
+        for col in df_std.columns
+        if col in STOCK_COLUMN_MAPPINGS and STOCK_COLUMN_MAPPINGS[col] not in df_std.columns
+    }
+    df_std = df_std.rename(columns=renames)
+    missing = {"codigo_producto", "stock_disponible"} - set(df_std.columns)
+    if missing:
+        raise ValueError(f"Faltan columnas de stock: {sorted(missing)} (columnas: {list(df_std.columns)})")
+    return df_std[[col for col in STOCK_COLUMNS if col in df_std.columns]]
+
+
+def stock_by_product(df_valid: pd.DataFrame) -> pd.Series:
+    """
+    Stock por `codigo_producto` (enteros, como los deja `StockRecord`).
+
+    Si un producto aparece en varias filas (ej. un export por depósito), se suma.
+    """
+    if df_valid.empty:
+        return pd.Series(dtype="int64", name="stock_disponible")
+    stock = np.trunc(pd.to_numeric(df_valid["stock_disponible"]).to_numpy(dtype=float)).astype("int64")
+    return (
+        pd.Series(stock, index=df_valid["codigo_producto"].to_numpy(), name="stock_disponible")
+        .groupby(level=0, sort=True)
+        .sum()
+    )
+
+
+def validate_stock(df: pd.DataFrame, report_path: str | None = None) -> tuple[pd.Series, pd.DataFrame]:
+    """
+    Normaliza y valida un reporte de stock con `StockRecord`.
+
+    Returns:
+        Tupla (stock por producto, df_errores)
+    """
+    df_valid, df_errors = validate_dataframe(prepare_stock_frame(df), StockRecord, report_path=report_path)
+    return stock_by_product(df_valid), df_errors
+
+
+def invalid_codes(df_errors: pd.DataFrame) -> set[str]:
+    """Códigos de producto de las filas que no pasaron la validación (según `raw_data`)."""
+    if df_errors.empty:
+        return set()
+    return {
+        str(row["codigo_producto"]) for row in df_errors["raw_data"]
+        if pd.notna(row.get("codigo_producto"))
+    }
+
+
+def compute_stock_delta(
+    current: pd.Series,
+    previous: pd.Series | dict,
+    missing_as_zero: bool = False,
+    invalid: Iterable[str] = (),
+) -> pd.DataFrame:
+    """
+    Productos cuyo stock cambió respecto del snapshot anterior.
+
+    Args:
+        current: Stock del export por `codigo_producto`
+        previous: Stock del snapshot anterior por `codigo_producto`
+        missing_as_zero: Si es True, los productos del snapshot anterior que no
+            vienen en el export pasan a stock 0; si no, se dejan como estaban
+        invalid: Códigos que vienen en el export pero sin ninguna fila válida
+            (ver `invalid_codes`): no están ausentes y se dejan como estaban
+
+    Returns:
+        DataFrame con codigo_producto, stock_anterior (nulo en las altas),
+        stock_disponible, delta y tipo ('alta', 'cambio' o 'ausente')
+    """
+    previous = pd.Series(previous, dtype="int64") if isinstance(previous, dict) else previous.astype("int64")
+    before = previous.reindex(current.index)
+    known = before.notna().to_numpy()
+    before_values = before.to_numpy(dtype=float)
+    after_values = current.to_numpy(dtype="int64")
+
+    changed = ~known | (before_values != after_values)
+    delta = pd.DataFrame({
+        "codigo_producto": current.index[changed],
+        # NaN (producto nuevo) -> nulo
+        "stock_anterior": pd.array(before_values[changed], dtype="Int64"),
+        "stock_disponible": after_values[changed],
+        "tipo": np.where(known[changed], CHANGE_UPDATE, CHANGE_NEW),
+    })
+
+    if missing_as_zero:
+        in_export = previous.index.isin(current.index) | previous.index.isin(list(invalid))
+        gone = previous[~in_export & (previous != 0)]
+        delta = pd.concat([delta, pd.DataFrame({
+            "codigo_producto": gone.index,
+            "stock_anterior": pd.array(gone.to_numpy(), dtype="Int64"),
+            "stock_disponible": np.zeros(len(gone), dtype="int64"),
+            "tipo": CHANGE_MISSING,
+        })], ignore_index=True)
+
+    delta["delta"] = delta["stock_disponible"] - delta["stock_anterior"].fillna(0).astype("int64")
+    return delta.reset_index(drop=True)
+
+
+def summarize_stock_delta(delta: pd.DataFrame, total: int) -> str:
+    """Resumen legible de un delta sobre un export de `total` productos."""
+    counts = delta["tipo"].value_counts()
+    text = (
+        f"{counts.get(CHANGE_NEW, 0)} altas, {counts.get(CHANGE_UPDATE, 0)} cambios, "
+        f"{total - counts.get(CHANGE_NEW, 0) - counts.get(CHANGE_UPDATE, 0)} sin cambios"
+    )
+    if counts.get(CHANGE_MISSING, 0):
+        text += f", {counts[CHANGE_MISSING]} ausentes del export (a stock 0)"
+    return text
@@ -0,0 +1,173 @@
+"""
+Fábrica compartida de clientes AWS (boto3) con configuración de red ajustada.
+
+Los clientes por defecto de boto3 usan 10 conexiones en el pool, el modo de
+reintentos 'legacy' y sin keep-alive TCP, lo que limita a los escritores
+concurrentes y provoca tormentas de reintentos ante throttling. Esta fábrica:
+
+- crea cada cliente/recurso una sola vez por proceso (y por región/endpoint),
+- usa reintentos 'adaptive' (con limitador de tasa del lado del cliente),
+- ajusta el tamaño del pool, los timeouts y el keep-alive TCP,
+- permite apuntar a un endpoint local (DynamoDB Local, LocalStack) para pruebas.
+
+Los valores por defecto se pueden sobrescribir con variables de entorno, de
+modo que la concurrencia se configura en un solo lugar para Lambdas y scripts:
+
+    TECNO_ETL_AWS_MAX_POOL_CONNECTIONS   (default 50)
+    TECNO_ETL_AWS_MAX_ATTEMPTS           (default 10)
+    TECNO_ETL_AWS_RETRY_MODE             (default 'adaptive')
+    TECNO_ETL_AWS_CONNECT_TIMEOUT        (segundos, default 5)
+    TECNO_ETL_AWS_READ_TIMEOUT           (segundos, default 60)
+    TECNO_ETL_AWS_ENDPOINT_URL           (sin definir = endpoints de AWS)
+
+Este módulo sólo depende de boto3/botocore para poder empaquetarse en las Lambdas.
+"""
+
+import os
+import threading
+
+import boto3
+from botocore.config import Config
+
+DEFAULT_REGION = "us-east-1"
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+DEFAULT_MAX_ATTEMPTS = 10
+DEFAULT_RETRY_MODE = "adaptive"
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+_lock = threading.Lock()
+_session: boto3.session.Session | None = None
+_clients: dict[tuple, object] = {}
+_resources: dict[tuple, object] = {}
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return type(default)(value) if value else default
+
+
+def build_config(
+    max_pool_connections: int | None = None,
+    max_attempts: int | None = None,
+    retry_mode: str | None = None,
+    connect_timeout: float | None = None,
+    read_timeout: float | None = None,
+    parameter_validation: bool = True,
+) -> Config:
+    """
+    Construye la configuración de botocore; los argumentos en None toman el
+    valor de la variable de entorno correspondiente o el default del módulo.
+    """
+    return Config(
+        max_pool_connections=max_pool_connections
+        or int(_env_number("TECNO_ETL_AWS_MAX_POOL_CONNECTIONS", DEFAULT_MAX_POOL_CONNECTIONS)),
+        retries={
+            "mode": retry_mode or os.getenv("TECNO_ETL_AWS_RETRY_MODE", DEFAULT_RETRY_MODE),
+            "max_attempts": max_attempts
+            or int(_env_number("TECNO_ETL_AWS_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)),
+        },
+        connect_timeout=connect_timeout
+        or _env_number("TECNO_ETL_AWS_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+        read_timeout=read_timeout
+        or _env_number("TECNO_ETL_AWS_READ_TIMEOUT", DEFAULT_READ_TIMEOUT),
+        tcp_keepalive=True,
+        parameter_validation=parameter_validation,
+    )
+
+
+def _get_session() -> boto3.session.Session:
+    global _session
+    if _session is None:
+        _session = boto3.session.Session()
+    return _session
+
+
+def _resolve(region_name: str | None, endpoint_url: str | None) -> tuple[str, str | None]:
+    region = (
+        region_name
+        or os.getenv("AWS_REGION")
+        or os.getenv("AWS_DEFAULT_REGION")
+        or DEFAULT_REGION
+    )
+    endpoint = endpoint_url or os.getenv("TECNO_ETL_AWS_ENDPOINT_URL") or None
+    return region, endpoint
+
+
+def get_client(
+    service_name: str,
+    region_name: str | None = None,
+    endpoint_url: str | None = None,
+    **config_overrides,
+):
+    """
+    Devuelve el cliente boto3 compartido del servicio (creándolo la primera vez).
+
+    Los clientes boto3 son thread-safe: el mismo objeto se comparte entre hilos.
+
+    Args:
+        service_name: Servicio AWS (ej. 'dynamodb', 'sqs', 'lambda')
+        region_name: Región (por defecto AWS_REGION / AWS_DEFAULT_REGION / us-east-1)
+        endpoint_url: Endpoint alternativo (por defecto TECNO_ETL_AWS_ENDPOINT_URL)
+        **config_overrides: Argumentos de `build_config` (ej. read_timeout=900)
+
+    Example:
+        ```python
+        sqs = get_client("sqs")
+        lambda_client = get_client("lambda", read_timeout=900)
+        ```
+    """
+    region, endpoint = _resolve(region_name, endpoint_url)
+    key = (service_name, region, endpoint, tuple(sorted(config_overrides.items())))
+    client = _clients.get(key)
+    if client is None:
+        # La creación de clientes a partir de una sesión no es thread-safe
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _get_session().client(
+                    service_name,
+                    region_name=region,
+                    endpoint_url=endpoint,
+                    config=build_config(**config_overrides),
+                )
+                _clients[key] = client
+    return client
+
+
+def get_resource(
+    service_name: str,
+    region_name: str | None = None,
+    endpoint_url: str | None = None,
+    **config_overrides,
+):
+    """
+    Devuelve el recurso boto3 compartido del servicio (ej. `get_resource("dynamodb")`).
+
+    A diferencia de los clientes, los recursos no son thread-safe: en código
+    concurrente conviene usar `get_client` o un recurso por hilo.
+    """
+    region, endpoint = _resolve(region_name, endpoint_url)
+    key = (service_name, region, endpoint, tuple(sorted(config_overrides.items())))
+    resource = _resources.get(key)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(key)
+            if resource is None:
+                resource = _get_session().resource(
+                    service_name,
+                    region_name=region,
+                    endpoint_url=endpoint,
+                    config=build_config(**config_overrides),
+                )
+                _resources[key] = resource
+    return resource
+
+
+def reset_clients() -> None:
+    """Descarta los clientes y la sesión cacheados (ej. tras cambiar credenciales en tests)."""
+    global _session
+    with _lock:
+        _clients.clear()
+        _resources.clear()
+        _session = None
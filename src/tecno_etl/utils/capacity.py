@@ -0,0 +1,156 @@
+"""
+Contabilidad de capacidad consumida de DynamoDB por etapa y por archivo.
+
+Todas las lecturas y escrituras del pipeline piden `ReturnConsumedCapacity`
+y registran la respuesta en un `CapacityLedger`. El ledger acumula las RCU y
+WCU consumidas por `file_id` y por tabla dentro de una etapa (Bronze, Silver,
+Gold, scripts) y, al terminar:
+
+- agrega los totales a la línea de métricas de la invocación, y
+- guarda una fila por (file_id, etapa) en el ledger de costos: la tabla
+  `tecnomundo_capacity_ledger` desde las Lambdas, o un archivo JSON Lines
+  desde los scripts locales.
+
+Con esos datos se puede ver qué etapa o archivo consume la capacidad (por
+ejemplo, los scans completos de Gold) antes de decidir qué optimizar.
+
+Example:
+    ```python
+    ledger = CapacityLedger("silver_transformation")
+    response = table.query(..., ReturnConsumedCapacity=RETURN_CONSUMED_CAPACITY)
+    ledger.record(response, file_id=file_id)
+    ledger.save_to_table(get_resource("dynamodb").Table(CAPACITY_LEDGER_TABLE))
+    ```
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Valor del parámetro ReturnConsumedCapacity en todas las llamadas
+RETURN_CONSUMED_CAPACITY = "TOTAL"
+
+CAPACITY_LEDGER_TABLE = os.getenv("CAPACITY_LEDGER_TABLE", "tecnomundo_capacity_ledger")
+DEFAULT_LEDGER_PATH = Path("reports/capacity/ledger.jsonl")
+
+# file_id para las operaciones que no corresponden a un archivo (ej. cargar dimensiones)
+NO_FILE = "-"
+
+
+class CapacityLedger:
+    """
+    Acumulador de capacidad consumida de una etapa, por file_id y tabla.
+
+    Se puede compartir entre escritores que corren en paralelo (hilos).
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        # file_id -> tabla -> {"read": RCU, "write": WCU}
+        self._entries: dict[str, dict[str, dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, table: str, read: float = 0.0, write: float = 0.0, file_id: str | None = None) -> None:
+        with self._lock:
+            tables = self._entries.setdefault(file_id or NO_FILE, {})
+            totals = tables.setdefault(table, {"read": 0.0, "write": 0.0})
+            totals["read"] += read
+            totals["write"] += write
+
+    def record(self, response: dict, file_id: str | None = None, kind: str | None = None) -> None:
+        """
+        Registra el `ConsumedCapacity` de una respuesta de DynamoDB.
+
+        Las respuestas de operaciones por lotes devuelven una lista (una entrada
+        por tabla). Si la respuesta sólo informa `CapacityUnits`, `kind`
+        ('read' o 'write') indica a qué corresponde.
+        """
+        consumed = response.get("ConsumedCapacity")
+        if not consumed:
+            return
+        for entry in consumed if isinstance(consumed, list) else [consumed]:
+            read = float(entry.get("ReadCapacityUnits", 0) or 0)
+            write = float(entry.get("WriteCapacityUnits", 0) or 0)
+            if not read and not write:
+                units = float(entry.get("CapacityUnits", 0) or 0)
+                if kind == "write":
+                    write = units
+                else:
+                    read = units
+            self.add(entry.get("TableName", "?"), read=read, write=write, file_id=file_id)
+
+    def total(self, kind: str) -> float:
+        """Total de 'read' o 'write' de la etapa."""
+        return sum(t[kind] for tables in self._entries.values() for t in tables.values())
+
+    def by_file(self) -> dict[str, dict]:
+        """Totales por file_id: {'read': RCU, 'write': WCU, 'tables': {...}}."""
+        return {
+            file_id: {
+                "read": round(sum(t["read"] for t in tables.values()), 3),
+                "write": round(sum(t["write"] for t in tables.values()), 3),
+                "tables": {name: {k: round(v, 3) for k, v in t.items()} for name, t in tables.items()},
+            }
+            for file_id, tables in self._entries.items()
+        }
+
+    def report_to(self, metrics) -> None:
+        """Agrega los totales a la línea de métricas de la invocación (`InvocationMetrics`)."""
+        metrics.count("read_capacity_units", round(self.total("read"), 3))
+        metrics.count("write_capacity_units", round(self.total("write"), 3))
+        metrics.set_property("consumed_capacity", self.by_file())
+
+    def rows(self) -> list[dict]:
+        """Filas del ledger: una por file_id de la etapa."""
+        recorded_at = datetime.now().isoformat()
+        return [
+            {
+                "file_id": file_id,
+                "stage_recorded_at": f"{self.stage}#{recorded_at}",
+                "stage": self.stage,
+                "recorded_at": recorded_at,
+                **totals,
+            }
+            for file_id, totals in self.by_file().items()
+        ]
+
+    def save_to_table(self, table) -> bool:
+        """
+        Guarda las filas en la tabla del ledger (clave file_id + stage_recorded_at).
+
+        Un error (ej. la tabla no existe) se registra en el log sin interrumpir la etapa.
+        """
+        try:
+            for row in self.rows():
+                # boto3 no acepta float: los números van como Decimal
+                table.put_item(Item=json.loads(json.dumps(row), parse_float=Decimal))
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el ledger de capacidad en {table.name}: {e}")
+            return False
+        return True
+
+    def save_to_file(self, path: Path | str = DEFAULT_LEDGER_PATH) -> Path:
+        """Agrega las filas a un archivo JSON Lines (ledger local de los scripts)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for row in self.rows():
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return path
+
+
+def summarize_ledger(rows: list[dict]) -> dict[str, dict[str, float]]:
+    """Totales de RCU/WCU por etapa a partir de filas del ledger."""
+    summary: dict[str, dict[str, float]] = {}
+    for row in rows:
+        totals = summary.setdefault(row["stage"], {"read": 0.0, "write": 0.0, "files": 0})
+        totals["read"] += float(row["read"])
+        totals["write"] += float(row["write"])
+        totals["files"] += 1
+    return summary
@@ -64,3 +64,28 @@ def get_logger(name: str) -> logging.Logger:
         Logger configurado
     """
     return logging.getLogger(name)
+
+
+def get_raw_logger(name: str, stream=None) -> logging.Logger:
+    """
+    Obtiene un logger que escribe cada mensaje tal cual, sin fecha, nivel ni nombre.
+
+    No propaga al logger raíz: ni el formatter de `setup_logging` ni el del
+    runtime de Lambda le agregan prefijos (necesario para líneas que otro
+    sistema interpreta, como el JSON de CloudWatch EMF).
+
+    Args:
+        name: Nombre del logger
+        stream: Stream de salida al crearlo por primera vez (por defecto stdout)
+
+    Returns:
+        Logger configurado
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        handler = logging.StreamHandler(stream or sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
@@ -0,0 +1,165 @@
+"""
+Métricas estructuradas por invocación para los handlers Lambda.
+
+Los logs de los handlers son mensajes legibles y no permiten ver en qué fase
+se va el tiempo (decodificar, parsear, sanear, escribir...). Este módulo
+permite medir fases con nombre dentro de `lambda_handler` y, al terminar la
+invocación, emitir una única línea JSON en formato CloudWatch Embedded Metric
+Format (EMF). CloudWatch extrae las métricas de esa línea sin llamadas a la
+API ni agentes adicionales.
+
+El costo es el de dos `time.perf_counter()` por fase y una suma por contador:
+las fases se miden alrededor de bloques completos, nunca por fila.
+
+Example:
+    ```python
+    metrics = start_invocation("bronze_ingestion", context)
+    try:
+        with metrics.span("decode"):
+            file_bytes = base64.b64decode(payload)
+        metrics.count("input_bytes", len(file_bytes), unit="Bytes")
+    finally:
+        metrics.emit()
+    ```
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from .logger import get_raw_logger
+
+DEFAULT_NAMESPACE = "TecnoMundo/ETL"
+
+# Logger de las líneas EMF (sin prefijos, ver `get_raw_logger`)
+EMF_LOGGER_NAME = "tecno_etl.metrics.emf"
+
+# True hasta que se crea la primera invocación del proceso (contenedor Lambda)
+_cold_start = True
+
+
+class InvocationMetrics:
+    """
+    Duraciones por fase y contadores de una invocación.
+
+    Las duraciones se acumulan por nombre (una fase medida varias veces, por
+    ejemplo una vez por mensaje SQS, suma sus tiempos).
+    """
+
+    def __init__(
+        self,
+        function_name: str,
+        namespace: str = DEFAULT_NAMESPACE,
+        cold_start: bool = False,
+        request_id: str | None = None,
+    ):
+        self.function_name = function_name
+        self.namespace = namespace
+        self.cold_start = cold_start
+        self.request_id = request_id
+        self.durations_ms: dict[str, float] = {}
+        self.counters: dict[str, tuple[float, str]] = {}
+        self.properties: dict[str, object] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str):
+        """Mide la duración del bloque y la acumula como `<name>_ms`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.durations_ms[name] = self.durations_ms.get(name, 0.0) + elapsed
+
+    def count(self, name: str, value: float, unit: str = "Count") -> None:
+        """Suma `value` al contador `name` (unidades EMF: 'Count', 'Bytes', ...)."""
+        current = self.counters.get(name)
+        self.counters[name] = ((current[0] if current else 0) + value, unit)
+
+    def set_property(self, name: str, value) -> None:
+        """Agrega un campo informativo a la línea (no se publica como métrica)."""
+        self.properties[name] = value
+
+    def to_emf(self) -> dict:
+        """Documento EMF con las fases, contadores, duración total y arranque en frío."""
+        total_ms = (time.perf_counter() - self._started) * 1000
+        values: dict[str, tuple[float, str]] = {
+            f"{name}_ms": (round(ms, 3), "Milliseconds") for name, ms in self.durations_ms.items()
+        }
+        values["total_ms"] = (round(total_ms, 3), "Milliseconds")
+        values.update(self.counters)
+        values["cold_start"] = (int(self.cold_start), "Count")
+
+        document = {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [["FunctionName"]],
+                        "Metrics": [{"Name": name, "Unit": unit} for name, (_, unit) in values.items()],
+                    }
+                ],
+            },
+            "FunctionName": self.function_name,
+            **self.properties,
+        }
+        if self.request_id:
+            document["RequestId"] = self.request_id
+        document.update({name: value for name, (value, _) in values.items()})
+        return document
+
+    def emit(self, stream=None) -> dict:
+        """
+        Escribe el documento EMF como una sola línea en stdout.
+
+        Sale por el logger `EMF_LOGGER_NAME` de `get_raw_logger`: CloudWatch
+        sólo reconoce EMF si la línea es JSON puro, sin prefijos del formatter.
+
+        Args:
+            stream: Stream alternativo (ej. para tests); se escribe directamente
+        """
+        document = self.to_emf()
+        line = json.dumps(document, default=str)
+        if stream is None:
+            get_raw_logger(EMF_LOGGER_NAME).info(line)
+        else:
+            stream.write(line + "\n")
+            stream.flush()
+        return document
+
+
+def start_invocation(
+    function_name: str, context=None, namespace: str = DEFAULT_NAMESPACE
+) -> InvocationMetrics:
+    """
+    Crea las métricas de una invocación; la primera del proceso se marca como arranque en frío.
+
+    Args:
+        function_name: Nombre lógico de la Lambda (dimensión 'FunctionName')
+        context: Contexto de Lambda (opcional), para registrar el request id
+        namespace: Namespace de CloudWatch
+    """
+    global _cold_start
+    cold_start, _cold_start = _cold_start, False
+    return InvocationMetrics(
+        function_name,
+        namespace=namespace,
+        cold_start=cold_start,
+        request_id=getattr(context, "aws_request_id", None),
+    )
+
+
+def elapsed_ms_since(timestamp: str | None) -> float | None:
+    """
+    Milisegundos transcurridos desde un timestamp ISO (ej. el que viaja en los
+    mensajes SQS entre etapas); None si no hay timestamp o no se puede leer.
+    """
+    if not timestamp:
+        return None
+    try:
+        return (datetime.now() - datetime.fromisoformat(timestamp)).total_seconds() * 1000
+    except (TypeError, ValueError):
+        return None
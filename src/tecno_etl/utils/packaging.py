@@ -0,0 +1,310 @@
+"""
+Utilidades de empaquetado mínimo de Lambdas (usadas por `lambda_functions/package_all.py`).
+
+El tamaño descomprimido del paquete y el tiempo de import del handler son lo
+que más pesa en un arranque en frío. Este módulo permite:
+
+- trazar los módulos que importa el handler (`python -X importtime`),
+- podar del paquete las dependencias y los módulos propios que nunca se
+  importan, y los datos de botocore de servicios que la función no usa,
+- eliminar cachés, tests y metadatos de instalación,
+- precompilar el bytecode (sin verificación de mtime, ver `compile_package`),
+- mover dependencias pesadas compartidas (pandas/numpy) a un Layer,
+- medir el tamaño descomprimido y el tiempo de import en frío.
+
+Los módulos que el handler importa dentro de funciones (ej. `dateutil.parser`
+en Silver o `openpyxl` vía `pd.read_excel` en Bronze) no aparecen en la traza
+del import del módulo: se declaran como `runtime_imports` y se trazan también.
+"""
+
+import compileall
+import os
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Python del runtime de las Lambdas (el bytecode sólo sirve para esta versión)
+LAMBDA_PYTHON_VERSION = (3, 11)
+
+# Paquete propio que se copia junto a cada handler
+FIRST_PARTY_PACKAGE = "tecno_etl"
+
+# Dependencias pesadas compartidas que pueden ir a un Layer
+LAYER_PACKAGES = ("pandas", "numpy", "pytz", "tzdata", "dateutil", "six")
+
+# Archivos comunes de botocore que se conservan aunque se poden los servicios
+BOTOCORE_SHARED_DATA = ("endpoints.json", "partitions.json", "sdk-default-configuration.json", "_retry.json")
+
+# Patrones que nunca hacen falta en tiempo de ejecución
+STRIP_PATTERNS = (
+    "**/__pycache__",
+    "**/*.pyc",
+    "**/*.pyo",
+    "**/*.dist-info",
+    "**/*.egg-info",
+    "**/tests",
+    "**/test",
+    "**/.git*",
+    "bin",
+)
+
+
+@dataclass
+class LambdaSpec:
+    """Configuración de empaquetado de una Lambda."""
+
+    name: str
+    # Módulos importados dentro de funciones del handler
+    runtime_imports: tuple[str, ...] = ()
+    # Servicios AWS usados (para podar los datos de botocore/boto3)
+    aws_services: tuple[str, ...] = ()
+    # Si las dependencias de LAYER_PACKAGES se mueven al Layer compartido
+    use_layer: bool = False
+    # Presupuestos (el empaquetado falla si se exceden)
+    max_unzipped_mb: float = 50.0
+    max_import_ms: float = 1000.0
+
+
+@dataclass
+class ImportTrace:
+    """Resultado de trazar el import del handler."""
+
+    modules: set[str] = field(default_factory=set)
+    # Tiempo acumulado del import de `lambda_function` en milisegundos
+    handler_import_ms: float = 0.0
+
+    @property
+    def top_level(self) -> set[str]:
+        return {module.split(".")[0] for module in self.modules}
+
+
+def directory_size(path: Path) -> int:
+    """Bytes totales de los archivos bajo `path`."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def parse_importtime(output: str) -> ImportTrace:
+    """
+    Interpreta la salida de `python -X importtime`.
+
+    Cada línea tiene el formato `import time: <self us> | <cumulative us> | <módulo>`
+    (con sangría según el anidamiento).
+    """
+    trace = ImportTrace()
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        module = parts[2].strip()
+        trace.modules.add(module)
+        if module == "lambda_function":
+            trace.handler_import_ms = int(parts[1]) / 1000
+    return trace
+
+
+def _import_env() -> dict:
+    env = os.environ.copy()
+    env.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    env.setdefault("AWS_ACCESS_KEY_ID", "packaging")
+    env.setdefault("AWS_SECRET_ACCESS_KEY", "packaging")
+    # Evita que el perfilado altere la medición
+    env.pop("TECNO_ETL_PROFILE", None)
+    return env
+
+
+def trace_imports(
+    package_dir: Path, runtime_imports: tuple[str, ...] = (), extra_paths: tuple[Path, ...] = ()
+) -> ImportTrace:
+    """
+    Importa el handler (y los `runtime_imports`) en un intérprete nuevo con
+    `-X importtime`, usando sólo el paquete (y el Layer) como path de terceros.
+
+    El intérprete corre aislado (`-I -S`: sin site-packages locales, sin
+    PYTHONPATH ni el directorio actual) y el path se arma explícitamente con
+    `package_dir` y `extra_paths`; `-B` evita escribir `.pyc` en el paquete.
+
+    Raises:
+        RuntimeError: Si el import falla (ej. una dependencia que falta en el
+            paquete o compilada para otra plataforma).
+    """
+    search_paths = [str(path) for path in (package_dir, *extra_paths)]
+    statements = [f"import sys; sys.path[:0] = {search_paths!r}", "import lambda_function"]
+    statements += [f"import {module}" for module in runtime_imports]
+    result = subprocess.run(
+        [sys.executable, "-I", "-S", "-B", "-X", "importtime", "-c", "; ".join(statements)],
+        cwd=package_dir,
+        env=_import_env(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "error desconocido"
+        raise RuntimeError(f"No se pudo importar el handler de {package_dir}: {error}")
+    return parse_importtime(result.stderr)
+
+
+def measure_import_ms(package_dir: Path, extra_paths: tuple[Path, ...] = (), repeat: int = 3) -> float:
+    """Mediana del tiempo de import en frío de `lambda_function` (un intérprete nuevo por medición)."""
+    samples = [
+        trace_imports(package_dir, extra_paths=extra_paths).handler_import_ms for _ in range(repeat)
+    ]
+    return statistics.median(samples)
+
+
+def _import_name(entry: Path) -> str:
+    """Nombre de import de una entrada del nivel superior del paquete."""
+    name = entry.name
+    if name.endswith(".libs"):
+        # Bibliotecas compartidas de un wheel (ej. numpy.libs)
+        return name[: -len(".libs")]
+    if entry.is_file():
+        # módulo.py o extensión compilada (módulo.cpython-311-x86_64-linux-gnu.so)
+        return name.split(".")[0]
+    return name
+
+
+def prune_unused(package_dir: Path, trace: ImportTrace) -> list[str]:
+    """
+    Elimina del paquete lo que la traza no importa.
+
+    - Dependencias de terceros: se eliminan las entradas de primer nivel cuyo
+      nombre de import no aparece en la traza (los metadatos `*.dist-info` se
+      tratan en `strip_package`).
+    - Paquete propio: se eliminan los módulos `.py` no importados.
+
+    Returns:
+        Rutas eliminadas (relativas al paquete).
+    """
+    removed = []
+    top_level = trace.top_level | {"lambda_function"}
+    for entry in sorted(package_dir.iterdir()):
+        if entry.name.endswith((".dist-info", ".egg-info")) or entry.name == "__pycache__":
+            continue
+        if _import_name(entry) not in top_level:
+            shutil.rmtree(entry) if entry.is_dir() else entry.unlink()
+            removed.append(entry.name)
+
+    first_party = package_dir / FIRST_PARTY_PACKAGE
+    if first_party.exists():
+        for module_path in sorted(first_party.rglob("*.py")):
+            relative = module_path.relative_to(package_dir).with_suffix("")
+            parts = relative.parts[:-1] if relative.name == "__init__" else relative.parts
+            if ".".join(parts) not in trace.modules:
+                module_path.unlink()
+                removed.append(str(relative) + ".py")
+        # Subpaquetes que quedaron vacíos
+        for directory in sorted(first_party.rglob("*"), reverse=True):
+            if directory.is_dir() and not any(directory.rglob("*.py")):
+                shutil.rmtree(directory)
+    return removed
+
+
+def prune_aws_data(package_dir: Path, services: tuple[str, ...]) -> int:
+    """
+    Elimina los modelos de botocore/boto3 de servicios no usados.
+
+    botocore incluye la definición JSON de todos los servicios de AWS (la mayor
+    parte de su tamaño); la función sólo necesita los que usa.
+
+    Returns:
+        Bytes eliminados.
+    """
+    removed_bytes = 0
+    for data_dir in (package_dir / "botocore" / "data", package_dir / "boto3" / "data"):
+        if not data_dir.exists():
+            continue
+        for entry in data_dir.iterdir():
+            if entry.name in services or entry.name in BOTOCORE_SHARED_DATA:
+                continue
+            if entry.is_dir():
+                removed_bytes += directory_size(entry)
+                shutil.rmtree(entry)
+    return removed_bytes
+
+
+def strip_package(package_dir: Path) -> int:
+    """
+    Elimina cachés, tests, metadatos de instalación y scripts.
+
+    Returns:
+        Bytes eliminados.
+    """
+    removed_bytes = 0
+    for pattern in STRIP_PATTERNS:
+        for item in list(package_dir.glob(pattern)):
+            if not item.exists():
+                continue
+            if item.is_dir():
+                removed_bytes += directory_size(item)
+                shutil.rmtree(item)
+            else:
+                removed_bytes += item.stat().st_size
+                item.unlink()
+    return removed_bytes
+
+
+def compile_package(package_dir: Path) -> bool:
+    """
+    Precompila el bytecode del paquete en `__pycache__`.
+
+    El sistema de archivos de Lambda es de sólo lectura, así que sin `.pyc`
+    empaquetados cada arranque en frío vuelve a compilar todos los módulos.
+    Se usa invalidación por hash sin verificar: el ZIP no conserva los mtime
+    con la precisión que Python compara.
+
+    Returns:
+        False si el intérprete no coincide con el runtime de Lambda (el
+        bytecode no serviría) y no se compiló nada.
+    """
+    if sys.version_info[:2] != LAMBDA_PYTHON_VERSION:
+        return False
+    return compileall.compile_dir(
+        str(package_dir),
+        quiet=1,
+        workers=0,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    )
+
+
+def move_to_layer(package_dir: Path, layer_dir: Path, packages: tuple[str, ...] = LAYER_PACKAGES) -> list[str]:
+    """
+    Mueve las dependencias compartidas del paquete de la función al Layer
+    (`layer_dir` corresponde a la carpeta `python/` del ZIP del Layer).
+
+    Returns:
+        Entradas movidas.
+    """
+    layer_dir.mkdir(parents=True, exist_ok=True)
+    moved = []
+    for entry in sorted(package_dir.iterdir()):
+        name = entry.name.split("-")[0] if entry.name.endswith(".dist-info") else _import_name(entry)
+        if name not in packages:
+            continue
+        target = layer_dir / entry.name
+        if target.exists():
+            shutil.rmtree(entry) if entry.is_dir() else entry.unlink()
+        else:
+            shutil.move(str(entry), str(target))
+        moved.append(entry.name)
+    return moved
+
+
+def check_budget(spec: LambdaSpec, unzipped_bytes: int, import_ms: float | None) -> list[str]:
+    """Mensajes de los presupuestos excedidos (lista vacía si se respetan)."""
+    violations = []
+    unzipped_mb = unzipped_bytes / 2**20
+    if unzipped_mb > spec.max_unzipped_mb:
+        violations.append(
+            f"{spec.name}: tamaño descomprimido {unzipped_mb:.1f} MB > {spec.max_unzipped_mb:.1f} MB"
+        )
+    if import_ms is not None and import_ms > spec.max_import_ms:
+        violations.append(
+            f"{spec.name}: import en frío {import_ms:.0f} ms > {spec.max_import_ms:.0f} ms"
+        )
+    return violations
@@ -0,0 +1,151 @@
+"""
+Perfilado bajo demanda (CPU y memoria) de los handlers Lambda.
+
+Cuando una invocación de Silver o Gold es lenta en producción no hay forma de
+reproducir dónde se fue el tiempo. El decorador `profile_handler` perfila una
+invocación concreta con `cProfile` y `tracemalloc` y resume:
+
+- las N funciones con mayor tiempo acumulado, y
+- los N sitios (archivo:línea) con más memoria asignada al terminar.
+
+Se activa por invocación con la variable de entorno `TECNO_ETL_PROFILE=1`
+o con `"profile": true` en el evento. En Lambda el resumen va a los logs;
+fuera de Lambda (o con `TECNO_ETL_PROFILE_DIR`) se escribe en
+`reports/profiles/` junto con el volcado `.prof` para abrirlo con snakeviz
+o `pstats`.
+
+Desactivado, el costo es una lectura de variable de entorno y un `dict.get`
+por invocación: ni el profiler ni tracemalloc se inician.
+
+Example:
+    ```python
+    @profile_handler
+    def lambda_handler(event, context):
+        ...
+    ```
+"""
+
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV_VAR = "TECNO_ETL_PROFILE"
+PROFILE_DIR_ENV_VAR = "TECNO_ETL_PROFILE_DIR"
+PROFILE_EVENT_FLAG = "profile"
+
+DEFAULT_TOP_N = 20
+DEFAULT_OUTPUT_DIR = Path("reports/profiles")
+
+# Frames guardados por asignación (más frames = más overhead de tracemalloc)
+TRACEMALLOC_FRAMES = 1
+
+_TRUTHY = {"1", "true", "yes", "on"}
+
+
+def profiling_requested(event) -> bool:
+    """True si la variable de entorno o el flag del evento piden perfilar la invocación."""
+    if os.environ.get(PROFILE_ENV_VAR, "").lower() in _TRUTHY:
+        return True
+    return isinstance(event, dict) and bool(event.get(PROFILE_EVENT_FLAG))
+
+
+def summarize_profile(
+    profiler: cProfile.Profile,
+    snapshot: tracemalloc.Snapshot,
+    top_n: int = DEFAULT_TOP_N,
+    title: str = "",
+) -> str:
+    """Resumen compacto en texto: top N funciones por tiempo acumulado y top N sitios de asignación."""
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    buffer.write(f"=== Perfil {title} ===\n")
+    buffer.write(f"--- CPU: top {top_n} funciones por tiempo acumulado ---\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+
+    allocations = snapshot.statistics("lineno")
+    total_kib = sum(stat.size for stat in allocations) / 1024
+    buffer.write(f"--- Memoria: top {top_n} sitios de asignación (total {total_kib:.1f} KiB) ---\n")
+    for stat in allocations[:top_n]:
+        frame = stat.traceback[0]
+        buffer.write(
+            f"{stat.size / 1024:10.1f} KiB {stat.count:8d} bloques  {frame.filename}:{frame.lineno}\n"
+        )
+    return buffer.getvalue()
+
+
+def _output_dir() -> Path | None:
+    """Directorio donde escribir el perfil, o None para enviarlo a los logs (en Lambda)."""
+    configured = os.environ.get(PROFILE_DIR_ENV_VAR)
+    if configured:
+        return Path(configured)
+    if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+        return None
+    return DEFAULT_OUTPUT_DIR
+
+
+def profile_handler(func=None, *, name: str | None = None, top_n: int = DEFAULT_TOP_N):
+    """
+    Decorador de `lambda_handler` que perfila las invocaciones que lo pidan.
+
+    Se puede usar como `@profile_handler` o `@profile_handler(name="silver_transformation")`.
+
+    Args:
+        name: Nombre del perfil (por defecto, el módulo del handler)
+        top_n: Cantidad de funciones y sitios de asignación en el resumen
+    """
+    if func is None:
+        return functools.partial(profile_handler, name=name, top_n=top_n)
+
+    name = name or func.__module__
+
+    @functools.wraps(func)
+    def wrapper(event, context):
+        if not profiling_requested(event):
+            return func(event, context)
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            return func(event, context)
+        finally:
+            profiler.disable()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            _report(profiler, snapshot, name, elapsed_ms, top_n)
+
+    return wrapper
+
+
+def _report(
+    profiler: cProfile.Profile,
+    snapshot: tracemalloc.Snapshot,
+    name: str,
+    elapsed_ms: float,
+    top_n: int,
+) -> None:
+    summary = summarize_profile(profiler, snapshot, top_n, title=f"{name} ({elapsed_ms:.0f} ms)")
+    output_dir = _output_dir()
+    if output_dir is None:
+        logger.info(summary)
+        return
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{name}_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+    summary_path = output_dir / f"{stem}.txt"
+    summary_path.write_text(summary, encoding="utf-8")
+    profiler.dump_stats(output_dir / f"{stem}.prof")
+    logger.info(f"📊 Perfil de {name} guardado en {summary_path}")
@@ -0,0 +1,265 @@
+"""
+Ledger de corridas del pipeline: progreso y latencia por etapa de cada archivo.
+
+Cada archivo (`file_id`) tiene un item en la tabla `tecnomundo_pipeline_runs`.
+El invocador lo crea al enviar el archivo y cada etapa (Bronze, Silver, Gold)
+registra con un `UpdateItem` (atómico) su inicio, su fin y las filas de
+entrada y salida:
+
+    file_id, file_name, status, current_stage, submitted_at, completed_at,
+    bronze_started_at, bronze_finished_at, bronze_rows_in, bronze_rows_out, ...
+
+`status` pasa por submitted -> running -> completed (o failed). La etapa que
+termina el archivo (Gold, o Silver en modo fusionado) marca `completed_at`.
+Los timestamps son ISO en UTC: el invocador corre en una máquina local y las
+Lambdas en UTC.
+
+Con estos datos el invocador puede esperar a que los archivos terminen
+(`wait_for`) y `scripts/reporte_corridas.py` muestra las corridas en curso y
+las terminadas con la latencia por etapa y los percentiles de punta a punta.
+
+Como el ledger de capacidad, un error al escribir se registra en el log sin
+interrumpir la etapa.
+"""
+
+import logging
+import os
+import statistics
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+RUN_LEDGER_TABLE = os.getenv("RUN_LEDGER_TABLE", "tecnomundo_pipeline_runs")
+
+STAGES = ("bronze", "silver", "gold")
+
+STATUS_SUBMITTED = "submitted"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+FINAL_STATUSES = (STATUS_COMPLETED, STATUS_FAILED)
+
+DEFAULT_WAIT_TIMEOUT_S = 900
+DEFAULT_POLL_S = 2.0
+MAX_POLL_S = 15.0
+
+
+def utc_now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def make_file_id(file_name: str, now: datetime | None = None) -> str:
+    """file_id de un archivo: nombre sin extensión + timestamp (el formato de Bronze)."""
+    timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
+    return f"{Path(file_name).name.split('.')[0]}_{timestamp}"
+
+
+def _seconds_between(start: str | None, end: str | None) -> float | None:
+    if not start or not end:
+        return None
+    return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+
+
+def stage_latencies(run: dict) -> dict[str, float]:
+    """Duración en segundos de cada etapa terminada de una corrida."""
+    latencies = {}
+    for stage in STAGES:
+        seconds = _seconds_between(run.get(f"{stage}_started_at"), run.get(f"{stage}_finished_at"))
+        if seconds is not None:
+            latencies[stage] = seconds
+    return latencies
+
+
+def end_to_end_s(run: dict) -> float | None:
+    """Segundos desde el envío (o el inicio de Bronze) hasta que el archivo terminó."""
+    return _seconds_between(run.get("submitted_at") or run.get("bronze_started_at"), run.get("completed_at"))
+
+
+def describe_run(run: dict) -> str:
+    """Una línea con el estado, la latencia por etapa y la de punta a punta de una corrida."""
+    latencies = stage_latencies(run)
+    stages = "  ".join(
+        f"{stage}={latencies[stage]:.1f}s" if stage in latencies
+        else f"{stage}=…" if run.get(f"{stage}_started_at") else f"{stage}=-"
+        for stage in STAGES
+    )
+    total = end_to_end_s(run)
+    rows = run.get("gold_rows_out", run.get("silver_rows_out", run.get("bronze_rows_out")))
+    return (
+        f"{run['file_id']:<45} {run.get('status', '?'):<10} {stages:<45} "
+        f"total={f'{total:.1f}s' if total is not None else '-':>8}  filas={rows if rows is not None else '-'}"
+    )
+
+
+class RunLedger:
+    """
+    Registro de corridas sobre la tabla del ledger (recurso boto3).
+
+    Args:
+        table: Tabla `tecnomundo_pipeline_runs` (clave: file_id)
+        clock: Función que devuelve el timestamp actual (ISO, UTC)
+    """
+
+    def __init__(self, table, clock: Callable[[], str] = utc_now):
+        self.table = table
+        self._clock = clock
+
+    def _update(self, file_id: str, values: dict, remove: tuple[str, ...] = ()) -> bool:
+        names = {f"#a{i}": name for i, name in enumerate(values)}
+        attribute_values = {f":v{i}": value for i, value in enumerate(values.values())}
+        expression = "SET " + ", ".join(f"#a{i} = :v{i}" for i in range(len(values)))
+        if remove:
+            names.update({f"#r{i}": name for i, name in enumerate(remove)})
+            expression += " REMOVE " + ", ".join(f"#r{i}" for i in range(len(remove)))
+        try:
+            self.table.update_item(
+                Key={"file_id": file_id},
+                UpdateExpression=expression,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=attribute_values,
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo actualizar el ledger de corridas para {file_id}: {e}")
+            return False
+        return True
+
+    def submitted(self, file_id: str, file_name: str) -> bool:
+        """El invocador envió el archivo a Bronze."""
+        now = self._clock()
+        return self._update(file_id, {
+            "file_name": file_name,
+            "status": STATUS_SUBMITTED,
+            "submitted_at": now,
+            "updated_at": now,
+        })
+
+    def start(self, file_id: str, stage: str, rows_in: int | None = None) -> bool:
+        """Una etapa empezó a procesar el archivo."""
+        now = self._clock()
+        values = {
+            "status": STATUS_RUNNING,
+            "current_stage": stage,
+            f"{stage}_started_at": now,
+            "updated_at": now,
+        }
+        if rows_in is not None:
+            values[f"{stage}_rows_in"] = rows_in
+        return self._update(file_id, values)
+
+    def finish(
+        self, file_id: str, stage: str, rows_in: int, rows_out: int, final: bool = False
+    ) -> bool:
+        """
+        Una etapa terminó. `final` indica que es la última del archivo (Gold, o
+        Silver en modo fusionado).
+        """
+        now = self._clock()
+        values = {
+            f"{stage}_finished_at": now,
+            f"{stage}_rows_in": rows_in,
+            f"{stage}_rows_out": rows_out,
+            "updated_at": now,
+        }
+        if final:
+            values.update(status=STATUS_COMPLETED, completed_at=now)
+        return self._update(file_id, values, remove=("current_stage",) if final else ())
+
+    def fail(self, file_id: str, stage: str, error: str) -> bool:
+        """Una etapa falló con el archivo."""
+        now = self._clock()
+        return self._update(file_id, {
+            "status": STATUS_FAILED,
+            f"{stage}_error": error[:1000],
+            "failed_at": now,
+            "updated_at": now,
+        })
+
+    def get(self, file_id: str) -> dict | None:
+        return self.table.get_item(Key={"file_id": file_id}, ConsistentRead=True).get("Item")
+
+    def scan(self) -> list[dict]:
+        """Todas las corridas del ledger."""
+        runs = []
+        kwargs = {}
+        while True:
+            response = self.table.scan(**kwargs)
+            runs.extend(response["Items"])
+            if "LastEvaluatedKey" not in response:
+                return runs
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def wait_for(
+        self,
+        file_ids: list[str],
+        timeout_s: float = DEFAULT_WAIT_TIMEOUT_S,
+        poll_s: float = DEFAULT_POLL_S,
+        sleep: Callable[[float], None] = time.sleep,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> dict[str, dict | None]:
+        """
+        Espera a que las corridas terminen (completed o failed), consultando el
+        ledger con un intervalo creciente (hasta `MAX_POLL_S`).
+
+        Returns:
+            La última versión de cada corrida (None si nunca apareció en el
+            ledger). Las que no terminaron antes del timeout conservan su estado.
+            Un error al consultar el ledger (ej. throttling) se registra en el
+            log y la corrida se vuelve a consultar en la siguiente vuelta.
+        """
+        deadline = monotonic() + timeout_s
+        runs: dict[str, dict | None] = dict.fromkeys(file_ids)
+        pending = set(file_ids)
+        while True:
+            for file_id in sorted(pending):
+                try:
+                    runs[file_id] = self.get(file_id)
+                except Exception as e:
+                    logger.warning(f"No se pudo consultar el ledger de corridas para {file_id}: {e}")
+                    continue
+                if runs[file_id] and runs[file_id].get("status") in FINAL_STATUSES:
+                    pending.discard(file_id)
+            remaining = deadline - monotonic()
+            if not pending or remaining <= 0:
+                return runs
+            logger.info(f"⏳ {len(pending)} corridas en curso...")
+            sleep(min(poll_s, remaining))
+            poll_s = min(poll_s * 1.5, MAX_POLL_S)
+
+
+def _quantiles(values: list[float]) -> dict[str, float]:
+    if len(values) == 1:
+        return {"p50": values[0], "p95": values[0]}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94]}
+
+
+def summarize_runs(runs: list[dict], bucket: str = "day") -> dict:
+    """
+    Resumen de corridas: en curso, fallidas y, para las terminadas, la latencia
+    p50/p95 de punta a punta y por etapa, en total y por período ('day' u 'hour').
+    """
+    bucket_length = {"day": 10, "hour": 13}[bucket]
+    completed = [run for run in runs if run.get("status") == STATUS_COMPLETED and end_to_end_s(run) is not None]
+    summary = {
+        "in_flight": [run for run in runs if run.get("status") not in FINAL_STATUSES],
+        "failed": [run for run in runs if run.get("status") == STATUS_FAILED],
+        "completed": len(completed),
+        "end_to_end": _quantiles([end_to_end_s(r) for r in completed]) if completed else {},
+        "stages": {},
+        "by_period": {},
+    }
+    for stage in STAGES:
+        values = [stage_latencies(run)[stage] for run in completed if stage in stage_latencies(run)]
+        if values:
+            summary["stages"][stage] = _quantiles(values)
+
+    periods: dict[str, list[float]] = {}
+    for run in completed:
+        periods.setdefault(run["completed_at"][:bucket_length], []).append(end_to_end_s(run))
+    summary["by_period"] = {
+        period: {"runs": len(values), **_quantiles(values)} for period, values in sorted(periods.items())
+    }
+    return summary
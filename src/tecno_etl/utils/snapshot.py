@@ -0,0 +1,35 @@
+"""
+Snapshots locales en JSON (clave -> valor) del estado de una tabla.
+
+Guardar el estado después de cada carga evita un scan completo de la tabla en
+la corrida siguiente (ej. el stock actual por producto, ver
+tecno_etl.pipelines.stock_pipeline). Si el archivo no existe o no se puede
+leer, el llamador vuelve a leer la tabla.
+"""
+
+import json
+import logging
+from collections.abc import Mapping
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def load_json_snapshot(path: Path | str) -> dict | None:
+    """Snapshot guardado en `path`, o None si no existe o no se puede leer."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Snapshot ilegible ({path}): {e}")
+        return None
+
+
+def save_json_snapshot(data: Mapping, path: Path | str) -> Path:
+    """Guarda el snapshot en `path` (creando el directorio) y devuelve la ruta."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(data), sort_keys=True, ensure_ascii=False), encoding="utf-8")
+    return path
@@ -1,6 +1,6 @@
 """Módulo de validación de datos."""
 
-from tecno_etl.validators.schemas import (
+from .schemas import (
     CategoryRecord,
     SalesRecord,
     StockRecord,
@@ -0,0 +1,336 @@
+"""
+Caché persistente de resultados de validación por huella de fila.
+
+Cuando se vuelve a exportar el mismo mes con algunas líneas corregidas, la
+mayoría de las filas ya fueron validadas en una corrida anterior. La caché
+guarda, por cada fila, si fue válida o el texto de su error, indexado por:
+
+- una huella estable de 128 bits de los valores (y tipos) de la fila, y
+- un contexto que combina la versión del esquema (campos, restricciones y
+  código de los validadores), los nombres de columna y sus dtypes.
+
+Cambiar el modelo o el layout de columnas cambia el contexto, por lo que las
+entradas anteriores dejan de coincidir. Los resultados inválidos vencen tras
+`invalid_ttl_s` porque algunos dependen de la fecha actual (ej. "fecha futura").
+La caché está acotada a `max_entries` con desalojo LRU.
+
+Cada contexto se guarda como un segmento NumPy (`<contexto>.npz`) con las
+huellas, el resultado y las marcas de tiempo, más un JSON con los mensajes de
+error. La búsqueda es una operación de índice hash vectorizada, de modo que
+consultar 100k filas cuesta milisegundos.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pydantic
+
+logger = logging.getLogger(__name__)
+
+# Claves de hash independientes (16 bytes) para obtener dos huellas de 64 bits
+_HASH_KEYS = ("tecno_etl_row_h1", "tecno_etl_row_h2")
+
+
+def schema_version(model: type[pydantic.BaseModel]) -> str:
+    """
+    Versión del esquema: cambia si cambian los campos, restricciones o validadores.
+    """
+    parts = [
+        pydantic.VERSION,
+        json.dumps(model.model_json_schema(), sort_keys=True, default=str),
+        json.dumps(dict(sorted(model.model_config.items())), default=str),
+    ]
+    decorators = model.__pydantic_decorators__
+    for group in (decorators.field_validators, decorators.model_validators):
+        for name in sorted(group):
+            func = group[name].func
+            try:
+                parts.append(inspect.getsource(func))
+            except (OSError, TypeError):
+                parts.append(getattr(func, "__qualname__", name))
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class _Segment:
+    """Entradas de un contexto: arrays alineados por entrada más los mensajes de error."""
+
+    def __init__(
+        self,
+        h1: np.ndarray,
+        h2: np.ndarray,
+        valid: np.ndarray,
+        created_at: np.ndarray,
+        last_used: np.ndarray,
+        errors: dict[int, str],
+    ):
+        self.h1 = h1
+        self.h2 = h2
+        self.valid = valid
+        self.created_at = created_at
+        self.last_used = last_used
+        self.errors = errors
+        self.index = pd.Index(h1)
+        self.dirty = False
+
+    @classmethod
+    def empty(cls) -> "_Segment":
+        return cls(
+            np.empty(0, np.uint64),
+            np.empty(0, np.uint64),
+            np.empty(0, bool),
+            np.empty(0, np.float64),
+            np.empty(0, np.float64),
+            {},
+        )
+
+    def __len__(self) -> int:
+        return len(self.h1)
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Conserva sólo las entradas marcadas en `mask`."""
+        kept = set(self.h1[mask & ~self.valid].tolist())
+        self.errors = {h: msg for h, msg in self.errors.items() if h in kept}
+        self.h1, self.h2 = self.h1[mask], self.h2[mask]
+        self.valid = self.valid[mask]
+        self.created_at, self.last_used = self.created_at[mask], self.last_used[mask]
+        self.index = pd.Index(self.h1)
+        self.dirty = True
+
+
+class ValidationCache:
+    """
+    Caché de validación persistente con desalojo LRU y estadísticas de aciertos.
+
+    Example:
+        ```python
+        with ValidationCache("reports/cache/validation") as cache:
+            df_ok, df_err = validate_dataframe(df, SalesRecord, cache=cache)
+        ```
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        max_entries: int = 2_000_000,
+        invalid_ttl_s: float = 24 * 3600,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.invalid_ttl_s = invalid_ttl_s
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._segments: dict[str, _Segment] = {}
+
+    def __enter__(self) -> "ValidationCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def context(self, df: pd.DataFrame, model: type[pydantic.BaseModel]) -> str:
+        """Identificador del esquema y del layout (columnas y dtypes) del DataFrame."""
+        layout = [(str(col), str(dtype)) for col, dtype in df.dtypes.items()]
+        payload = json.dumps([schema_version(model), layout], default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def fingerprint(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Huella de 128 bits (dos arrays uint64) de los valores de cada fila.
+
+        En columnas object o de texto (el dtype `str` de pandas 3) se incorpora
+        el tipo de cada valor, ya que 1, 1.0 y "1" producen resultados de
+        validación distintos.
+        """
+        frame = df.reset_index(drop=True)
+        text_columns = [
+            col for col in frame.columns
+            if pd.api.types.is_object_dtype(frame[col]) or pd.api.types.is_string_dtype(frame[col])
+        ]
+        for col in text_columns:
+            frame[f"__type__{col}"] = frame[col].map(lambda v: type(v).__name__)
+
+        return tuple(
+            pd.util.hash_pandas_object(frame, index=False, hash_key=key).to_numpy()
+            for key in _HASH_KEYS
+        )
+
+    # --- Persistencia ---------------------------------------------------------
+
+    def _paths(self, context: str) -> tuple[Path, Path]:
+        return self.directory / f"{context}.npz", self.directory / f"{context}.errors.json"
+
+    def _segment(self, context: str) -> _Segment:
+        if context not in self._segments:
+            data_path, errors_path = self._paths(context)
+            if data_path.exists():
+                with np.load(data_path) as data:
+                    errors = {}
+                    if errors_path.exists():
+                        raw = json.loads(errors_path.read_text(encoding="utf-8"))
+                        errors = {int(h): msg for h, msg in raw.items()}
+                    segment = _Segment(
+                        data["h1"],
+                        data["h2"],
+                        data["valid"],
+                        data["created_at"],
+                        data["last_used"],
+                        errors,
+                    )
+            else:
+                segment = _Segment.empty()
+            self._segments[context] = segment
+        return self._segments[context]
+
+    def _save(self, context: str, segment: _Segment) -> None:
+        data_path, errors_path = self._paths(context)
+        if len(segment) == 0:
+            data_path.unlink(missing_ok=True)
+            errors_path.unlink(missing_ok=True)
+            return
+        # Escritura atómica: archivo temporal + reemplazo
+        tmp = data_path.with_suffix(".tmp.npz")
+        np.savez(
+            tmp,
+            h1=segment.h1,
+            h2=segment.h2,
+            valid=segment.valid,
+            created_at=segment.created_at,
+            last_used=segment.last_used,
+        )
+        os.replace(tmp, data_path)
+        tmp = errors_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({str(h): msg for h, msg in segment.errors.items()}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, errors_path)
+        segment.dirty = False
+
+    def flush(self) -> None:
+        """Persiste los segmentos modificados (incluidas las marcas de último uso)."""
+        for context, segment in self._segments.items():
+            if segment.dirty:
+                self._save(context, segment)
+
+    def close(self) -> None:
+        self.flush()
+        self._segments.clear()
+
+    # --- Consulta y escritura -------------------------------------------------
+
+    def lookup(
+        self, context: str, h1: np.ndarray, h2: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Busca las huellas en la caché.
+
+        Returns:
+            (encontradas, válidas, mensajes de error) alineados con las filas.
+        """
+        n = len(h1)
+        segment = self._segment(context)
+        valid = np.zeros(n, dtype=bool)
+        errors = np.empty(n, dtype=object)
+
+        positions = segment.index.get_indexer(h1) if len(segment) else np.full(n, -1)
+        found = positions >= 0
+        safe = np.where(found, positions, 0)
+        if len(segment):
+            now = time.time()
+            found &= segment.h2[safe] == h2
+            found &= segment.valid[safe] | (segment.created_at[safe] >= now - self.invalid_ttl_s)
+            valid[found] = segment.valid[safe[found]]
+            for pos in np.flatnonzero(found & ~valid):
+                errors[pos] = segment.errors.get(int(h1[pos]))
+            segment.last_used[positions[found]] = now
+            segment.dirty = segment.dirty or bool(found.any())
+
+        hits = int(found.sum())
+        self.hits += hits
+        self.misses += n - hits
+        return found, valid, errors
+
+    def store(
+        self,
+        context: str,
+        h1: np.ndarray,
+        h2: np.ndarray,
+        valid: np.ndarray,
+        errors: list[str | None],
+    ) -> None:
+        """Guarda los resultados de validación, aplica el límite de tamaño y persiste."""
+        if len(h1) == 0:
+            return
+        segment = self._segment(context)
+
+        # Las huellas nuevas reemplazan a las existentes (y a sus duplicadas en el lote)
+        new = pd.DataFrame({"h1": h1, "h2": h2, "valid": np.asarray(valid, dtype=bool)})
+        new["error"] = errors
+        new = new.drop_duplicates("h1", keep="last")
+        segment.keep(~np.isin(segment.h1, new["h1"].to_numpy()))
+
+        now = time.time()
+        count = len(new)
+        segment.h1 = np.concatenate([segment.h1, new["h1"].to_numpy(np.uint64)])
+        segment.h2 = np.concatenate([segment.h2, new["h2"].to_numpy(np.uint64)])
+        segment.valid = np.concatenate([segment.valid, new["valid"].to_numpy(bool)])
+        segment.created_at = np.concatenate([segment.created_at, np.full(count, now)])
+        segment.last_used = np.concatenate([segment.last_used, np.full(count, now)])
+        invalid = new[~new["valid"]]
+        segment.errors.update(zip(invalid["h1"].astype("uint64").tolist(), invalid["error"], strict=True))
+        segment.index = pd.Index(segment.h1)
+        segment.dirty = True
+
+        self._evict()
+        self.flush()
+
+    def _load_all(self) -> None:
+        for data_path in self.directory.glob("*.npz"):
+            if not data_path.name.endswith(".tmp.npz"):
+                self._segment(data_path.stem)
+
+    def _evict(self) -> None:
+        """Desaloja las entradas usadas hace más tiempo hasta respetar `max_entries`."""
+        self._load_all()
+        total = sum(len(s) for s in self._segments.values())
+        excess = total - self.max_entries
+        if excess <= 0:
+            return
+
+        segments = list(self._segments.values())
+        last_used = np.concatenate([s.last_used for s in segments])
+        owner = np.repeat(np.arange(len(segments)), [len(s) for s in segments])
+        offsets = np.cumsum([0] + [len(s) for s in segments[:-1]])
+        # Las `excess` entradas con la marca de uso más antigua
+        oldest = np.argpartition(last_used, excess - 1)[:excess]
+        for i, segment in enumerate(segments):
+            drop = np.zeros(len(segment), dtype=bool)
+            drop[oldest[owner[oldest] == i] - offsets[i]] = True
+            if drop.any():
+                segment.keep(~drop)
+        self.evictions += excess
+        logger.info(f"Caché de validación: {excess} entradas desalojadas (LRU)")
+
+    def stats(self) -> dict:
+        self._load_all()
+        return {
+            "entries": sum(len(s) for s in self._segments.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,405 @@
+"""
+Compilador de restricciones columnar para los modelos Pydantic.
+
+Traduce las restricciones de `Field` (gt, ge, lt, le, min_length, max_length)
+y los validadores conocidos de `SalesRecord`, `StockRecord` y `CategoryRecord`
+a máscaras vectorizadas sobre el DataFrame completo.
+
+La máscara es conservadora: una fila se marca como válida sólo si es seguro
+que Pydantic también la aceptaría. Las filas restantes (valores ausentes,
+tipos inesperados, fechas en formatos no canónicos, valores límite) se
+validan con el modelo Pydantic fila a fila, por lo que la separación
+válidos/errores y los mensajes de error son idénticos a los de la ruta
+original.
+
+Si un modelo tiene un tipo de campo, una restricción o un validador sin
+equivalente vectorizado, `compile_model` devuelve None y la validación
+completa se hace con Pydantic.
+"""
+
+import logging
+import re
+import types
+from collections.abc import Callable
+from datetime import datetime
+from functools import cache
+from typing import Union, get_args, get_origin
+
+import annotated_types
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Formatos de fecha que aceptan los validadores de los modelos, con la forma
+# canónica (con ceros a la izquierda) que se certifica de forma vectorizada.
+_DATE_FORMATS = (
+    ("%Y-%m-%d", re.compile(r"\d{4}-\d{2}-\d{2}")),
+    ("%d/%m/%Y", re.compile(r"\d{2}/\d{2}/\d{4}")),
+    ("%Y-%m-%d %H:%M:%S", re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")),
+)
+
+_CONSTRAINTS = {
+    annotated_types.Gt: "gt",
+    annotated_types.Ge: "ge",
+    annotated_types.Lt: "lt",
+    annotated_types.Le: "le",
+    annotated_types.MinLen: "min_length",
+    annotated_types.MaxLen: "max_length",
+}
+
+
+class _FieldSpec:
+    """Descripción compilada de un campo del modelo."""
+
+    def __init__(self, name: str, kind: str, optional: bool, required: bool):
+        self.name = name
+        self.kind = kind  # 'str', 'number', 'int' o 'datetime_str'
+        self.optional = optional
+        self.required = required
+        self.constraints: dict[str, float] = {}
+
+
+class _Columns:
+    """
+    Vista del DataFrame con conversiones cacheadas por columna.
+
+    Las columnas de texto se factorizan: los chequeos se evalúan sobre los
+    valores únicos y se proyectan a las filas con los códigos.
+    """
+
+    def __init__(self, df: pd.DataFrame, strip: bool, now: datetime):
+        self.df = df
+        self.strip = strip
+        self.now = np.datetime64(now)
+        self._strings: dict[str, tuple[np.ndarray, pd.Series, np.ndarray]] = {}
+        self._numbers: dict[str, np.ndarray | None] = {}
+        self._dates: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def strings(self, name: str) -> tuple[np.ndarray, pd.Series, np.ndarray]:
+        """
+        Returns:
+            (codes, únicos normalizados, máscara de únicos que son str).
+            Los códigos valen -1 para valores nulos.
+        """
+        if name not in self._strings:
+            codes, uniques = pd.factorize(self.df[name])
+            uniques = pd.Series(np.asarray(uniques, dtype=object))
+            is_str = uniques.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+            values = uniques.where(is_str, "").astype(object)
+            if self.strip:
+                values = values.str.strip()
+            self._strings[name] = (codes, values, is_str)
+        return self._strings[name]
+
+    def numbers(self, name: str) -> np.ndarray | None:
+        """Valores numéricos como float64 (NaN para nulos) o None si la columna no es numérica."""
+        if name not in self._numbers:
+            col = self.df[name]
+            values = None
+            if pd.api.types.is_bool_dtype(col):
+                values = None
+            elif pd.api.types.is_numeric_dtype(col):
+                values = col.to_numpy(dtype="float64", na_value=np.nan)
+            elif col.dtype == object and pd.api.types.infer_dtype(col, skipna=False) in (
+                "integer",
+                "floating",
+                "mixed-integer-float",
+            ):
+                values = col.to_numpy(dtype="float64", na_value=np.nan)
+            self._numbers[name] = values
+        return self._numbers[name]
+
+    def dates(self, name: str) -> np.ndarray:
+        """
+        Fechas certificables como datetime64 (NaT donde no se puede asegurar el parseo).
+
+        Acepta columnas datetime64 sin zona horaria o texto en los formatos
+        canónicos de `_DATE_FORMATS`.
+        """
+        if name not in self._dates:
+            col = self.df[name]
+            if pd.api.types.is_datetime64_dtype(col):
+                parsed = col.to_numpy(dtype="datetime64[ns]")
+            else:
+                codes, values, is_str = self.strings(name)
+                unique_dates = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+                for fmt, pattern in _DATE_FORMATS:
+                    pending = is_str & unique_dates.isna().to_numpy()
+                    matches = values[pending].map(lambda v, p=pattern: p.fullmatch(v) is not None)
+                    candidates = values[pending][matches.to_numpy(dtype=bool)]
+                    unique_dates.loc[candidates.index] = pd.to_datetime(
+                        candidates, format=fmt, errors="coerce"
+                    )
+                lookup = np.append(unique_dates.to_numpy(), np.datetime64("NaT", "ns"))
+                parsed = lookup[codes]
+            self._dates[name] = parsed
+        return self._dates[name]
+
+
+def _string_mask(cols: _Columns, spec: _FieldSpec) -> np.ndarray:
+    codes, values, is_str = cols.strings(spec.name)
+    lengths = values.str.len().to_numpy()
+    unique_ok = is_str.copy()
+    if "min_length" in spec.constraints:
+        unique_ok &= lengths >= spec.constraints["min_length"]
+    if "max_length" in spec.constraints:
+        unique_ok &= lengths <= spec.constraints["max_length"]
+
+    mask = np.append(unique_ok, False)[codes]
+    if spec.optional:
+        # Sólo None es un nulo válido; NaN falla en Pydantic ("valid string")
+        nulls = np.flatnonzero(codes == -1)
+        column = cols.df[spec.name].to_numpy(dtype=object)
+        mask[nulls] = [column[i] is None for i in nulls]
+    return mask
+
+
+def _number_mask(cols: _Columns, spec: _FieldSpec) -> np.ndarray:
+    values = cols.numbers(spec.name)
+    if values is None:
+        return np.zeros(len(cols), dtype=bool)
+    if spec.kind == "int" and not pd.api.types.is_integer_dtype(cols.df[spec.name]):
+        return np.zeros(len(cols), dtype=bool)
+
+    mask = ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        if "gt" in spec.constraints:
+            mask &= values > spec.constraints["gt"]
+        if "ge" in spec.constraints:
+            mask &= values >= spec.constraints["ge"]
+        if "lt" in spec.constraints:
+            mask &= values < spec.constraints["lt"]
+        if "le" in spec.constraints:
+            mask &= values <= spec.constraints["le"]
+    return mask
+
+
+def _datetime_str_mask(cols: _Columns, spec: _FieldSpec) -> np.ndarray:
+    mask = ~np.isnat(cols.dates(spec.name))
+    if spec.optional:
+        column = cols.df[spec.name].to_numpy(dtype=object)
+        nulls = np.flatnonzero(pd.isna(column))
+        mask[nulls] = [column[i] is None for i in nulls]
+    return mask
+
+
+_FIELD_MASKS = {
+    "str": _string_mask,
+    "number": _number_mask,
+    "int": _number_mask,
+    "datetime_str": _datetime_str_mask,
+}
+
+
+# --- Kernels vectorizados de los validadores conocidos ----------------------
+# Cada kernel replica un validador de `schemas.py` y devuelve True donde es
+# seguro que el validador no lanzará error. Si se modifica un validador, su
+# kernel debe actualizarse (o eliminarse para volver a la ruta Pydantic).
+
+_KERNELS: dict[str, Callable[[_Columns, tuple[str, ...]], np.ndarray]] = {}
+
+
+def _kernel(*qualnames: str):
+    def register(func):
+        for qualname in qualnames:
+            _KERNELS[qualname] = func
+        return func
+
+    return register
+
+
+@_kernel(
+    "CategoryRecord.validate_codigo_producto",
+    "CategoryRecord.validate_text_fields",
+    "SalesRecord.validate_codigo_producto",
+    "StockRecord.validate_codigo_producto",
+)
+def _non_blank_text(cols: _Columns, fields: tuple[str, ...]) -> np.ndarray:
+    """`v.strip().upper()` no vacío."""
+    mask = np.ones(len(cols), dtype=bool)
+    for name in fields:
+        codes, values, is_str = cols.strings(name)
+        unique_ok = is_str & (values.str.strip().str.len().to_numpy() > 0)
+        mask &= np.append(unique_ok, False)[codes]
+    return mask
+
+
+@_kernel("SalesRecord.validate_cantidad")
+def _positive(cols: _Columns, fields: tuple[str, ...]) -> np.ndarray:
+    mask = np.ones(len(cols), dtype=bool)
+    for name in fields:
+        values = cols.numbers(name)
+        if values is None:
+            return np.zeros(len(cols), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            mask &= values > 0
+    return mask
+
+
+@_kernel("SalesRecord.validate_precio")
+def _reasonable_price(cols: _Columns, fields: tuple[str, ...]) -> np.ndarray:
+    values = cols.numbers(fields[0])
+    if values is None:
+        return np.zeros(len(cols), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        return (values > 0) & (values <= 1_000_000)
+
+
+@_kernel("StockRecord.validate_stock")
+def _non_negative_int(cols: _Columns, fields: tuple[str, ...]) -> np.ndarray:
+    values = cols.numbers(fields[0])
+    if values is None:
+        return np.zeros(len(cols), dtype=bool)
+    # int(v) falla con NaN/inf
+    with np.errstate(invalid="ignore"):
+        return np.isfinite(values) & (values >= 0)
+
+
+@_kernel("SalesRecord.validate_fecha")
+def _past_sale_date(cols: _Columns, fields: tuple[str, ...]) -> np.ndarray:
+    dates = cols.dates(fields[0])
+    mask = ~np.isnat(dates)
+    mask &= dates <= cols.now
+    mask &= dates >= np.datetime64("2000-01-01")
+    return mask
+
+
+@_kernel("StockRecord.validate_fecha")
+def _optional_date(cols: _Columns, fields: tuple[str, ...]) -> np.ndarray:
+    # El tipo del campo ya exige None o una fecha parseable (_datetime_str_mask)
+    return np.ones(len(cols), dtype=bool)
+
+
+@_kernel("SalesRecord.validate_total")
+def _reasonable_total(cols: _Columns, fields: tuple[str, ...]) -> np.ndarray:
+    cantidad = cols.numbers("cantidad")
+    precio = cols.numbers("precio_unitario")
+    if cantidad is None or precio is None:
+        return np.zeros(len(cols), dtype=bool)
+    # El modelo usa round(precio, 2); el margen cubre el redondeo y el error de punto flotante
+    with np.errstate(invalid="ignore"):
+        return cantidad * (precio + 0.01) <= 10_000_000
+
+
+# --- Compilación -------------------------------------------------------------
+
+
+def _field_kind(annotation) -> tuple[str, bool] | None:
+    """Clasifica la anotación del campo; None si no tiene equivalente vectorizado."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = set(get_args(annotation))
+    else:
+        args = {annotation}
+
+    optional = type(None) in args
+    args.discard(type(None))
+
+    if args == {str}:
+        return "str", optional
+    if args in ({float}, {int, float}):
+        return "number", optional
+    if args == {int}:
+        return "int", optional
+    if args == {datetime, str}:
+        return "datetime_str", optional
+    return None
+
+
+class CompiledModel:
+    """Modelo Pydantic compilado a máscaras columnares."""
+
+    def __init__(self, model: type[BaseModel], fields: list[_FieldSpec], kernels: list):
+        self.model = model
+        self.fields = fields
+        self.kernels = kernels
+        self.strip = bool(model.model_config.get("str_strip_whitespace", False))
+
+    def certify(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Devuelve una máscara booleana con las filas que Pydantic aceptaría con certeza.
+
+        Las filas en False deben validarse con el modelo Pydantic (pueden ser
+        válidas o no).
+        """
+        if len(df) == 0:
+            return np.zeros(0, dtype=bool)
+        if not df.columns.is_unique:
+            return np.zeros(len(df), dtype=bool)
+
+        cols = _Columns(df, self.strip, datetime.now())
+        mask = np.ones(len(df), dtype=bool)
+
+        for spec in self.fields:
+            if spec.name not in df.columns:
+                if spec.required:
+                    return np.zeros(len(df), dtype=bool)
+                continue
+            mask &= _FIELD_MASKS[spec.kind](cols, spec)
+
+        required = {spec.name for spec in self.fields if spec.required}
+        for kernel, fields in self.kernels:
+            missing = [name for name in fields if name not in df.columns]
+            if missing:
+                # Pydantic no ejecuta los validadores de un campo opcional ausente (toma el default)
+                if any(name in required for name in missing) or len(missing) < len(fields):
+                    return np.zeros(len(df), dtype=bool)
+                continue
+            mask &= kernel(cols, fields)
+
+        return mask
+
+
+@cache
+def compile_model(model: type[BaseModel]) -> CompiledModel | None:
+    """
+    Compila un modelo Pydantic a su versión columnar.
+
+    Returns:
+        El modelo compilado, o None si algún campo, restricción o validador
+        no tiene equivalente vectorizado.
+    """
+    if model.model_config.get("extra") == "forbid":
+        return None
+
+    fields = []
+    for name, info in model.model_fields.items():
+        kind = _field_kind(info.annotation)
+        if kind is None:
+            logger.debug(f"{model.__name__}.{name}: tipo sin equivalente columnar")
+            return None
+        spec = _FieldSpec(name, kind[0], kind[1], info.is_required())
+        if not spec.required and info.default is not None:
+            return None
+        for meta in info.metadata:
+            attr = _CONSTRAINTS.get(type(meta))
+            if attr is None:
+                logger.debug(f"{model.__name__}.{name}: restricción no soportada {meta}")
+                return None
+            spec.constraints[attr] = getattr(meta, attr)
+        fields.append(spec)
+
+    decorators = model.__pydantic_decorators__
+    kernels = []
+    for decorator in decorators.field_validators.values():
+        kernel = _KERNELS.get(decorator.func.__qualname__)
+        if kernel is None:
+            logger.debug(f"Validador sin kernel columnar: {decorator.func.__qualname__}")
+            return None
+        kernels.append((kernel, tuple(decorator.info.fields)))
+
+    for decorator in decorators.model_validators.values():
+        kernel = _KERNELS.get(decorator.func.__qualname__)
+        if kernel is None:
+            logger.debug(f"Validador sin kernel columnar: {decorator.func.__qualname__}")
+            return None
+        kernels.append((kernel, ()))
+
+    if decorators.validators or decorators.root_validators:
+        return None
+
+    return CompiledModel(model, fields, kernels)
@@ -0,0 +1,57 @@
+import pytest
+
+from src.tecno_etl.utils import aws_clients
+from src.tecno_etl.utils.aws_clients import build_config, get_client, get_resource, reset_clients
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    for name in (
+        "AWS_REGION",
+        "TECNO_ETL_AWS_MAX_POOL_CONNECTIONS",
+        "TECNO_ETL_AWS_MAX_ATTEMPTS",
+        "TECNO_ETL_AWS_RETRY_MODE",
+        "TECNO_ETL_AWS_ENDPOINT_URL",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    reset_clients()
+    yield
+    reset_clients()
+
+
+class TestAwsClients:
+
+    def test_default_config(self):
+        config = build_config()
+        assert config.max_pool_connections == aws_clients.DEFAULT_MAX_POOL_CONNECTIONS
+        assert config.retries == {"mode": "adaptive", "max_attempts": 10}
+        assert config.tcp_keepalive is True
+
+    def test_env_overrides(self, monkeypatch):
+        monkeypatch.setenv("TECNO_ETL_AWS_MAX_POOL_CONNECTIONS", "128")
+        monkeypatch.setenv("TECNO_ETL_AWS_RETRY_MODE", "standard")
+        config = build_config(read_timeout=900)
+        assert config.max_pool_connections == 128
+        assert config.retries["mode"] == "standard"
+        assert config.read_timeout == 900
+
+    def test_clients_are_shared_per_key(self):
+        sqs = get_client("sqs")
+        assert get_client("sqs") is sqs
+        assert get_client("sqs", region_name="sa-east-1") is not sqs
+        assert get_client("sqs", read_timeout=900) is not sqs
+        assert sqs.meta.config.max_pool_connections == aws_clients.DEFAULT_MAX_POOL_CONNECTIONS
+
+    def test_endpoint_url_from_env(self, monkeypatch):
+        monkeypatch.setenv("TECNO_ETL_AWS_ENDPOINT_URL", "http://localhost:8000")
+        dynamodb = get_resource("dynamodb")
+        assert dynamodb.meta.client.meta.endpoint_url == "http://localhost:8000"
+        assert get_resource("dynamodb") is dynamodb
+
+    def test_reset_clients(self):
+        sqs = get_client("sqs")
+        reset_clients()
+        assert get_client("sqs") is not sqs
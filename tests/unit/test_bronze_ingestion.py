@@ -0,0 +1,49 @@
+import importlib.util
+import io
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.tecno_etl.pipelines.invoke_aws_pipeline import compress_file_bytes
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+BRONZE_LAMBDA = PROJECT_ROOT / "lambda_functions" / "bronze_ingestion" / "lambda_function.py"
+
+CSV_BYTES = ("fecha,codigo,cantidad,descripción\n" + "2024-03-01,A04-LU1,2,Mouse óptico\n" * 200).encode()
+
+
+@pytest.fixture(scope="module")
+def bronze():
+    """Módulo de la Lambda Bronze, importado como en el paquete desplegado (tecno_etl en el path)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.syspath_prepend(str(PROJECT_ROOT / "src"))
+        mp.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        spec = importlib.util.spec_from_file_location("bronze_lambda_function", BRONZE_LAMBDA)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+class TestOpenFileStream:
+
+    @pytest.mark.parametrize("compression", ["gzip", "zstd"])
+    def test_compressed_payload_round_trips_into_read_csv(self, bronze, compression):
+        if compression == "zstd":
+            pytest.importorskip("zstandard")
+        payload, encoding = compress_file_bytes(CSV_BYTES, compression)
+
+        df = pd.read_csv(bronze.open_file_stream(payload, encoding))
+
+        pd.testing.assert_frame_equal(df, pd.read_csv(io.BytesIO(CSV_BYTES)))
+        assert len(df) == 200
+
+    @pytest.mark.parametrize("encoding", [None, "", "identity"])
+    def test_uncompressed_payload_is_read_as_is(self, bronze, encoding):
+        stream = bronze.open_file_stream(CSV_BYTES, encoding)
+
+        assert stream.read() == CSV_BYTES
+
+    def test_unknown_encoding_is_rejected(self, bronze):
+        with pytest.raises(ValueError, match="content_encoding no soportado: br"):
+            bronze.open_file_stream(CSV_BYTES, "br")
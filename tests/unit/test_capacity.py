@@ -0,0 +1,104 @@
+import json
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from src.tecno_etl.loaders.dynamodb_writer import RateLimitedBatchWriter
+from src.tecno_etl.utils.capacity import CapacityLedger, summarize_ledger
+from src.tecno_etl.utils.metrics import InvocationMetrics
+
+
+class TestCapacityLedger:
+
+    def test_aggregates_per_file_and_table(self):
+        ledger = CapacityLedger("gold_enrichment")
+        ledger.record(
+            {"ConsumedCapacity": {"TableName": "tecnomundo_silver_sales", "CapacityUnits": 128.5}},
+            file_id="ventas_1",
+        )
+        ledger.record(
+            {"ConsumedCapacity": {"TableName": "tecnomundo_dimensions_products", "CapacityUnits": 3.0}},
+            file_id="ventas_1",
+        )
+        ledger.record(
+            {"ConsumedCapacity": [{"TableName": "tecnomundo_gold_sales", "CapacityUnits": 25.0}]},
+            file_id="ventas_1",
+            kind="write",
+        )
+        ledger.record({"ConsumedCapacity": {"TableName": "tecnomundo_silver_sales", "CapacityUnits": 2.0}},
+                      file_id="ventas_2")
+        ledger.record({"Items": []}, file_id="ventas_2")
+
+        by_file = ledger.by_file()
+        assert by_file["ventas_1"]["read"] == 131.5
+        assert by_file["ventas_1"]["write"] == 25.0
+        assert by_file["ventas_1"]["tables"]["tecnomundo_gold_sales"] == {"read": 0.0, "write": 25.0}
+        assert ledger.total("read") == 133.5
+
+    def test_explicit_read_write_units_take_precedence(self):
+        ledger = CapacityLedger("silver_transformation")
+        ledger.record(
+            {"ConsumedCapacity": {"TableName": "t", "CapacityUnits": 3, "WriteCapacityUnits": 3}},
+            kind="read",
+        )
+        assert ledger.total("write") == 3
+        assert ledger.total("read") == 0
+
+    def test_report_to_metrics_line(self):
+        ledger = CapacityLedger("bronze_ingestion")
+        ledger.add("tecnomundo_bronze_sales", write=40, file_id="ventas_1")
+        metrics = InvocationMetrics("bronze_ingestion")
+
+        ledger.report_to(metrics)
+        document = metrics.to_emf()
+
+        assert document["write_capacity_units"] == 40
+        assert document["consumed_capacity"]["ventas_1"]["write"] == 40
+
+    def test_save_to_table_uses_decimals(self):
+        ledger = CapacityLedger("silver_transformation")
+        ledger.add("tecnomundo_bronze_sales", read=0.5, file_id="ventas_1")
+        table = MagicMock()
+
+        assert ledger.save_to_table(table) is True
+        item = table.put_item.call_args.kwargs["Item"]
+        assert item["file_id"] == "ventas_1"
+        assert item["stage_recorded_at"].startswith("silver_transformation#")
+        assert item["read"] == Decimal("0.5")
+
+    def test_save_to_table_failure_does_not_raise(self):
+        ledger = CapacityLedger("gold_enrichment")
+        ledger.add("t", read=1, file_id="f")
+        table = MagicMock()
+        table.put_item.side_effect = RuntimeError("ResourceNotFoundException")
+
+        assert ledger.save_to_table(table) is False
+
+    def test_save_to_file_and_summary(self, tmp_path):
+        path = tmp_path / "ledger.jsonl"
+        for stage, units in [("silver_transformation", 10), ("gold_enrichment", 300), ("gold_enrichment", 200)]:
+            ledger = CapacityLedger(stage)
+            ledger.add("t", read=units, file_id="ventas_1")
+            ledger.save_to_file(path)
+
+        rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        summary = summarize_ledger(rows)
+
+        assert summary["gold_enrichment"] == {"read": 500.0, "write": 0.0, "files": 2}
+        assert summary["silver_transformation"]["read"] == 10.0
+
+    def test_writer_records_consumed_capacity(self):
+        table = MagicMock()
+        table.name = "tecnomundo_silver_sales"
+        table.meta.client.batch_write_item.return_value = {
+            "UnprocessedItems": {},
+            "ConsumedCapacity": [{"TableName": "tecnomundo_silver_sales", "CapacityUnits": 2.0}],
+        }
+        ledger = CapacityLedger("silver_transformation")
+
+        with RateLimitedBatchWriter(table, limiter=None, ledger=ledger, file_id="ventas_1") as writer:
+            writer.put_item(Item={"fecha": "2024-01-01", "sale_id": "1#A"})
+            writer.put_item(Item={"fecha": "2024-01-01", "sale_id": "2#B"})
+
+        call = table.meta.client.batch_write_item.call_args
+        assert call.kwargs["ReturnConsumedCapacity"] == "TOTAL"
+        assert ledger.by_file()["ventas_1"]["write"] == 2.0
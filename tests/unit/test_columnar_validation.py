@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import BaseModel, field_validator
+
+from src.tecno_etl.benchmarks.synthetic_data import generate_sales_frame
+from src.tecno_etl.transformers.data_normalizer import (
+    apply_standard_transformations,
+    validate_dataframe,
+)
+from src.tecno_etl.validators import CategoryRecord, SalesRecord, StockRecord
+from src.tecno_etl.validators.columnar import compile_model
+
+
+def _assert_same_split(df, model):
+    valid_row, errors_row = validate_dataframe(df, model, engine="pydantic")
+    valid_col, errors_col = validate_dataframe(df, model, engine="columnar")
+
+    pd.testing.assert_frame_equal(valid_col, valid_row)
+    pd.testing.assert_frame_equal(errors_col, errors_row)
+    return valid_col, errors_col
+
+
+class TestColumnarValidation:
+
+    def test_models_compile(self):
+        assert compile_model(SalesRecord) is not None
+        assert compile_model(StockRecord) is not None
+        assert compile_model(CategoryRecord) is not None
+
+    def test_unknown_validator_is_not_compiled(self):
+        class CustomRecord(BaseModel):
+            codigo: str
+
+            @field_validator("codigo")
+            @classmethod
+            def validate_codigo(cls, v: str) -> str:
+                return v
+
+        assert compile_model(CustomRecord) is None
+        df = pd.DataFrame({"codigo": ["A", 1]})
+        valid, errors = validate_dataframe(df, CustomRecord)
+        assert len(valid) == 1 and len(errors) == 1
+
+    def test_sales_edge_cases(self):
+        df = pd.DataFrame({
+            "codigo_producto": ["A1", "  ", "B2", "C3", "D4", "E5", "F6", "G7", "H8", None],
+            "cantidad": [1, 2, -1, 3, 1, 1, 2, 1, 1, 1],
+            "precio_unitario": [10.0, 5.0, 5.0, 0.0, 2_000_000.0, 9_999_999.0, 1.5, 3.0, 4.0, 1.0],
+            "fecha": ["2024-01-05", "2024-01-05", "05/01/2024", "2024-01-05", "2024-01-05",
+                      "2024-01-05", "2099-01-01", " 2024-1-5 ", "1999-12-31", "2024-01-05"],
+            "cliente": ["ANA", None, np.nan, "LUIS", "ANA", "ANA", "ANA", "ANA", "ANA", "ANA"],
+        })
+
+        valid, errors = _assert_same_split(df, SalesRecord)
+
+        # ' 2024-1-5 ' no es canónica pero Pydantic la acepta: pasa por la ruta fila a fila
+        assert list(valid.index) == [0, 7]
+        assert errors["row_number"].tolist() == [2, 3, 4, 5, 6, 7, 9, 10]
+
+    def test_sales_synthetic_report(self):
+        df = apply_standard_transformations(generate_sales_frame(3000, dirty_ratio=0.1))
+        df = df.rename(columns={"precio_un_": "precio_unitario"})
+
+        valid, errors = _assert_same_split(df, SalesRecord)
+
+        assert len(valid) > 0 and len(errors) > 0
+
+    def test_sales_datetime_column(self):
+        df = pd.DataFrame({
+            "codigo_producto": ["A1", "B2", "C3"],
+            "cantidad": [1.0, 2.0, 3.0],
+            "precio_unitario": [1.0, 2.0, 3.0],
+            "fecha": pd.to_datetime(["2024-01-01", None, "1990-01-01"]),
+        })
+
+        valid, _ = _assert_same_split(df, SalesRecord)
+
+        # NaT no falla en los validadores del modelo; 1990 es una fecha muy antigua
+        assert list(valid.index) == [0, 1]
+
+    def test_stock_records(self):
+        df = pd.DataFrame({
+            "codigo_producto": ["A1", "B2", "C3", "D4", "E5"],
+            "stock_disponible": [0, 5, -1, np.inf, 7],
+            "fecha_actualizacion": pd.Series(
+                [None, "2024-01-01", "2024-01-01", None, "ayer"], dtype=object
+            ),
+        })
+
+        valid, _ = _assert_same_split(df, StockRecord)
+
+        assert list(valid.index) == [0, 1]
+
+    def test_absent_optional_field_does_not_block_certification(self):
+        df = pd.DataFrame({"codigo_producto": ["A1", "B2"], "stock_disponible": [0, -1]})
+
+        valid, _ = _assert_same_split(df, StockRecord)
+
+        assert list(valid.index) == [0]
+        assert compile_model(StockRecord).certify(df).tolist() == [True, False]
+
+    def test_category_records(self):
+        df = pd.DataFrame({
+            "codigo_producto": ["LU8029", "", "B306", "x" * 60],
+            "nombre_del_producto": ["FOCO", "TAPA", "   ", "BATERIA"],
+            "categoria": ["LUCES", "RC/TAPA", "RC/BATERIAS", "RC/BATERIAS"],
+        })
+
+        valid, _ = _assert_same_split(df, CategoryRecord)
+
+        assert list(valid.index) == [0]
+
+    def test_missing_required_column(self):
+        df = pd.DataFrame({"codigo_producto": ["A1"], "cantidad": [1]})
+
+        valid, errors = _assert_same_split(df, SalesRecord)
+
+        assert valid.empty and len(errors) == 1
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            validate_dataframe(pd.DataFrame({"a": [1]}), SalesRecord, engine="polars")
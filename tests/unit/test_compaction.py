@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from src.tecno_etl.benchmarks.synthetic_data import generate_sales_frame
+from src.tecno_etl.transformers.compaction import compact_dataframe
+from src.tecno_etl.transformers.data_normalizer import (
+    apply_standard_transformations,
+    validate_dataframe,
+)
+from src.tecno_etl.validators import SalesRecord
+
+
+def _normalized_sales(rows=2000):
+    df = apply_standard_transformations(generate_sales_frame(rows, seed=11))
+    return df.rename(columns={"precio_un_": "precio_unitario"})
+
+
+class TestCompaction:
+
+    def test_low_cardinality_text_becomes_categorical(self):
+        df = _normalized_sales()
+        compact, report = compact_dataframe(df)
+
+        for col in ("codigo_producto", "categoria", "nombre_del_producto", "cliente"):
+            assert isinstance(compact[col].dtype, pd.CategoricalDtype)
+        assert report["after_mb"] < report["before_mb"]
+        assert report["columns"]["categoria"]["to"] == "category"
+        # Los valores no cambian
+        pd.testing.assert_frame_equal(compact.astype(df.dtypes.to_dict()), df)
+
+    def test_high_cardinality_text_is_kept(self):
+        df = pd.DataFrame({"id": [f"X{i}" for i in range(100)], "tipo": ["A", "B"] * 50})
+        compact, _ = compact_dataframe(df.astype(object))
+        assert not isinstance(compact["id"].dtype, pd.CategoricalDtype)
+        assert isinstance(compact["tipo"].dtype, pd.CategoricalDtype)
+
+    def test_numeric_downcast_is_lossless(self):
+        df = pd.DataFrame({
+            "cantidad": np.array([1, 2, 120], dtype=np.int64),
+            "exacto": [0.5, 1.25, 2.0],
+            "precio": [1234567.89, 10.01, 3.3],
+        })
+        compact, _ = compact_dataframe(df)
+
+        assert compact["cantidad"].dtype == np.int8
+        assert compact["exacto"].dtype == np.float32
+        # float32 perdería los centavos: se conserva float64
+        assert compact["precio"].dtype == np.float64
+
+    def test_joins_and_groupbys_work_on_compacted_frame(self):
+        df = _normalized_sales()
+        compact, _ = compact_dataframe(df)
+
+        expected = df.groupby("categoria")["subtotal"].sum()
+        result = compact.groupby("categoria", observed=True)["subtotal"].sum()
+        assert result.to_dict() == expected.to_dict()
+
+        dims = df[["codigo_producto", "categoria"]].drop_duplicates("codigo_producto")
+        expected = df.merge(dims, on="codigo_producto", suffixes=("", "_dim"))
+        merged = compact.merge(dims, on="codigo_producto", suffixes=("", "_dim"))
+        pd.testing.assert_frame_equal(merged.astype(expected.dtypes.to_dict()), expected)
+
+    def test_validate_dataframe_compact_option(self):
+        df = _normalized_sales()
+        valid, errors = validate_dataframe(df, SalesRecord)
+        valid_compact, errors_compact = validate_dataframe(df, SalesRecord, compact=True)
+
+        assert isinstance(valid_compact["categoria"].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(valid_compact.astype(valid.dtypes.to_dict()), valid)
+        pd.testing.assert_frame_equal(errors_compact, errors)
@@ -1,12 +1,29 @@
-import pytest
 import pandas as pd
+
+from src.tecno_etl.benchmarks.synthetic_data import generate_sales_frame
+from src.tecno_etl.transformers import data_normalizer
 from src.tecno_etl.transformers.data_normalizer import (
-    sanitize_string,
-    normalize_column_names,
+    _remove_accents,
+    apply_standard_transformations,
+    build_transformation_plan,
     conform_product_key_name,
-    standardize_product_key_format
+    conform_product_name_column,
+    normalize_column_names,
+    sanitize_string,
+    standardize_product_key_format,
+    standardize_text_columns,
+    standardize_text_series,
 )
 
+
+def _apply_step_by_step(df):
+    df = normalize_column_names(df)
+    df = conform_product_key_name(df)
+    df = standardize_product_key_format(df)
+    df = conform_product_name_column(df)
+    return standardize_text_columns(df)
+
+
 class TestDataNormalizer:
 
     def test_sanitize_string(self):
@@ -59,3 +76,43 @@ class TestDataNormalizer:
         
         expected_values = ["123", "XYZ", "SIMPLE"]
         assert df_std["codigo_producto"].tolist() == expected_values
+
+    def test_transformation_plan_fuses_renames(self):
+        plan = build_transformation_plan(["Código", "Nombre del Artículo", "Precio Un."])
+        assert plan["renames"] == {
+            "Código": "codigo_producto",
+            "Nombre del Artículo": "nombre_del_producto",
+            "Precio Un.": "precio_un_",
+        }
+        assert plan["standardize_key"]
+
+    def test_apply_standard_transformations_matches_step_by_step(self):
+        df = generate_sales_frame(500, seed=3)
+        df["Vendedor"] = df["Vendedor"].astype(object)
+        original = df.copy()
+
+        result = apply_standard_transformations(df)
+
+        pd.testing.assert_frame_equal(result, _apply_step_by_step(df))
+        # La entrada no se modifica
+        pd.testing.assert_frame_equal(df, original)
+
+    def test_standardize_text_series_matches_per_row_normalization(self):
+        values = ["  José ", "josé", None, float("nan"), 1, 1.0, True, "Ñandú", "", "  "]
+        series = pd.Series(values * 3, dtype=object, index=range(100, 130), name="cliente")
+
+        expected = series.astype(str).apply(_remove_accents).str.strip().str.upper()
+        pd.testing.assert_series_equal(standardize_text_series(series), expected)
+
+    def test_standardize_text_series_normalizes_each_distinct_value_once(self, monkeypatch):
+        calls = []
+        original = data_normalizer._remove_accents
+        monkeypatch.setattr(
+            data_normalizer, "_remove_accents", lambda v: calls.append(v) or original(v)
+        )
+        series = pd.Series(["Árbol", "Casa", "árbol"] * 1000, dtype=object)
+
+        result = standardize_text_series(series)
+
+        assert len(calls) == 3
+        assert result.tolist()[:3] == ["ARBOL", "CASA", "ARBOL"]
@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock
+
+from src.tecno_etl.loaders.dimension_sync import (
+    apply_diff,
+    catalog_hashes,
+    content_hash,
+    diff_catalog,
+    load_snapshot,
+    read_table_hashes,
+    save_snapshot,
+    snapshot_after,
+)
+from src.tecno_etl.utils.capacity import CapacityLedger
+
+
+def _product(code, name="Auricular", category="Audio"):
+    return {"codigo_producto": code, "nombre_del_producto": name, "categoria": category}
+
+
+def _table():
+    table = MagicMock()
+    table.name = "tecnomundo_dimensions_products"
+    table.meta.client.batch_write_item.return_value = {
+        "UnprocessedItems": {},
+        "ConsumedCapacity": [{"TableName": "tecnomundo_dimensions_products", "CapacityUnits": 1.0}],
+    }
+    return table
+
+
+class TestDiffCatalog:
+
+    def test_content_hash_ignores_attribute_order(self):
+        assert content_hash({"a": "1", "b": "2"}) == content_hash({"b": "2", "a": "1"})
+        assert content_hash({"a": "1"}) != content_hash({"a": "2"})
+
+    def test_only_changes_are_reported(self):
+        current = catalog_hashes([_product("A1"), _product("A2"), _product("A3")])
+        desired = [_product("A1"), _product("A2", name="Auricular BT"), _product("A4")]
+
+        diff = diff_catalog(current, desired)
+
+        assert [item["codigo_producto"] for item in diff.inserts] == ["A4"]
+        assert [item["codigo_producto"] for item in diff.updates] == ["A2"]
+        assert diff.deletes == ["A3"]
+        assert diff.unchanged == 1
+        assert diff.summary() == "1 altas, 1 modificaciones, 1 obsoletos (sin eliminar), 1 sin cambios"
+
+    def test_repeated_codes_keep_last_row(self):
+        diff = diff_catalog({}, [_product("A1", name="viejo"), _product("A1", name="nuevo")])
+
+        assert diff.inserts == [_product("A1", name="nuevo")]
+        assert diff.duplicates == 1
+
+    def test_snapshot_after_applies_changes(self):
+        current = catalog_hashes([_product("A1"), _product("A3")])
+        diff = diff_catalog(current, [_product("A1", name="nuevo")])
+
+        assert snapshot_after(current, diff) == {**current, **catalog_hashes([_product("A1", name="nuevo")])}
+        assert set(snapshot_after(current, diff, delete=True)) == {"A1"}
+
+    def test_snapshot_round_trip(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        assert load_snapshot(path) is None
+        save_snapshot({"A1": "abc"}, path)
+        assert load_snapshot(path) == {"A1": "abc"}
+        path.write_text("{roto", encoding="utf-8")
+        assert load_snapshot(path) is None
+
+    def test_table_hashes_match_catalog_hashes(self):
+        table = MagicMock()
+        table.scan.side_effect = [
+            {"Items": [_product("A1")], "LastEvaluatedKey": {"codigo_producto": "A1"}},
+            {"Items": [_product("A2")]},
+        ]
+        assert read_table_hashes(table) == catalog_hashes([_product("A1"), _product("A2")])
+
+
+class TestApplyDiff:
+
+    def test_writes_only_changes_in_parallel(self):
+        table = _table()
+        current = catalog_hashes([_product(f"P{i:03d}") for i in range(200)])
+        desired = [_product(f"P{i:03d}") for i in range(190)]
+        desired[0] = _product("P000", name="Cambiado")
+        desired += [_product(f"N{i:03d}") for i in range(60)]
+        diff = diff_catalog(current, desired)
+        ledger = CapacityLedger("cargar_dimensiones")
+
+        stats = apply_diff(table, diff, delete=True, workers=3, ledger=ledger, limiter=None)
+
+        assert stats["items"] == 61 + 10
+        sent = [
+            request
+            for call in table.meta.client.batch_write_item.call_args_list
+            for request in call.kwargs["RequestItems"]["tecnomundo_dimensions_products"]
+        ]
+        assert sum("PutRequest" in r for r in sent) == 61
+        assert sorted(r["DeleteRequest"]["Key"]["codigo_producto"] for r in sent if "DeleteRequest" in r) == [
+            f"P{i:03d}" for i in range(190, 200)
+        ]
+        assert ledger.total("write") == table.meta.client.batch_write_item.call_count
+
+    def test_deletes_are_skipped_by_default_and_no_changes_write_nothing(self):
+        table = _table()
+        current = catalog_hashes([_product("A1"), _product("A2")])
+
+        stats = apply_diff(table, diff_catalog(current, [_product("A1")]), limiter=None)
+
+        assert stats["items"] == 0
+        table.meta.client.batch_write_item.assert_not_called()
@@ -0,0 +1,140 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.tecno_etl.benchmarks.fused_mode import (
+    SimulatedDynamoDB,
+    SimulatedQueue,
+    SimulatedTable,
+    run_fused_mode_benchmark,
+)
+from src.tecno_etl.benchmarks.suite import load_lambda_module
+from src.tecno_etl.loaders.rate_limiter import reset_limiters
+from src.tecno_etl.transformers.enrichment import (
+    FUSED_MAX_ROWS_ENV,
+    enrich_items,
+    load_dimensions,
+    use_fused_mode,
+)
+from src.tecno_etl.utils.capacity import CapacityLedger
+from src.tecno_etl.utils.run_ledger import RUN_LEDGER_TABLE, RunLedger
+
+DIMENSIONS = {
+    "LU28015": {"codigo_producto": "LU28015", "nombre_del_producto": "FOCO GIRATORIO", "categoria": "LUCES"},
+}
+
+BRONZE_TABLE = "tecnomundo_bronze_sales"
+
+
+class PagedBronzeTable(SimulatedTable):
+    """Tabla Bronze que devuelve la query en páginas de 100 items (como el límite de 1 MB)."""
+
+    def query(self, ExpressionAttributeValues: dict, ExclusiveStartKey: dict | None = None, **kwargs) -> dict:
+        items = super().query(ExpressionAttributeValues)["Items"]
+        start = ExclusiveStartKey["offset"] if ExclusiveStartKey else 0
+        page = {"Items": items[start: start + 100]}
+        if start + 100 < len(items):
+            page["LastEvaluatedKey"] = {"offset": start + 100}
+        return page
+
+
+class PagedBronzeDynamoDB(SimulatedDynamoDB):
+
+    def Table(self, name: str) -> SimulatedTable:  # noqa: N802
+        return PagedBronzeTable(self, name) if name == BRONZE_TABLE else super().Table(name)
+
+
+@pytest.fixture
+def run_silver(monkeypatch):
+    """Ejecuta el handler Silver sobre un archivo Bronze de 300 filas (3 páginas)."""
+    def run(fused_max_rows, message):
+        db = PagedBronzeDynamoDB(request_latency_ms=0)
+        for i in range(300):
+            db.put(BRONZE_TABLE, {
+                "file_id": "ventas_1", "row_id": i, "fecha": "2024-03-01",
+                "comprobante_num": str(i), "codigo": f"A04-LU{i}", "cantidad": "1",
+            })
+        queue = SimulatedQueue()
+        silver = load_lambda_module("silver_transformation")
+        monkeypatch.setattr(silver, "dynamodb", db)
+        monkeypatch.setattr(silver, "sqs", queue)
+        monkeypatch.setattr(silver, "runs", RunLedger(db.Table(RUN_LEDGER_TABLE)))
+        monkeypatch.setenv(FUSED_MAX_ROWS_ENV, str(fused_max_rows))
+        reset_limiters()
+        silver.lambda_handler({"Records": [{"body": json.dumps({"file_id": "ventas_1", **message})}]}, None)
+        reset_limiters()
+        return db, queue
+    return run
+
+
+class TestEnrichment:
+
+    def test_enrich_items(self):
+        items = [
+            {"fecha": "2024-01-15", "sale_id": "1#LU28015", "codigo_producto": "LU28015"},
+            {"fecha": "2024-01-15", "sale_id": "1#XX00000", "codigo_producto": "XX00000"},
+        ]
+
+        gold_items, found = enrich_items(items, DIMENSIONS)
+
+        assert found == [True, False]
+        assert gold_items[0]["categoria"] == "LUCES"
+        assert gold_items[0]["sale_id"] == "1#LU28015"
+        assert gold_items[1]["nombre_del_producto"] == "NO_ENCONTRADO"
+        assert gold_items[1]["categoria"] == "SIN_CATEGORIA"
+        assert "enriched_at" in gold_items[1]
+
+    def test_load_dimensions_paginates_and_records_capacity(self):
+        table = MagicMock()
+        table.scan.side_effect = [
+            {"Items": [DIMENSIONS["LU28015"]], "LastEvaluatedKey": {"codigo_producto": "LU28015"},
+             "ConsumedCapacity": {"TableName": "dims", "CapacityUnits": 1.0}},
+            {"Items": [{"codigo_producto": "AB1"}], "ConsumedCapacity": {"TableName": "dims", "CapacityUnits": 0.5}},
+        ]
+        ledger = CapacityLedger("gold_enrichment")
+
+        dimensions = load_dimensions(table, ledger, "ventas_1")
+
+        assert set(dimensions) == {"LU28015", "AB1"}
+        assert table.scan.call_args.kwargs["ExclusiveStartKey"] == {"codigo_producto": "LU28015"}
+        assert ledger.by_file()["ventas_1"]["read"] == 1.5
+
+
+class TestFusedMode:
+
+    @pytest.mark.parametrize("env, rows, expected", [
+        (None, 100, False),
+        ("5000", 100, True),
+        ("5000", 5001, False),
+        ("5000", 0, False),
+        ("no", 100, False),
+    ])
+    def test_mode_selection_by_size(self, monkeypatch, env, rows, expected):
+        if env is None:
+            monkeypatch.delenv(FUSED_MAX_ROWS_ENV, raising=False)
+        else:
+            monkeypatch.setenv(FUSED_MAX_ROWS_ENV, env)
+        assert use_fused_mode(rows) is expected
+
+    def test_mode_uses_the_row_count_sent_by_bronze(self, run_silver):
+        # La primera página (100 filas) entra en el límite, el archivo (300) no
+        db, queue = run_silver(200, {"row_count": 300})
+
+        assert len(queue.messages) == 1
+        assert "tecnomundo_gold_sales" not in db.tables
+
+    @pytest.mark.parametrize("message", [{"row_count": 300}, {}])
+    def test_fused_mode_reads_every_bronze_page(self, run_silver, message):
+        db, queue = run_silver(500, message)
+
+        assert queue.messages == []
+        assert len(db.tables["tecnomundo_gold_sales"]) == 300
+
+    def test_fused_mode_writes_the_same_gold_rows_with_one_hop_less(self, tmp_path):
+        staged, fused = run_fused_mode_benchmark(sizes=(300,), data_dir=tmp_path, queue_delay_ms=0)
+
+        assert staged["gold_rows"] == fused["gold_rows"] > 0
+        assert staged["queue_hops"] == 2
+        assert fused["queue_hops"] == 1
+        assert fused["dynamodb_requests"] < staged["dynamodb_requests"]
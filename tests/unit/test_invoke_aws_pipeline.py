@@ -0,0 +1,157 @@
+import base64
+import gzip
+import io
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.tecno_etl.pipelines import invoke_aws_pipeline
+from src.tecno_etl.pipelines.invoke_aws_pipeline import (
+    _percentile,
+    assign_file_ids,
+    compress_file_bytes,
+    discover_input_files,
+    invoke_bronze_lambda,
+    run_batch,
+    submit_batch,
+)
+
+
+@pytest.fixture(autouse=True)
+def mock_runs():
+    """Ledger de corridas en memoria: los tests no escriben en DynamoDB."""
+    with patch.object(invoke_aws_pipeline, "runs", MagicMock()) as runs:
+        yield runs
+
+
+def _sync_response(file_id: str) -> dict:
+    body = {"statusCode": 200, "body": json.dumps({"file_id": file_id, "rows_processed": 2})}
+    return {"StatusCode": 200, "Payload": io.BytesIO(json.dumps(body).encode())}
+
+
+class TestBatchSubmission:
+
+    @pytest.fixture
+    def input_dir(self, tmp_path):
+        for name in ["enero.csv", "febrero.xlsx", "notas.txt", "marzo.CSV"]:
+            (tmp_path / name).write_bytes(b"a,b\n1,2\n")
+        return tmp_path
+
+    def test_discover_input_files(self, input_dir):
+        files = discover_input_files(input_dir)
+        assert [f.name for f in files] == ["enero.csv", "febrero.xlsx", "marzo.CSV"]
+
+    @patch.object(invoke_aws_pipeline, "lambda_client")
+    def test_submit_batch_sync(self, mock_client, input_dir):
+        mock_client.invoke.side_effect = lambda **kw: _sync_response(
+            json.loads(kw["Payload"])["file_name"]
+        )
+        files = discover_input_files(input_dir)
+
+        results = submit_batch(files, max_workers=2)
+
+        assert [r["file"] for r in results] == [f.name for f in files]
+        assert all(r["ok"] for r in results)
+        assert results[0]["file_id"] == "enero.csv"
+        assert mock_client.invoke.call_count == 3
+
+    @patch.object(invoke_aws_pipeline, "lambda_client")
+    def test_submit_batch_event(self, mock_client, input_dir):
+        mock_client.invoke.return_value = {"StatusCode": 202, "Payload": io.BytesIO(b"")}
+
+        results = submit_batch(discover_input_files(input_dir), invocation_type="Event")
+
+        assert all(r["ok"] and r["status_code"] == 202 for r in results)
+        assert mock_client.invoke.call_args.kwargs["InvocationType"] == "Event"
+
+    @patch.object(invoke_aws_pipeline, "lambda_client")
+    def test_submit_batch_records_failures(self, mock_client, input_dir):
+        mock_client.invoke.side_effect = RuntimeError("throttled")
+
+        results = submit_batch(discover_input_files(input_dir))
+
+        assert not any(r["ok"] for r in results)
+        assert results[0]["error"] == "throttled"
+
+    @patch.object(invoke_aws_pipeline, "lambda_client")
+    def test_file_id_is_sent_and_registered_in_ledger(self, mock_client, input_dir, mock_runs):
+        mock_client.invoke.return_value = {"StatusCode": 202, "Payload": io.BytesIO(b"")}
+
+        [result] = submit_batch([input_dir / "enero.csv"], invocation_type="Event")
+
+        payload = json.loads(mock_client.invoke.call_args.kwargs["Payload"])
+        assert payload["file_id"] == result["file_id"]
+        assert result["file_id"].startswith("enero_")
+        mock_runs.submitted.assert_called_once_with(result["file_id"], "enero.csv")
+
+    def test_assign_file_ids_are_unique(self):
+        file_ids = assign_file_ids([Path("a/enero.csv"), Path("b/enero.csv"), Path("enero.xlsx")])
+        assert len(set(file_ids)) == 3
+        assert file_ids[1] == f"{file_ids[0]}_2"
+
+    @patch.object(invoke_aws_pipeline, "lambda_client")
+    def test_run_batch_waits_on_ledger(self, mock_client, input_dir, mock_runs):
+        mock_client.invoke.return_value = {"StatusCode": 202, "Payload": io.BytesIO(b"")}
+        mock_runs.wait_for.side_effect = lambda file_ids, timeout_s: {
+            file_id: {"file_id": file_id, "status": "completed",
+                      "submitted_at": "2024-01-01T00:00:00+00:00",
+                      "completed_at": "2024-01-01T00:00:30+00:00"}
+            for file_id in file_ids
+        }
+
+        assert run_batch(input_dir, 2, "Event", None, wait=True, timeout_s=60) == 0
+        assert len(mock_runs.wait_for.call_args.args[0]) == 3
+
+        mock_runs.wait_for.side_effect = lambda file_ids, timeout_s: dict.fromkeys(file_ids)
+        assert run_batch(input_dir, 2, "Event", None, wait=True, timeout_s=60) == 1
+
+    def test_percentile(self):
+        values = [1.0, 2.0, 3.0, 4.0]
+        assert _percentile(values, 50) == 2.5
+        assert _percentile(values, 100) == 4.0
+        assert _percentile([7.0], 95) == 7.0
+
+
+class TestPayloadCompression:
+
+    def test_compress_gzip_roundtrip(self):
+        data = b"fecha,codigo,cantidad\n" * 1000
+        compressed, encoding = compress_file_bytes(data, "gzip")
+
+        assert encoding == "gzip"
+        assert len(compressed) < len(data)
+        assert gzip.decompress(compressed) == data
+
+    def test_compress_none(self):
+        assert compress_file_bytes(b"abc", None) == (b"abc", None)
+        assert compress_file_bytes(b"abc", "none") == (b"abc", None)
+
+    def test_unsupported_compression(self):
+        with pytest.raises(ValueError):
+            compress_file_bytes(b"abc", "brotli")
+
+    @patch.object(invoke_aws_pipeline, "lambda_client")
+    def test_csv_payload_declares_encoding(self, mock_client, tmp_path):
+        mock_client.invoke.return_value = _sync_response("ventas")
+        file_path = tmp_path / "ventas.csv"
+        file_path.write_bytes(b"a,b\n1,2\n" * 100)
+
+        invoke_bronze_lambda(file_path)
+
+        payload = json.loads(mock_client.invoke.call_args.kwargs["Payload"])
+        assert payload["content_encoding"] == "gzip"
+        assert gzip.decompress(base64.b64decode(payload["file_content"])) == file_path.read_bytes()
+
+    @patch.object(invoke_aws_pipeline, "lambda_client")
+    def test_excel_payload_is_not_compressed(self, mock_client, tmp_path):
+        mock_client.invoke.return_value = _sync_response("ventas")
+        file_path = tmp_path / "ventas.xlsx"
+        file_path.write_bytes(b"PK\x03\x04")
+
+        invoke_bronze_lambda(file_path)
+
+        payload = json.loads(mock_client.invoke.call_args.kwargs["Payload"])
+        assert "content_encoding" not in payload
+        assert base64.b64decode(payload["file_content"]) == b"PK\x03\x04"
@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+from src.tecno_etl.loaders.item_codec import (
+    decode_items,
+    encode_gold_item,
+    encode_silver_item,
+    file_header_item,
+    is_file_header,
+    size_report,
+)
+
+SILVER_ITEM = {
+    "fecha": "2024-01-15",
+    "sale_id": "0001-00012345#ABC123",
+    "comprobante_num": "0001-00012345",
+    "codigo_producto": "ABC123",
+    "cantidad": Decimal("2"),
+    "precio_un_": Decimal("1500.5"),
+    "ganancia": Decimal("300"),
+    "subtotal": Decimal("3001"),
+    "processed_at": "2024-01-15T10:00:00",
+}
+
+DIMENSIONS = {
+    "ABC123": {"codigo_producto": "ABC123", "nombre_del_producto": "Mouse USB", "categoria": "Periféricos"},
+}
+
+
+class TestItemCodec:
+
+    def test_silver_round_trip(self):
+        items = [
+            file_header_item("ventas_1", "processed_at", "2024-01-15T10:00:00"),
+            encode_silver_item(SILVER_ITEM, "ventas_1"),
+        ]
+
+        decoded = decode_items(items)
+
+        assert decoded == [{**SILVER_ITEM, "file_id": "ventas_1"}]
+
+    def test_gold_round_trip_resolves_dimension(self):
+        items = [
+            file_header_item("ventas_1", "enriched_at", "2024-01-15T10:05:00"),
+            encode_gold_item(SILVER_ITEM, "ventas_1", found=True),
+        ]
+
+        [gold] = decode_items(items, DIMENSIONS)
+
+        assert gold["nombre_del_producto"] == "Mouse USB"
+        assert gold["categoria"] == "Periféricos"
+        assert gold["enriched_at"] == "2024-01-15T10:05:00"
+        assert gold["subtotal"] == Decimal("3001")
+
+    def test_gold_not_found_flag(self):
+        encoded = encode_gold_item(SILVER_ITEM, "ventas_1", found=False)
+
+        [gold] = decode_items([encoded], DIMENSIONS)
+
+        assert encoded["nf"] is True
+        assert gold["nombre_del_producto"] == "NO_ENCONTRADO"
+        assert gold["categoria"] == "SIN_CATEGORIA"
+
+    def test_legacy_items_pass_through(self):
+        legacy = {**SILVER_ITEM, "nombre_del_producto": "Mouse USB", "categoria": "Periféricos"}
+        assert decode_items([legacy], DIMENSIONS) == [legacy]
+
+    def test_header_keys_and_detection(self):
+        header = file_header_item("ventas_1", "processed_at")
+        assert header["fecha"] == "#file"
+        assert header["sale_id"] == "ventas_1"
+        assert is_file_header(header)
+        assert not is_file_header(encode_silver_item(SILVER_ITEM, "ventas_1"))
+
+    def test_compact_items_are_smaller(self):
+        gold = {**SILVER_ITEM, "nombre_del_producto": "Mouse USB", "categoria": "Periféricos",
+                "enriched_at": "2024-01-15T10:05:00"}
+
+        before = size_report([gold])
+        after = size_report([encode_gold_item(SILVER_ITEM, "ventas_1", found=True)])
+
+        assert after["avg_bytes"] < before["avg_bytes"] * 0.6
+        assert size_report([]) == {"items": 0, "avg_bytes": 0.0, "avg_wcu": 0.0}
@@ -0,0 +1,116 @@
+import json
+import logging
+
+import pandas as pd
+
+from src.tecno_etl.benchmarks.synthetic_data import write_sales_report
+from src.tecno_etl.extractors import local_file_extractor
+from src.tecno_etl.extractors.layout_registry import LayoutRegistry, header_fingerprint
+from src.tecno_etl.extractors.local_file_extractor import read_file
+from src.tecno_etl.transformers.data_normalizer import apply_standard_transformations
+
+
+class TestLayoutRegistry:
+
+    def test_second_file_with_same_header_skips_inference(self, tmp_path, monkeypatch):
+        registry = LayoutRegistry(tmp_path / "layouts.json")
+        write_sales_report(tmp_path / "enero.csv", 500, seed=1)
+        write_sales_report(tmp_path / "febrero.csv", 500, seed=2)
+
+        df_enero, _ = read_file(tmp_path / "enero.csv", registry=registry)
+        assert registry.misses == 1 and len(registry) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("no debería inferirse el layout")
+
+        monkeypatch.setattr(local_file_extractor, "detect_encoding", fail)
+        monkeypatch.setattr(local_file_extractor, "sniff_csv_format", fail)
+        df_febrero, _ = read_file(tmp_path / "febrero.csv", registry=registry)
+
+        assert registry.hits == 1
+        assert df_febrero.dtypes.to_dict() == df_enero.dtypes.to_dict()
+        pd.testing.assert_frame_equal(
+            df_febrero, pd.read_csv(tmp_path / "febrero.csv"), check_index_type=False
+        )
+
+    def test_registry_is_persistent(self, tmp_path):
+        path = tmp_path / "layouts.json"
+        write_sales_report(tmp_path / "ventas.csv", 100, seed=1)
+        read_file(tmp_path / "ventas.csv", registry=LayoutRegistry(path))
+
+        registry = LayoutRegistry(path)
+        read_file(tmp_path / "ventas.csv", registry=registry)
+        assert registry.hits == 1
+
+    def test_header_change_is_a_miss(self, tmp_path):
+        registry = LayoutRegistry(tmp_path / "layouts.json")
+        (tmp_path / "a.csv").write_text("Código,Cantidad\nA1,1\n", encoding="utf-8")
+        (tmp_path / "b.csv").write_text("Código;Cantidad\nA1;1\n", encoding="utf-8")
+
+        assert header_fingerprint(tmp_path / "a.csv") != header_fingerprint(tmp_path / "b.csv")
+        read_file(tmp_path / "a.csv", registry=registry)
+        df, _ = read_file(tmp_path / "b.csv", registry=registry)
+
+        assert registry.misses == 2 and len(registry) == 2
+        assert list(df.columns) == ["Código", "Cantidad"]
+
+    def test_schema_mismatch_invalidates_and_reinfers(self, tmp_path, caplog):
+        registry = LayoutRegistry(tmp_path / "layouts.json")
+        (tmp_path / "a.csv").write_text("Código,Cantidad\nA1,1\nB2,2\n", encoding="utf-8")
+        (tmp_path / "b.csv").write_text("Código,Cantidad\nA1,1\nB2,\n", encoding="utf-8")
+
+        read_file(tmp_path / "a.csv", registry=registry)
+        with caplog.at_level(logging.INFO):
+            df, _ = read_file(tmp_path / "b.csv", registry=registry)
+
+        assert "Layout de origen reconocido" in caplog.text
+        assert "Layout de origen invalidado" in caplog.text
+        assert df["Cantidad"].isna().sum() == 1
+        fingerprint = header_fingerprint(tmp_path / "b.csv")
+        assert registry.lookup(fingerprint)["dtypes"]["Cantidad"] == "float64"
+
+    def test_column_mapping_is_reused_by_transformations(self, tmp_path, monkeypatch):
+        registry = LayoutRegistry(tmp_path / "layouts.json")
+        write_sales_report(tmp_path / "ventas.csv", 50, seed=1)
+        read_file(tmp_path / "ventas.csv", registry=registry)
+        df, _ = read_file(tmp_path / "ventas.csv", registry=registry)
+        expected = apply_standard_transformations(df)
+
+        monkeypatch.setattr(
+            "src.tecno_etl.transformers.data_normalizer.sanitize_string",
+            lambda s: (_ for _ in ()).throw(AssertionError("no debería sanearse")),
+        )
+        pd.testing.assert_frame_equal(apply_standard_transformations(df), expected)
+
+    def test_hits_are_written_once_on_close(self, tmp_path, monkeypatch):
+        path = tmp_path / "layouts.json"
+        write_sales_report(tmp_path / "ventas.csv", 50, seed=1)
+        read_file(tmp_path / "ventas.csv", registry=LayoutRegistry(path))
+        saves = []
+        save = LayoutRegistry._save
+
+        def counting_save(self):
+            saves.append(self.path)
+            save(self)
+
+        monkeypatch.setattr(LayoutRegistry, "_save", counting_save)
+        with LayoutRegistry(path) as registry:
+            for _ in range(3):
+                read_file(tmp_path / "ventas.csv", registry=registry)
+            assert registry.hits == 3 and saves == []
+
+        assert len(saves) == 1
+        [entry] = json.loads(path.read_text(encoding="utf-8")).values()
+        assert entry["hits"] == 3
+
+    def test_disabled_registry_always_infers(self, tmp_path):
+        path = tmp_path / "layouts.json"
+        write_sales_report(tmp_path / "ventas.csv", 50, seed=1)
+        read_file(tmp_path / "ventas.csv", registry=LayoutRegistry(path))
+
+        with LayoutRegistry(path, enabled=False) as registry:
+            df, _ = read_file(tmp_path / "ventas.csv", registry=registry)
+
+        assert registry.hits == 0 and len(registry) == 0
+        assert "column_mapping" not in df.attrs
+        assert json.loads(path.read_text(encoding="utf-8"))  # la entrada existente no se toca
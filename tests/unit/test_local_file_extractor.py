@@ -1,26 +1,30 @@
-import pytest
-import pandas as pd
-from unittest.mock import patch, MagicMock
 from pathlib import Path
-from src.tecno_etl.extractors.local_file_extractor import read_file
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.tecno_etl.benchmarks.synthetic_data import write_sales_report
+from src.tecno_etl.extractors.local_file_extractor import (
+    detect_encoding,
+    iter_file_chunks,
+    read_file,
+    sniff_csv_format,
+)
+
 
 class TestLocalFileExtractor:
 
-    @patch("src.tecno_etl.extractors.local_file_extractor.pd.read_csv")
-    def test_read_csv_success(self, mock_read_csv):
-        # Setup mock
-        mock_df = pd.DataFrame({"col1": [1, 2]})
-        mock_read_csv.return_value = mock_df
-        
-        file_path = Path("dummy/path/data.csv")
-        
+    def test_read_csv_success(self, tmp_path):
+        file_path = tmp_path / "data.csv"
+        file_path.write_text("col1;col2\n1;a\n2;b\n", encoding="utf-8")
+
         # Execute
         df, file_type = read_file(file_path)
-        
+
         # Assert
         assert file_type == 'csv'
-        pd.testing.assert_frame_equal(df, mock_df)
-        mock_read_csv.assert_called_once()
+        pd.testing.assert_frame_equal(df, pd.DataFrame({"col1": [1, 2], "col2": ["a", "b"]}))
 
     @patch("src.tecno_etl.extractors.local_file_extractor.pd.read_excel")
     def test_read_excel_success(self, mock_read_excel):
@@ -57,3 +61,85 @@ class TestLocalFileExtractor:
         
         assert df is None
         assert file_type is None
+
+    @pytest.mark.parametrize("sep", [",", ";", "\t", "|"])
+    def test_sniff_csv_format(self, sep):
+        sample = sep.join(["Fecha", "Código", "Cantidad"]) + "\n" + sep.join(["2024-01-01", "A1", "3"]) + "\n20"
+        delimiter, header = sniff_csv_format(sample)
+        assert delimiter == sep
+        assert header == ["Fecha", "Código", "Cantidad"]
+
+    def test_iter_file_chunks_yields_configured_size(self, tmp_path):
+        file_path = tmp_path / "ventas.csv"
+        write_sales_report(file_path, 2500, seed=5)
+
+        chunks = list(iter_file_chunks(file_path, chunksize=1000))
+
+        assert [len(c) for c in chunks] == [1000, 1000, 500]
+        assert chunks[1].index[0] == 1000
+
+    def test_read_file_matches_whole_file_python_parser(self, tmp_path, monkeypatch):
+        file_path = tmp_path / "ventas.csv"
+        write_sales_report(file_path, 3000, seed=9)
+        monkeypatch.setattr(
+            "src.tecno_etl.extractors.local_file_extractor.DEFAULT_CHUNK_SIZE", 700
+        )
+
+        df, _ = read_file(file_path)
+
+        expected = pd.read_csv(file_path, sep=None, engine="python")
+        pd.testing.assert_frame_equal(df, expected, check_index_type=False)
+
+    def test_mixed_types_across_chunks_are_read_as_text(self, tmp_path, monkeypatch):
+        file_path = tmp_path / "mixto.csv"
+        rows = [f"{i};{i}" for i in range(10)] + ["10;A10", "11;007"]
+        file_path.write_text("n;codigo\n" + "\n".join(rows) + "\n", encoding="utf-8")
+        monkeypatch.setattr(
+            "src.tecno_etl.extractors.local_file_extractor.DEFAULT_CHUNK_SIZE", 4
+        )
+
+        df, _ = read_file(file_path)
+
+        expected = pd.read_csv(file_path, sep=";")
+        pd.testing.assert_frame_equal(df, expected, check_index_type=False)
+        assert df["codigo"].tolist()[-3:] == ["9", "A10", "007"]
+        assert df["n"].dtype == "int64"
+
+    def test_latin1_fallback(self, tmp_path):
+        file_path = tmp_path / "latin.csv"
+        file_path.write_bytes("Categoría;Cantidad\nAudio;1\nCámaras;2\n".encode("latin1"))
+
+        df, _ = read_file(file_path)
+
+        assert list(df.columns) == ["Categoría", "Cantidad"]
+        assert df["Categoría"].tolist() == ["Audio", "Cámaras"]
+        assert df.attrs["encoding"] == "latin1"
+
+    def test_detect_encoding(self, tmp_path):
+        utf8 = tmp_path / "utf8.csv"
+        utf8.write_text("Categoría\nCámaras\n", encoding="utf-8")
+        bom = tmp_path / "bom.csv"
+        bom.write_text("Categoría\nCámaras\n", encoding="utf-8-sig")
+        utf16 = tmp_path / "utf16.csv"
+        utf16.write_text("Categoría\nCámaras\n", encoding="utf-16")
+
+        assert detect_encoding(utf8) == "utf-8"
+        assert detect_encoding(bom) == "utf-8-sig"
+        assert detect_encoding(utf16) == "utf-16"
+
+    def test_non_utf8_byte_deep_in_file_is_parsed_once(self, tmp_path, monkeypatch):
+        file_path = tmp_path / "windows.csv"
+        body = "".join(f"{i};AUDIO\n" for i in range(50_000))
+        file_path.write_bytes(("n;categoria\n" + body + "50000;CÁMARAS\n").encode("latin1"))
+
+        calls = []
+        original = pd.read_csv
+        monkeypatch.setattr(
+            "src.tecno_etl.extractors.local_file_extractor.pd.read_csv",
+            lambda *a, **kw: calls.append(kw["encoding"]) or original(*a, **kw),
+        )
+        df, _ = read_file(file_path)
+
+        assert calls == ["latin1"]
+        assert df["categoria"].iloc[-1] == "CÁMARAS"
+        assert df.attrs["encoding"] == "latin1"
@@ -0,0 +1,91 @@
+import io
+import json
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.tecno_etl.utils import metrics as metrics_module
+from src.tecno_etl.utils.logger import get_raw_logger
+from src.tecno_etl.utils.metrics import InvocationMetrics, elapsed_ms_since, start_invocation
+
+
+class FakeContext:
+    aws_request_id = "req-123"
+
+
+class TestInvocationMetrics:
+
+    def test_spans_accumulate_by_name(self):
+        metrics = InvocationMetrics("silver_transformation")
+        for _ in range(3):
+            with metrics.span("read_bronze"):
+                pass
+        with metrics.span("transform"):
+            sum(range(1000))
+
+        assert set(metrics.durations_ms) == {"read_bronze", "transform"}
+        assert all(ms >= 0 for ms in metrics.durations_ms.values())
+
+    def test_span_is_recorded_when_block_raises(self):
+        metrics = InvocationMetrics("bronze_ingestion")
+        with pytest.raises(ValueError), metrics.span("parse"):
+            raise ValueError("archivo corrupto")
+        assert "parse" in metrics.durations_ms
+
+    def test_emit_writes_single_emf_line(self):
+        metrics = InvocationMetrics("bronze_ingestion", cold_start=True, request_id="req-1")
+        with metrics.span("decode"):
+            pass
+        metrics.count("rows", 10)
+        metrics.count("rows", 5)
+        metrics.count("input_bytes", 2048, unit="Bytes")
+        metrics.set_property("file_id", "ventas_20240101_000000")
+
+        stream = io.StringIO()
+        metrics.emit(stream)
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 1
+
+        document = json.loads(lines[0])
+        directive = document["_aws"]["CloudWatchMetrics"][0]
+        units = {m["Name"]: m["Unit"] for m in directive["Metrics"]}
+        assert directive["Dimensions"] == [["FunctionName"]]
+        assert units["decode_ms"] == "Milliseconds"
+        assert units["input_bytes"] == "Bytes"
+        assert document["FunctionName"] == "bronze_ingestion"
+        assert document["rows"] == 15
+        assert document["input_bytes"] == 2048
+        assert document["cold_start"] == 1
+        assert document["RequestId"] == "req-1"
+        assert document["file_id"] == "ventas_20240101_000000"
+        # Cada métrica declarada tiene su valor en el documento
+        assert all(name in document for name in units)
+
+    def test_emit_goes_through_raw_logger_without_prefixes(self, monkeypatch):
+        stream = io.StringIO()
+        logger = logging.getLogger("test_metrics.emf")
+        monkeypatch.setattr(logger, "handlers", [])
+        monkeypatch.setattr(metrics_module, "EMF_LOGGER_NAME", logger.name)
+        get_raw_logger(logger.name, stream)
+
+        InvocationMetrics("gold_enrichment").emit()
+
+        [line] = stream.getvalue().splitlines()
+        assert json.loads(line)["FunctionName"] == "gold_enrichment"
+        assert logger.propagate is False  # el formatter del raíz no le agrega prefijos
+
+    def test_only_first_invocation_is_cold_start(self, monkeypatch):
+        monkeypatch.setattr(metrics_module, "_cold_start", True)
+        first = start_invocation("gold_enrichment", FakeContext())
+        second = start_invocation("gold_enrichment", FakeContext())
+
+        assert first.cold_start is True
+        assert second.cold_start is False
+        assert first.request_id == "req-123"
+
+    def test_elapsed_ms_since_message_timestamp(self):
+        timestamp = (datetime.now() - timedelta(seconds=2)).isoformat()
+        assert 2000 <= elapsed_ms_since(timestamp) < 3000
+        assert elapsed_ms_since(None) is None
+        assert elapsed_ms_since("no es una fecha") is None
@@ -0,0 +1,141 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.tecno_etl.benchmarks.suite import LAMBDA_DIR, PROJECT_ROOT
+from src.tecno_etl.utils.packaging import (
+    LambdaSpec,
+    check_budget,
+    move_to_layer,
+    parse_importtime,
+    prune_aws_data,
+    prune_unused,
+    strip_package,
+    trace_imports,
+)
+
+
+def build_package(root):
+    """Paquete de prueba: handler que importa `usado`, el paquete propio y una dependencia tardía."""
+    package = root / "package"
+    (package / "usado").mkdir(parents=True)
+    (package / "usado" / "__init__.py").write_text("VALOR = 1\n")
+    (package / "tardio").mkdir()
+    (package / "tardio" / "__init__.py").write_text("")
+    (package / "sin_uso").mkdir()
+    (package / "sin_uso" / "__init__.py").write_text("")
+    (package / "sin_uso.libs").mkdir()
+    (package / "modulo_suelto.py").write_text("")
+    (package / "bin").mkdir()
+    (package / "usado-1.0.dist-info").mkdir()
+
+    first_party = package / "tecno_etl"
+    (first_party / "utils").mkdir(parents=True)
+    (first_party / "benchmarks").mkdir()
+    for path in ("__init__.py", "utils/__init__.py", "benchmarks/__init__.py", "benchmarks/suite.py"):
+        (first_party / path).write_text("")
+    (first_party / "utils" / "metrics.py").write_text("")
+    (first_party / "utils" / "profiling.py").write_text("")
+
+    (package / "lambda_function.py").write_text(
+        "import usado\n"
+        "from tecno_etl.utils.metrics import *\n"
+        "def lambda_handler(event, context):\n"
+        "    import tardio\n"
+    )
+    return package
+
+
+class TestPackaging:
+
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   usado\n"
+            "import time:       300 |       2500 | lambda_function\n"
+            "Traceback irrelevante\n"
+        )
+        trace = parse_importtime(output)
+        assert trace.modules == {"usado", "lambda_function"}
+        assert trace.handler_import_ms == 2.5
+
+    def test_prune_keeps_traced_and_runtime_imports(self, tmp_path):
+        package = build_package(tmp_path)
+        trace = trace_imports(package, runtime_imports=("tardio",))
+
+        assert {"usado", "tardio", "tecno_etl.utils.metrics"} <= trace.modules
+        assert trace.handler_import_ms > 0
+
+        removed = prune_unused(package, trace)
+
+        remaining = {p.name for p in package.iterdir()}
+        assert {"usado", "tardio", "tecno_etl", "lambda_function.py", "usado-1.0.dist-info"} <= remaining
+        assert not {"sin_uso", "sin_uso.libs", "modulo_suelto.py", "bin"} & remaining
+        assert (package / "tecno_etl" / "utils" / "metrics.py").exists()
+        assert not (package / "tecno_etl" / "utils" / "profiling.py").exists()
+        assert not (package / "tecno_etl" / "benchmarks").exists()
+        assert "sin_uso" in removed
+
+    def test_missing_dependency_fails_even_if_installed_locally(self, tmp_path):
+        # pytest está instalado en el intérprete local pero no en el paquete
+        package = build_package(tmp_path)
+        (package / "lambda_function.py").write_text("import usado\nimport pytest\n")
+
+        with pytest.raises(RuntimeError, match="No module named 'pytest'"):
+            trace_imports(package)
+
+    def test_strip_and_aws_data(self, tmp_path):
+        package = build_package(tmp_path)
+        for service in ("dynamodb", "sqs", "ec2"):
+            (package / "botocore" / "data" / service).mkdir(parents=True)
+            (package / "botocore" / "data" / service / "service-2.json").write_text("{}" * 100)
+        (package / "botocore" / "data" / "endpoints.json").write_text("{}")
+        (package / "usado" / "tests").mkdir()
+
+        removed_bytes = prune_aws_data(package, ("dynamodb",))
+        strip_package(package)
+
+        data = {p.name for p in (package / "botocore" / "data").iterdir()}
+        assert data == {"dynamodb", "endpoints.json"}
+        assert removed_bytes == 400
+        assert not (package / "usado" / "tests").exists()
+        assert not (package / "usado-1.0.dist-info").exists()
+
+    def test_move_to_layer(self, tmp_path):
+        package = build_package(tmp_path)
+        (package / "pandas").mkdir()
+        (package / "numpy.libs").mkdir()
+        (package / "numpy-1.26.4.dist-info").mkdir()
+
+        moved = move_to_layer(package, tmp_path / "layer" / "python")
+
+        assert set(moved) == {"pandas", "numpy.libs", "numpy-1.26.4.dist-info"}
+        assert (tmp_path / "layer" / "python" / "pandas").exists()
+        assert not (package / "pandas").exists()
+
+    def test_check_budget(self):
+        spec = LambdaSpec("gold_enrichment", max_unzipped_mb=10, max_import_ms=500)
+        assert check_budget(spec, 5 * 2**20, 100.0) == []
+        assert check_budget(spec, 5 * 2**20, None) == []
+
+        violations = check_budget(spec, 12 * 2**20, 800.0)
+        assert len(violations) == 2
+        assert "12.0 MB > 10.0 MB" in violations[0]
+        assert "800 ms > 500 ms" in violations[1]
+
+    @pytest.mark.parametrize("name", ["silver_transformation", "gold_enrichment"])
+    def test_silver_and_gold_do_not_import_pandas(self, name):
+        # Sus paquetes no incluyen pandas: tecno_etl no debe importarlo en su camino
+        code = (
+            "import importlib.util, sys; "
+            f"spec = importlib.util.spec_from_file_location('lambda_function', r'{LAMBDA_DIR / name / 'lambda_function.py'}'); "
+            "spec.loader.exec_module(importlib.util.module_from_spec(spec)); "
+            "print(sorted({'pandas', 'numpy'} & set(sys.modules)))"
+        )
+        env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT / "src"), "AWS_DEFAULT_REGION": "us-east-1"}
+        result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
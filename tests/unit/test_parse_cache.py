@@ -0,0 +1,94 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.tecno_etl.benchmarks.synthetic_data import write_sales_report
+from src.tecno_etl.extractors import local_file_extractor
+from src.tecno_etl.extractors.local_file_extractor import read_file
+from src.tecno_etl.extractors.parse_cache import ParseCache
+
+pytest.importorskip("pyarrow")
+
+
+class TestParseCache:
+
+    def test_second_read_is_served_from_cache(self, tmp_path, monkeypatch):
+        cache = ParseCache(tmp_path / "cache")
+        file_path = tmp_path / "ventas.xlsx"
+        write_sales_report(file_path, 300, seed=4)
+
+        df1, file_type = read_file(file_path, cache=cache)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("no debería volver a parsearse")
+
+        monkeypatch.setattr(local_file_extractor.pd, "read_excel", fail)
+        df2, file_type2 = read_file(file_path, cache=cache)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert file_type == file_type2 == "excel"
+        pd.testing.assert_frame_equal(df2, df1)
+
+    def test_csv_round_trip_keeps_attrs(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache")
+        file_path = tmp_path / "ventas.csv"
+        write_sales_report(file_path, 300, seed=4)
+
+        df1, _ = read_file(file_path, cache=cache)
+        df2, _ = read_file(file_path, cache=ParseCache(tmp_path / "cache"))
+
+        pd.testing.assert_frame_equal(df2, df1)
+        assert df2.attrs["encoding"] == "utf-8"
+
+    def test_modified_file_is_a_miss(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache")
+        file_path = tmp_path / "a.csv"
+        file_path.write_text("a,b\n1,2\n", encoding="utf-8")
+        read_file(file_path, cache=cache)
+
+        file_path.write_text("a,b\n3,4\n", encoding="utf-8")
+        df, _ = read_file(file_path, cache=cache)
+
+        assert cache.misses == 2
+        assert df["a"].tolist() == [3]
+
+    def test_touched_file_with_same_content_is_a_hit(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache")
+        file_path = tmp_path / "a.csv"
+        file_path.write_text("a,b\n1,2\n", encoding="utf-8")
+        read_file(file_path, cache=cache)
+
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        read_file(file_path, cache=cache)
+
+        assert cache.hits == 1
+
+    def test_lru_eviction_respects_size_cap(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache")
+        paths = []
+        for i in range(3):
+            paths.append(tmp_path / f"v{i}.csv")
+            write_sales_report(paths[-1], 200, seed=i)
+            read_file(paths[-1], cache=cache)
+        entry_bytes = max(e["bytes"] for e in cache._index.values())
+
+        cache.max_bytes = 2 * entry_bytes
+        read_file(paths[0], cache=cache)  # v0 pasa a ser el más reciente
+        cache._evict()
+
+        assert cache.stats()["entries"] == 2
+        read_file(paths[1], cache=cache)
+        assert cache.misses == 4  # v1 fue desalojado
+
+    def test_disabled_cache_is_a_passthrough(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache", enabled=False)
+        file_path = tmp_path / "a.csv"
+        file_path.write_text("a,b\n1,2\n", encoding="utf-8")
+
+        read_file(file_path, cache=cache)
+        read_file(file_path, cache=cache)
+
+        assert (cache.hits, cache.misses) == (0, 0)
+        assert not (tmp_path / "cache").exists()
@@ -0,0 +1,68 @@
+import cProfile
+import logging
+
+import pytest
+
+from src.tecno_etl.utils import profiling
+from src.tecno_etl.utils.profiling import PROFILE_ENV_VAR, profile_handler
+
+
+def busy_work(n):
+    return sum(i * i for i in range(n))
+
+
+@profile_handler(name="test_handler", top_n=5)
+def handler(event, context):
+    data = [str(i) for i in range(20_000)]
+    return {"statusCode": 200, "total": busy_work(10_000), "rows": len(data)}
+
+
+class TestProfileHandler:
+
+    def test_disabled_does_not_start_profiler(self, monkeypatch):
+        monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("no debería crearse el profiler")
+
+        monkeypatch.setattr(cProfile, "Profile", fail)
+        result = handler({"Records": []}, None)
+        assert result["statusCode"] == 200
+
+    def test_env_var_writes_summary_file_locally(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(PROFILE_ENV_VAR, "1")
+        monkeypatch.setenv(profiling.PROFILE_DIR_ENV_VAR, str(tmp_path))
+
+        result = handler({}, None)
+
+        assert result["rows"] == 20_000
+        summaries = list(tmp_path.glob("test_handler_*.txt"))
+        assert len(summaries) == 1
+        assert len(list(tmp_path.glob("test_handler_*.prof"))) == 1
+        summary = summaries[0].read_text(encoding="utf-8")
+        assert "busy_work" in summary
+        assert "Memoria: top 5 sitios" in summary
+        assert "test_profiling.py" in summary
+
+    def test_event_flag_logs_summary_in_lambda(self, monkeypatch, caplog):
+        monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+        monkeypatch.delenv(profiling.PROFILE_DIR_ENV_VAR, raising=False)
+        monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "tecnomundo-silver")
+
+        with caplog.at_level(logging.INFO, logger=profiling.__name__):
+            handler({"profile": True}, None)
+
+        assert "=== Perfil test_handler" in caplog.text
+        assert "busy_work" in caplog.text
+
+    def test_profile_is_reported_when_handler_raises(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(PROFILE_ENV_VAR, "true")
+        monkeypatch.setenv(profiling.PROFILE_DIR_ENV_VAR, str(tmp_path))
+
+        @profile_handler(name="failing")
+        def failing(event, context):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            failing({}, None)
+        assert list(tmp_path.glob("failing_*.txt"))
@@ -0,0 +1,232 @@
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.tecno_etl.loaders import rate_limiter
+from src.tecno_etl.loaders.dynamodb_writer import (
+    RateLimitedBatchWriter,
+    WriteDeadlineExceeded,
+    estimate_item_size,
+    write_capacity_units,
+)
+from src.tecno_etl.loaders.rate_limiter import TokenBucket, limiter_for_table
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_table(name="tecnomundo_bronze_sales", responses=None):
+    table = MagicMock()
+    table.name = name
+    if responses is not None:
+        table.meta.client.batch_write_item.side_effect = responses
+    else:
+        table.meta.client.batch_write_item.return_value = {"UnprocessedItems": {}}
+    return table
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters(monkeypatch):
+    for name in ("TECNO_ETL_DYNAMODB_WCU", "TECNO_ETL_DYNAMODB_BURST_S", "TECNO_ETL_DYNAMODB_CAPACITY_FRACTION"):
+        monkeypatch.delenv(name, raising=False)
+    rate_limiter.reset_limiters()
+    yield
+    rate_limiter.reset_limiters()
+
+
+class TestTokenBucket:
+
+    def test_sustained_rate_matches_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=5, clock=clock, sleep=clock.sleep)
+
+        for _ in range(50):
+            bucket.acquire(1)
+
+        # 5 tokens de ráfaga inicial + 45 a 5 por segundo
+        assert clock.now == pytest.approx(9.0)
+        assert bucket.waited_s == pytest.approx(9.0)
+
+    def test_throttle_halves_rate_and_success_recovers(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, clock=clock, sleep=clock.sleep)
+
+        bucket.on_throttle()
+        bucket.on_throttle()
+        assert bucket.rate == pytest.approx(2.5)
+        assert bucket.throttles == 2
+
+        for _ in range(100):
+            bucket.on_success()
+        assert bucket.rate == pytest.approx(10)
+
+    def test_wait_time_does_not_consume_tokens(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=5, capacity=10, clock=clock, sleep=clock.sleep)
+
+        assert bucket.wait_time(10) == 0
+        assert bucket.wait_time(20) == pytest.approx(2.0)
+        assert bucket.acquire(10) == 0
+
+    def test_rate_never_drops_below_minimum(self):
+        bucket = TokenBucket(rate=4, min_rate=1)
+        for _ in range(10):
+            bucket.on_throttle()
+        assert bucket.rate == 1
+
+
+class TestCapacityEstimates:
+
+    def test_small_item_costs_one_unit(self):
+        item = {"file_id": "ventas_20240101", "row_id": "row_00001", "cantidad": 3}
+        assert estimate_item_size(item) == len("file_id") + 15 + len("row_id") + 9 + len("cantidad") + 2
+        assert write_capacity_units(item) == 1
+
+    def test_large_item_costs_one_unit_per_kb(self):
+        item = {"file_id": "x", "descripcion": "a" * 2500}
+        assert write_capacity_units(item) == 3
+
+
+class TestRateLimitedBatchWriter:
+
+    def test_writes_in_batches_of_25(self):
+        table = make_table()
+        with RateLimitedBatchWriter(table, limiter=None) as writer:
+            for i in range(60):
+                writer.put_item(Item={"file_id": "f", "row_id": f"row_{i:05d}"})
+
+        calls = table.meta.client.batch_write_item.call_args_list
+        assert [len(c.kwargs["RequestItems"]["tecnomundo_bronze_sales"]) for c in calls] == [25, 25, 10]
+        assert writer.stats()["items"] == 60
+        assert writer.stats()["write_units"] == 60
+
+    def test_unprocessed_items_are_retried_and_slow_down_the_limiter(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=20, clock=clock, sleep=clock.sleep)
+        items = [{"file_id": "f", "row_id": f"row_{i}"} for i in range(3)]
+        unprocessed = {"tecnomundo_bronze_sales": [{"PutRequest": {"Item": items[2]}}]}
+        table = make_table(
+            responses=[{"UnprocessedItems": unprocessed}, {"UnprocessedItems": {}}]
+        )
+
+        with RateLimitedBatchWriter(table, limiter=bucket, sleep=clock.sleep) as writer:
+            for item in items:
+                writer.put_item(Item=item)
+
+        second_call = table.meta.client.batch_write_item.call_args_list[1]
+        assert second_call.kwargs["RequestItems"]["tecnomundo_bronze_sales"] == unprocessed[
+            "tecnomundo_bronze_sales"
+        ]
+        assert writer.stats()["items"] == 3
+        assert writer.stats()["retries"] == 1
+        assert writer.throttles == 1
+        assert bucket.rate < 20
+
+    def test_throttling_error_is_retried(self):
+        error = ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow down"}},
+            "BatchWriteItem",
+        )
+        table = make_table(responses=[error, {"UnprocessedItems": {}}])
+
+        with RateLimitedBatchWriter(table, limiter=None, sleep=lambda s: None) as writer:
+            writer.put_item(Item={"file_id": "f", "row_id": "row_1"})
+
+        assert writer.stats()["items"] == 1
+        assert writer.throttles == 1
+
+    def test_other_errors_are_raised(self):
+        error = ClientError(
+            {"Error": {"Code": "ValidationException", "Message": "bad item"}}, "BatchWriteItem"
+        )
+        table = make_table(responses=[error])
+
+        with pytest.raises(ClientError):
+            with RateLimitedBatchWriter(table, limiter=None) as writer:
+                writer.put_item(Item={"file_id": "f"})
+
+    def test_gives_up_after_max_attempts(self):
+        unprocessed = {"t": [{"PutRequest": {"Item": {"file_id": "f"}}}]}
+        table = make_table(name="t")
+        table.meta.client.batch_write_item.return_value = {"UnprocessedItems": unprocessed}
+
+        writer = RateLimitedBatchWriter(table, limiter=None, max_attempts=3, sleep=lambda s: None)
+        writer.put_item(Item={"file_id": "f"})
+        with pytest.raises(RuntimeError, match="sin procesar"):
+            writer.flush()
+        assert table.meta.client.batch_write_item.call_count == 3
+
+
+    def test_check_deadline_fails_before_writing(self):
+        clock = FakeClock()
+        table = make_table()
+        bucket = TokenBucket(rate=4.5, capacity=4.5 * 300, clock=clock, sleep=clock.sleep)
+        items = [{"file_id": "f", "row_id": f"row_{i:05d}"} for i in range(5000)]
+        writer = RateLimitedBatchWriter(
+            table, limiter=bucket, remaining_ms=lambda: 900_000, sleep=clock.sleep
+        )
+
+        # 1350 WCU de ráfaga + 3650 a 4.5 WCU/s ≈ 811 s: entra en 900 s (menos el margen); el doble no
+        writer.check_deadline(items)
+        with pytest.raises(WriteDeadlineExceeded, match="no termina a tiempo"):
+            writer.check_deadline(items + items)
+        table.meta.client.batch_write_item.assert_not_called()
+
+    def test_deadline_stops_writing_mid_file(self):
+        clock = FakeClock()
+        table = make_table()
+        bucket = TokenBucket(rate=1, capacity=30, clock=clock, sleep=clock.sleep)
+
+        with pytest.raises(WriteDeadlineExceeded, match="25 items escritos"):
+            with RateLimitedBatchWriter(
+                table, limiter=bucket, remaining_ms=lambda: 15_000, sleep=clock.sleep
+            ) as writer:
+                for i in range(100):
+                    writer.put_item(Item={"file_id": "f", "row_id": f"row_{i:05d}"})
+
+        assert table.meta.client.batch_write_item.call_count == 1
+        assert writer.items_written == 25
+
+
+class TestLimiterForTable:
+
+    def test_provisioned_table(self):
+        table = make_table()
+        table.billing_mode_summary = None
+        table.provisioned_throughput = {"WriteCapacityUnits": 10, "ReadCapacityUnits": 10}
+
+        limiter = limiter_for_table(table)
+
+        assert limiter.rate == pytest.approx(9.0)
+        assert limiter.capacity == pytest.approx(9.0 * 300)
+        assert limiter_for_table(table) is limiter
+
+    def test_on_demand_table_is_not_limited(self):
+        table = make_table(name="on_demand")
+        table.billing_mode_summary = {"BillingMode": "PAY_PER_REQUEST"}
+        assert limiter_for_table(table) is None
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv("TECNO_ETL_DYNAMODB_WCU", "20")
+        limiter = limiter_for_table(make_table(name="otra"))
+        assert limiter.rate == pytest.approx(18.0)
+
+    def test_burst_and_fraction_env_override(self, monkeypatch):
+        monkeypatch.setenv("TECNO_ETL_DYNAMODB_WCU", "5")
+        monkeypatch.setenv("TECNO_ETL_DYNAMODB_BURST_S", "60")
+        monkeypatch.setenv("TECNO_ETL_DYNAMODB_CAPACITY_FRACTION", "0.5")
+
+        limiter = limiter_for_table(make_table(name="chica"))
+
+        assert limiter.rate == pytest.approx(2.5)
+        assert limiter.max_rate == pytest.approx(2.5)
+        assert limiter.capacity == pytest.approx(150)
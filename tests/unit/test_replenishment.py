@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tecno_etl.analytics.replenishment import (
+    DemandMatrix,
+    ReplenishmentPolicy,
+    sales_arrays_from_items,
+)
+from src.tecno_etl.benchmarks.replenishment import (
+    generate_sales_events,
+    run_replenishment_benchmark,
+)
+
+
+def _naive_demand(codes, dates, quantities, window):
+    """Media y desvío de la ventana calculados desde cero con pandas"""
+    df = pd.DataFrame({"codigo_producto": codes, "fecha": pd.to_datetime(dates), "cantidad": quantities})
+    days = pd.date_range(df["fecha"].min(), df["fecha"].max(), freq="D")
+    daily = df.pivot_table(index="codigo_producto", columns="fecha", values="cantidad", aggfunc="sum")
+    daily = daily.reindex(columns=days).fillna(0.0)
+    first = df.groupby("codigo_producto")["fecha"].min().reindex(daily.index)
+    result = {}
+    for code, row in daily.iterrows():
+        start = max(days[-1] - pd.Timedelta(days=window - 1), first[code])
+        values = row[row.index >= start].to_numpy()
+        std = values.std(ddof=1) if len(values) > 1 else 0.0
+        result[code] = (values.mean(), std)
+    return result
+
+
+def _assert_matches_naive(demand, codes, dates, quantities):
+    expected = _naive_demand(codes, dates, quantities, demand.window_days)
+    metrics = demand.metrics().set_index("codigo_producto")
+    assert set(metrics.index) == set(expected)
+    for code, (mean, std) in expected.items():
+        assert metrics.loc[code, "demanda_media"] == pytest.approx(mean, abs=1e-6)
+        assert metrics.loc[code, "desvio"] == pytest.approx(std, abs=1e-6)
+
+
+class TestDemandMatrix:
+
+    def test_rolling_demand_matches_naive_computation(self):
+        codes, dates, quantities = generate_sales_events(200, 90, seed=1)
+
+        demand = DemandMatrix.from_sales(codes, dates, quantities, window_days=14)
+
+        assert demand.matrix().shape == (len(set(codes)), 90)
+        _assert_matches_naive(demand, codes, dates, quantities)
+
+    def test_incremental_days_match_rebuild(self):
+        codes, dates, quantities = generate_sales_events(100, 60, seed=2)
+        cut = dates < np.datetime64("2022-01-31")
+        demand = DemandMatrix.from_sales(codes[cut], dates[cut], quantities[cut], window_days=7)
+
+        # Un día a la vez, después un salto de varios días y un producto nuevo
+        new_days = np.unique(dates[~cut])[:20]
+        for day in new_days:
+            same = dates == day
+            demand.add_sales(codes[same], dates[same], quantities[same])
+        demand.add_sales(["NUEVO"], ["2022-03-15"], [4.0])
+
+        loaded = dates <= new_days[-1]
+        all_codes = np.concatenate([codes[loaded], ["NUEVO"]])
+        all_dates = np.concatenate([dates[loaded], [np.datetime64("2022-03-15")]])
+        all_quantities = np.concatenate([quantities[loaded], [4.0]])
+        rebuilt = DemandMatrix.from_sales(all_codes, all_dates, all_quantities, window_days=7)
+
+        pd.testing.assert_frame_equal(
+            demand.metrics().set_index("codigo_producto").sort_index(),
+            rebuilt.metrics().set_index("codigo_producto").sort_index(),
+        )
+
+    def test_saved_matrix_continues_like_the_original(self, tmp_path):
+        codes, dates, quantities = generate_sales_events(80, 40, seed=3)
+        cut = dates < np.datetime64("2022-01-31")
+        demand = DemandMatrix.from_sales(codes[cut], dates[cut], quantities[cut], window_days=7)
+
+        loaded = DemandMatrix.load(demand.save(tmp_path / "estado" / "demand.npz"))
+
+        assert loaded.codes == demand.codes
+        assert loaded.start == demand.start and loaded.last_date == demand.last_date
+        np.testing.assert_array_equal(loaded.matrix(), demand.matrix())
+        # Sólo las ventas posteriores al último día cargado, más un producto nuevo
+        after = dates > loaded.last_date
+        new_day = dates.max() + np.timedelta64(2, "D")
+        for matrix in (demand, loaded):
+            matrix.add_sales(codes[after], dates[after], quantities[after])
+            matrix.add_sales(["NUEVO"], [new_day], [3.0])
+        pd.testing.assert_frame_equal(loaded.metrics(), demand.metrics())
+        rebuilt = DemandMatrix.from_sales(
+            np.concatenate([codes, ["NUEVO"]]),
+            np.concatenate([dates, [new_day]]),
+            np.concatenate([quantities, [3.0]]),
+            window_days=7,
+        )
+        pd.testing.assert_frame_equal(
+            loaded.metrics().set_index("codigo_producto").sort_index(),
+            rebuilt.metrics().set_index("codigo_producto").sort_index(),
+        )
+
+    def test_late_sales_inside_window_update_sums(self):
+        demand = DemandMatrix.from_sales(["A1", "A1"], ["2024-03-01", "2024-03-05"], [2.0, 3.0], window_days=7)
+
+        demand.add_sales(["A1"], ["2024-03-03"], [5.0])
+
+        row = demand.metrics().iloc[0]
+        assert row["demanda_media"] == pytest.approx(10 / 5)
+        assert row["desvio"] == pytest.approx(np.std([2, 0, 5, 0, 3], ddof=1))
+
+    def test_invalid_dates_are_dropped_and_earlier_dates_rejected(self):
+        demand = DemandMatrix.from_sales(
+            ["A1", "B2", "C3"], ["2024-03-01", "1900-01-01", "2024-03-02"], [1.0, 5.0, float("nan")]
+        )
+
+        assert demand.codes == ["A1"]
+        assert demand.n_days == 1
+        with pytest.raises(ValueError, match="anteriores al inicio"):
+            demand.add_sales(["A1"], ["2024-02-01"], [1.0])
+
+    def test_sales_arrays_from_gold_items(self):
+        items = [
+            {"codigo_producto": "A1", "fecha": "2024-03-01", "cantidad": 2},
+            {"codigo_producto": "B2", "fecha": "2024-03-02"},
+        ]
+
+        codes, dates, quantities = sales_arrays_from_items(items)
+
+        assert codes.tolist() == ["A1", "B2"]
+        assert dates.dtype == np.dtype("datetime64[D]")
+        assert quantities.tolist() == [2.0, 0.0]
+
+
+class TestReplenishmentMetrics:
+
+    def test_orders_up_to_target_when_below_reorder_point(self):
+        # Demanda constante de 2 unidades diarias durante 10 días: desvío 0
+        dates = pd.date_range("2024-03-01", periods=10).to_numpy()
+        demand = DemandMatrix.from_sales(["A1"] * 10 + ["B2"] * 10, np.tile(dates, 2), [2.0] * 20, window_days=10)
+        policy = ReplenishmentPolicy(lead_time_days=5, review_days=10)
+
+        metrics = demand.metrics({"A1": 8, "B2": 40}, policy).set_index("codigo_producto")
+
+        assert metrics.loc["A1", "dias_cobertura"] == 4
+        assert metrics.loc["A1", "punto_pedido"] == 10
+        assert metrics.loc["A1", "cantidad_sugerida"] == 30 - 8
+        assert metrics.loc["B2", "cantidad_sugerida"] == 0
+
+    def test_safety_stock_is_the_one_in_reorder_point_and_target(self):
+        codes, dates, quantities = generate_sales_events(50, 30, seed=4)
+        demand = DemandMatrix.from_sales(codes, dates, quantities, window_days=14)
+        policy = ReplenishmentPolicy(lead_time_days=4, review_days=9, service_z=2.0)
+
+        metrics = demand.metrics(policy=policy)
+
+        assert (metrics["stock_seguridad"] > 0).any()
+        np.testing.assert_allclose(
+            metrics["stock_seguridad"], policy.service_z * metrics["desvio"] * np.sqrt(policy.lead_time_days)
+        )
+        np.testing.assert_allclose(
+            metrics["punto_pedido"], metrics["demanda_media"] * policy.lead_time_days + metrics["stock_seguridad"]
+        )
+        np.testing.assert_allclose(
+            metrics["stock_objetivo"], metrics["punto_pedido"] + metrics["demanda_media"] * policy.review_days
+        )
+
+    def test_products_without_demand_have_infinite_cover(self):
+        demand = DemandMatrix.from_sales(["A1", "B2"], ["2024-03-01", "2024-03-01"], [1.0, 1.0], window_days=3)
+        demand.add_sales(["A1"], ["2024-03-10"], [1.0])
+
+        metrics = demand.metrics({"B2": 5, "Z9": 3}).set_index("codigo_producto")
+
+        assert np.isinf(metrics.loc["B2", "dias_cobertura"])
+        assert metrics.loc["B2", "cantidad_sugerida"] == 0
+        assert metrics.loc["A1", "stock"] == 0
+        assert "Z9" not in metrics.index
+
+    def test_benchmark_reports_incremental_speedup(self):
+        results = run_replenishment_benchmark(products=300, days=60)
+
+        assert [r["stage"] for r in results] == [
+            "replenishment[build]", "replenishment[metrics]",
+            "replenishment[incremental_day]", "replenishment[rebuild_day]",
+        ]
+        assert results[2]["speedup"] > 0
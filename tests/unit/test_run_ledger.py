@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.tecno_etl.utils.run_ledger import (
+    RunLedger,
+    describe_run,
+    end_to_end_s,
+    make_file_id,
+    stage_latencies,
+    summarize_runs,
+)
+
+
+def _run(file_id, submitted, bronze, silver, gold, status="completed"):
+    """Corrida terminada con las etapas indicadas como (inicio, fin) en segundos desde `submitted`."""
+    base = datetime.fromisoformat(submitted)
+
+    def at(seconds):
+        return (base + timedelta(seconds=seconds)).isoformat()
+
+    run = {"file_id": file_id, "status": status, "submitted_at": submitted}
+    for stage, (start, end) in (("bronze", bronze), ("silver", silver), ("gold", gold)):
+        run[f"{stage}_started_at"] = at(start)
+        run[f"{stage}_finished_at"] = at(end)
+    if status == "completed":
+        run["completed_at"] = at(gold[1])
+    return run
+
+
+class TestRunLedger:
+
+    @pytest.fixture
+    def ledger(self):
+        return RunLedger(MagicMock(), clock=lambda: "2024-01-01T00:00:00+00:00")
+
+    def test_start_is_a_single_atomic_update(self, ledger):
+        ledger.start("ventas_1", "silver", rows_in=120)
+
+        kwargs = ledger.table.update_item.call_args.kwargs
+        assert kwargs["Key"] == {"file_id": "ventas_1"}
+        assert kwargs["UpdateExpression"].startswith("SET ")
+        updated = {
+            kwargs["ExpressionAttributeNames"][name]: kwargs["ExpressionAttributeValues"][value]
+            for name, value in (pair.split(" = ") for pair in kwargs["UpdateExpression"][4:].split(", "))
+        }
+        assert updated == {
+            "status": "running",
+            "current_stage": "silver",
+            "silver_started_at": "2024-01-01T00:00:00+00:00",
+            "silver_rows_in": 120,
+            "updated_at": "2024-01-01T00:00:00+00:00",
+        }
+
+    def test_final_stage_completes_the_run(self, ledger):
+        ledger.finish("ventas_1", "gold", rows_in=100, rows_out=100, final=True)
+
+        kwargs = ledger.table.update_item.call_args.kwargs
+        values = kwargs["ExpressionAttributeValues"]
+        assert "completed" in values.values()
+        assert kwargs["UpdateExpression"].endswith("REMOVE #r0")
+        assert kwargs["ExpressionAttributeNames"]["#r0"] == "current_stage"
+
+        ledger.finish("ventas_1", "silver", rows_in=100, rows_out=98)
+        assert "REMOVE" not in ledger.table.update_item.call_args.kwargs["UpdateExpression"]
+
+    def test_fail_records_stage_error(self, ledger):
+        ledger.fail("ventas_1", "bronze", "CSV inválido")
+
+        kwargs = ledger.table.update_item.call_args.kwargs
+        names = kwargs["ExpressionAttributeNames"].values()
+        assert "bronze_error" in names
+        assert "failed" in kwargs["ExpressionAttributeValues"].values()
+
+    def test_update_errors_do_not_interrupt_the_stage(self, ledger):
+        ledger.table.update_item.side_effect = RuntimeError("AccessDenied")
+        assert ledger.start("ventas_1", "bronze") is False
+
+    def test_wait_for_polls_until_runs_finish(self, ledger):
+        states = iter([
+            {"file_id": "a", "status": "running"},
+            {"file_id": "a", "status": "running"},
+            {"file_id": "a", "status": "completed"},
+        ])
+        ledger.table.get_item.side_effect = lambda **kw: {"Item": next(states)}
+        clock = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        runs = ledger.wait_for(["a"], timeout_s=60, poll_s=2, sleep=sleep, monotonic=lambda: clock[0])
+
+        assert runs["a"]["status"] == "completed"
+        assert sleeps == [2, 3.0]
+        assert ledger.table.get_item.call_args.kwargs["ConsistentRead"] is True
+
+    def test_wait_for_stops_at_timeout(self, ledger):
+        ledger.table.get_item.return_value = {}
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        runs = ledger.wait_for(["a"], timeout_s=5, poll_s=2, sleep=sleep, monotonic=lambda: clock[0])
+
+        assert runs == {"a": None}
+        assert clock[0] == 5
+
+
+    def test_wait_for_keeps_polling_after_ledger_errors(self, ledger):
+        responses = iter([
+            RuntimeError("ProvisionedThroughputExceededException"),
+            {"Item": {"file_id": "a", "status": "completed"}},
+        ])
+
+        def get_item(**kwargs):
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        ledger.table.get_item.side_effect = get_item
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        runs = ledger.wait_for(["a"], timeout_s=60, poll_s=2, sleep=sleep, monotonic=lambda: clock[0])
+
+        assert runs["a"]["status"] == "completed"
+        assert clock[0] == 2
+
+
+class TestRunSummary:
+
+    def test_stage_and_end_to_end_latency(self):
+        run = _run("a", "2024-01-01T10:00:00+00:00", bronze=(1, 4), silver=(5, 7), gold=(8, 10))
+        assert stage_latencies(run) == {"bronze": 3.0, "silver": 2.0, "gold": 2.0}
+        assert end_to_end_s(run) == 10.0
+        assert "total=" in describe_run(run)
+
+    def test_summarize_runs_percentiles_and_periods(self):
+        runs = [
+            _run(f"r{i}", f"2024-01-0{1 + i // 5}T10:00:00+00:00", (0, 1), (1, 2), (2, 2 + i))
+            for i in range(10)
+        ]
+        runs.append({"file_id": "en_curso", "status": "running", "current_stage": "silver"})
+        runs.append({"file_id": "roto", "status": "failed", "bronze_error": "x"})
+
+        summary = summarize_runs(runs)
+
+        assert [run["file_id"] for run in summary["in_flight"]] == ["en_curso"]
+        assert [run["file_id"] for run in summary["failed"]] == ["roto"]
+        assert summary["completed"] == 10
+        assert summary["end_to_end"]["p50"] == pytest.approx(6.5)
+        assert summary["end_to_end"]["p95"] == pytest.approx(10.55)
+        assert summary["stages"]["bronze"] == {"p50": 1.0, "p95": 1.0}
+        assert list(summary["by_period"]) == ["2024-01-01", "2024-01-02"]
+        assert summary["by_period"]["2024-01-01"]["runs"] == 5
+
+    def test_make_file_id_matches_bronze_format(self):
+        now = datetime(2024, 3, 5, 14, 30, 0)
+        assert make_file_id("data/raw/ventas marzo.csv", now) == "ventas marzo_20240305_143000"
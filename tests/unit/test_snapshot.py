@@ -0,0 +1,14 @@
+from src.tecno_etl.utils.snapshot import load_json_snapshot, save_json_snapshot
+
+
+class TestJsonSnapshot:
+
+    def test_round_trip_and_unreadable_file(self, tmp_path):
+        path = tmp_path / "stock" / "tecnomundo_stock_current.json"
+        assert load_json_snapshot(path) is None
+
+        assert save_json_snapshot({"B2": 0, "A1": 12}, path) == path
+        assert load_json_snapshot(path) == {"A1": 12, "B2": 0}
+
+        path.write_text("{incompleto", encoding="utf-8")
+        assert load_json_snapshot(path) is None
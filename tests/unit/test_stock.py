@@ -0,0 +1,126 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from src.tecno_etl.pipelines.stock_pipeline import (
+    build_change_items,
+    read_current_stock,
+    write_stock_delta,
+)
+from src.tecno_etl.transformers.stock import (
+    compute_stock_delta,
+    invalid_codes,
+    prepare_stock_frame,
+    summarize_stock_delta,
+    validate_stock,
+)
+
+
+def _table(name):
+    table = MagicMock()
+    table.name = name
+    table.meta.client.batch_write_item.return_value = {"UnprocessedItems": {}}
+    return table
+
+
+class TestStockTransformations:
+
+    def test_prepare_conforms_export_columns(self):
+        df = pd.DataFrame({"Código Interno": ["a04-lu1"], "Existencia": [3], "Depósito": ["central"]})
+
+        prepared = prepare_stock_frame(df)
+
+        assert list(prepared.columns) == ["codigo_producto", "stock_disponible"]
+        assert prepared["codigo_producto"].tolist() == ["LU1"]
+
+    def test_prepare_requires_stock_column(self):
+        with pytest.raises(ValueError, match="stock_disponible"):
+            prepare_stock_frame(pd.DataFrame({"Código": ["A1"], "Precio": [10]}))
+
+    def test_validate_sums_repeated_products_and_drops_invalid_rows(self):
+        df = pd.DataFrame({
+            "Código": ["B2", "A1", "B2", "C3"],
+            "Stock": [3, 5.9, 4, -1],
+        })
+
+        stock, errors = validate_stock(df)
+
+        assert stock.to_dict() == {"A1": 5, "B2": 7}
+        assert len(errors) == 1
+
+
+class TestStockDelta:
+
+    def test_only_changed_products_are_returned(self):
+        current = pd.Series({"A1": 5, "B2": 7, "C3": 0, "D4": 2})
+        previous = {"A1": 5, "B2": 1, "C3": 0, "Z9": 4}
+
+        delta = compute_stock_delta(current, previous)
+
+        assert delta["codigo_producto"].tolist() == ["B2", "D4"]
+        assert delta["tipo"].tolist() == ["cambio", "alta"]
+        assert delta["delta"].tolist() == [6, 2]
+        assert delta["stock_anterior"].isna().tolist() == [False, True]
+        assert summarize_stock_delta(delta, len(current)) == "1 altas, 1 cambios, 2 sin cambios"
+
+    def test_missing_products_can_be_zeroed(self):
+        current = pd.Series({"A1": 5})
+        delta = compute_stock_delta(current, {"A1": 5, "Z9": 4, "Y8": 0}, missing_as_zero=True)
+
+        assert delta.to_dict("records") == [
+            {"codigo_producto": "Z9", "stock_anterior": 4, "stock_disponible": 0, "tipo": "ausente", "delta": -4}
+        ]
+
+    def test_products_with_only_invalid_rows_are_not_zeroed(self):
+        # C3 viene en el export, pero su única fila no pasa la validación
+        df = pd.DataFrame({"Código": ["A1", "C3"], "Stock": [5, -1]})
+        stock, errors = validate_stock(df)
+
+        delta = compute_stock_delta(
+            stock, {"A1": 5, "C3": 4, "Z9": 2}, missing_as_zero=True, invalid=invalid_codes(errors)
+        )
+
+        assert invalid_codes(errors) == {"C3"}
+        assert delta[["codigo_producto", "tipo"]].to_dict("records") == [{"codigo_producto": "Z9", "tipo": "ausente"}]
+
+    def test_unchanged_export_produces_no_writes(self):
+        current = pd.Series({f"P{i}": i for i in range(1000)})
+        assert compute_stock_delta(current, current.to_dict()).empty
+
+
+class TestStockPipeline:
+
+    def test_change_items_omit_previous_stock_for_new_products(self):
+        delta = compute_stock_delta(pd.Series({"A1": 5, "B2": 2}), {"A1": 3})
+
+        items = build_change_items(delta, "2024-03-05", "stock.xlsx")
+
+        assert items[0] == {
+            "codigo_producto": "A1", "snapshot_date": "2024-03-05", "stock_disponible": 5,
+            "delta": 2, "tipo": "cambio", "source_file": "stock.xlsx", "stock_anterior": 3,
+        }
+        assert "stock_anterior" not in items[1]
+        assert all(type(item["stock_disponible"]) is int for item in items)
+
+    def test_writes_changes_and_current_snapshot(self):
+        changes, current = _table("tecnomundo_stock_changes"), _table("tecnomundo_stock_current")
+        delta = compute_stock_delta(pd.Series({"A1": 5, "B2": 2, "C3": 1}), {"A1": 3, "C3": 1})
+
+        stats = write_stock_delta(changes, current, delta, "2024-03-05", "stock.xlsx", limiter=None)
+
+        assert stats["tecnomundo_stock_changes"]["items"] == 2
+        [call] = current.meta.client.batch_write_item.call_args_list
+        written = [r["PutRequest"]["Item"] for r in call.kwargs["RequestItems"]["tecnomundo_stock_current"]]
+        assert written == [
+            {"codigo_producto": "A1", "stock_disponible": 5, "snapshot_date": "2024-03-05"},
+            {"codigo_producto": "B2", "stock_disponible": 2, "snapshot_date": "2024-03-05"},
+        ]
+
+    def test_read_current_stock_paginates(self):
+        table = MagicMock()
+        table.scan.side_effect = [
+            {"Items": [{"codigo_producto": "A1", "stock_disponible": 5}], "LastEvaluatedKey": {"k": 1}},
+            {"Items": [{"codigo_producto": "B2", "stock_disponible": 0}]},
+        ]
+        assert read_current_stock(table) == {"A1": 5, "B2": 0}
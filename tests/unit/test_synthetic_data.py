@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from src.tecno_etl.benchmarks.suite import compare_results
+from src.tecno_etl.benchmarks.synthetic_data import (
+    EXCEL_MAX_ROWS,
+    SALES_HEADERS,
+    generate_sales_frame,
+    iter_sales_chunks,
+    write_sales_report,
+)
+
+
+class TestSyntheticData:
+
+    def test_generate_sales_frame_layout(self):
+        df = generate_sales_frame(500, seed=1)
+
+        assert list(df.columns) == SALES_HEADERS
+        assert len(df) == 500
+        # Algunos códigos llevan prefijo de caja (ej. 'A04-')
+        assert df["Código"].str.match(r"^[A-Ca-c]\d{2}-").any()
+
+    def test_generate_sales_frame_is_reproducible(self):
+        df1 = generate_sales_frame(200, seed=7)
+        df2 = generate_sales_frame(200, seed=7)
+        pd.testing.assert_frame_equal(df1, df2)
+
+    def test_dirty_rows(self):
+        clean = generate_sales_frame(2000, seed=3, dirty_ratio=0.0)
+        dirty = generate_sales_frame(2000, seed=3, dirty_ratio=0.5)
+
+        assert (clean["Cantidad"] > 0).all()
+        assert (dirty["Cantidad"].fillna(0) <= 0).any()
+
+    def test_iter_sales_chunks(self):
+        chunks = list(iter_sales_chunks(2500, chunk_rows=1000))
+
+        assert [len(c) for c in chunks] == [1000, 1000, 500]
+        # La numeración de comprobantes continúa entre bloques
+        assert chunks[1]["Comprobante Nº"].iloc[0] == "0001-00000333"
+
+    def test_write_csv_report(self, tmp_path):
+        path = write_sales_report(tmp_path / "ventas.csv", 1500, chunk_rows=700)
+        df = pd.read_csv(path)
+
+        assert list(df.columns) == SALES_HEADERS
+        assert len(df) == 1500
+
+    def test_write_excel_over_limit(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_sales_report(tmp_path / "ventas.xlsx", EXCEL_MAX_ROWS + 1)
+
+    def test_write_rejects_xls(self, tmp_path):
+        with pytest.raises(ValueError, match="no soportado"):
+            write_sales_report(tmp_path / "ventas.xls", 10)
+        assert not (tmp_path / "ventas.xls").exists()
+
+
+class TestCompareResults:
+
+    def test_detects_regressions(self):
+        baseline = {"results": [
+            {"stage": "read_file", "rows": 1000, "format": "csv", "best_s": 1.0},
+            {"stage": "validate_dataframe", "rows": 1000, "format": "csv", "best_s": 1.0},
+        ]}
+        current = {"results": [
+            {"stage": "read_file", "rows": 1000, "format": "csv", "best_s": 1.1},
+            {"stage": "validate_dataframe", "rows": 1000, "format": "csv", "best_s": 1.5},
+        ]}
+
+        regressions = compare_results(baseline, current, tolerance=0.2)
+
+        assert [r["stage"] for r in regressions] == ["validate_dataframe"]
@@ -0,0 +1,105 @@
+import pandas as pd
+
+from src.tecno_etl.transformers.data_normalizer import validate_dataframe
+from src.tecno_etl.validators import CategoryRecord, SalesRecord
+from src.tecno_etl.validators.cache import ValidationCache, schema_version
+
+
+def _sales_frame():
+    return pd.DataFrame({
+        "codigo_producto": ["A1", "B2", "C3", "D4"],
+        "cantidad": [1, -2, 3, 4],
+        "precio_unitario": [10.0, 5.0, 0.0, 8.0],
+        "fecha": ["2024-01-05", "2024-01-05", "2024-01-06", "2024-01-07"],
+    })
+
+
+class TestValidationCache:
+
+    def test_second_run_is_served_from_cache(self, tmp_path):
+        df = _sales_frame()
+        with ValidationCache(tmp_path / "cache") as cache:
+            valid1, errors1 = validate_dataframe(df, SalesRecord, cache=cache)
+            assert cache.hits == 0
+
+            valid2, errors2 = validate_dataframe(df, SalesRecord, cache=cache)
+            assert cache.hits == len(df)
+
+        pd.testing.assert_frame_equal(valid1, valid2)
+        pd.testing.assert_frame_equal(errors1, errors2)
+
+    def test_cache_is_persistent_and_only_changed_rows_miss(self, tmp_path):
+        path = tmp_path / "cache"
+        df = _sales_frame()
+        with ValidationCache(path) as cache:
+            validate_dataframe(df, SalesRecord, cache=cache)
+
+        corrected = df.copy()
+        corrected.loc[1, "cantidad"] = 2
+        with ValidationCache(path) as cache:
+            valid, errors = validate_dataframe(corrected, SalesRecord, cache=cache)
+            assert cache.hits == 3 and cache.misses == 1
+
+        assert list(valid.index) == [0, 1, 3]
+        assert errors["row_number"].tolist() == [3]
+
+    def test_matches_uncached_results(self, tmp_path):
+        df = _sales_frame()
+        expected_valid, expected_errors = validate_dataframe(df, SalesRecord)
+        with ValidationCache(tmp_path / "cache") as cache:
+            validate_dataframe(df, SalesRecord, cache=cache)
+            valid, errors = validate_dataframe(df, SalesRecord, cache=cache)
+
+        pd.testing.assert_frame_equal(valid, expected_valid)
+        pd.testing.assert_frame_equal(errors, expected_errors)
+
+    def test_value_types_are_part_of_the_fingerprint(self, tmp_path):
+        df = pd.DataFrame({"a": pd.Series([1, "1"], dtype=object)})
+        with ValidationCache(tmp_path / "cache") as cache:
+            h1, h2 = cache.fingerprint(df)
+        assert h1[0] != h1[1] and h2[0] != h2[1]
+
+    def test_string_dtype_columns_are_tagged_like_object(self, tmp_path):
+        values = ["A1", "B2"]
+        with ValidationCache(tmp_path / "cache") as cache:
+            as_object = cache.fingerprint(pd.DataFrame({"a": pd.Series(values, dtype=object)}))
+            as_string = cache.fingerprint(pd.DataFrame({"a": pd.Series(values, dtype="string")}))
+        assert (as_object[0] == as_string[0]).all()
+
+    def test_context_depends_on_schema_and_dtypes(self, tmp_path):
+        df = _sales_frame()
+        with ValidationCache(tmp_path / "cache") as cache:
+            base = cache.context(df, SalesRecord)
+            assert cache.context(df, CategoryRecord) != base
+            assert cache.context(df.astype({"cantidad": "float64"}), SalesRecord) != base
+        assert schema_version(SalesRecord) != schema_version(CategoryRecord)
+
+    def test_lru_eviction(self, tmp_path):
+        with ValidationCache(tmp_path / "cache", max_entries=3) as cache:
+            validate_dataframe(_sales_frame(), SalesRecord, cache=cache)
+            stats = cache.stats()
+        assert stats["entries"] == 3
+        assert stats["evictions"] == 1
+
+    def test_invalid_results_expire(self, tmp_path):
+        df = _sales_frame()
+        with ValidationCache(tmp_path / "cache", invalid_ttl_s=-1) as cache:
+            validate_dataframe(df, SalesRecord, cache=cache)
+            validate_dataframe(df, SalesRecord, cache=cache)
+            # Sólo las 2 filas válidas se reutilizan
+            assert cache.hits == 2
+
+    def test_last_used_survives_reopen(self, tmp_path):
+        df = _sales_frame()
+        with ValidationCache(tmp_path / "cache", max_entries=4) as cache:
+            validate_dataframe(df.iloc[:2], SalesRecord, cache=cache)
+            validate_dataframe(df.iloc[2:], SalesRecord, cache=cache)
+            # Usar de nuevo las dos primeras filas: pasan a ser las más recientes
+            validate_dataframe(df.iloc[:2], SalesRecord, cache=cache)
+
+        with ValidationCache(tmp_path / "cache", max_entries=3) as cache:
+            extra = df.iloc[[0]].assign(codigo_producto="Z9")
+            validate_dataframe(extra, SalesRecord, cache=cache)
+            validate_dataframe(df, SalesRecord, cache=cache)
+            # Se desalojaron las filas 2 y 3 (las de uso más antiguo)
+            assert cache.hits == 2
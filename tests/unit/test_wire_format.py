@@ -0,0 +1,97 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from boto3.dynamodb.types import TypeDeserializer
+
+from src.tecno_etl.loaders.dynamodb_writer import estimate_item_size
+from src.tecno_etl.loaders.wire_format import (
+    PreSerializedBatchWriter,
+    serialize_column,
+    serialize_frame,
+    wire_item_size,
+    wire_write_capacity_units,
+)
+from src.tecno_etl.utils.aws_clients import build_config
+
+
+def deserialize(item: dict) -> dict:
+    deserializer = TypeDeserializer()
+    return {name: deserializer.deserialize(value) for name, value in item.items()}
+
+
+class TestSerializeColumn:
+
+    def test_floats_become_number_strings_and_nan_null(self):
+        column = pd.Series([6853.42, np.nan, 3.0, 1e-07])
+        assert serialize_column(column) == [
+            {"N": "6853.42"},
+            {"NULL": True},
+            {"N": "3.0"},
+            {"N": "0.0000001"},
+        ]
+
+    def test_integers_strings_and_booleans(self):
+        assert serialize_column(pd.Series([1, 20])) == [{"N": "1"}, {"N": "20"}]
+        assert serialize_column(pd.Series(["A04-LU1", None])) == [{"S": "A04-LU1"}, {"NULL": True}]
+        assert serialize_column(pd.Series([True, False])) == [{"BOOL": True}, {"BOOL": False}]
+
+    def test_mixed_object_column(self):
+        column = pd.Series([1, "x", None, 2.5], dtype=object)
+        assert serialize_column(column) == [{"N": "1"}, {"S": "x"}, {"NULL": True}, {"N": "2.5"}]
+
+    def test_infinity_is_rejected(self):
+        with pytest.raises(ValueError, match="infinitos"):
+            serialize_column(pd.Series([1.0, np.inf]))
+
+
+class TestSerializeFrame:
+
+    def test_round_trip_matches_resource_values(self):
+        df = pd.DataFrame({
+            "codigo": ["A04-LU1", "B08-VT2"],
+            "cantidad": [3.0, np.nan],
+            "precio_un_": [6853.42, 2426.1],
+        })
+
+        items = serialize_frame(df, constants={"file_id": "ventas_1"})
+
+        assert [deserialize(item) for item in items] == [
+            {"file_id": "ventas_1", "codigo": "A04-LU1", "cantidad": Decimal("3.0"),
+             "precio_un_": Decimal("6853.42")},
+            {"file_id": "ventas_1", "codigo": "B08-VT2", "cantidad": None,
+             "precio_un_": Decimal("2426.1")},
+        ]
+
+    def test_wire_size_matches_python_estimate(self):
+        python_item = {"file_id": "ventas_1", "codigo": "LU28015", "subtotal": Decimal("5433.72"), "x": None}
+        [wire_item] = serialize_frame(
+            pd.DataFrame({"codigo": ["LU28015"], "subtotal": [5433.72], "x": [None]}),
+            constants={"file_id": "ventas_1"},
+        )
+        assert wire_item_size(wire_item) == estimate_item_size(python_item)
+        assert wire_write_capacity_units({"d": {"S": "a" * 2500}}) == 3
+
+
+class TestPreSerializedBatchWriter:
+
+    def test_items_are_sent_unchanged_with_the_low_level_client(self):
+        table = MagicMock()
+        table.name = "tecnomundo_bronze_sales"
+        client = MagicMock()
+        client.batch_write_item.return_value = {"UnprocessedItems": {}}
+        items = serialize_frame(pd.DataFrame({"row_id": ["row_00000", "row_00001"]}), {"file_id": "f"})
+
+        with PreSerializedBatchWriter(table, client=client, limiter=None) as writer:
+            for item in items:
+                writer.put_item(Item=item)
+
+        requests = client.batch_write_item.call_args.kwargs["RequestItems"]["tecnomundo_bronze_sales"]
+        assert [r["PutRequest"]["Item"] for r in requests] == items
+        assert writer.stats()["write_units"] == 2
+        table.meta.client.batch_write_item.assert_not_called()
+
+    def test_config_can_disable_parameter_validation(self):
+        assert build_config(parameter_validation=False).parameter_validation is False